@@ -0,0 +1,371 @@
+"""
+Document analysis benchmark.
+
+Runs DocumentAnalysisService over the synthetic corpus (document_corpus.py)
+and records, per document:
+
+- per layer     latency (min/p50/p95 over --repeat runs), peak Python/NumPy
+                allocations (tracemalloc) and peak RSS growth
+- end to end    DocumentAnalysisService.analyze latency, plus the score,
+                status and flags (so detection drift shows up too)
+
+Each layer runs on a fresh ParsedDocument, so a layer's numbers include
+opening the libraries it uses. Allocations and RSS come from a separate,
+untimed pass (tracemalloc slows allocation-heavy code down).
+
+Results are written as JSON; --compare diffs two result files and exits 1
+when a metric regressed past --threshold. Runs offline on Linux (RSS is read
+from /proc; elsewhere only the process peak is available).
+
+Run with:
+    python scripts/benchmark_documents.py --out bench.json
+    python scripts/benchmark_documents.py --size medium --repeat 10 --out bench.json
+    python scripts/benchmark_documents.py --compare baseline.json bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import resource
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from scripts.document_corpus import SIZES, CorpusDocument, generate_corpus, load_corpus, MANIFEST_NAME
+
+RESULTS_VERSION = 1
+
+# Metrics compared by --compare (higher is worse for all of them)
+COMPARED_LAYER_METRICS = ["p50_ms", "peak_alloc_kb", "peak_rss_kb"]
+
+
+# ============ MEASUREMENT ============
+
+class RssSampler:
+    """
+    Peak resident set size growth while the block runs.
+
+    Polls /proc/self/statm from a background thread. Without /proc, falls
+    back to the growth of the process-lifetime peak (ru_maxrss), which only
+    moves when a new high is reached.
+    """
+
+    INTERVAL = 0.002
+
+    def __init__(self):
+        self._page_kb = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+        self._proc = os.path.exists("/proc/self/statm")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.baseline_kb = 0
+        self.peak_kb = 0
+
+    def _rss_kb(self) -> int:
+        if self._proc:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_kb
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_kb = max(self.peak_kb, self._rss_kb())
+            self._stop.wait(self.INTERVAL)
+
+    def __enter__(self) -> "RssSampler":
+        self.baseline_kb = self.peak_kb = self._rss_kb()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_kb = max(self.peak_kb, self._rss_kb())
+
+    @property
+    def growth_kb(self) -> int:
+        return self.peak_kb - self.baseline_kb
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Latency over `repeat` timed runs (after one warm-up), then one tracked run."""
+    fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        with RssSampler() as rss:
+            fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": repeat,
+        "min_ms": round(min(timings), 3),
+        "p50_ms": round(float(np.percentile(timings, 50)), 3),
+        "p95_ms": round(float(np.percentile(timings, 95)), 3),
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "retained_alloc_kb": round(current / 1024, 1),
+        "peak_rss_kb": rss.growth_kb,
+    }
+
+
+# ============ BENCHMARK ============
+
+def _layer_call(spec, path: str, doc_type: str) -> Callable[[], object]:
+    from src.services.document.context import ParsedDocument
+
+    analyzer = spec.factory()
+
+    def run():
+        parsed = ParsedDocument(path)
+        try:
+            if spec.takes_doc_type:
+                return analyzer.analyze(parsed, doc_type)
+            return analyzer.analyze(parsed)
+        finally:
+            parsed.close()
+    return run
+
+
+def benchmark_document(service, document: CorpusDocument, corpus_dir: str, repeat: int) -> dict:
+    from src.services.document.context import sniff_format
+
+    path = os.path.join(corpus_dir, document.name)
+    file_format = sniff_format(path)
+    specs = service.registry.profile(document.doc_type, file_format)
+
+    layers = {spec.name: measure(_layer_call(spec, path, document.doc_type), repeat) for spec in specs}
+    end_to_end = measure(lambda: service.analyze(path, document.doc_type), repeat)
+    result = service.analyze(path, document.doc_type)
+
+    return {
+        "name": document.name,
+        "kind": document.kind,
+        "format": file_format,
+        "pages": document.pages,
+        "size_bytes": document.size_bytes,
+        "tampering": document.tampering,
+        "layers": layers,
+        "end_to_end": end_to_end,
+        "result": {
+            "legitimacy_score": result.legitimacy_score,
+            "status": result.status.value,
+            "flags": sorted(result.flags),
+        },
+    }
+
+
+def summarize(documents: List[dict]) -> dict:
+    """Per-layer and end-to-end aggregates over the corpus."""
+    per_layer: Dict[str, List[dict]] = {}
+    for doc in documents:
+        for name, stats in doc["layers"].items():
+            per_layer.setdefault(name, []).append(stats)
+
+    layers = {}
+    for name, runs in per_layer.items():
+        p50s = [r["p50_ms"] for r in runs]
+        layers[name] = {
+            "documents": len(runs),
+            "total_p50_ms": round(sum(p50s), 3),
+            "p50_ms": round(float(np.median(p50s)), 3),
+            "max_p50_ms": round(max(p50s), 3),
+            "peak_alloc_kb": max(r["peak_alloc_kb"] for r in runs),
+            "peak_rss_kb": max(r["peak_rss_kb"] for r in runs),
+        }
+
+    e2e = [doc["end_to_end"]["p50_ms"] for doc in documents]
+    total_ms = sum(e2e)
+    pages = sum(doc["pages"] for doc in documents)
+    return {
+        "layers": layers,
+        "end_to_end": {
+            "documents": len(documents),
+            "total_p50_ms": round(total_ms, 3),
+            "p50_ms": round(float(np.median(e2e)), 3),
+            "p95_ms": round(float(np.percentile(e2e, 95)), 3),
+            "docs_per_second": round(len(documents) / (total_ms / 1000), 3) if total_ms else None,
+            "pages_per_second": round(pages / (total_ms / 1000), 3) if total_ms else None,
+            "peak_alloc_kb": max(doc["end_to_end"]["peak_alloc_kb"] for doc in documents),
+            "peak_rss_kb": max(doc["end_to_end"]["peak_rss_kb"] for doc in documents),
+        },
+    }
+
+
+def _environment() -> dict:
+    import fitz
+    import PIL
+    from src.services.document.result_cache import rules_version
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pymupdf": fitz.VersionBind,
+        "pillow": PIL.__version__,
+        "rules_version": rules_version()[:12],
+        "settings": {k: v for k, v in sorted(os.environ.items()) if k.startswith("DOCUMENT_")},
+    }
+
+
+def run_benchmark(corpus_dir: Optional[str], size: str, repeat: int, only: Optional[str]) -> dict:
+    from src.services.document.service import DocumentAnalysisService
+
+    if corpus_dir is None or not os.path.exists(os.path.join(corpus_dir, MANIFEST_NAME)):
+        corpus_dir = corpus_dir or tempfile.mkdtemp(prefix="doc_corpus_")
+        print(f"Generating {size} corpus in {corpus_dir}")
+        generate_corpus(corpus_dir, size)
+    corpus = load_corpus(corpus_dir)
+    if only:
+        corpus = [doc for doc in corpus if only in doc.name]
+
+    service = DocumentAnalysisService()
+    documents = []
+    for document in corpus:
+        stats = benchmark_document(service, document, corpus_dir, repeat)
+        documents.append(stats)
+        layer_ms = "  ".join(f"{name}={s['p50_ms']:.1f}" for name, s in stats["layers"].items())
+        print(f"  {document.name:28s} e2e p50 {stats['end_to_end']['p50_ms']:8.1f} ms  [{layer_ms}]")
+
+    return {
+        "version": RESULTS_VERSION,
+        "environment": _environment(),
+        "config": {"corpus_dir": corpus_dir, "size": size, "repeat": repeat, "only": only},
+        "documents": documents,
+        "summary": summarize(documents),
+    }
+
+
+# ============ COMPARE ============
+
+def _change(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    if old is None or new is None or old == 0:
+        return None
+    return (new - old) / old * 100
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """Print metric changes; return the regressions past threshold (%)."""
+    regressions = []
+    rows = []
+
+    def check(label: str, old, new, higher_is_worse: bool = True, noise_floor: float = 0.0):
+        change = _change(old, new)
+        worse = change is not None and (change if higher_is_worse else -change) > threshold
+        # Tiny absolute values (sub-ms, a few KB) are all noise
+        if worse and abs((new or 0) - (old or 0)) <= noise_floor:
+            worse = False
+        rows.append((label, old, new, change, worse))
+        if worse:
+            regressions.append(f"{label}: {old} -> {new} ({change:+.1f}%)")
+
+    old_layers = baseline["summary"]["layers"]
+    new_layers = current["summary"]["layers"]
+    for name in sorted(set(old_layers) | set(new_layers)):
+        old, new = old_layers.get(name, {}), new_layers.get(name, {})
+        check(f"{name}.p50_ms", old.get("p50_ms"), new.get("p50_ms"), noise_floor=1.0)
+        check(f"{name}.peak_alloc_kb", old.get("peak_alloc_kb"), new.get("peak_alloc_kb"), noise_floor=64)
+        check(f"{name}.peak_rss_kb", old.get("peak_rss_kb"), new.get("peak_rss_kb"), noise_floor=1024)
+
+    old_e2e, new_e2e = baseline["summary"]["end_to_end"], current["summary"]["end_to_end"]
+    check("end_to_end.p50_ms", old_e2e.get("p50_ms"), new_e2e.get("p50_ms"), noise_floor=1.0)
+    check("end_to_end.docs_per_second", old_e2e.get("docs_per_second"), new_e2e.get("docs_per_second"), higher_is_worse=False)
+
+    print(f"{'metric':34s} {'baseline':>12s} {'current':>12s} {'change':>9s}")
+    for label, old, new, change, worse in rows:
+        change_text = f"{change:+8.1f}%" if change is not None else "       -"
+        print(f"{label:34s} {old if old is not None else '-':>12} {new if new is not None else '-':>12} {change_text}{'  <-' if worse else ''}")
+
+    # Detection drift: same document, different verdict
+    old_results = {doc["name"]: doc["result"] for doc in baseline["documents"]}
+    for doc in current["documents"]:
+        old = old_results.get(doc["name"])
+        if old and (old["status"] != doc["result"]["status"] or old["flags"] != doc["result"]["flags"]):
+            print(f"  result changed: {doc['name']}: {old['status']} {old['flags']} -> "
+                  f"{doc['result']['status']} {doc['result']['flags']}")
+
+    for key in ("commit", "rules_version", "cpu_count", "python"):
+        if baseline["environment"].get(key) != current["environment"].get(key):
+            print(f"  note: {key} differs ({baseline['environment'].get(key)} -> {current['environment'].get(key)})")
+
+    for key in ("size", "repeat", "only"):
+        if baseline["config"].get(key) != current["config"].get(key):
+            print(f"  note: {key} differs ({baseline['config'].get(key)} -> {current['config'].get(key)})")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark document analysis on a synthetic corpus")
+    parser.add_argument("--corpus", help="Corpus directory (generated here if it has no corpus.json)")
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("--only", help="Only documents whose name contains this")
+    parser.add_argument("--out", help="Write results JSON here")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Diff two result files")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold}%:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions")
+        return 0
+
+    logging.basicConfig(level=logging.WARNING)
+    results = run_benchmark(args.corpus, args.size, args.repeat, args.only)
+
+    e2e = results["summary"]["end_to_end"]
+    print(f"\nEnd to end: p50 {e2e['p50_ms']} ms, p95 {e2e['p95_ms']} ms, "
+          f"{e2e['docs_per_second']} docs/s, {e2e['pages_per_second']} pages/s")
+    for name, stats in results["summary"]["layers"].items():
+        print(f"  {name:16s} p50 {stats['p50_ms']:8.1f} ms  max {stats['max_p50_ms']:8.1f} ms  "
+              f"alloc {stats['peak_alloc_kb']:9.1f} KB  rss +{stats['peak_rss_kb']} KB")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
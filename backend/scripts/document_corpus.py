@@ -0,0 +1,303 @@
+"""
+Synthetic document corpus for the document analysis benchmark.
+
+Generates certificate-like PDFs and images, each clean or tampered, from a
+fixed seed, so two runs produce the same corpus:
+
+- digital    Born-digital text PDFs (varied page counts and fonts)
+- scanned    PDFs of noisy, JPEG-compressed page scans
+- image      JPEG/PNG page scans
+- tampered   Editor metadata, back-dated modification, mixed fonts, a
+             retyped date in another font, an incremental update,
+             pasted-in dates, double-compressed JPEGs, editor EXIF
+
+Needs only PyMuPDF, Pillow and NumPy; runs offline.
+
+Run with: python scripts/document_corpus.py OUT_DIR [--size small|medium|large]
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import fitz
+from PIL import Image, ImageDraw, ImageFont
+
+MANIFEST_NAME = "corpus.json"
+
+# Page counts per corpus size (digital PDFs get each count)
+SIZES = {
+    "small": [1, 3],
+    "medium": [1, 5, 20],
+    "large": [1, 10, 50, 200],
+}
+
+SCAN_DPI = 150
+FONTS = ["helv", "tiro", "cour"]
+MIXED_FONTS = ["helv", "tiro", "cour", "hebo", "tibo", "cobo", "heit"]
+
+TRUSTED_METADATA = {
+    "creator": "Microsoft Word",
+    "producer": "Microsoft: Print To PDF",
+    "creationDate": "D:20210312101500",
+    "modDate": "D:20210312101500",
+}
+
+
+@dataclass
+class CorpusDocument:
+    """One generated file and what was done to it."""
+    name: str
+    kind: str                  # digital | scanned | image
+    file_format: str           # pdf | jpeg | png
+    pages: int
+    tampering: Optional[str] = None
+    doc_type: str = "education"
+    size_bytes: int = 0
+    tags: List[str] = field(default_factory=list)
+
+
+# ============ PAGE CONTENT ============
+
+def _page_lines(rng: np.random.RandomState, page_num: int) -> List[str]:
+    """Certificate-style text with PAN and date fields for the text layer."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    pan = "".join(rng.choice(list(letters), 3)) + "P" + rng.choice(list(letters)) + f"{rng.randint(1000, 9999)}" + rng.choice(list(letters))
+    lines = [
+        "UNIVERSITY OF EXAMPLE",
+        "Degree Certificate" if page_num == 0 else f"Statement of Marks - Page {page_num + 1}",
+        "",
+        f"This is to certify that Candidate {rng.randint(1000, 9999)} has passed",
+        "the examination of Bachelor of Technology held by the college.",
+        f"PAN: {pan}",
+        f"Date of issue: {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/20{rng.randint(10, 23)}",
+        "",
+    ]
+    for i in range(22):
+        lines.append(f"Subject {i + 1:02d}    Marks {rng.randint(40, 100):3d} / 100    Grade {rng.choice(list('ABC'))}")
+    return lines
+
+
+def _text_pdf(rng: np.random.RandomState, pages: int, fonts: List[str], metadata: Dict[str, str]) -> fitz.Document:
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page(width=595, height=842)
+        y = 72
+        for i, line in enumerate(_page_lines(rng, page_num)):
+            fontname = fonts[i % len(fonts)]
+            fontsize = 18 if i == 0 else 11
+            if line:
+                page.insert_text((72, y), line, fontname=fontname, fontsize=fontsize)
+            y += fontsize + 9
+    doc.set_metadata(metadata)
+    return doc
+
+
+def _scan(rng: np.random.RandomState, page: fitz.Page) -> np.ndarray:
+    """Render a page and add paper tone and sensor noise (uint8 grayscale)."""
+    pix = page.get_pixmap(matrix=fitz.Matrix(SCAN_DPI / 72, SCAN_DPI / 72), colorspace=fitz.csGRAY)
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    noisy = gray.astype(np.float32) * 0.85 + 20 + rng.normal(0, 5, gray.shape)
+    return noisy.clip(0, 255).astype(np.uint8)
+
+
+def _paste_date(gray: np.ndarray) -> np.ndarray:
+    """Cover part of the page with a clean digital patch carrying a new date."""
+    img = Image.fromarray(gray.copy())
+    draw = ImageDraw.Draw(img)
+    x, y = int(gray.shape[1] * 0.45), int(gray.shape[0] * 0.24)
+    draw.rectangle([x - 6, y - 6, x + 280, y + 40], fill=236)
+    draw.text((x, y), "01/04/2024", fill=12, font=ImageFont.load_default(size=32))
+    return np.asarray(img)
+
+
+def _jpeg(gray: np.ndarray, quality: int, exif: Optional[Image.Exif] = None) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(gray).save(buffer, "JPEG", quality=quality, **({"exif": exif} if exif else {}))
+    return buffer.getvalue()
+
+
+def _png(gray: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(gray).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _pdf_bytes(doc: fitz.Document) -> bytes:
+    """Serialized PDF without a random /ID, so the corpus is byte-for-byte reproducible."""
+    return doc.tobytes(garbage=1, no_new_id=True)
+
+
+def _incremental_update(data: bytes, edit: Callable[[fitz.Document], None]) -> bytes:
+    """Apply edit and append it as an incremental update, as editors save."""
+    tmp_dir = tempfile.mkdtemp(prefix="doc_corpus_")
+    try:
+        path = os.path.join(tmp_dir, "doc.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        doc = fitz.open(path)
+        edit(doc)
+        doc.save(path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP, no_new_id=True)
+        doc.close()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _scanned_pdf(scans: List[bytes]) -> fitz.Document:
+    doc = fitz.open()
+    for data in scans:
+        page = doc.new_page(width=595, height=842)
+        page.insert_image(page.rect, stream=data)
+    doc.set_metadata({"creator": "ScanSoft", "producer": "Scanner PDF"})
+    return doc
+
+
+# ============ CORPUS ============
+
+def _builders(size: str) -> List[Callable[[np.random.RandomState], tuple]]:
+    """(CorpusDocument, bytes) factories, in corpus order."""
+    builders = []
+
+    for pages in SIZES[size]:
+        def digital(rng, pages=pages):
+            doc = _text_pdf(rng, pages, FONTS[:1], TRUSTED_METADATA)
+            return CorpusDocument(f"digital_{pages}p.pdf", "digital", "pdf", pages), _pdf_bytes(doc)
+        builders.append(digital)
+
+    def digital_fonts(rng):
+        doc = _text_pdf(rng, 1, FONTS, TRUSTED_METADATA)
+        return CorpusDocument("digital_3fonts.pdf", "digital", "pdf", 1, tags=["fonts"]), _pdf_bytes(doc)
+
+    def tampered_editor(rng):
+        meta = dict(TRUSTED_METADATA, creator="Adobe Photoshop 24.0")
+        doc = _text_pdf(rng, 1, FONTS[:1], meta)
+        return CorpusDocument("tampered_editor.pdf", "digital", "pdf", 1, tampering="editor_metadata"), _pdf_bytes(doc)
+
+    def tampered_dates(rng):
+        meta = dict(TRUSTED_METADATA, modDate="D:20190101000000")
+        doc = _text_pdf(rng, 1, FONTS[:1], meta)
+        return CorpusDocument("tampered_dates.pdf", "digital", "pdf", 1, tampering="modified_before_created"), _pdf_bytes(doc)
+
+    def tampered_fonts(rng):
+        doc = _text_pdf(rng, 1, MIXED_FONTS, TRUSTED_METADATA)
+        return CorpusDocument("tampered_fonts.pdf", "digital", "pdf", 1, tampering="mixed_fonts"), _pdf_bytes(doc)
+
+    def tampered_line(rng):
+        doc = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+        # Retype the issue date in another font, as an edit tool would
+        page = doc[0]
+        label = "Date of issue: "
+        hit = page.search_for(label)[0]
+        page.add_redact_annot(fitz.Rect(hit.x1, hit.y0, hit.x1 + 80, hit.y1))
+        page.apply_redactions()
+        x = hit.x0 + fitz.get_text_length(label, fontname="helv", fontsize=11)
+        page.insert_text((x, hit.y1 - 2.5), "01/04/2024", fontname="tiro", fontsize=11)
+        return CorpusDocument("tampered_line_font.pdf", "digital", "pdf", 1, tampering="font_switch_in_line"), _pdf_bytes(doc)
+
+    def tampered_incremental(rng):
+        doc = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+
+        def edit(doc):
+            page = doc[0]
+            hit = page.search_for("Date of issue: ")[0]
+            page.draw_rect(fitz.Rect(hit.x1, hit.y0, hit.x1 + 80, hit.y1), color=None, fill=(1, 1, 1))
+            page.insert_text((hit.x1, hit.y1 - 2.5), "01/04/2024", fontname="helv", fontsize=11)
+
+        data = _incremental_update(_pdf_bytes(doc), edit)
+        return CorpusDocument("tampered_incremental.pdf", "digital", "pdf", 1, tampering="incremental_update"), data
+
+    def scanned(rng):
+        source = _text_pdf(rng, 2, FONTS[:1], TRUSTED_METADATA)
+        doc = _scanned_pdf([_jpeg(_scan(rng, page), 85) for page in source])
+        return CorpusDocument("scanned_2p.pdf", "scanned", "pdf", 2), _pdf_bytes(doc)
+
+    def scanned_pasted(rng):
+        source = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+        doc = _scanned_pdf([_jpeg(_paste_date(_scan(rng, source[0])), 85)])
+        return CorpusDocument("tampered_scan_pasted.pdf", "scanned", "pdf", 1, tampering="pasted_date"), _pdf_bytes(doc)
+
+    def image_jpeg(rng):
+        source = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+        return CorpusDocument("scan.jpg", "image", "jpeg", 1), _jpeg(_scan(rng, source[0]), 88)
+
+    def image_png(rng):
+        source = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+        return CorpusDocument("scan.png", "image", "png", 1), _png(_scan(rng, source[0]))
+
+    def image_double(rng):
+        source = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+        first = np.asarray(Image.open(io.BytesIO(_jpeg(_scan(rng, source[0]), 60))))
+        return CorpusDocument("tampered_double.jpg", "image", "jpeg", 1, tampering="double_compression"), _jpeg(first, 90)
+
+    def image_pasted(rng):
+        source = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+        return CorpusDocument("tampered_pasted.jpg", "image", "jpeg", 1, tampering="pasted_date"), _jpeg(_paste_date(_scan(rng, source[0])), 88)
+
+    def image_exif(rng):
+        source = _text_pdf(rng, 1, FONTS[:1], TRUSTED_METADATA)
+        exif = Image.Exif()
+        exif[0x0131] = "Adobe Photoshop 24.0"
+        return CorpusDocument("tampered_exif.jpg", "image", "jpeg", 1, tampering="editor_metadata"), _jpeg(_scan(rng, source[0]), 88, exif)
+
+    builders.extend([
+        digital_fonts, tampered_editor, tampered_dates, tampered_fonts,
+        scanned, scanned_pasted,
+        image_jpeg, image_png, image_double, image_pasted, image_exif,
+        # New builders go last: each document's seed is its position
+        tampered_line, tampered_incremental,
+    ])
+    return builders
+
+
+def generate_corpus(out_dir: str, size: str = "small", seed: int = 360) -> List[CorpusDocument]:
+    """Write the corpus and its manifest (corpus.json) to out_dir."""
+    if size not in SIZES:
+        raise ValueError(f"Unknown corpus size '{size}' (use one of {list(SIZES)})")
+    os.makedirs(out_dir, exist_ok=True)
+
+    documents = []
+    for i, build in enumerate(_builders(size)):
+        # One generator per document: adding a document never changes the others
+        document, data = build(np.random.RandomState(seed + i))
+        with open(os.path.join(out_dir, document.name), "wb") as f:
+            f.write(data)
+        document.size_bytes = len(data)
+        documents.append(document)
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump({"size": size, "seed": seed, "documents": [asdict(d) for d in documents]}, f, indent=2)
+    return documents
+
+
+def load_corpus(corpus_dir: str) -> List[CorpusDocument]:
+    """Read a corpus written by generate_corpus."""
+    with open(os.path.join(corpus_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    return [CorpusDocument(**entry) for entry in manifest["documents"]]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate the synthetic document corpus")
+    parser.add_argument("out_dir")
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--seed", type=int, default=360)
+    args = parser.parse_args(argv)
+
+    documents = generate_corpus(args.out_dir, args.size, args.seed)
+    for document in documents:
+        print(f"  {document.name:32s} {document.size_bytes / 1024:8.1f} KB  {document.tampering or ''}")
+    print(f"\n{len(documents)} documents written to {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
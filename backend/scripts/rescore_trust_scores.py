@@ -0,0 +1,161 @@
+"""
+Re-score a company's verifications with the batch trust score engine.
+
+After tuning WEIGHTS, THRESHOLDS or a *_DEDUCTIONS table in
+services/trust_score/rules.py, this recalculates every verification of a
+company with BatchTrustScorer, in chunks (a few queries per chunk), and
+writes the TrustScore rows, Verification.trust_score and the component
+cache used by incremental recalculation (store.store_trust_score).
+
+Each chunk's verifications are locked (FOR UPDATE SKIP LOCKED) until the
+chunk commits, as the trust_score job locks its verification, so a job
+running meanwhile cannot interleave with the write-back. Verifications
+locked by a running job are skipped and reported; that job scores them
+with the current rules anyway.
+
+Prints how many scores moved and how statuses shifted. --dry-run only
+reports; --verify also runs the scalar TrustScoreCalculator on every row
+and exits 1 if any result differs.
+
+Run with:
+    python scripts/rescore_trust_scores.py --company-id 3 --dry-run
+    python scripts/rescore_trust_scores.py --company-id 3
+    python scripts/rescore_trust_scores.py --company-id 3 --verify --dry-run
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import SessionLocal
+from src.models import Verification
+from src.models.trust_score import TrustScore
+from src.services.trust_score import get_batch_scorer, get_trust_calculator
+from src.services.trust_score.store import gather_verification_data_bulk, store_trust_score
+
+logger = logging.getLogger("rescore_trust_scores")
+
+
+def rescore_chunk(db, verifications: List[Verification], args, totals: Dict) -> None:
+    """Score one chunk and (unless --dry-run) write it back."""
+    rows = gather_verification_data_bulk(db, verifications)
+    batch = get_batch_scorer().score(rows)
+
+    existing = {
+        ts.verification_id: ts
+        for ts in db.query(TrustScore).filter(
+            TrustScore.verification_id.in_([v.id for v in verifications])
+        )
+    }
+
+    calculator = get_trust_calculator()
+    for i, verification in enumerate(verifications):
+        result = batch.result(i)
+        previous = existing.get(verification.id)
+
+        # Score movement and status transitions
+        old_status = previous.status if previous else "NONE"
+        transition = (old_status, result.status.value)
+        totals["transitions"][transition] = totals["transitions"].get(transition, 0) + 1
+        if previous is None or previous.score != result.score:
+            totals["changed"] += 1
+        if previous is not None:
+            totals["rescored"] += 1
+            totals["delta"] += result.score - previous.score
+
+        if args.verify:
+            expected = calculator.calculate(rows[i])
+            if _differs(expected, result):
+                totals["mismatches"] += 1
+                logger.error(
+                    f"verification {verification.id}: scalar {expected.to_audit()} "
+                    f"!= batch {result.to_audit()}"
+                )
+
+        if args.dry_run:
+            continue
+
+        store_trust_score(
+            db, verification, result, batch.components(i),
+            rows[i]["candidate"]["experience_years"], previous,
+        )
+
+    if not args.dry_run:
+        db.commit()
+
+
+def _differs(expected, result) -> bool:
+    return (
+        expected.score != result.score
+        or expected.status != result.status
+        or sorted(expected.flags) != sorted(result.flags)
+        or expected.breakdown != result.breakdown
+        or expected.completion_rate != result.completion_rate
+        or expected.recommendations != result.recommendations
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Re-score a company's verifications")
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Verifications per chunk")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    parser.add_argument("--verify", action="store_true", help="Compare with the scalar calculator")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    totals = {"rows": 0, "changed": 0, "rescored": 0, "delta": 0.0, "mismatches": 0, "transitions": {}}
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        company_total = db.query(Verification).filter(Verification.company_id == args.company_id).count()
+        last_id = 0
+        while True:
+            # Keyset pagination keeps each chunk's query cheap
+            query = (
+                db.query(Verification)
+                .filter(Verification.company_id == args.company_id, Verification.id > last_id)
+                .order_by(Verification.id)
+                .limit(args.chunk_size)
+            )
+            if not args.dry_run:
+                # Held until the chunk commits; skip rows a trust_score job holds
+                query = query.with_for_update(skip_locked=True)
+            verifications = query.all()
+            if not verifications:
+                break
+            rescore_chunk(db, verifications, args, totals)
+            totals["rows"] += len(verifications)
+            last_id = verifications[-1].id
+            logger.info(f"{totals['rows']} verification(s) scored")
+            db.expunge_all()
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"\nCompany {args.company_id}: {totals['rows']} verification(s) in {elapsed:.1f}s"
+          f"{' (dry run, nothing written)' if args.dry_run else ''}")
+    print(f"  Scores changed: {totals['changed']}")
+    if totals["rows"] < company_total:
+        print(f"  Skipped (locked by a running job): {company_total - totals['rows']}")
+    if totals["rescored"]:
+        print(f"  Mean change of previously scored: {totals['delta'] / totals['rescored']:+.2f}")
+    transitions: List[Tuple[Tuple[str, str], int]] = sorted(
+        totals["transitions"].items(), key=lambda item: -item[1]
+    )
+    for (old, new), count in transitions:
+        marker = "" if old == new else "  <-"
+        print(f"  {old:>16} -> {new:<16} {count}{marker}")
+    if args.verify:
+        print(f"  Scalar mismatches: {totals['mismatches']}")
+    return 1 if totals["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,22 +4,52 @@ Document verification API routes.
 Phase 4: Document analysis endpoints for legitimacy scoring.
 """
 
+import os
+import json
+import asyncio
 import logging
 import base64
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from ...database import get_db
+from ...database import get_db, SessionLocal
 from ...models import DocumentVerification
-from ...services.document import get_document_service, DocumentStatus
+from ...services.document import DocumentStatus
+from ...services.document.context import (
+    FORMAT_EXTENSIONS,
+    SUPPORTED_FORMATS,
+    UNSUPPORTED_FORMAT_MESSAGE,
+    sniff_format,
+)
+from ...services.document.executor import (
+    get_document_executor,
+    DocumentAnalysisBusyError,
+    DocumentAnalysisTimeoutError,
+)
+from ...services.jobs import JobType, get_job_queue
+from ...services.document.batch import (
+    BATCH_MAX_FILES,
+    BatchItem,
+    analyze_batch,
+)
 from ...utils.face_storage import get_face_storage  # Reuse for document storage
+from ...utils.uploads import SpooledUpload, UploadSizeError, spool_upload, unpack_zip
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["Document Analysis"])
 
+# Return 202 + job id by default instead of waiting for the analysis
+ASYNC_ANALYSIS_DEFAULT = os.getenv("DOCUMENT_ANALYSIS_ASYNC", "false").lower() == "true"
+
+# Largest zip accepted by the batch endpoint
+BATCH_MAX_ARCHIVE_BYTES = int(os.getenv("DOCUMENT_BATCH_MAX_ARCHIVE_BYTES", str(200 * 1024 * 1024)))
+
+VALID_DOCUMENT_TYPES = ["education", "experience", "id_card", "other"]
+
 
 @router.post("/analyze")
 async def analyze_document(
@@ -27,54 +57,108 @@ async def analyze_document(
     document_type: str = Form(...),
     candidate_id: int = Form(...),
     verification_id: Optional[int] = Form(None),
+    async_analysis: Optional[bool] = Form(None),
     db: Session = Depends(get_db),
 ):
     """
     Upload and analyze a document for legitimacy.
     
-    Returns legitimacy score and status.
+    Returns legitimacy score and status. With async_analysis=true (or
+    DOCUMENT_ANALYSIS_ASYNC=true) returns 202 with a job id instead; the
+    background worker analyzes the stored file. Poll
+    GET /documents/analysis/{job_id} for the result.
     """
     # Validate document type
-    valid_types = ["education", "experience", "id_card", "other"]
-    if document_type not in valid_types:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid document_type. Must be one of: {valid_types}"
-        )
-    
-    # Validate file type
-    if not file.content_type or not file.content_type.startswith(("application/pdf", "image/")):
+    if document_type not in VALID_DOCUMENT_TYPES:
         raise HTTPException(
             status_code=400,
-            detail="Only PDF and image files are supported"
+            detail=f"Invalid document_type. Must be one of: {VALID_DOCUMENT_TYPES}"
         )
     
-    # Read file
-    file_bytes = await file.read()
-    
-    if len(file_bytes) < 100:
-        raise HTTPException(status_code=400, detail="File too small")
-    
-    if len(file_bytes) > 10 * 1024 * 1024:  # 10MB limit
-        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
+    # Stream to a spool file; size limits are enforced while reading
+    try:
+        upload = await spool_upload(file)
+    except UploadSizeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
+    try:
+        # Validate file type from the magic bytes; content_type is client-supplied
+        file_format = sniff_format(upload.path)
+        if file_format not in SUPPORTED_FORMATS:
+            raise HTTPException(status_code=400, detail=UNSUPPORTED_FORMAT_MESSAGE)
+        
+        return await _analyze_upload(
+            db, upload, file.filename, file_format,
+            document_type, candidate_id, verification_id, async_analysis,
+        )
+    finally:
+        upload.cleanup()
+
+
+async def _analyze_upload(
+    db: Session,
+    upload: SpooledUpload,
+    filename: Optional[str],
+    file_format: str,
+    document_type: str,
+    candidate_id: int,
+    verification_id: Optional[int],
+    async_analysis: Optional[bool],
+):
+    """Store, then analyze (or queue) a spooled upload."""
     # Store file
     storage = get_face_storage()  # Reusing storage utility
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    s3_key = f"documents/{candidate_id}/{document_type}_{timestamp}.pdf"
+    s3_key = f"documents/{candidate_id}/{document_type}_{timestamp}.{FORMAT_EXTENSIONS[file_format]}"
     
     # For local mode, save directly
     if storage._storage_type == "local":
-        from pathlib import Path
-        path = storage._local_path / s3_key
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_bytes(file_bytes)
+        upload.save_to(storage._local_path / s3_key)
     
-    # Analyze document
-    service = get_document_service()
+    if async_analysis if async_analysis is not None else ASYNC_ANALYSIS_DEFAULT:
+        # The worker reads the file back from storage, so store it in S3 mode too
+        if storage._storage_type != "local":
+            await asyncio.to_thread(storage.save_document, s3_key, upload.path)
+        
+        # Record the row as PENDING and queue its analysis in the same transaction
+        doc_verification = DocumentVerification(
+            verification_id=verification_id,
+            candidate_id=candidate_id,
+            document_type=document_type,
+            s3_key=s3_key,
+            original_filename=filename,
+            legitimacy_score=0.0,
+            status=DocumentStatus.PENDING.value,
+        )
+        db.add(doc_verification)
+        db.flush()
+        get_job_queue().enqueue(db, JobType.DOCUMENT_ANALYSIS, {
+            "target": "document_verification",
+            "document_id": doc_verification.id,
+            "s3_key": s3_key,
+            "document_type": document_type,
+            "content_hash": upload.sha256,
+        })
+        db.commit()
+        db.refresh(doc_verification)
+        
+        return JSONResponse(status_code=202, content={
+            "id": doc_verification.id,
+            "job_id": doc_verification.id,
+            "status": DocumentStatus.PENDING.value,
+            "poll_url": f"/api/v1/documents/analysis/{doc_verification.id}",
+            "message": _get_status_message(DocumentStatus.PENDING),
+        })
     
+    # Analyze document (off the event loop)
     try:
-        result = service.analyze(file_bytes, document_type)
+        result = await get_document_executor().analyze(
+            upload.path, document_type, content_hash=upload.sha256
+        )
+    except DocumentAnalysisBusyError:
+        raise HTTPException(status_code=503, detail="Document analysis is busy, retry shortly")
+    except DocumentAnalysisTimeoutError:
+        raise HTTPException(status_code=504, detail="Document analysis timed out")
     except Exception as e:
         logger.error(f"Document analysis failed: {e}")
         raise HTTPException(status_code=500, detail="Analysis failed")
@@ -85,11 +169,12 @@ async def analyze_document(
         candidate_id=candidate_id,
         document_type=document_type,
         s3_key=s3_key,
-        original_filename=file.filename,
+        original_filename=filename,
         legitimacy_score=result.legitimacy_score,
         status=result.status.value,
         breakdown=result.breakdown,
         flags=result.flags,
+        timings=result.timings,
         analyzed_at=result.analyzed_at,
     )
     
@@ -108,6 +193,276 @@ async def analyze_document(
     }
 
 
+@router.post("/analyze/batch")
+async def analyze_document_batch(
+    files: List[UploadFile] = File(...),
+    manifest: Optional[str] = Form(None),
+):
+    """
+    Analyze many documents, for many candidates, in one request.
+    
+    files: PDF/JPEG/PNG files and/or zip archives of them.
+    manifest: JSON list of {"file", "candidate_id", "document_type",
+    "verification_id"}. "file" is the upload filename or zip member path.
+    A zip may carry manifest.json instead of the form field.
+    
+    Streams application/x-ndjson: one line per file as it finishes, then a
+    summary line with the DocumentVerification ids (one bulk insert).
+    """
+    spooled: List[Tuple[str, SpooledUpload]] = []
+    rejected: List[Tuple[str, str]] = []
+    try:
+        for file in files:
+            name = file.filename or "upload"
+            if name.lower().endswith(".zip") or file.content_type in ("application/zip", "application/x-zip-compressed"):
+                try:
+                    archive = await spool_upload(file, max_bytes=BATCH_MAX_ARCHIVE_BYTES)
+                except UploadSizeError as e:
+                    raise HTTPException(status_code=400, detail=f"{name}: {e}")
+                try:
+                    # Decompressing and spooling every member is blocking I/O
+                    members, zip_manifest, member_errors = await asyncio.get_running_loop().run_in_executor(
+                        None, unpack_zip, archive, BATCH_MAX_FILES - len(spooled)
+                    )
+                except UploadSizeError as e:
+                    raise HTTPException(status_code=400, detail=f"{name}: {e}")
+                finally:
+                    archive.cleanup()
+                spooled.extend(members)
+                rejected.extend(member_errors)
+                manifest = manifest or zip_manifest
+                continue
+            
+            if len(spooled) >= BATCH_MAX_FILES:
+                raise HTTPException(status_code=400, detail=f"Too many files (max {BATCH_MAX_FILES})")
+            try:
+                spooled.append((name, await spool_upload(file)))
+            except UploadSizeError as e:
+                rejected.append((name, str(e)))
+        
+        # File type from the magic bytes (zip members carry no content_type)
+        formats: Dict[str, str] = {}
+        supported: List[Tuple[str, SpooledUpload]] = []
+        for name, upload in spooled:
+            file_format = sniff_format(upload.path)
+            if file_format in SUPPORTED_FORMATS:
+                formats[upload.path] = file_format
+                supported.append((name, upload))
+            else:
+                upload.cleanup()
+                rejected.append((name, "unsupported_type"))
+        spooled = supported
+        
+        items, unmatched = _match_manifest(_parse_manifest(manifest), spooled, formats, rejected)
+    except BaseException:
+        for _, upload in spooled:
+            upload.cleanup()
+        raise
+    
+    return StreamingResponse(
+        _stream_batch(items, spooled, rejected + unmatched),
+        media_type="application/x-ndjson",
+    )
+
+
+def _parse_manifest(manifest: Optional[str]) -> List[dict]:
+    """Validate the batch manifest (400 on any malformed entry)."""
+    if not manifest:
+        raise HTTPException(status_code=400, detail="Batch manifest is required")
+    try:
+        entries = json.loads(manifest)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Batch manifest is not valid JSON")
+    if not isinstance(entries, list):
+        raise HTTPException(status_code=400, detail="Batch manifest must be a JSON list")
+    
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get("file"):
+            raise HTTPException(status_code=400, detail=f"Manifest entry {i}: 'file' is required")
+        if entry.get("document_type") not in VALID_DOCUMENT_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Manifest entry {i}: document_type must be one of {VALID_DOCUMENT_TYPES}",
+            )
+        if not isinstance(entry.get("candidate_id"), int):
+            raise HTTPException(status_code=400, detail=f"Manifest entry {i}: candidate_id must be an integer")
+    return entries
+
+
+def _match_manifest(
+    entries: List[dict],
+    spooled: List[Tuple[str, SpooledUpload]],
+    formats: Dict[str, str],
+    rejected: List[Tuple[str, str]],
+) -> Tuple[List[BatchItem], List[Tuple[str, str]]]:
+    """
+    Pair manifest entries with spooled files by path, then by basename.
+    
+    Entries for rejected files are not reported again as file_missing.
+    """
+    by_name: Dict[str, dict] = {}
+    for entry in entries:
+        by_name.setdefault(entry["file"], entry)
+        by_name.setdefault(os.path.basename(entry["file"]), entry)
+    
+    items: List[BatchItem] = []
+    unmatched: List[Tuple[str, str]] = []
+    used = set()
+    for name, _ in rejected:
+        entry = by_name.get(name) or by_name.get(os.path.basename(name))
+        if entry is not None:
+            used.add(id(entry))
+    for name, upload in spooled:
+        entry = by_name.get(name) or by_name.get(os.path.basename(name))
+        if entry is None:
+            unmatched.append((name, "not_in_manifest"))
+            continue
+        used.add(id(entry))
+        items.append(BatchItem(
+            index=len(items),
+            filename=name,
+            path=upload.path,
+            content_hash=upload.sha256,
+            document_type=entry["document_type"],
+            candidate_id=entry["candidate_id"],
+            verification_id=entry.get("verification_id"),
+            file_format=formats[upload.path],
+        ))
+    
+    unmatched.extend(
+        (entry["file"], "file_missing") for entry in entries if id(entry) not in used
+    )
+    return items, unmatched
+
+
+async def _stream_batch(
+    items: List[BatchItem],
+    spooled: List[Tuple[str, SpooledUpload]],
+    errors: List[Tuple[str, str]],
+):
+    """NDJSON lines for a batch; rows are bulk-inserted once analysis ends."""
+    storage = get_face_storage()
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    uploads = {upload.path: upload for _, upload in spooled}
+    rows: List[Tuple[BatchItem, DocumentVerification]] = []
+    failed = len(errors)
+    
+    try:
+        for name, error in errors:
+            yield _ndjson({"type": "error", "file": name, "error": error})
+        
+        async for outcome in analyze_batch(items):
+            item, result = outcome.item, outcome.result
+            if result is None:
+                failed += 1
+                yield _ndjson({
+                    "type": "error",
+                    "index": item.index,
+                    "file": item.filename,
+                    "candidate_id": item.candidate_id,
+                    "error": outcome.error,
+                })
+                continue
+            
+            extension = FORMAT_EXTENSIONS[item.file_format]
+            s3_key = f"documents/{item.candidate_id}/{item.document_type}_{timestamp}_{item.index}.{extension}"
+            if storage._storage_type == "local":
+                uploads[item.path].save_to(storage._local_path / s3_key)
+            
+            rows.append((item, DocumentVerification(
+                verification_id=item.verification_id,
+                candidate_id=item.candidate_id,
+                document_type=item.document_type,
+                s3_key=s3_key,
+                original_filename=os.path.basename(item.filename),
+                legitimacy_score=result.legitimacy_score,
+                status=result.status.value,
+                breakdown=result.breakdown,
+                flags=result.flags,
+                timings=result.timings,
+                analyzed_at=result.analyzed_at,
+            )))
+            yield _ndjson({
+                "type": "result",
+                "index": item.index,
+                "file": item.filename,
+                "candidate_id": item.candidate_id,
+                "document_type": item.document_type,
+                "legitimacy_score": round(result.legitimacy_score, 1),
+                "status": result.status.value,
+                "review_required": result.status != DocumentStatus.LEGITIMATE,
+                "flags": result.flags,
+                "breakdown": {k: round(v, 1) for k, v in result.breakdown.items()},
+            })
+    finally:
+        # Also runs when the client disconnects: keep what was analyzed.
+        # The insert is blocking I/O; shield it so a cancelled stream still
+        # hands it to the thread instead of dropping it from the queue.
+        try:
+            ids = await asyncio.shield(asyncio.to_thread(_bulk_insert, [row for _, row in rows]))
+        finally:
+            for _, upload in spooled:
+                upload.cleanup()
+    
+    yield _ndjson({
+        "type": "summary",
+        "total": len(items) + len(errors),
+        "analyzed": len(rows),
+        "failed": failed,
+        "saved": ids is not None,
+        "ids": [
+            {"index": item.index, "file": item.filename, "id": row_id}
+            for (item, _), row_id in zip(rows, ids or [])
+        ],
+    })
+
+
+def _bulk_insert(rows: List[DocumentVerification]) -> Optional[List[int]]:
+    """
+    Insert all batch rows in one transaction.
+    
+    The flush is a single multi-row INSERT ... RETURNING id, so ids are read
+    without a refresh per row. Returns None if the insert failed.
+    """
+    if not rows:
+        return []
+    db = SessionLocal()
+    try:
+        db.add_all(rows)
+        db.flush()
+        ids = [row.id for row in rows]
+        db.commit()
+        return ids
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Batch document insert failed ({len(rows)} rows): {e}")
+        return None
+    finally:
+        db.close()
+
+
+def _ndjson(payload: dict) -> str:
+    return json.dumps(payload, default=str) + "\n"
+
+
+@router.get("/analysis/{job_id}")
+async def get_analysis_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+):
+    """Poll an async analysis job (job id = DocumentVerification id)."""
+    doc = db.query(DocumentVerification).filter(DocumentVerification.id == job_id).first()
+    
+    if not doc:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    
+    view = doc.to_hr_view()
+    view["job_id"] = doc.id
+    view["done"] = doc.status != DocumentStatus.PENDING.value
+    view["message"] = _get_status_message(DocumentStatus(doc.status))
+    return view
+
+
 @router.get("/{candidate_id}")
 async def get_candidate_documents(
     candidate_id: int,
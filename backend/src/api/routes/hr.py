@@ -4,6 +4,7 @@ HR Review API Routes.
 Phase 6: HR document handling, summary viewing, and decision APIs.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional, List
@@ -17,8 +18,21 @@ from ...models.hr_review import HRDocument, HRDecision, HRDecisionStatus
 from ...models.trust_score import TrustScore
 from ...models.document_verification import DocumentVerification
 from ...services.hr import get_hr_summary_service
-from ...services.document import get_document_service
+from ...services.document import DocumentStatus
+from ...services.document.executor import (
+    get_document_executor,
+    DocumentAnalysisBusyError,
+    DocumentAnalysisTimeoutError,
+)
+from ...services.jobs import JobType, get_job_queue
+from ...services.document.context import (
+    FORMAT_EXTENSIONS,
+    SUPPORTED_FORMATS,
+    UNSUPPORTED_FORMAT_MESSAGE,
+    sniff_format,
+)
 from ...utils.face_storage import get_face_storage
+from ...utils.uploads import UploadSizeError, spool_upload
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +70,8 @@ async def upload_hr_document(
     - Clarification documents
     - Bonafide letters
     
-    Document is auto-analyzed via Phase 4 pipeline.
+    Document is auto-analyzed via Phase 4 pipeline. If analysis fails
+    (busy, timeout), it is queued for the background worker instead.
     Does NOT auto-change trust score.
     """
     # Validate document type
@@ -67,49 +82,56 @@ async def upload_hr_document(
             detail=f"Invalid document_type. Must be one of: {valid_types}"
         )
     
-    # Validate file type
-    if not file.content_type or not file.content_type.startswith(("application/pdf", "image/")):
-        raise HTTPException(status_code=400, detail="Only PDF and image files are supported")
-    
     # Validate candidate exists
     candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Read file
-    file_bytes = await file.read()
-    
-    if len(file_bytes) < 100:
-        raise HTTPException(status_code=400, detail="File too small")
-    
-    if len(file_bytes) > 10 * 1024 * 1024:  # 10MB limit
-        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
-    
-    # Store file
-    storage = get_face_storage()
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    s3_key = f"hr_documents/{candidate_id}/{document_type}_{timestamp}.pdf"
-    
-    # For local mode, save directly
-    if storage._storage_type == "local":
-        from pathlib import Path
-        path = storage._local_path / s3_key
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_bytes(file_bytes)
-    
-    # Analyze document via Phase 4 pipeline
-    doc_service = get_document_service()
+    # Stream to a spool file; size limits are enforced while reading
+    try:
+        upload = await spool_upload(file)
+    except UploadSizeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     try:
-        analysis_result = doc_service.analyze(file_bytes, document_type)
-        is_analyzed = True
-        analysis_status = analysis_result.status.value
-        legitimacy_score = analysis_result.legitimacy_score
-    except Exception as e:
-        logger.error(f"Document analysis failed: {e}")
-        is_analyzed = False
-        analysis_status = None
+        # Validate file type from the magic bytes; content_type is client-supplied
+        file_format = sniff_format(upload.path)
+        if file_format not in SUPPORTED_FORMATS:
+            raise HTTPException(status_code=400, detail=UNSUPPORTED_FORMAT_MESSAGE)
+        
+        # Store file
+        storage = get_face_storage()
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        s3_key = f"hr_documents/{candidate_id}/{document_type}_{timestamp}.{FORMAT_EXTENSIONS[file_format]}"
+        
+        # For local mode, save directly
+        if storage._storage_type == "local":
+            upload.save_to(storage._local_path / s3_key)
+        
+        # Analyze document via Phase 4 pipeline (off the event loop).
+        # Busy/timeout leave the analysis pending for the worker to retry;
+        # any other failure (corrupt or unreadable file) would only repeat.
         legitimacy_score = None
+        try:
+            analysis_result = await get_document_executor().analyze(
+                upload.path, document_type, content_hash=upload.sha256
+            )
+            is_analyzed = True
+            analysis_status = analysis_result.status.value
+            legitimacy_score = analysis_result.legitimacy_score
+        except (DocumentAnalysisBusyError, DocumentAnalysisTimeoutError) as e:
+            logger.warning(f"Document analysis deferred to the worker: {e}")
+            is_analyzed = False
+            analysis_status = None
+            # The worker reads the file back from storage
+            if storage._storage_type != "local":
+                await asyncio.to_thread(storage.save_document, s3_key, upload.path)
+        except Exception as e:
+            logger.error(f"Document analysis failed: {e}")
+            is_analyzed = True
+            analysis_status = DocumentStatus.ERROR.value
+    finally:
+        upload.cleanup()
     
     # Create HR document record
     hr_doc = HRDocument(
@@ -127,6 +149,15 @@ async def upload_hr_document(
     )
     
     db.add(hr_doc)
+    if not is_analyzed:
+        db.flush()
+        get_job_queue().enqueue(db, JobType.DOCUMENT_ANALYSIS, {
+            "target": "hr_document",
+            "document_id": hr_doc.id,
+            "s3_key": s3_key,
+            "document_type": document_type,
+            "content_hash": upload.sha256,
+        })
     db.commit()
     db.refresh(hr_doc)
     
@@ -140,7 +171,11 @@ async def upload_hr_document(
         "is_analyzed": is_analyzed,
         "analysis_status": analysis_status,
         "legitimacy_score": round(legitimacy_score, 1) if legitimacy_score else None,
-        "message": "Document uploaded and analyzed" if is_analyzed else "Document uploaded, analysis pending",
+        "message": (
+            "Document uploaded, analysis pending" if not is_analyzed
+            else "Document uploaded, analysis failed" if analysis_status == DocumentStatus.ERROR.value
+            else "Document uploaded and analyzed"
+        ),
     }
 
 
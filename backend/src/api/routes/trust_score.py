@@ -13,9 +13,8 @@ from pydantic import BaseModel, Field
 from ...database import get_db
 from ...models import Verification, Candidate
 from ...models.trust_score import TrustScore, TrustScoreOverride
-from ...models.face_comparison import FaceComparison
-from ...models.document_verification import DocumentVerification
-from ...services.trust_score import get_trust_calculator, TrustScoreStatus
+from ...services.trust_score import TrustScoreStatus
+from ...services.trust_score.store import recalculate_trust_score
 from ...services.trust_score.rules import OVERRIDE_RULES, OVERRIDE_CATEGORIES
 
 logger = logging.getLogger(__name__)
@@ -45,10 +44,10 @@ async def calculate_trust_score(
     
     Aggregates all verification steps and calculates weighted score.
     """
-    # Get verification
+    # Get verification (locked: a trust_score job may be recalculating it)
     verification = db.query(Verification).filter(
         Verification.id == verification_id
-    ).first()
+    ).with_for_update().first()
     
     if not verification:
         raise HTTPException(status_code=404, detail="Verification not found")
@@ -61,46 +60,9 @@ async def calculate_trust_score(
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Gather verification data
-    verification_data = _gather_verification_data(db, verification, candidate)
-    
-    # Calculate score
-    calculator = get_trust_calculator()
-    result = calculator.calculate(verification_data)
-    
-    # Check if score already exists
-    existing = db.query(TrustScore).filter(
-        TrustScore.verification_id == verification_id
-    ).first()
-    
-    if existing:
-        # Update existing score
-        existing.score = result.score
-        existing.status = result.status.value
-        existing.completion_rate = result.completion_rate
-        existing.breakdown = result.breakdown
-        existing.flags = result.flags
-        existing.recommendations = result.recommendations
-        existing.calculated_at = result.calculated_at
-        db.commit()
-        db.refresh(existing)
-        trust_score = existing
-    else:
-        # Create new score
-        trust_score = TrustScore(
-            verification_id=verification_id,
-            candidate_id=candidate.id,
-            score=result.score,
-            status=result.status.value,
-            completion_rate=result.completion_rate,
-            breakdown=result.breakdown,
-            flags=result.flags,
-            recommendations=result.recommendations,
-            calculated_at=result.calculated_at,
-        )
-        db.add(trust_score)
-        db.commit()
-        db.refresh(trust_score)
+    trust_score, result = recalculate_trust_score(db, verification, candidate)
+    db.commit()
+    db.refresh(trust_score)
     
     return {
         "id": trust_score.id,
@@ -229,54 +191,3 @@ async def get_override_history(
     ).order_by(TrustScoreOverride.created_at.desc()).all()
     
     return [o.to_audit() for o in overrides]
-
-
-# ============ HELPERS ============
-
-def _gather_verification_data(db: Session, verification: Verification, candidate: Candidate) -> dict:
-    """Gather all verification data for score calculation."""
-    
-    # Get face comparison
-    face = db.query(FaceComparison).filter(
-        FaceComparison.candidate_id == candidate.id
-    ).order_by(FaceComparison.created_at.desc()).first()
-    
-    # Get documents
-    documents = db.query(DocumentVerification).filter(
-        DocumentVerification.candidate_id == candidate.id
-    ).all()
-    
-    # Build verification data dict
-    # Note: Aadhaar, PAN, UAN data would come from verification_steps
-    # For now we're using a simplified structure
-    
-    return {
-        "candidate": {
-            "id": candidate.id,
-            "experience_years": getattr(candidate, "experience_years", 0),
-        },
-        "aadhaar": _get_step_data(verification, "aadhaar"),
-        "pan": _get_step_data(verification, "pan"),
-        "uan": _get_step_data(verification, "uan"),
-        "face": {
-            "decision": face.decision if face else None,
-            "confidence": face.confidence_score if face else None,
-            "liveness_passed": True,  # Default for now
-        } if face else None,
-        "documents": [
-            {
-                "document_type": doc.document_type,
-                "legitimacy_score": doc.legitimacy_score,
-                "status": doc.status,
-            }
-            for doc in documents
-        ],
-    }
-
-
-def _get_step_data(verification: Verification, step_type: str) -> Optional[dict]:
-    """Get verification step data by type."""
-    # This would query verification_steps table
-    # For now, returning None as placeholder
-    # TODO: Integrate with actual verification step data
-    return None
@@ -5,6 +5,13 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .routers import auth, candidates, verification_requests, verifications, verify_public
 from .api.routes.face import router as face_router
+from .services.surepass.client import get_surepass_client, close_surepass_clients
+from .services.surepass.cache import get_response_cache
+from .services.document.executor import get_document_executor
+from .services.document.registry import get_analyzer_registry
+from .services.jobs import get_job_queue
+from .services.trust_score import install_trust_score_events
+from .database import SessionLocal
 
 # Configure logging
 logging.basicConfig(
@@ -75,6 +82,9 @@ def validate_environment():
 # Run validation on import (before app starts)
 validate_environment()
 
+# Queue trust score recalculation when its inputs change
+install_trust_score_events()
+
 
 app = FastAPI(
     title="Check360 API",
@@ -125,3 +135,48 @@ async def root():
 async def health_check():
     return {"status": "healthy", "version": "2.5.0"}
 
+
+@app.get("/health/surepass")
+async def surepass_health():
+    """Surepass connection pool, request stats, circuit breakers, quotas and cache metrics."""
+    client = get_surepass_client()
+    return {
+        "mock_mode": client.is_mock_mode(),
+        "pool": client.pool_stats(),
+        "circuit_breakers": client.breaker_states(),
+        "rate_limits": client.rate_limit_stats(),
+        "cache": get_response_cache().snapshot(),
+        "single_flight": client.single_flight_stats(),
+    }
+
+
+@app.on_event("shutdown")
+async def shutdown_surepass_pool():
+    """Close pooled Surepass connections (sync and async) cleanly on shutdown."""
+    await close_surepass_clients()
+
+
+@app.get("/health/documents")
+async def document_analysis_health():
+    """Document analysis worker pool stats and registered layers."""
+    return {
+        **get_document_executor().stats(),
+        "layers": get_analyzer_registry().describe(),
+    }
+
+
+@app.get("/health/jobs")
+def job_queue_health():
+    """Background job counts by type and status (run by python -m src.worker)."""
+    db = SessionLocal()
+    try:
+        return get_job_queue().stats(db)
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+async def shutdown_document_executor():
+    """Stop document analysis worker processes."""
+    get_document_executor().shutdown()
+
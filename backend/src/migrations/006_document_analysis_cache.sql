@@ -0,0 +1,21 @@
+-- Document analysis result cache
+-- Content-addressed: SHA-256 of the file + document type + rules version
+
+CREATE TABLE IF NOT EXISTS document_analysis_cache (
+    id SERIAL PRIMARY KEY,
+    
+    -- Cache key
+    content_hash VARCHAR(64) NOT NULL,   -- SHA-256 of the uploaded file
+    document_type VARCHAR(50) NOT NULL,  -- education, experience, id_card, other
+    rules_version VARCHAR(64) NOT NULL,  -- Hash of services/document/rules.py constants
+    
+    -- DocumentAnalysisResult.to_cache()
+    result JSONB NOT NULL,
+    
+    -- Timestamps
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes
+CREATE UNIQUE INDEX IF NOT EXISTS ux_doc_analysis_cache_key
+    ON document_analysis_cache(content_hash, document_type, rules_version);
@@ -0,0 +1,6 @@
+-- Per-layer timing and resource counters for document analysis
+-- DocumentAnalysisResult.timings: total_ms, cpu_ms, format, and per layer
+-- wall_ms, cpu_ms, process_peak_rss_kb, process_peak_growth_kb, pages
+
+ALTER TABLE document_verifications
+    ADD COLUMN IF NOT EXISTS timings JSONB DEFAULT '{}'::jsonb;
@@ -0,0 +1,33 @@
+-- Durable background job queue
+-- Claimed by worker processes (python -m src.worker) with
+-- SELECT ... FOR UPDATE SKIP LOCKED
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id SERIAL PRIMARY KEY,
+    
+    -- What to run
+    job_type VARCHAR(50) NOT NULL,       -- face_compare, document_analysis, trust_score
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    dedupe_key VARCHAR(255),             -- At most one QUEUED job per key (ux_jobs_dedupe_queued)
+    
+    -- Scheduling
+    status VARCHAR(20) NOT NULL DEFAULT 'QUEUED',  -- QUEUED, RUNNING, DONE, DEAD
+    run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    
+    -- Lease held by the worker running the job
+    locked_by VARCHAR(255),
+    locked_at TIMESTAMP,
+    
+    last_error TEXT,
+    
+    -- Timestamps
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS ix_jobs_due ON jobs(status, run_at);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_dedupe_queued ON jobs(dedupe_key) WHERE status = 'QUEUED';
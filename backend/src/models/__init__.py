@@ -6,8 +6,10 @@ from .verification import Verification, VerificationStatus
 from .verification_step import VerificationStep, StepType, StepStatus, MANDATORY_STEPS
 from .face_comparison import FaceComparison
 from .document_verification import DocumentVerification
+from .document_analysis_cache import DocumentAnalysisCache
 from .trust_score import TrustScore, TrustScoreOverride
 from .hr_review import HRDocument, HRDecision, HRDecisionStatus
+from .job import Job, JobStatus
 
 __all__ = [
     "Company",
@@ -22,11 +24,14 @@ __all__ = [
     "MANDATORY_STEPS",
     "FaceComparison",
     "DocumentVerification",
+    "DocumentAnalysisCache",
     "TrustScore",
     "TrustScoreOverride",
     "HRDocument",
     "HRDecision",
     "HRDecisionStatus",
+    "Job",
+    "JobStatus",
 ]
 
 
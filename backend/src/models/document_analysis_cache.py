@@ -0,0 +1,54 @@
+"""
+DocumentAnalysisCache model.
+
+Content-addressed store of document analysis results, so an identical file
+is not analyzed twice under the same rules.
+"""
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+
+from ..database import Base
+
+
+class DocumentAnalysisCache(Base):
+    """
+    Cached DocumentAnalysisResult.
+    
+    Keyed by:
+    - SHA-256 of the file bytes
+    - Document type
+    - Rules version (hash of services/document/rules.py constants)
+    
+    Rows from an older rules version are never read again.
+    """
+    __tablename__ = "document_analysis_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Cache key
+    content_hash = Column(String(64), nullable=False)
+    document_type = Column(String(50), nullable=False)
+    rules_version = Column(String(64), nullable=False)
+    
+    # DocumentAnalysisResult.to_cache()
+    result = Column(JSONB, nullable=False)
+    
+    # Audit
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # Indexes
+    __table_args__ = (
+        Index(
+            "ux_doc_analysis_cache_key",
+            "content_hash", "document_type", "rules_version",
+            unique=True,
+        ),
+    )
@@ -28,6 +28,7 @@ class DocumentVerification(Base):
     - Status (LEGITIMATE, REVIEW_REQUIRED, SUSPICIOUS)
     - Layer breakdown
     - Flags
+    - Per-layer timings (wall/CPU time, RSS, pages)
     """
     __tablename__ = "document_verifications"
 
@@ -64,6 +65,9 @@ class DocumentVerification(Base):
     # Flags for HR review
     flags = Column(JSONB, nullable=True, default=list)
     
+    # Per-layer timing and resource counters (DocumentAnalysisResult.timings)
+    timings = Column(JSONB, nullable=True, default=dict)
+    
     # Audit
     analyzed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -84,7 +84,7 @@ class HRDocument(Base):
     
     # Status
     is_analyzed = Column(Boolean, default=False)
-    analysis_status = Column(String(50), nullable=True)  # LEGITIMATE, REVIEW_REQUIRED, SUSPICIOUS
+    analysis_status = Column(String(50), nullable=True)  # LEGITIMATE, REVIEW_REQUIRED, SUSPICIOUS, ERROR
     legitimacy_score = Column(Float, nullable=True)
     
     # Timestamps
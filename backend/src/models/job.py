@@ -0,0 +1,101 @@
+"""
+Job model.
+
+Durable queue of post-submission work (face comparison, document analysis,
+trust-score recompute), claimed by worker processes (src/worker.py).
+"""
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Index,
+    JSON,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+import enum
+
+from ..database import Base
+
+
+class JobStatus(str, enum.Enum):
+    """Lifecycle of a queued job."""
+    QUEUED = "QUEUED"     # Waiting for run_at (new, or retrying after backoff)
+    RUNNING = "RUNNING"   # Claimed by a worker
+    DONE = "DONE"         # Finished
+    DEAD = "DEAD"         # Out of attempts, or failed permanently
+
+
+class Job(Base):
+    """
+    One unit of background work.
+    
+    Workers claim QUEUED rows whose run_at has passed with
+    SELECT ... FOR UPDATE SKIP LOCKED, so any number can share the table.
+    A failed job goes back to QUEUED with run_at pushed out (exponential
+    backoff) until max_attempts, then to DEAD with its last error.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # What to run (services/jobs/handlers.py)
+    job_type = Column(String(50), nullable=False)
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False, default=dict)
+    
+    # At most one QUEUED job per key (e.g. "trust_score:42"), enforced by
+    # ux_jobs_dedupe_queued
+    dedupe_key = Column(String(255), nullable=True)
+    
+    # Scheduling
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED.value)
+    run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    
+    # Lease held by the worker running the job
+    locked_by = Column(String(255), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    
+    last_error = Column(Text, nullable=True)
+    
+    # Audit
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
+    finished_at = Column(DateTime, nullable=True)
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_jobs_due", "status", "run_at"),
+        Index(
+            "ux_jobs_dedupe_queued",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text("status = 'QUEUED'"),
+            sqlite_where=text("status = 'QUEUED'"),
+        ),
+    )
+    
+    def to_view(self) -> dict:
+        """Job state for /health/jobs and the worker CLI."""
+        return {
+            "id": self.id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_at": self.run_at.isoformat() if self.run_at else None,
+            "locked_by": self.locked_by,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
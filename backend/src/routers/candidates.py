@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
 from ..models.candidate import Candidate
+from ..models.trust_score import TrustScore
 from ..schemas.candidate import CandidateCreate, CandidateResponse, CandidateListItem
 from ..dependencies import get_current_user, require_roles
 from ..models.user import User
@@ -79,6 +80,9 @@ async def list_candidates(
     - Full name
     - Created date
     - Trust score (if available)
+
+    Trust scores are kept current by the background worker as verification
+    data changes, so listing never triggers a calculation.
     """
     candidates = (
         db.query(Candidate)
@@ -87,7 +91,18 @@ async def list_candidates(
         .all()
     )
 
-    # Map to response format with trust_score placeholder
+    # Latest stored score per candidate (one query for the whole list)
+    latest_scores = {}
+    if candidates:
+        rows = (
+            db.query(TrustScore.candidate_id, TrustScore.score)
+            .filter(TrustScore.candidate_id.in_([c.id for c in candidates]))
+            .order_by(TrustScore.calculated_at)
+        )
+        for candidate_id, score in rows:
+            latest_scores[candidate_id] = round(score, 1)
+
+    # Map to response format
     result = []
     for candidate in candidates:
         result.append(
@@ -95,7 +110,7 @@ async def list_candidates(
                 id=candidate.id,
                 full_name=candidate.full_name,
                 created_at=candidate.created_at,
-                trust_score=None,  # Will be calculated later when trust scoring is implemented
+                trust_score=latest_scores.get(candidate.id),
             )
         )
 
@@ -34,6 +34,7 @@ from ..schemas.verification import (
     ExperienceDocSubmission,
     StepTypeSchema,
     StepStatusSchema,
+    VerificationStatusSchema,
     # Phase 2 schemas
     AadhaarOTPRequest,
     AadhaarOTPSubmitRequest,
@@ -56,7 +57,8 @@ from ..services.surepass import (
 )
 from ..services.surepass.aadhaar import get_aadhaar_service
 from ..services.surepass.pan import get_pan_service
-from ..services.face.rekognition import RekognitionProvider
+from ..services.surepass.uan import get_uan_service
+from ..services.jobs import JobType, get_job_queue, queue_trust_score
 
 # Duplicate removal complete
 from ..utils.face_storage import get_face_storage
@@ -66,73 +68,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/verify", tags=["Candidate Verification"])
 
 
-async def _run_face_comparison(
-    verification: Verification,
-    face_step: VerificationStep,
-    selfie_key: str,
-    reference_key: str,
-    db: Session,
-):
-    """
-    Run face comparison between selfie and reference.
-    Updates face_step status and metadata.
-    """
-    try:
-        storage = get_face_storage()
-        rekognition = RekognitionProvider()
-        
-        # Get images
-        selfie_bytes = storage.get_image(selfie_key)
-        reference_bytes = storage.get_image(reference_key)
-        
-        if not selfie_bytes or not reference_bytes:
-            logger.error(f"Missing image bytes for verification {verification.id}")
-            return
-
-        # Run comparison
-        result = rekognition.compare_faces(
-            source_bytes=selfie_bytes,
-            target_bytes=reference_bytes,
-            source_key=selfie_key,
-            target_key=reference_key,
-        )
-        
-        # Update step based on result
-        face_step.score_contribution = result.confidence_score
-        
-        # Update metadata
-        input_data = face_step.input_data or {}
-        input_data.update({
-            "comparison_status": result.decision.value,
-            "confidence_score": result.confidence_score,
-            "flags": result.flags,
-            "compared_at": result.compared_at.isoformat(),
-            "reference_source": result.reference_source.value,
-        })
-        face_step.input_data = input_data
-        
-        # Mark step status
-        if result.decision.value == "MATCH":
-            face_step.status = StepStatus.COMPLETED
-            logger.info(f"Face MATCH for verification {verification.id} ({result.confidence_score}%)")
-        elif result.decision.value == "MISMATCH":
-            # We mark as COMPLETED even on mismatch so user can proceed to next steps.
-            # The mismatch is flagged in metadata for HR review.
-            face_step.status = StepStatus.COMPLETED
-            logger.warning(f"Face MISMATCH for verification {verification.id} ({result.confidence_score}%)")
-        else:
-            # Low confidence / Review needed
-            face_step.status = StepStatus.COMPLETED
-            logger.warning(f"Face LOW_CONFIDENCE for verification {verification.id} ({result.confidence_score}%)")
-            
-        db.commit()
-        
-    except Exception as e:
-        logger.error(f"Face comparison failed for verification {verification.id}: {e}")
-        # Don't fail the request, just log error
-
-
-
 def get_verification_by_token(token: str, db: Session) -> Verification:
     """
     Get verification by token.
@@ -444,7 +379,7 @@ async def generate_aadhaar_otp(
     
     try:
         aadhaar_service = get_aadhaar_service()
-        result = aadhaar_service.generate_otp(data.aadhaar_number)
+        result = await aadhaar_service.generate_otp_async(data.aadhaar_number)
         
         # Store client_id in step for later use
         step.input_data = {
@@ -523,7 +458,7 @@ async def submit_aadhaar_otp(
         aadhaar_service = get_aadhaar_service()
         
         # Submit OTP and get verified data
-        surepass_data = aadhaar_service.submit_otp(client_id, data.otp)
+        surepass_data = await aadhaar_service.submit_otp_async(client_id, data.otp)
         
         # Get candidate data for comparison
         candidate = verification.candidate
@@ -611,7 +546,7 @@ async def initiate_aadhaar_digilocker(
         aadhaar_service = get_aadhaar_service()
         
         # Initiate session
-        result = aadhaar_service.initiate_digilocker_flow(data.redirect_url)
+        result = await aadhaar_service.initiate_digilocker_flow_async(data.redirect_url)
         
         # Store client_id in step
         step.input_data = {
@@ -692,7 +627,7 @@ async def complete_aadhaar_digilocker(
         logger.info(f"Fetching DigiLocker data for client_id: {client_id}")
         
         # Fetch data
-        response = aadhaar_service.fetch_digilocker_data(client_id)
+        response = await aadhaar_service.fetch_digilocker_data_async(client_id)
         
         # DEBUG: Log exact type and snippet
         logger.info(f"Aadhaar service response type: {type(response)}")
@@ -945,7 +880,7 @@ async def submit_uan(
         uan_service = get_uan_service()
         
         # Verify UAN
-        uan_data = uan_service.verify(data.uan_number)
+        uan_data = await uan_service.verify_async(data.uan_number)
         
         # Analyze employment and compare identity
         analysis = uan_service.analyze(
@@ -1146,6 +1081,10 @@ async def submit_verification(
     """
     Finalize the verification process.
     Matches the user's "Consent & Submit" action.
+    
+    Face comparison and trust scoring are queued for the background
+    worker (python -m src.worker) in the same transaction, so this
+    returns without waiting on Rekognition.
     """
     verification = get_verification_by_token(token, db)
     
@@ -1166,9 +1105,10 @@ async def submit_verification(
     verification.status = VerificationStatus.SUBMITTED
     verification.submitted_at = datetime.utcnow()
     
-    # Run Face Comparison (deferred until submission)
+    # Queue Face Comparison (deferred until submission)
     face_step = get_step_by_type(verification, StepType.FACE_LIVENESS)
     aadhaar_step = get_step_by_type(verification, StepType.AADHAAR)
+    face_queued = False
     
     if (face_step.status == StepStatus.COMPLETED and face_step.input_data and 
         aadhaar_step.status == StepStatus.COMPLETED and aadhaar_step.input_data):
@@ -1177,10 +1117,23 @@ async def submit_verification(
         reference_key = aadhaar_step.input_data.get("reference_key")
         
         if selfie_key and reference_key:
-            logger.info(f"Running deferred face comparison for {verification.id}")
-            # We don't await so the user doesn't wait, but for sqlite/simplicity we might have to.
-            # Using await ensures DB consistency before response.
-            await _run_face_comparison(verification, face_step, selfie_key, reference_key, db)
+            logger.info(f"Queueing deferred face comparison for {verification.id}")
+            get_job_queue().enqueue(
+                db,
+                JobType.FACE_COMPARE,
+                {
+                    "verification_id": verification.id,
+                    "face_step_id": face_step.id,
+                    "selfie_key": selfie_key,
+                    "reference_key": reference_key,
+                },
+                dedupe_key=f"face_compare:{verification.id}",
+            )
+            face_queued = True
+    
+    # The face comparison job queues the trust score itself once it has a result
+    if not face_queued:
+        queue_trust_score(db, verification.id)
 
     db.commit()
     
@@ -5,6 +5,8 @@ Phase 4: Open-source document forensics for legitimacy scoring.
 """
 
 from .service import DocumentAnalysisService, get_document_service
+from .registry import AnalyzerRegistry, AnalyzerSpec, CostClass, get_analyzer_registry
+from .instrumentation import LayerMetrics, get_layer_metrics
 from .contracts import (
     DocumentAnalysisResult,
     DocumentStatus,
@@ -15,6 +17,12 @@ from .contracts import (
 __all__ = [
     "DocumentAnalysisService",
     "get_document_service",
+    "AnalyzerRegistry",
+    "AnalyzerSpec",
+    "CostClass",
+    "get_analyzer_registry",
+    "LayerMetrics",
+    "get_layer_metrics",
     "DocumentAnalysisResult",
     "DocumentStatus",
     "DocumentType",
@@ -6,10 +6,18 @@ from .metadata import MetadataAnalyzer
 from .fonts import FontAnalyzer
 from .text import TextAnalyzer
 from .forensics import ForensicsAnalyzer
+from .image_metadata import ImageMetadataAnalyzer
+from .compression import CompressionAnalyzer
+from .ela import ErrorLevelAnalyzer
+from .revisions import RevisionAnalyzer
 
 __all__ = [
     "MetadataAnalyzer",
     "FontAnalyzer",
     "TextAnalyzer",
     "ForensicsAnalyzer",
+    "ImageMetadataAnalyzer",
+    "CompressionAnalyzer",
+    "ErrorLevelAnalyzer",
+    "RevisionAnalyzer",
 ]
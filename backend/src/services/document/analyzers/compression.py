@@ -0,0 +1,216 @@
+"""
+JPEG Compression Analyzer.
+
+Checks for:
+- Quantization tables (estimated quality, standard vs custom tables)
+- Double compression (an edited JPEG saved again)
+"""
+
+import logging
+from typing import Dict, List, Optional, Union
+import numpy as np
+
+from ..contracts import LayerResult
+from ..context import DocumentSource, ParsedDocument, parsed_document
+from ..rules import (
+    DEFAULT_SCORES,
+    JPEG_DOUBLE_COMPRESSION_THRESHOLD,
+    JPEG_DCT_FREQUENCIES,
+    JPEG_DCT_MAX_BIN,
+    JPEG_DCT_MIN_COEFFS,
+    JPEG_ANALYSIS_MAX_SIDE,
+)
+
+logger = logging.getLogger(__name__)
+
+# IJG (libjpeg) base luminance table, natural order; quality 50 = as-is
+IJG_LUMINANCE = np.array([
+    16, 11, 10, 16, 24, 40, 51, 61,
+    12, 12, 14, 19, 26, 58, 60, 55,
+    14, 13, 16, 24, 40, 57, 69, 56,
+    14, 17, 22, 29, 51, 87, 80, 62,
+    18, 22, 37, 56, 68, 109, 103, 77,
+    24, 35, 55, 64, 81, 104, 113, 92,
+    49, 64, 78, 87, 103, 121, 120, 101,
+    72, 92, 95, 98, 112, 100, 103, 99,
+], dtype=float).reshape(8, 8)
+
+
+def _dct_matrix() -> np.ndarray:
+    """Orthonormal 8-point DCT-II, as used by JPEG."""
+    k = np.arange(8)[:, None]
+    i = np.arange(8)[None, :]
+    matrix = np.sqrt(2 / 8) * np.cos(np.pi * (2 * i + 1) * k / 16)
+    matrix[0] = np.sqrt(1 / 8)
+    return matrix
+
+
+DCT_MATRIX = _dct_matrix()
+
+
+def _ijg_table(quality: int) -> np.ndarray:
+    """Luminance table libjpeg writes for a quality setting."""
+    scale = 5000 / quality if quality < 50 else 200 - 2 * quality
+    return np.clip(np.floor((IJG_LUMINANCE * scale + 50) / 100), 1, 255)
+
+
+IJG_TABLES = np.stack([_ijg_table(q) for q in range(1, 101)])
+
+
+class CompressionAnalyzer:
+    """
+    Analyze JPEG compression history.
+    
+    Double compression: a JPEG decoded and saved again quantizes each DCT
+    coefficient twice. With a finer second table the histogram of quantized
+    values shows periodic gaps/peaks, which this layer measures as the
+    strongest periodic component left after removing the smooth trend.
+    Recompression at a coarser quality leaves no such trace and is not
+    detected.
+    """
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument]) -> LayerResult:
+        """
+        Analyze JPEG quantization and compression history.
+        
+        Accepts image bytes, a file path, or a shared ParsedDocument.
+        
+        Returns LayerResult with score and flags.
+        """
+        try:
+            from PIL import Image  # noqa: F401
+        except ImportError:
+            logger.warning("Pillow not installed, skipping compression analysis")
+            return LayerResult(
+                name="compression",
+                score=DEFAULT_SCORES["clean"],
+                flags=["ANALYZER_NOT_AVAILABLE"],
+            )
+        
+        flags = []
+        score = DEFAULT_SCORES["clean"]
+        details = {}
+        
+        try:
+            with parsed_document(source) as parsed:
+                with parsed.image() as img:
+                    image_format = img.format
+                    tables = getattr(img, "quantization", None) or {}
+                if image_format != "JPEG":
+                    return LayerResult(
+                        name="compression",
+                        score=DEFAULT_SCORES["clean"],
+                        details={"format": (image_format or "").lower(), "applicable": False},
+                    )
+                with parsed.decode_image() as img:
+                    luma_y = self._luminance(img)
+            
+            if 0 not in tables:
+                flags.append("NO_QUANTIZATION_TABLE")
+                return LayerResult(
+                    name="compression",
+                    score=DEFAULT_SCORES["minor_issue"],
+                    flags=flags,
+                )
+            
+            # Check 1: Quantization table -> estimated quality
+            table = np.array(tables[0], dtype=float).reshape(8, 8)
+            quality, standard = self._estimate_quality(table)
+            details["estimated_quality"] = quality
+            details["standard_tables"] = standard
+            details["table_count"] = len(tables)
+            
+            # Check 2: Double compression
+            periodicity = self._double_compression(luma_y, table)
+            details["dct_periodicity"] = periodicity["per_frequency"]
+            details["double_compression_score"] = periodicity["score"]
+            if periodicity["score"] is not None and periodicity["score"] > JPEG_DOUBLE_COMPRESSION_THRESHOLD:
+                flags.append("DOUBLE_JPEG_COMPRESSION")
+                score = min(score, DEFAULT_SCORES["moderate_issue"])
+        
+        except Exception as e:
+            logger.warning(f"Compression analysis failed: {e}")
+            return LayerResult(
+                name="compression",
+                score=DEFAULT_SCORES["minor_issue"],
+                flags=["ANALYSIS_ERROR"],
+                details={"error": str(e)},
+            )
+        
+        return LayerResult(
+            name="compression",
+            score=score,
+            flags=flags,
+            details=details,
+        )
+    
+    def _luminance(self, img) -> np.ndarray:
+        """
+        Decoded Y channel, centre-cropped on the 8x8 block grid.
+        
+        Decoding in YCbCr skips the RGB round trip, so the pixels are what
+        the last encoder quantized.
+        """
+        img.draft("YCbCr", img.size)
+        if img.mode == "YCbCr":
+            y = np.asarray(img.getchannel(0))
+        else:
+            # Grayscale JPEG (or a CMYK one, converted)
+            y = np.asarray(img if img.mode == "L" else img.convert("L"))
+        
+        h, w = y.shape
+        crop_h = min(h, JPEG_ANALYSIS_MAX_SIDE) // 8 * 8
+        crop_w = min(w, JPEG_ANALYSIS_MAX_SIDE) // 8 * 8
+        top = (h - crop_h) // 2 // 8 * 8
+        left = (w - crop_w) // 2 // 8 * 8
+        return y[top:top + crop_h, left:left + crop_w]
+    
+    def _estimate_quality(self, table: np.ndarray):
+        """Closest IJG quality setting -> (quality, exact match)."""
+        errors = np.abs(IJG_TABLES - table).sum(axis=(1, 2))
+        best = int(np.argmin(errors))
+        return best + 1, bool(errors[best] == 0)
+    
+    def _double_compression(self, y: np.ndarray, table: np.ndarray) -> Dict[str, object]:
+        """
+        Median histogram periodicity over the low DCT frequencies.
+        
+        Per frequency: |round(coefficient / q)| histogram over 1..MAX_BIN,
+        log-scaled, minus a quadratic trend; the peak of the residual's
+        spectrum (excluding the two lowest bins) normalized by sqrt(length).
+        """
+        h, w = y.shape
+        if h < 8 or w < 8:
+            return {"score": None, "per_frequency": {}}
+        
+        blocks = (y.astype(np.float32) - 128).reshape(h // 8, 8, w // 8, 8).transpose(0, 2, 1, 3)
+        coeffs = DCT_MATRIX @ blocks @ DCT_MATRIX.T
+        
+        per_frequency = {}
+        bins = np.arange(1, JPEG_DCT_MAX_BIN + 1)
+        for u, v in JPEG_DCT_FREQUENCIES:
+            metric = self._periodicity(coeffs[..., u, v], table[u, v], bins)
+            if metric is not None:
+                per_frequency[f"{u},{v}"] = round(metric, 2)
+        
+        values: List[float] = list(per_frequency.values())
+        score: Optional[float] = round(float(np.median(values)), 2) if values else None
+        return {"score": score, "per_frequency": per_frequency}
+    
+    def _periodicity(self, coeffs: np.ndarray, q: float, bins: np.ndarray) -> Optional[float]:
+        k = np.abs(np.rint(coeffs / q)).astype(np.int64).ravel()
+        k = k[(k > 0) & (k <= JPEG_DCT_MAX_BIN)]
+        if k.size < JPEG_DCT_MIN_COEFFS:
+            return None
+        
+        hist = np.bincount(k, minlength=JPEG_DCT_MAX_BIN + 1)[1:].astype(float)
+        populated = np.nonzero(hist >= 3)[0]
+        if populated.size == 0 or populated[-1] + 1 < 8:
+            return None
+        last = populated[-1] + 1
+        
+        log_hist = np.log1p(hist[:last])
+        x = bins[:last]
+        residual = log_hist - np.polyval(np.polyfit(x, log_hist, 2), x)
+        spectrum = np.abs(np.fft.rfft(residual - residual.mean()))
+        return float(spectrum[2:].max() / np.sqrt(last))
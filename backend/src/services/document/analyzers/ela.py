@@ -0,0 +1,281 @@
+"""
+Error Level Analysis (ELA) Analyzer.
+
+Checks for:
+- Regions with a different JPEG compression history ("JPEG ghosts")
+- Regions whose sensor noise differs from the rest of the page
+
+Both look at the page region by region, so a pasted-in mark or date that
+leaves the global statistics untouched still stands out locally.
+"""
+
+import io
+import os
+import logging
+from typing import Optional, Union
+import numpy as np
+
+from ..contracts import LayerResult
+from ..context import DocumentSource, ParsedDocument, parsed_document
+from ..rules import (
+    DEFAULT_SCORES,
+    ELA_DPI,
+    ELA_MAX_PAGES,
+    ELA_MAX_SIDE,
+    ELA_QUALITIES,
+    ELA_REGION_SIZE,
+    ELA_MIN_ERROR_SPAN,
+    ELA_GHOST_THRESHOLD,
+    ELA_GHOST_MIN_REGIONS,
+    ELA_NOISE_MIN_LEVEL,
+    ELA_NOISE_RATIO,
+    ELA_NOISE_MIN_REGIONS,
+    ELA_MAX_REGION_FRACTION,
+    ELA_HEATMAP_MAX_CELLS,
+)
+from .forensics import fit_image
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorLevelAnalyzer:
+    """
+    Local recompression and noise-residual analysis.
+    
+    The page is recompressed at each of ELA_QUALITIES and the squared error
+    is averaged per region. Normalized per region, that error curve falls
+    as the quality rises; a region last saved at a lower quality than the
+    page dips at that quality instead (the "ghost").
+    
+    The noise residual is the pixel minus the mean of its 4 neighbours; its
+    25th percentile per region estimates the noise floor without the text
+    strokes. Regions far cleaner than the page are flagged. Born-digital
+    pages have no noise floor and skip this check.
+    
+    details["heatmap"] holds a 0-100 anomaly score per region, max-pooled
+    to at most ELA_HEATMAP_MAX_CELLS cells per side.
+    
+    Environment:
+        DOCUMENT_ELA_DPI        PDF render resolution (default: 150)
+        DOCUMENT_ELA_MAX_PAGES  First N pages analyzed (default: 1)
+    """
+    
+    # Lowest score a page can get (both checks agreeing)
+    SCORE_FLOOR = DEFAULT_SCORES["major_issue"]
+    
+    def __init__(self, dpi: Optional[int] = None, max_pages: Optional[int] = None):
+        self.dpi = dpi or int(os.getenv("DOCUMENT_ELA_DPI", str(ELA_DPI)))
+        self.max_pages = max_pages or int(os.getenv("DOCUMENT_ELA_MAX_PAGES", str(ELA_MAX_PAGES)))
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument]) -> LayerResult:
+        """
+        Analyze document regions for local manipulation signals.
+        
+        Accepts PDF/image bytes, a file path, or a shared ParsedDocument.
+        
+        Returns LayerResult with score and flags. details["pages"] holds the
+        per-page counts; the heatmap describes the worst page.
+        """
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            logger.warning("Pillow not installed, skipping error level analysis")
+            return LayerResult(
+                name="ela",
+                score=DEFAULT_SCORES["clean"],
+                flags=["ANALYZER_NOT_AVAILABLE"],
+            )
+        
+        flags = []
+        score = DEFAULT_SCORES["clean"]
+        details = {}
+        pages = []
+        
+        try:
+            with parsed_document(source) as parsed:
+                for page_num, gray in self._pages(parsed):
+                    page_score, page_flags, page_details = self._analyze_page(gray)
+                    heatmap = page_details.pop("heatmap")
+                    pages.append({
+                        "page": page_num + 1,
+                        "score": page_score,
+                        "flags": page_flags,
+                        **page_details,
+                    })
+                    
+                    for flag in page_flags:
+                        if flag not in flags:
+                            flags.append(flag)
+                    if page_score < score or not details:
+                        score = page_score
+                        details = dict(page_details, heatmap=heatmap)
+                        details["worst_page"] = page_num + 1
+                    
+                    if score <= self.SCORE_FLOOR:
+                        break
+            
+            details["pages_analyzed"] = len(pages)
+            details["pages"] = pages
+            
+            # Born-digital pages were never compressed or scanned: unless a
+            # check fired, there was nothing to examine
+            applicable = bool(flags) or any(
+                page.get("noise_mismatch_regions") is not None for page in pages
+            )
+        
+        except Exception as e:
+            logger.warning(f"Error level analysis failed: {e}")
+            return LayerResult(
+                name="ela",
+                score=DEFAULT_SCORES["minor_issue"],
+                flags=["ANALYSIS_ERROR"],
+                details={"error": str(e)},
+            )
+        
+        return LayerResult(
+            name="ela",
+            score=score,
+            flags=flags,
+            details=details,
+            applicable=applicable,
+        )
+    
+    def _pages(self, parsed: ParsedDocument):
+        """Yield (page number, uint8 grayscale array), one page at a time."""
+        if parsed.is_image:
+            with parsed.decode_image() as img:
+                # Full size when possible: downscaling loses the 8x8 JPEG grid
+                img = fit_image(img, ELA_MAX_SIDE)
+                gray = np.asarray(img.convert("L"))
+            yield 0, gray
+            return
+        
+        import fitz
+        matrix = fitz.Matrix(self.dpi / 72.0, self.dpi / 72.0)
+        with parsed.fitz() as doc:
+            page_count = len(doc)
+        for page_num in range(min(page_count, self.max_pages)):
+            with parsed.fitz() as doc:
+                pix = doc[page_num].get_pixmap(matrix=matrix, colorspace=fitz.csGRAY)
+            gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+            pix = None
+            yield page_num, gray
+    
+    def _analyze_page(self, gray: np.ndarray):
+        """Region checks on one grayscale page -> (score, flags, details)."""
+        flags = []
+        score = DEFAULT_SCORES["clean"]
+        
+        ghost = self._ghost_map(gray)
+        noise_ratio, noise_level = self._noise_map(gray)
+        region_count = ghost.size
+        details = {
+            "image_size": f"{gray.shape[1]}x{gray.shape[0]}",
+            "region_size": ELA_REGION_SIZE,
+            "noise_level": round(float(noise_level), 2),
+        }
+        if region_count == 0:
+            details["heatmap"] = {"region_size": ELA_REGION_SIZE, "values": []}
+            return score, flags, details
+        
+        # Check 1: Regions with a different compression history
+        ghost_regions = int(np.count_nonzero(ghost > ELA_GHOST_THRESHOLD))
+        details["ghost_regions"] = ghost_regions
+        if ELA_GHOST_MIN_REGIONS <= ghost_regions <= ELA_MAX_REGION_FRACTION * region_count:
+            flags.append("ELA_COMPRESSION_MISMATCH")
+            score = min(score, DEFAULT_SCORES["moderate_issue"])
+        
+        # Check 2: Regions cleaner than the page's noise floor
+        if noise_ratio is not None:
+            clean_regions = int(np.count_nonzero(noise_ratio < ELA_NOISE_RATIO))
+            details["noise_mismatch_regions"] = clean_regions
+            if ELA_NOISE_MIN_REGIONS <= clean_regions <= ELA_MAX_REGION_FRACTION * region_count:
+                flags.append("NOISE_INCONSISTENT_REGIONS")
+                score = min(score, DEFAULT_SCORES["moderate_issue"])
+            noise_score = np.clip(1.0 - noise_ratio, 0.0, 1.0)
+        else:
+            details["noise_mismatch_regions"] = None
+            noise_score = np.zeros_like(ghost)
+        
+        # Both checks on one page: a confirmed region mismatch
+        if "ELA_COMPRESSION_MISMATCH" in flags and "NOISE_INCONSISTENT_REGIONS" in flags:
+            score = min(score, DEFAULT_SCORES["major_issue"])
+        
+        anomaly = np.maximum(ghost, noise_score)
+        details["heatmap"] = self._heatmap(anomaly)
+        return score, flags, details
+    
+    def _regions(self, values: np.ndarray) -> np.ndarray:
+        """(rows, cols, pixels) view of whole ELA_REGION_SIZE regions."""
+        size = ELA_REGION_SIZE
+        h, w = values.shape
+        rows, cols = h // size, w // size
+        return (
+            values[:rows * size, :cols * size]
+            .reshape(rows, size, cols, size)
+            .transpose(0, 2, 1, 3)
+            .reshape(rows, cols, size * size)
+        )
+    
+    def _ghost_map(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Per-region rise of the normalized recompression error curve (0-1).
+        
+        0 = error never increases with quality (consistent history).
+        """
+        from PIL import Image
+        
+        original = gray.astype(np.float32)
+        image = Image.fromarray(gray)
+        errors = []
+        for quality in ELA_QUALITIES:
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=quality)
+            buffer.seek(0)
+            with Image.open(buffer) as recompressed:
+                diff = original - np.asarray(recompressed.convert("L"), dtype=np.float32)
+            errors.append(self._regions(np.square(diff, out=diff)).mean(axis=-1))
+        curves = np.stack(errors, axis=-1)
+        
+        low = curves.min(axis=-1, keepdims=True)
+        span = curves.max(axis=-1) - low[..., 0]
+        curves = (curves - low) / np.maximum(span, 1e-6)[..., None]
+        
+        # Largest increase from any lower quality to a higher one
+        running_min = np.minimum.accumulate(curves, axis=-1)
+        rise = (curves[..., 1:] - running_min[..., :-1]).max(axis=-1).clip(0.0)
+        return np.where(span >= ELA_MIN_ERROR_SPAN, rise, 0.0)
+    
+    def _noise_map(self, gray: np.ndarray):
+        """
+        Per-region noise floor relative to the page -> (ratio or None, page level).
+        
+        None when the page has no measurable noise (born-digital).
+        """
+        g = gray.astype(np.float32)
+        padded = np.pad(g, 1, mode="edge")
+        neighbours = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]) / 4
+        residual = np.abs(g - neighbours)
+        
+        regions = self._regions(residual)
+        if regions.size == 0:
+            return None, 0.0
+        floor = np.percentile(regions, 25, axis=-1)
+        level = float(np.median(floor))
+        if level < ELA_NOISE_MIN_LEVEL:
+            return None, level
+        return floor / level, level
+    
+    def _heatmap(self, anomaly: np.ndarray) -> dict:
+        """0-100 per region, max-pooled to at most ELA_HEATMAP_MAX_CELLS per side."""
+        rows, cols = anomaly.shape
+        pool = max(1, -(-max(rows, cols) // ELA_HEATMAP_MAX_CELLS))
+        pad_rows, pad_cols = -rows % pool, -cols % pool
+        padded = np.pad(anomaly, ((0, pad_rows), (0, pad_cols)))
+        pooled = padded.reshape(
+            padded.shape[0] // pool, pool, padded.shape[1] // pool, pool
+        ).max(axis=(1, 3))
+        return {
+            "region_size": ELA_REGION_SIZE * pool,
+            "values": np.rint(pooled * 100).astype(int).tolist(),
+        }
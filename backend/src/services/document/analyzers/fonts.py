@@ -4,17 +4,63 @@ Font Consistency Analyzer.
 Checks:
 - Number of fonts used
 - Font consistency across document
+- Font family or size switches inside a line of text
+
+Fonts are read from the PDF's resource objects, each of which is visited
+once no matter how many pages share it; per-font page sets are kept as
+integer bitmaps.
+
+Environment:
+    DOCUMENT_FONT_SPAN_PAGES  Pages checked span by span (default: 5)
 """
 
+import os
+import re
 import logging
-from io import BytesIO
-from typing import Dict, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from ..contracts import LayerResult
-from ..rules import MAX_NORMAL_FONTS, DEFAULT_SCORES
+from ..context import DocumentSource, ParsedDocument, parsed_document
+from ..rules import (
+    MAX_NORMAL_FONTS,
+    DEFAULT_SCORES,
+    FONT_SPAN_MAX_PAGES,
+    FONT_SIZE_TOLERANCE,
+    FONT_SWITCH_MIN_CHARS,
+    FONT_BASELINE_TOLERANCE,
+    FONT_LINE_GAP,
+    FONT_SYMBOL_FAMILIES,
+    FONT_SWITCH_EXAMPLES,
+)
 
 logger = logging.getLogger(__name__)
 
+# "/F1 12 0 R" inside a resource dictionary
+_REFERENCE = re.compile(r"/([^\s/<>\[\]()]+)\s*(\d+)\s+\d+\s+R")
+# BaseFont of a font dictionary written inline instead of as an object
+_INLINE_BASEFONT = re.compile(r"/BaseFont\s*/([^\s/<>\[\]()]+)")
+# Style suffixes dropped to compare families: Arial-BoldMT, TimesNewRomanPS-ItalicMT
+_STYLE_SUFFIX = re.compile(r"[-,].*$")
+_VENDOR_SUFFIX = re.compile(r"(PS)?(MT)?$")
+# Names that say nothing about the family ("CIDFont+F1", "T3")
+_PLACEHOLDER_FAMILY = re.compile(r"^(cidfont|[a-z]{1,2}\d+)$")
+
+# Guards against cyclic or absurdly nested Form XObjects
+_MAX_FORM_DEPTH = 8
+_MAX_PARENT_DEPTH = 32
+
+
+def font_family(name: str) -> str:
+    """'ABCDEF+Arial-BoldMT' -> 'arial'."""
+    base = name.split("+", 1)[-1]
+    base = _STYLE_SUFFIX.sub("", base)
+    return (_VENDOR_SUFFIX.sub("", base) or base).lower()
+
+
+def _reference_xref(value: str) -> Optional[int]:
+    parts = value.split()
+    return int(parts[0]) if len(parts) == 3 and parts[2] == "R" else None
+
 
 class FontAnalyzer:
     """
@@ -23,12 +69,25 @@ class FontAnalyzer:
     Red flags:
     - Too many different fonts (suggests copy-paste)
     - Unusual font combinations
+    - A run of text inside a line set in another family or size than the
+      rest of the line (a pasted-in or retyped value)
+    
+    Only runs containing digits count as switches: dates, amounts and ID
+    numbers are what gets edited, while word-level switches (code, names
+    in another script, bold labels) are common in genuine documents.
     """
     
-    def analyze(self, file_bytes: bytes) -> LayerResult:
+    def __init__(self, span_pages: Optional[int] = None):
+        self.span_pages = span_pages if span_pages is not None else int(
+            os.getenv("DOCUMENT_FONT_SPAN_PAGES", str(FONT_SPAN_MAX_PAGES))
+        )
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument]) -> LayerResult:
         """
         Analyze font consistency in PDF.
         
+        Accepts PDF bytes, a file path, or a shared ParsedDocument.
+        
         Returns LayerResult with score and flags.
         """
         try:
@@ -46,31 +105,19 @@ class FontAnalyzer:
         details = {}
         
         try:
-            doc = fitz.open(stream=file_bytes, filetype="pdf")
-            
-            fonts_used: Dict[str, int] = {}
-            pages_with_fonts: Dict[str, Set[int]] = {}
-            
-            for page_num, page in enumerate(doc):
-                page_fonts = page.get_fonts()
+            with parsed_document(source) as parsed, parsed.fitz() as doc:
+                # Font name -> bitmap of the pages using it (bit n = page n)
+                pages_with_fonts = self._font_pages(doc)
                 
-                for font in page_fonts:
-                    font_name = font[3] if len(font) > 3 else "Unknown"
-                    
-                    # Count font occurrences
-                    fonts_used[font_name] = fonts_used.get(font_name, 0) + 1
-                    
-                    # Track which pages use which fonts
-                    if font_name not in pages_with_fonts:
-                        pages_with_fonts[font_name] = set()
-                    pages_with_fonts[font_name].add(page_num)
-            
-            doc.close()
+                pages_with_text = 0
+                for bits in pages_with_fonts.values():
+                    pages_with_text |= bits
+                switches = self._line_switches(doc, pages_with_text)
             
-            font_count = len(fonts_used)
+            font_count = len(pages_with_fonts)
             details = {
                 "font_count": font_count,
-                "fonts": list(fonts_used.keys())[:10],  # Limit for display
+                "fonts": list(pages_with_fonts.keys())[:10],  # Limit for display
             }
             
             # Check 1: Too many fonts
@@ -82,13 +129,13 @@ class FontAnalyzer:
                 score = min(score, DEFAULT_SCORES["minor_issue"])
             
             # Check 2: Inconsistent font usage (font only on one page in multi-page doc)
-            if len(pages_with_fonts) > 0:
-                page_count = max(max(pages) for pages in pages_with_fonts.values()) + 1
+            if pages_with_text:
+                page_count = pages_with_text.bit_length()
                 
                 if page_count > 1:
                     isolated_fonts = [
                         f for f, pages in pages_with_fonts.items()
-                        if len(pages) == 1
+                        if pages & (pages - 1) == 0  # Exactly one bit set
                     ]
                     
                     # More than half fonts are isolated
@@ -96,6 +143,14 @@ class FontAnalyzer:
                         flags.append("INCONSISTENT_FONT_USAGE")
                         score = min(score, DEFAULT_SCORES["minor_issue"])
             
+            # Check 3: Font family or size switching inside a line.
+            # A retyped value: one such line is enough for a review
+            details["font_switch_lines"] = len(switches)
+            details["font_switches"] = switches[:FONT_SWITCH_EXAMPLES]
+            if switches:
+                flags.append(f"FONT_SWITCH_IN_LINE: {len(switches)}")
+                score = min(score, DEFAULT_SCORES["major_issue"])
+        
         except Exception as e:
             logger.warning(f"Font analysis failed: {e}")
             return LayerResult(
@@ -111,3 +166,186 @@ class FontAnalyzer:
             flags=flags,
             details=details,
         )
+    
+    # ============ Resource Graph ============
+    
+    def _font_pages(self, doc) -> Dict[str, int]:
+        """
+        Font name -> page bitmap, walking each resource object once.
+        
+        Pages are grouped by the resource dictionary they use (their own or
+        inherited from the page tree); the fonts of each distinct dictionary,
+        including those of the Form XObjects it draws, are then read once
+        and OR-ed into the bitmaps of all its pages.
+        """
+        # Resource location (holder xref, key path) -> page bitmap
+        groups: Dict[Tuple[int, str], int] = {}
+        inline: Dict[str, Tuple[int, str]] = {}
+        for page_num in range(doc.page_count):
+            location = self._page_resources(doc, doc.page_xref(page_num))
+            if location is None:
+                continue
+            if location[1]:
+                # Inline dictionary: identical text means identical resources
+                text = doc.xref_get_key(*location)[1]
+                location = inline.setdefault(text, location)
+            groups[location] = groups.get(location, 0) | (1 << page_num)
+        
+        font_names: Dict[int, str] = {}
+        forms: Dict[int, Set[str]] = {}
+        pages_with_fonts: Dict[str, int] = {}
+        for location, bits in groups.items():
+            for name in self._resource_fonts(doc, location, font_names, forms, 0):
+                pages_with_fonts[name] = pages_with_fonts.get(name, 0) | bits
+        return pages_with_fonts
+    
+    def _page_resources(self, doc, xref: int) -> Optional[Tuple[int, str]]:
+        """(holder xref, key path) of a page's resource dictionary, or None."""
+        for _ in range(_MAX_PARENT_DEPTH):
+            kind, value = doc.xref_get_key(xref, "Resources")
+            if kind == "xref":
+                return _reference_xref(value), ""
+            if kind == "dict":
+                return xref, "Resources"
+            kind, value = doc.xref_get_key(xref, "Parent")
+            if kind != "xref":
+                return None
+            xref = _reference_xref(value)
+        return None
+    
+    def _entries(self, doc, location: Tuple[int, str], key: str) -> str:
+        """Text of the dictionary under location/key, following one reference."""
+        holder, path = location
+        kind, value = doc.xref_get_key(holder, f"{path}/{key}" if path else key)
+        if kind == "xref":
+            return doc.xref_object(_reference_xref(value), compressed=True)
+        return value if kind == "dict" else ""
+    
+    def _resource_fonts(
+        self,
+        doc,
+        location: Tuple[int, str],
+        font_names: Dict[int, str],
+        forms: Dict[int, Set[str]],
+        depth: int,
+    ) -> Set[str]:
+        """Font names of one resource dictionary and the forms it draws."""
+        names: Set[str] = set()
+        
+        fonts = self._entries(doc, location, "Font")
+        for _, ref in _REFERENCE.findall(fonts):
+            font_xref = int(ref)
+            if font_xref not in font_names:
+                font_names[font_xref] = self._font_name(doc, font_xref)
+            names.add(font_names[font_xref])
+        names.update(_INLINE_BASEFONT.findall(fonts))
+        
+        if depth >= _MAX_FORM_DEPTH:
+            return names
+        for _, ref in _REFERENCE.findall(self._entries(doc, location, "XObject")):
+            form_xref = int(ref)
+            if form_xref not in forms:
+                forms[form_xref] = set()  # Marks the form visited (cycles)
+                if doc.xref_get_key(form_xref, "Subtype")[1] == "/Form":
+                    form_resources = self._page_resources(doc, form_xref)
+                    if form_resources is not None:
+                        forms[form_xref] = self._resource_fonts(
+                            doc, form_resources, font_names, forms, depth + 1
+                        )
+            names.update(forms[form_xref])
+        return names
+    
+    def _font_name(self, doc, xref: int) -> str:
+        kind, value = doc.xref_get_key(xref, "BaseFont")
+        if kind == "name":
+            return value.lstrip("/")
+        kind, value = doc.xref_get_key(xref, "Name")
+        return value.lstrip("/") if kind == "name" else "Unknown"
+    
+    # ============ Span Checks ============
+    
+    def _line_switches(self, doc, pages_with_text: int) -> List[dict]:
+        """Lines where a run of text changes font family or size (first N text pages)."""
+        import fitz
+        
+        switches = []
+        checked = 0
+        for page_num in range(doc.page_count):
+            if checked >= self.span_pages:
+                break
+            if not pages_with_text >> page_num & 1:
+                continue  # No fonts, nothing to read (scanned page)
+            checked += 1
+            
+            page = doc.load_page(page_num)
+            text = page.get_text("dict", flags=fitz.TEXT_MEDIABOX_CLIP)
+            for line in self._visual_lines(text["blocks"]):
+                switch = self._line_switch(line)
+                if switch is not None:
+                    switches.append({"page": page_num + 1, **switch})
+        return switches
+    
+    def _visual_lines(self, blocks: List[dict]) -> Iterable[List[dict]]:
+        """
+        Group spans sharing a baseline into lines, left to right.
+        
+        PyMuPDF starts a new line (or block) when the size changes, so its
+        own lines would hide exactly the switches looked for here.
+        """
+        spans = []
+        for block in blocks:
+            for line in block.get("lines", []):
+                if tuple(line["dir"]) != (1.0, 0.0):
+                    continue  # Rotated text
+                for span in line["spans"]:
+                    if span["text"].strip():
+                        spans.append(span)
+        spans.sort(key=lambda s: (round(s["origin"][1]), s["origin"][0]))
+        
+        line: List[dict] = []
+        for span in spans:
+            if line:
+                last = line[-1]
+                same_baseline = abs(span["origin"][1] - last["origin"][1]) <= FONT_BASELINE_TOLERANCE
+                gap = span["bbox"][0] - last["bbox"][2]
+                if not same_baseline or gap > FONT_LINE_GAP * max(last["size"], span["size"]):
+                    yield line
+                    line = []
+            line.append(span)
+        if line:
+            yield line
+    
+    def _line_switch(self, spans: List[dict]) -> Optional[dict]:
+        """The first digit-bearing run whose family or size differs from the line's main style."""
+        if len(spans) < 2:
+            return None
+        
+        # Main style = the one covering the most characters
+        weight: Dict[Tuple[str, float], int] = {}
+        for span in spans:
+            style = (font_family(span["font"]), round(span["size"], 1))
+            weight[style] = weight.get(style, 0) + len(span["text"].strip())
+        family, size = max(weight, key=weight.get)
+        
+        for span in spans:
+            span_family = font_family(span["font"])
+            if span_family in FONT_SYMBOL_FAMILIES:
+                continue
+            run = span["text"].strip()
+            if len(run) < FONT_SWITCH_MIN_CHARS or not any(c.isdigit() for c in run):
+                continue
+            # Placeholder names hide the family; only the size can be compared
+            family_switch = span_family != family and not (
+                _PLACEHOLDER_FAMILY.match(span_family) or _PLACEHOLDER_FAMILY.match(family)
+            )
+            size_switch = abs(span["size"] - size) > FONT_SIZE_TOLERANCE
+            if family_switch or size_switch:
+                return {
+                    "text": "".join(s["text"] for s in spans).strip()[:80],
+                    "run": run[:40],
+                    "font": span["font"],
+                    "size": round(span["size"], 1),
+                    "line_font": family,
+                    "line_size": size,
+                }
+        return None
@@ -7,29 +7,90 @@ Checks for:
 - Basic manipulation signals
 """
 
+import os
+import math
 import logging
-from io import BytesIO
-from typing import Optional
+from typing import List, Optional, Union
 import numpy as np
 
 from ..contracts import LayerResult
-from ..rules import DEFAULT_SCORES
+from ..context import DocumentSource, ParsedDocument, parsed_document
+from ..rules import (
+    DEFAULT_SCORES,
+    FORENSICS_BLOCK_SIZE,
+    FORENSICS_BLOCK_OVERLAP,
+    BLOCK_VARIANCE_STD_THRESHOLD,
+    FORENSICS_PAGE_MODE,
+    FORENSICS_DPI,
+    FORENSICS_MAX_PAGES,
+    FORENSICS_IMAGE_MAX_SIDE,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def fit_image(img, max_side: int):
+    """
+    A Pillow image no larger than max_side on its longest side.
+    
+    JPEGs are scaled down during decoding (draft), so a large photo is
+    never decoded at full size; whatever is left is box-reduced.
+    """
+    longest = max(img.size)
+    if longest > max_side:
+        ratio = longest / max_side
+        target = (math.ceil(img.width / ratio), math.ceil(img.height / ratio))
+        img.draft("L" if img.mode == "L" else "RGB", target)
+    
+    factor = math.ceil(max(img.size) / max_side)
+    if factor > 1:
+        img = img.reduce(factor)
+    return img
+
+
 class ForensicsAnalyzer:
     """
     Analyze image/scanned document for manipulation signals.
     
     Uses basic statistical analysis, not ML.
+    
+    Pages are rendered one at a time into a reused grayscale buffer, so
+    memory stays flat however many pages are analyzed. The layer score is
+    the worst page's score; analysis stops once it reaches the floor.
+    
+    JPEG/PNG uploads skip rendering: the image is decoded straight to an
+    array (downscaled to FORENSICS_IMAGE_MAX_SIDE) and checked as one page.
+    
+    Environment:
+        DOCUMENT_FORENSICS_PAGES      first | all | sample (default: first)
+        DOCUMENT_FORENSICS_DPI        Render resolution (default: 72 = 1x)
+        DOCUMENT_FORENSICS_MAX_PAGES  Pages analyzed in sample mode (default: 10)
     """
     
-    def analyze(self, file_bytes: bytes) -> LayerResult:
+    # Lowest score any forensics check can assign
+    SCORE_FLOOR = DEFAULT_SCORES["moderate_issue"]
+    
+    def __init__(
+        self,
+        page_mode: Optional[str] = None,
+        dpi: Optional[int] = None,
+        max_pages: Optional[int] = None,
+    ):
+        self.page_mode = (page_mode or os.getenv("DOCUMENT_FORENSICS_PAGES", FORENSICS_PAGE_MODE)).lower()
+        if self.page_mode not in ("first", "all", "sample"):
+            logger.warning(f"Unknown forensics page mode {self.page_mode} - using first")
+            self.page_mode = "first"
+        self.dpi = dpi or int(os.getenv("DOCUMENT_FORENSICS_DPI", str(FORENSICS_DPI)))
+        self.max_pages = max_pages or int(os.getenv("DOCUMENT_FORENSICS_MAX_PAGES", str(FORENSICS_MAX_PAGES)))
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument]) -> LayerResult:
         """
         Analyze document for image manipulation signals.
         
-        Returns LayerResult with score and flags.
+        Accepts PDF/image bytes, a file path, or a shared ParsedDocument.
+        
+        Returns LayerResult with score and flags. details["pages"] holds the
+        per-page breakdown; the top-level details describe the worst page.
         """
         try:
             import fitz  # PyMuPDF for PDF to image
@@ -44,58 +105,63 @@ class ForensicsAnalyzer:
         flags = []
         score = DEFAULT_SCORES["clean"]
         details = {}
+        pages = []
         
         try:
-            # Convert first page to image
-            doc = fitz.open(stream=file_bytes, filetype="pdf")
-            
-            if len(doc) == 0:
-                return LayerResult(
-                    name="forensics",
-                    score=DEFAULT_SCORES["minor_issue"],
-                    flags=["EMPTY_DOCUMENT"],
-                )
-            
-            # Get first page as pixmap
-            page = doc[0]
-            pix = page.get_pixmap(matrix=fitz.Matrix(1, 1))  # 1x scale
-            
-            # Convert to numpy array
-            img_array = np.frombuffer(pix.samples, dtype=np.uint8)
-            img_array = img_array.reshape(pix.height, pix.width, pix.n)
-            
-            # Convert to grayscale for analysis
-            if pix.n >= 3:
-                gray = np.mean(img_array[:, :, :3], axis=2)
-            else:
-                gray = img_array[:, :, 0]
+            with parsed_document(source) as parsed:
+                if parsed.is_image:
+                    return self._analyze_image(parsed)
+                
+                with parsed.fitz() as doc:
+                    page_count = len(doc)
+                if page_count == 0:
+                    return LayerResult(
+                        name="forensics",
+                        score=DEFAULT_SCORES["minor_issue"],
+                        flags=["EMPTY_DOCUMENT"],
+                    )
+                
+                zoom = self.dpi / 72.0
+                matrix = fitz.Matrix(zoom, zoom)
+                page_numbers = self._select_pages(page_count)
+                buffer = None
+                
+                for page_num in page_numbers:
+                    # Hold the shared handle only while rendering, not while analyzing
+                    with parsed.fitz() as doc:
+                        pix = doc[page_num].get_pixmap(matrix=matrix)
+                    gray, buffer = self._to_gray(pix, buffer)
+                    width, height = pix.width, pix.height
+                    pix = None  # Release the page pixmap before the next render
+                    
+                    page_score, page_flags, page_details = self._analyze_page(gray)
+                    page_details["image_size"] = f"{width}x{height}"
+                    heatmap = page_details.pop("variance_heatmap")
+                    pages.append({
+                        "page": page_num + 1,
+                        "score": page_score,
+                        "flags": page_flags,
+                        **page_details,
+                    })
+                    
+                    for flag in page_flags:
+                        if flag not in flags:
+                            flags.append(flag)
+                    if page_score < score or not details:
+                        # Keep only the worst page's heatmap
+                        score = page_score
+                        details = dict(page_details, variance_heatmap=heatmap)
+                        details["worst_page"] = page_num + 1
+                    
+                    if score <= self.SCORE_FLOOR:
+                        break
             
-            doc.close()
-            
-            details["image_size"] = f"{pix.width}x{pix.height}"
-            
-            # Analysis 1: Block variance analysis
-            variance_result = self._analyze_block_variance(gray)
-            if variance_result["suspicious"]:
-                flags.append("INCONSISTENT_QUALITY_REGIONS")
-                score = min(score, DEFAULT_SCORES["moderate_issue"])
-            details["variance_std"] = round(variance_result["std"], 2)
-            
-            # Analysis 2: Edge density check
-            edge_result = self._analyze_edge_density(gray)
-            if edge_result["suspicious"]:
-                flags.append("UNUSUAL_EDGE_PATTERN")
-                score = min(score, DEFAULT_SCORES["minor_issue"])
-            details["edge_density"] = round(edge_result["density"], 4)
-            
-            # Analysis 3: Entropy analysis
-            entropy = self._calculate_entropy(gray)
-            details["entropy"] = round(entropy, 2)
-            
-            # Very low entropy = possibly synthetic
-            if entropy < 2.0:
-                flags.append("LOW_ENTROPY")
-                score = min(score, DEFAULT_SCORES["minor_issue"])
+            details["page_mode"] = self.page_mode
+            details["dpi"] = self.dpi
+            details["page_count"] = page_count
+            details["pages_analyzed"] = len(pages)
+            details["early_exit"] = len(pages) < len(page_numbers)
+            details["pages"] = pages
             
         except Exception as e:
             logger.warning(f"Forensics analysis failed: {e}")
@@ -113,31 +179,187 @@ class ForensicsAnalyzer:
             details=details,
         )
     
-    def _analyze_block_variance(self, gray: np.ndarray, block_size: int = 50) -> dict:
+    def _analyze_image(self, parsed: ParsedDocument) -> LayerResult:
+        """JPEG/PNG: the page checks on the decoded image, as a one-page document."""
+        with parsed.decode_image() as img:
+            original_size = f"{img.width}x{img.height}"
+            gray = self._image_to_gray(img)
+        
+        score, flags, details = self._analyze_page(gray)
+        details["image_size"] = f"{gray.shape[1]}x{gray.shape[0]}"
+        details["original_size"] = original_size
+        heatmap = details.pop("variance_heatmap")
+        
+        page = {"page": 1, "score": score, "flags": flags, **details}
+        details.update(
+            variance_heatmap=heatmap,
+            worst_page=1,
+            page_mode="image",
+            dpi=None,
+            page_count=1,
+            pages_analyzed=1,
+            early_exit=False,
+            pages=[page],
+        )
+        return LayerResult(
+            name="forensics",
+            score=score,
+            flags=list(flags),
+            details=details,
+        )
+    
+    def _image_to_gray(self, img) -> np.ndarray:
+        """
+        Grayscale array of a Pillow image, no larger than FORENSICS_IMAGE_MAX_SIDE.
+        
+        """
+        img = fit_image(img, FORENSICS_IMAGE_MAX_SIDE)
+        if img.mode in ("1", "L", "LA", "I", "I;16", "F"):
+            return np.asarray(img.convert("L"))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        # Same grayscale as rendered PDF pages: mean of R, G, B
+        return np.asarray(img).mean(axis=2)
+    
+    def _select_pages(self, page_count: int) -> List[int]:
+        """Zero-based page numbers to analyze for the configured mode."""
+        if self.page_mode == "first":
+            return [0]
+        if self.page_mode == "all" or page_count <= self.max_pages:
+            return list(range(page_count))
+        # Evenly spaced sample, always including the first and last page
+        return sorted({int(round(i)) for i in np.linspace(0, page_count - 1, self.max_pages)})
+    
+    def _to_gray(self, pix, buffer: Optional[np.ndarray]):
+        """
+        Grayscale view of a pixmap, written into a reused float buffer.
+        
+        Returns (gray, buffer); the buffer is only reallocated when the page
+        size changes.
+        """
+        img_array = np.frombuffer(pix.samples, dtype=np.uint8)
+        img_array = img_array.reshape(pix.height, pix.width, pix.n)
+        
+        if pix.n < 3:
+            # Copy so the array does not keep the pixmap alive
+            return img_array[:, :, 0].copy(), buffer
+        
+        if buffer is None or buffer.shape != (pix.height, pix.width):
+            buffer = np.empty((pix.height, pix.width))
+        np.mean(img_array[:, :, :3], axis=2, out=buffer)
+        return buffer, buffer
+    
+    def _analyze_page(self, gray: np.ndarray):
+        """Run the statistical checks on one grayscale page -> (score, flags, details)."""
+        flags = []
+        score = DEFAULT_SCORES["clean"]
+        details = {}
+        
+        # Analysis 1: Block variance analysis
+        variance_result = self._analyze_block_variance(gray)
+        if variance_result["suspicious"]:
+            flags.append("INCONSISTENT_QUALITY_REGIONS")
+            score = min(score, DEFAULT_SCORES["moderate_issue"])
+        details["variance_std"] = round(variance_result["std"], 2)
+        details["variance_heatmap"] = variance_result["heatmap"]
+        
+        # Analysis 2: Edge density check
+        edge_result = self._analyze_edge_density(gray)
+        if edge_result["suspicious"]:
+            flags.append("UNUSUAL_EDGE_PATTERN")
+            score = min(score, DEFAULT_SCORES["minor_issue"])
+        details["edge_density"] = round(edge_result["density"], 4)
+        
+        # Analysis 3: Entropy analysis
+        entropy = self._calculate_entropy(gray)
+        details["entropy"] = round(entropy, 2)
+        
+        # Very low entropy = possibly synthetic
+        if entropy < 2.0:
+            flags.append("LOW_ENTROPY")
+            score = min(score, DEFAULT_SCORES["minor_issue"])
+        
+        return score, flags, details
+    
+    def _analyze_block_variance(
+        self,
+        gray: np.ndarray,
+        block_size: int = FORENSICS_BLOCK_SIZE,
+        overlap: int = FORENSICS_BLOCK_OVERLAP,
+    ) -> dict:
         """
         Analyze variance across image blocks.
         
         Large variance differences between blocks may indicate editing.
+        Also returns the per-block variance grid as a heatmap for HR.
         """
-        h, w = gray.shape
-        variances = []
+        variances = self._block_variances(gray, block_size, overlap)
         
-        for i in range(0, h - block_size, block_size):
-            for j in range(0, w - block_size, block_size):
-                block = gray[i:i+block_size, j:j+block_size]
-                variances.append(np.var(block))
+        heatmap = {
+            "block_size": block_size,
+            "step": block_size - overlap,
+            "values": np.round(variances, 1).tolist(),
+        }
         
-        if not variances:
-            return {"suspicious": False, "std": 0}
+        if variances.size == 0:
+            return {"suspicious": False, "std": 0, "heatmap": heatmap}
         
         variance_std = np.std(variances)
         
         # High variance between blocks = potential manipulation
         return {
-            "suspicious": variance_std > 1500,
+            "suspicious": variance_std > BLOCK_VARIANCE_STD_THRESHOLD,
             "std": variance_std,
+            "heatmap": heatmap,
         }
     
+    def _block_variances(self, gray: np.ndarray, block_size: int, overlap: int = 0) -> np.ndarray:
+        """
+        Per-block variance grid (rows x cols), vectorized.
+        
+        Blocks start every `block_size - overlap` pixels; like the original
+        loop, a block starting exactly at `h - block_size` is not included.
+        
+        var = E[x^2] - E[x]^2 from one pass per band of block rows: column
+        sums of x and x^2 over the band, then 1-D prefix sums give every
+        window in the band at once. Band-sized buffers are reused, so no
+        full-frame temporaries are allocated.
+        """
+        step = block_size - overlap
+        if step <= 0:
+            raise ValueError("overlap must be smaller than block_size")
+        
+        h, w = gray.shape
+        n_rows = len(range(0, h - block_size, step))
+        n_cols = len(range(0, w - block_size, step))
+        if n_rows == 0 or n_cols == 0:
+            return np.empty((0, 0))
+        
+        # Centre on the global mean so E[x^2] - E[x]^2 does not lose precision
+        centre = gray.mean()
+        left = np.arange(n_cols) * step
+        right = left + block_size
+        
+        band = np.empty((block_size, w))
+        band_sq = np.empty((block_size, w))
+        prefix = np.zeros(w + 1)
+        prefix_sq = np.zeros(w + 1)
+        sums = np.empty((n_rows, n_cols))
+        sq_sums = np.empty((n_rows, n_cols))
+        
+        for r in range(n_rows):
+            top = r * step
+            np.subtract(gray[top:top + block_size], centre, out=band)
+            np.multiply(band, band, out=band_sq)
+            np.cumsum(band.sum(axis=0), out=prefix[1:])
+            np.cumsum(band_sq.sum(axis=0), out=prefix_sq[1:])
+            sums[r] = prefix[right] - prefix[left]
+            sq_sums[r] = prefix_sq[right] - prefix_sq[left]
+        
+        n = block_size * block_size
+        mean = sums / n
+        return np.maximum(sq_sums / n - np.square(mean), 0.0)
+    
     def _analyze_edge_density(self, gray: np.ndarray) -> dict:
         """
         Analyze edge density.
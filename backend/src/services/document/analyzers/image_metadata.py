@@ -0,0 +1,138 @@
+"""
+Image Metadata Analyzer.
+
+Checks (JPEG EXIF / PNG text chunks):
+- Software tag (Photoshop = suspicious)
+- Modification vs original capture date
+- Camera/scanner info
+"""
+
+import logging
+from typing import Optional, Union
+from datetime import datetime
+
+from ..contracts import LayerResult
+from ..context import DocumentSource, ParsedDocument, parsed_document
+from ..rules import SUSPICIOUS_CREATORS, DEFAULT_SCORES
+
+logger = logging.getLogger(__name__)
+
+# EXIF tags (IFD0 unless noted)
+EXIF_MAKE = 0x010F
+EXIF_MODEL = 0x0110
+EXIF_SOFTWARE = 0x0131
+EXIF_DATETIME = 0x0132
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003  # In the Exif sub-IFD
+
+
+class ImageMetadataAnalyzer:
+    """
+    Analyze JPEG/PNG metadata for suspicious patterns.
+    
+    The image counterpart of MetadataAnalyzer. Red flags:
+    - Saved by image editing software
+    - Modified before the original capture date
+    - No metadata at all (stripped, or re-exported)
+    """
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument]) -> LayerResult:
+        """
+        Analyze image metadata.
+        
+        Accepts image bytes, a file path, or a shared ParsedDocument.
+        
+        Returns LayerResult with score and flags.
+        """
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            logger.warning("Pillow not installed, skipping image metadata analysis")
+            return LayerResult(
+                name="image_metadata",
+                score=DEFAULT_SCORES["clean"],
+                flags=["ANALYZER_NOT_AVAILABLE"],
+            )
+        
+        flags = []
+        score = DEFAULT_SCORES["clean"]
+        details = {}
+        
+        try:
+            with parsed_document(source) as parsed, parsed.image() as img:
+                exif = img.getexif()
+                sub_ifd = exif.get_ifd(EXIF_IFD)
+                # PNG tEXt/iTXt chunks (e.g. "Software", "Creation Time")
+                text = getattr(img, "text", None) or {}
+                
+                software = self._get_string(exif.get(EXIF_SOFTWARE)) or self._get_string(text.get("Software"))
+                make = self._get_string(exif.get(EXIF_MAKE))
+                model = self._get_string(exif.get(EXIF_MODEL))
+                modified = self._get_string(exif.get(EXIF_DATETIME))
+                original = self._get_string(sub_ifd.get(EXIF_DATETIME_ORIGINAL))
+                
+                details = {
+                    "format": (img.format or "").lower(),
+                    "width": img.width,
+                    "height": img.height,
+                    "mode": img.mode,
+                    "page_count": getattr(img, "n_frames", 1),
+                    "software": software,
+                    "camera": " ".join(part for part in (make, model) if part) or None,
+                    "datetime": modified,
+                    "datetime_original": original,
+                }
+            
+            # Check 1: Editing software
+            if software:
+                software_lower = software.lower()
+                for suspicious in SUSPICIOUS_CREATORS:
+                    if suspicious in software_lower:
+                        flags.append(f"CREATED_WITH_IMAGE_EDITOR: {software}")
+                        score = min(score, DEFAULT_SCORES["major_issue"])
+                        break
+            
+            # Check 2: Date consistency
+            if modified and original:
+                modified_at = self._parse_exif_date(modified)
+                original_at = self._parse_exif_date(original)
+                if modified_at and original_at and modified_at < original_at:
+                    flags.append("MODIFIED_BEFORE_CREATED")
+                    score = min(score, DEFAULT_SCORES["moderate_issue"])
+            
+            # Check 3: Missing metadata (minor flag)
+            if not software and not details["camera"] and not modified and not original:
+                flags.append("NO_CREATOR_INFO")
+                score = min(score, DEFAULT_SCORES["minor_issue"])
+        
+        except Exception as e:
+            logger.warning(f"Image metadata analysis failed: {e}")
+            return LayerResult(
+                name="image_metadata",
+                score=DEFAULT_SCORES["minor_issue"],
+                flags=["ANALYSIS_ERROR"],
+                details={"error": str(e)},
+            )
+        
+        return LayerResult(
+            name="image_metadata",
+            score=score,
+            flags=flags,
+            details=details,
+        )
+    
+    def _get_string(self, value) -> Optional[str]:
+        """EXIF values may be bytes, padded with NULs."""
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", errors="replace")
+        value = str(value).strip("\x00 ").strip()
+        return value or None
+    
+    def _parse_exif_date(self, date_str: str) -> Optional[datetime]:
+        """Parse EXIF date format (YYYY:MM:DD HH:MM:SS)."""
+        try:
+            return datetime.strptime(date_str[:19], "%Y:%m:%d %H:%M:%S")
+        except ValueError:
+            return None
@@ -5,15 +5,25 @@ Checks:
 - Creator software (Photoshop = suspicious)
 - Creation/modification dates
 - Producer info
+- Incremental updates appended after the file was first written
+
+The Info dictionary and XMP packet are read straight from the memory-mapped
+file by following the trailer (pdf_trailer.py); pikepdf opens the whole
+document only when that fails (encryption, unusual structure).
+
+Environment:
+    DOCUMENT_METADATA_FAST_PATH  Read metadata via the trailer (default: true)
 """
 
+import os
 import logging
-from typing import Optional
-from io import BytesIO
+from typing import Dict, Optional, Tuple, Union
 from datetime import datetime
 
 from ..contracts import LayerResult
-from ..rules import SUSPICIOUS_CREATORS, TRUSTED_CREATORS, DEFAULT_SCORES
+from ..context import DocumentSource, ParsedDocument, parsed_document
+from ..pdf_trailer import PdfStructureError, TrailerReader, parse_xmp
+from ..rules import SUSPICIOUS_CREATORS, TRUSTED_CREATORS, DEFAULT_SCORES, METADATA_FAST_PATH
 
 logger = logging.getLogger(__name__)
 
@@ -26,61 +36,66 @@ class MetadataAnalyzer:
     - Created with image editing software
     - Modified before creation date
     - Missing expected metadata
+    - Incremental updates (edits saved on top of the original), unless
+      they only add signatures
     """
     
-    def analyze(self, file_bytes: bytes) -> LayerResult:
+    INFO_KEYS = ("Creator", "Producer", "CreationDate", "ModDate")
+    
+    def __init__(self, fast_path: Optional[bool] = None):
+        self.fast_path = fast_path if fast_path is not None else os.getenv(
+            "DOCUMENT_METADATA_FAST_PATH", str(METADATA_FAST_PATH)
+        ).lower() == "true"
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument]) -> LayerResult:
         """
         Analyze PDF metadata.
         
+        Accepts PDF bytes, a file path, or a shared ParsedDocument.
+        
         Returns LayerResult with score and flags.
         """
-        try:
-            import pikepdf
-        except ImportError:
-            logger.warning("pikepdf not installed, skipping metadata analysis")
-            return LayerResult(
-                name="metadata",
-                score=DEFAULT_SCORES["clean"],
-                flags=["ANALYZER_NOT_AVAILABLE"],
-            )
-        
         flags = []
         score = DEFAULT_SCORES["clean"]
         details = {}
         
         try:
-            pdf = pikepdf.open(BytesIO(file_bytes))
-            docinfo = pdf.docinfo
+            with parsed_document(source) as parsed:
+                info, xmp, reader = self._read_metadata(parsed)
+                revisions, linearized = parsed.revisions()
             
-            # Extract metadata
-            creator = self._get_string(docinfo, '/Creator')
-            producer = self._get_string(docinfo, '/Producer')
-            creation_date = self._get_string(docinfo, '/CreationDate')
-            mod_date = self._get_string(docinfo, '/ModDate')
+            # The Info dictionary wins; XMP fills what it lacks
+            creator = info.get("Creator") or xmp["creator_tool"]
+            producer = info.get("Producer") or xmp["producer"]
+            creation_date = info.get("CreationDate") or xmp["create_date"]
+            mod_date = info.get("ModDate") or xmp["modify_date"]
             
             details = {
                 "creator": creator,
                 "producer": producer,
                 "creation_date": creation_date,
                 "mod_date": mod_date,
+                "xmp": {k: v for k, v in xmp.items() if v},
+                "reader": reader,
             }
             
-            # Check 1: Creator software
-            if creator:
-                creator_lower = creator.lower()
+            # Check 1: Creator software (Info and XMP may name different tools)
+            for tool in dict.fromkeys(filter(None, [creator, xmp["creator_tool"]])):
+                tool_lower = tool.lower()
                 
                 # Check for suspicious creators (image editors)
                 for suspicious in SUSPICIOUS_CREATORS:
-                    if suspicious in creator_lower:
-                        flags.append(f"CREATED_WITH_IMAGE_EDITOR: {creator}")
+                    if suspicious in tool_lower:
+                        flags.append(f"CREATED_WITH_IMAGE_EDITOR: {tool}")
                         score = min(score, DEFAULT_SCORES["major_issue"])
                         break
                 
                 # Bonus for trusted creators
-                for trusted in TRUSTED_CREATORS:
-                    if trusted in creator_lower:
-                        details["trusted_creator"] = True
-                        break
+                if tool == creator:
+                    for trusted in TRUSTED_CREATORS:
+                        if trusted in tool_lower:
+                            details["trusted_creator"] = True
+                            break
             
             # Check 2: Date consistency
             if creation_date and mod_date:
@@ -109,8 +124,22 @@ class MetadataAnalyzer:
                 flags.append("NO_CREATOR_INFO")
                 score = min(score, DEFAULT_SCORES["minor_issue"])
             
-            pdf.close()
-            
+            # Incremental updates (signatures are appended this way too).
+            # Counted only: the revisions layer diffs and scores them
+            updates = revisions[1:]
+            edits = [r for r in updates if not r.signed]
+            details["revisions"] = len(revisions)
+            details["incremental_updates"] = len(edits)
+            details["signed_updates"] = len(updates) - len(edits)
+            details["linearized"] = linearized
+        
+        except ImportError:
+            logger.warning("pikepdf not installed and the trailer reader failed, skipping metadata analysis")
+            return LayerResult(
+                name="metadata",
+                score=DEFAULT_SCORES["clean"],
+                flags=["ANALYZER_NOT_AVAILABLE"],
+            )
         except Exception as e:
             logger.warning(f"Metadata analysis failed: {e}")
             return LayerResult(
@@ -127,6 +156,25 @@ class MetadataAnalyzer:
             details=details,
         )
     
+    def _read_metadata(self, parsed: ParsedDocument) -> Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]], str]:
+        """(Info fields, XMP fields, reader used): the trailer first, pikepdf if it gives up."""
+        if self.fast_path:
+            try:
+                with parsed.buffer() as buffer:
+                    trailer = TrailerReader(buffer)
+                    info = trailer.info()
+                    packet = trailer.xmp()
+                return {k: info.get(k) for k in self.INFO_KEYS}, parse_xmp(packet), "trailer"
+            except PdfStructureError as e:
+                logger.debug(f"Trailer reader gave up ({e}), opening with pikepdf")
+        
+        with parsed.pikepdf() as pdf:
+            docinfo = pdf.docinfo
+            info = {k: self._get_string(docinfo, f"/{k}") for k in self.INFO_KEYS}
+            metadata = pdf.Root.get("/Metadata")
+            packet = metadata.read_bytes() if metadata is not None else None
+        return info, parse_xmp(packet), "pikepdf"
+    
     def _get_string(self, docinfo, key: str) -> Optional[str]:
         """Safely extract string from docinfo."""
         try:
@@ -137,7 +185,12 @@ class MetadataAnalyzer:
         return None
     
     def _parse_pdf_date(self, date_str: str) -> Optional[datetime]:
-        """Parse PDF date format (D:YYYYMMDDHHmmSS)."""
+        """Parse PDF date format (D:YYYYMMDDHHmmSS), or an XMP (ISO 8601) date."""
+        if len(date_str) >= 10 and date_str[4:5] == "-":
+            try:
+                return datetime.fromisoformat(date_str[:19])
+            except ValueError:
+                return None
         try:
             # Remove 'D:' prefix if present
             if date_str.startswith('D:'):
@@ -0,0 +1,367 @@
+"""
+Incremental Revision Analyzer.
+
+Checks for:
+- Text rewritten by an appended incremental update
+- Other visible page changes made by an update
+- Pages added or removed by an update
+- Form fields and annotations filled in by an update
+
+A genuine PDF with one text object swapped out in an appended update keeps
+its creator, fonts and page statistics, so every other layer sees the
+original. Diffing the revisions shows exactly what the update changed.
+"""
+
+import os
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+import numpy as np
+
+from ..contracts import LayerResult
+from ..context import FITZ_LOCK, DocumentSource, ParsedDocument, parsed_document
+from ..pdf_trailer import TrailerReader
+from ..rules import (
+    DEFAULT_SCORES,
+    REVISION_MAX_DIFFS,
+    REVISION_MAX_PAGES,
+    REVISION_MAX_REGIONS,
+    REVISION_DPI,
+    REVISION_SCAN_DPI,
+    REVISION_SCAN_CELL,
+    REVISION_REGION_MARGIN,
+    REVISION_PIXEL_THRESHOLD,
+    REVISION_VISIBLE_FRACTION,
+    REVISION_TEXT_EXAMPLE_CHARS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Object types an update may rewrite without touching any page
+_DOCUMENT_LEVEL_TYPES = {"/Catalog", "/Pages", "/XRef", "/ObjStm", "/Metadata", "/Sig"}
+
+
+class RevisionAnalyzer:
+    """
+    Diff each incremental update against the revision before it.
+    
+    The objects an update wrote come from its own cross-reference section,
+    so nothing is compared for pages it left alone. On the pages it did
+    touch, words are diffed between the two revisions; where the words are
+    the same the pages are rendered at REVISION_SCAN_DPI and compared pixel
+    by pixel instead. Only the changed regions are then rendered at
+    REVISION_DPI, on both revisions, to confirm the change is visible.
+    
+    Page content is rendered without annotations, which are compared on
+    their own: filling in a form is an update too, but a benign one.
+    Updates that add a signature are skipped.
+    
+    details["updates"] holds one entry per diffed update, with the objects
+    and pages it changed and the regions (page, bbox in points, words added
+    and removed, share of changed pixels).
+    
+    Environment:
+        DOCUMENT_REVISION_MAX_DIFFS  Latest updates diffed (default: 5)
+        DOCUMENT_REVISION_MAX_PAGES  Changed pages compared per update (default: 10)
+        DOCUMENT_REVISION_DPI        Render resolution for changed regions (default: 72)
+    """
+    
+    def __init__(
+        self,
+        max_diffs: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        dpi: Optional[int] = None,
+    ):
+        self.max_diffs = max_diffs or int(os.getenv("DOCUMENT_REVISION_MAX_DIFFS", str(REVISION_MAX_DIFFS)))
+        self.max_pages = max_pages or int(os.getenv("DOCUMENT_REVISION_MAX_PAGES", str(REVISION_MAX_PAGES)))
+        self.dpi = dpi or int(os.getenv("DOCUMENT_REVISION_DPI", str(REVISION_DPI)))
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument]) -> LayerResult:
+        """
+        Diff the incremental updates of a PDF.
+        
+        Accepts PDF bytes, a file path, or a shared ParsedDocument.
+        
+        Returns LayerResult with score and flags. Documents saved once
+        (a single revision) are not applicable, without any parsing.
+        """
+        try:
+            import fitz  # noqa: F401
+        except ImportError:
+            logger.warning("PyMuPDF not installed, skipping revision analysis")
+            return LayerResult(
+                name="revisions",
+                score=DEFAULT_SCORES["clean"],
+                flags=["ANALYZER_NOT_AVAILABLE"],
+            )
+        
+        flags = []
+        score = DEFAULT_SCORES["clean"]
+        details: Dict[str, Any] = {}
+        
+        try:
+            with parsed_document(source) as parsed:
+                revisions, linearized = parsed.revisions()
+                details["revisions"] = len(revisions)
+                details["linearized"] = linearized
+                
+                updates = []
+                first = max(1, len(revisions) - self.max_diffs)
+                for index in range(first, len(revisions)):
+                    revision = revisions[index]
+                    entry: Dict[str, Any] = {"revision": index + 1, "signed": revision.signed}
+                    if not revision.signed:
+                        # Views, not copies: both revisions are prefixes of the file.
+                        # The buffer stays mapped until the document is closed
+                        with parsed.buffer() as buffer:
+                            changed = TrailerReader(buffer).section_objects(revision.startxref)
+                            view = memoryview(buffer)
+                        try:
+                            entry.update(self._diff_update(
+                                view[:revisions[index - 1].end],
+                                view[:revision.end],
+                                set(changed),
+                            ))
+                        finally:
+                            view.release()
+                    updates.append(entry)
+            
+            details["updates_skipped"] = max(0, len(revisions) - 1 - self.max_diffs)
+            details["updates"] = updates
+            
+            # Saved once (or only signed since): nothing was diffed
+            applicable = any(not update["signed"] for update in updates)
+            
+            text_regions = hidden_regions = other_regions = 0
+            pages_changed = annotations_changed = 0
+            for update in updates:
+                for region in update.get("regions", []):
+                    if not region["visible"]:
+                        if region["text_added"] or region["text_removed"]:
+                            hidden_regions += 1
+                    elif region["text_added"] or region["text_removed"]:
+                        text_regions += 1
+                    else:
+                        other_regions += 1
+                pages_changed += abs(update.get("pages_added", 0))
+                annotations_changed += len(update.get("annotation_pages", []))
+            
+            # Check 1: Visible text rewritten after the document was saved
+            if text_regions:
+                flags.append(f"REVISION_TEXT_CHANGED: {text_regions}")
+                score = min(score, DEFAULT_SCORES["major_issue"])
+            
+            # Check 2: Other visible changes (images, drawings, removed text)
+            if other_regions:
+                flags.append(f"REVISION_CONTENT_CHANGED: {other_regions}")
+                score = min(score, DEFAULT_SCORES["moderate_issue"])
+            
+            # Check 3: Pages added or removed
+            if pages_changed:
+                flags.append(f"REVISION_PAGES_CHANGED: {pages_changed}")
+                score = min(score, DEFAULT_SCORES["moderate_issue"])
+            
+            # Check 4: Text that changed without changing the rendering
+            if hidden_regions:
+                flags.append(f"REVISION_HIDDEN_TEXT_CHANGED: {hidden_regions}")
+                score = min(score, DEFAULT_SCORES["minor_issue"])
+            
+            # Check 5: Annotations / form fields (expected for filled-in forms)
+            if annotations_changed:
+                flags.append(f"REVISION_ANNOTATIONS_CHANGED: {annotations_changed}")
+                score = min(score, DEFAULT_SCORES["minor_issue"])
+        
+        except Exception as e:
+            logger.warning(f"Revision analysis failed: {e}")
+            return LayerResult(
+                name="revisions",
+                score=DEFAULT_SCORES["minor_issue"],
+                flags=["ANALYSIS_ERROR"],
+                details={"error": str(e)},
+            )
+        
+        return LayerResult(
+            name="revisions",
+            score=score,
+            flags=flags,
+            details=details,
+            applicable=applicable,
+        )
+    
+    def _diff_update(self, before: memoryview, after: memoryview, changed: Set[int]) -> Dict[str, Any]:
+        """Objects, pages and regions one update changed."""
+        import fitz
+        
+        # Documents of our own, but PyMuPDF calls still take turns
+        with FITZ_LOCK:
+            old = fitz.open(stream=before, filetype="pdf")
+            new = fitz.open(stream=after, filetype="pdf")
+            try:
+                document_level = {num for num in changed if self._is_document_level(new, num)}
+                content_pages, annotation_pages = self._changed_pages(old, new, changed)
+                
+                regions = []
+                for page_num in content_pages[:self.max_pages]:
+                    if page_num < len(old):
+                        regions.extend(self._page_regions(old, new, page_num))
+                
+                return {
+                    "objects_changed": len(changed),
+                    "document_level_objects": len(document_level),
+                    "pages_changed": [num + 1 for num in content_pages],
+                    "pages_compared": min(len(content_pages), self.max_pages),
+                    "pages_added": len(new) - len(old),
+                    "annotation_pages": [num + 1 for num in annotation_pages],
+                    "regions": regions,
+                }
+            finally:
+                old.close()
+                new.close()
+    
+    def _is_document_level(self, doc, num: int) -> bool:
+        if num >= doc.xref_length():
+            return False
+        kind, value = doc.xref_get_key(num, "Type")
+        return kind == "name" and value in _DOCUMENT_LEVEL_TYPES
+    
+    def _changed_pages(self, old, new, changed: Set[int]) -> Tuple[List[int], List[int]]:
+        """(pages whose content objects changed, pages whose annotations changed)."""
+        content_pages = []
+        annotation_pages = []
+        for page_num in range(len(new)):
+            page = new[page_num]
+            annots = {xref for xref, *_ in page.annot_xrefs()}
+            
+            objects = {page.xref, *page.get_contents()}
+            kind, value = new.xref_get_key(page.xref, "Resources")
+            if kind == "xref":
+                objects.add(int(value.split()[0]))
+            objects.update(item[0] for item in page.get_images(full=True))
+            objects.update(item[0] for item in page.get_xobjects())
+            objects.update(item[0] for item in page.get_fonts(full=True))
+            
+            if page_num >= len(old):
+                content_pages.append(page_num)
+            elif objects & changed:
+                content_pages.append(page_num)
+            
+            old_annots = {xref for xref, *_ in old[page_num].annot_xrefs()} if page_num < len(old) else set()
+            if annots & changed or annots != old_annots:
+                annotation_pages.append(page_num)
+        return content_pages, annotation_pages
+    
+    def _page_regions(self, old, new, page_num: int) -> List[Dict[str, Any]]:
+        """Changed regions of one page: word diff first, pixel scan as fallback."""
+        import fitz
+        
+        old_page, new_page = old[page_num], new[page_num]
+        old_words = self._words(old_page)
+        new_words = self._words(new_page)
+        added = [new_words[key] for key in new_words.keys() - old_words.keys()]
+        removed = [old_words[key] for key in old_words.keys() - new_words.keys()]
+        
+        if added or removed:
+            rects = [fitz.Rect(word[:4]) for word in added + removed]
+        else:
+            rects = self._scan_rects(old_page, new_page)
+        
+        regions = []
+        for rect in self._merge(rects)[:REVISION_MAX_REGIONS]:
+            clip = (rect + (-REVISION_REGION_MARGIN, -REVISION_REGION_MARGIN,
+                            REVISION_REGION_MARGIN, REVISION_REGION_MARGIN)) & new_page.rect
+            fraction = self._changed_fraction(old_page, new_page, clip)
+            regions.append({
+                "page": page_num + 1,
+                "bbox": [round(v, 1) for v in rect],
+                "text_added": self._text_in(added, rect),
+                "text_removed": self._text_in(removed, rect),
+                "changed_fraction": round(fraction, 4),
+                "visible": fraction >= REVISION_VISIBLE_FRACTION,
+            })
+        return regions
+    
+    def _words(self, page) -> Dict[Tuple, tuple]:
+        """Words keyed by text and position (to 0.1 pt)."""
+        return {
+            (word[4], round(word[0], 1), round(word[1], 1)): word
+            for word in page.get_text("words")
+        }
+    
+    def _scan_rects(self, old_page, new_page) -> list:
+        """Changed REVISION_SCAN_CELL cells of a low-resolution page render."""
+        import fitz
+        
+        if old_page.rect != new_page.rect:
+            return [new_page.rect]
+        old_gray = self._render(old_page, REVISION_SCAN_DPI)
+        new_gray = self._render(new_page, REVISION_SCAN_DPI)
+        if old_gray.shape != new_gray.shape:
+            return [new_page.rect]
+        
+        changed = np.abs(old_gray.astype(np.int16) - new_gray) > REVISION_PIXEL_THRESHOLD
+        cell = REVISION_SCAN_CELL
+        h, w = changed.shape
+        rows, cols = -(-h // cell), -(-w // cell)
+        padded = np.zeros((rows * cell, cols * cell), dtype=bool)
+        padded[:h, :w] = changed
+        cells = padded.reshape(rows, cell, cols, cell).any(axis=(1, 3))
+        
+        scale = 72.0 / REVISION_SCAN_DPI
+        x0, y0 = new_page.rect.x0, new_page.rect.y0
+        return [
+            fitz.Rect(
+                x0 + col * cell * scale, y0 + row * cell * scale,
+                x0 + (col + 1) * cell * scale, y0 + (row + 1) * cell * scale,
+            )
+            for row, col in zip(*np.nonzero(cells))
+        ]
+    
+    def _merge(self, rects: list) -> list:
+        """Union rects closer than REVISION_REGION_MARGIN, largest first."""
+        merged = []
+        for rect in rects:
+            rect = +rect
+            grown = True
+            while grown:
+                grown = False
+                for other in merged:
+                    near = other + (-REVISION_REGION_MARGIN, -REVISION_REGION_MARGIN,
+                                    REVISION_REGION_MARGIN, REVISION_REGION_MARGIN)
+                    if near.intersects(rect):
+                        merged.remove(other)
+                        rect |= other
+                        grown = True
+                        break
+            merged.append(rect)
+        return sorted(merged, key=lambda r: r.width * r.height, reverse=True)
+    
+    def _changed_fraction(self, old_page, new_page, clip) -> float:
+        """Share of pixels in clip that differ between the two revisions."""
+        if clip.is_empty:
+            return 0.0
+        old_gray = self._render(old_page, self.dpi, clip)
+        new_gray = self._render(new_page, self.dpi, clip)
+        if old_gray.shape != new_gray.shape or old_gray.size == 0:
+            return 1.0
+        changed = np.abs(old_gray.astype(np.int16) - new_gray) > REVISION_PIXEL_THRESHOLD
+        return float(np.count_nonzero(changed)) / changed.size
+    
+    def _render(self, page, dpi: int, clip=None) -> np.ndarray:
+        """Grayscale page content (no annotations) as a uint8 array."""
+        import fitz
+        
+        zoom = dpi / 72.0
+        pix = page.get_pixmap(
+            matrix=fitz.Matrix(zoom, zoom),
+            colorspace=fitz.csGRAY,
+            clip=clip,
+            annots=False,
+        )
+        return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+    
+    def _text_in(self, words: list, rect) -> str:
+        """Words inside rect in reading order, truncated for details."""
+        inside = sorted(
+            (word for word in words if rect.contains(word[:4])),
+            key=lambda word: (round(word[3], 0), word[0]),
+        )
+        return " ".join(word[4] for word in inside)[:REVISION_TEXT_EXAMPLE_CHARS]
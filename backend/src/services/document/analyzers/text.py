@@ -8,21 +8,84 @@ Validates:
 - Basic sanity checks
 """
 
+import os
 import re
 import logging
-from io import BytesIO
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple, Union
 
 from ..contracts import LayerResult
+from ..context import DocumentSource, ParsedDocument, parsed_document
 from ..rules import (
     VALID_PAN_ENTITY_TYPES,
     AADHAAR_PATTERN,
     DATE_PATTERNS,
     DEFAULT_SCORES,
+    TEXT_BACKEND,
+    TEXT_MAX_PAGES,
+    TEXT_MAX_CHARS,
+    TEXT_CHECKS,
 )
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; every pattern is applied page by page
+PAN_CANDIDATE_RE = re.compile(r'[A-Z]{5}[0-9]{4}[A-Z]')
+AADHAAR_CANDIDATE_RE = re.compile(r'\b\d{12}\b')
+AADHAAR_RE = re.compile(AADHAAR_PATTERN)
+DATE_SLASH_RE = re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}')
+DATE_DASH_RE = re.compile(r'\d{1,2}-\d{1,2}-\d{2,4}')
+
+
+class _TextStats:
+    """
+    Per-page accumulator for the text checks.
+    
+    Pages are joined with "\\n" and no pattern can match across a newline,
+    so per-page results add up to exactly what one pass over the full text
+    would give.
+    """
+    
+    def __init__(self, checks: List[str]):
+        self.checks = set(checks)
+        self.pan_flags: List[str] = []
+        self.pan_valid = 0
+        self.aadhaar_flags: List[str] = []
+        self.aadhaar_valid = 0
+        self.dates_slash = 0
+        self.dates_dash = 0
+        self.char_count = 0
+        # Offsets of the first/last non-whitespace char (len(full_text.strip()))
+        self._first: Optional[int] = None
+        self._last = 0
+    
+    @property
+    def stripped_length(self) -> int:
+        return 0 if self._first is None else self._last - self._first
+    
+    def add_page(self, analyzer: "TextAnalyzer", text: str) -> None:
+        stripped = text.strip()
+        if stripped:
+            lead = len(text) - len(text.lstrip())
+            if self._first is None:
+                self._first = self.char_count + lead
+            self._last = self.char_count + lead + len(stripped)
+        self.char_count += len(text) + 1  # + page separator
+        
+        if "pan" in self.checks:
+            pan_flags, pan_valid = analyzer._check_pan_format(text)
+            self.pan_flags.extend(pan_flags)
+            self.pan_valid += pan_valid
+        
+        if "aadhaar" in self.checks:
+            aadhaar_flags, aadhaar_valid = analyzer._check_aadhaar_format(text)
+            self.aadhaar_flags.extend(aadhaar_flags)
+            self.aadhaar_valid += aadhaar_valid
+        
+        if "dates" in self.checks:
+            slash, dash = analyzer._count_dates(text)
+            self.dates_slash += slash
+            self.dates_dash += dash
+
 
 class TextAnalyzer:
     """
@@ -30,17 +93,45 @@ class TextAnalyzer:
     
     NOTE: This ONLY validates format, NOT existence.
     Existence checking is done by Surepass in Phase 2.
+    
+    Text is extracted and checked one page at a time, within a page and
+    character budget; the full document text is never built.
+    
+    Environment:
+        DOCUMENT_TEXT_BACKEND    pymupdf | pdfplumber (default: pymupdf;
+                                 falls back to pdfplumber)
+        DOCUMENT_TEXT_MAX_PAGES  Pages checked, 0 = all (default: 200)
+        DOCUMENT_TEXT_MAX_CHARS  Characters checked, 0 = all (default: 2000000)
     """
     
-    def analyze(self, file_bytes: bytes, doc_type: str = "other") -> LayerResult:
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ):
+        self.backend = (backend or os.getenv("DOCUMENT_TEXT_BACKEND", TEXT_BACKEND)).lower()
+        if self.backend not in ("pymupdf", "pdfplumber"):
+            logger.warning(f"Unknown text backend {self.backend} - using pdfplumber")
+            self.backend = "pdfplumber"
+        self.max_pages = max_pages if max_pages is not None else int(
+            os.getenv("DOCUMENT_TEXT_MAX_PAGES", str(TEXT_MAX_PAGES))
+        )
+        self.max_chars = max_chars if max_chars is not None else int(
+            os.getenv("DOCUMENT_TEXT_MAX_CHARS", str(TEXT_MAX_CHARS))
+        )
+    
+    def analyze(self, source: Union[DocumentSource, ParsedDocument], doc_type: str = "other") -> LayerResult:
         """
         Analyze text content of PDF.
         
+        Accepts PDF bytes, a file path, or a shared ParsedDocument.
+        The checks run are chosen by doc_type (rules.TEXT_CHECKS).
+        
         Returns LayerResult with score and flags.
         """
-        try:
-            import pdfplumber
-        except ImportError:
+        backend = self._available_backend()
+        if backend is None:
             logger.warning("pdfplumber not installed, skipping text analysis")
             return LayerResult(
                 name="text",
@@ -51,33 +142,34 @@ class TextAnalyzer:
         flags = []
         score = DEFAULT_SCORES["clean"]
         details = {}
+        checks = TEXT_CHECKS.get(doc_type, TEXT_CHECKS["default"])
         
         try:
-            with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-                full_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text() or ""
-                    full_text += page_text + "\n"
-                
-                details["char_count"] = len(full_text)
-                details["page_count"] = len(pdf.pages)
+            with parsed_document(source) as parsed:
+                stats, page_count, pages_read, backend = self._extract(parsed, backend, checks)
+            
+            details["char_count"] = stats.char_count
+            details["page_count"] = page_count
+            details["pages_analyzed"] = pages_read
+            details["truncated"] = pages_read < page_count or (
+                self.max_chars > 0 and stats.char_count >= self.max_chars
+            )
+            details["backend"] = backend
+            details["checks"] = list(checks)
             
             # Check 1: PAN format validation
-            pan_flags, pan_valid_count = self._check_pan_format(full_text)
-            flags.extend(pan_flags)
-            details["pan_found"] = pan_valid_count
+            flags.extend(stats.pan_flags)
+            details["pan_found"] = stats.pan_valid
             
             # Check 2: Aadhaar format validation  
-            aadhaar_flags, aadhaar_valid_count = self._check_aadhaar_format(full_text)
-            flags.extend(aadhaar_flags)
-            details["aadhaar_found"] = aadhaar_valid_count
+            flags.extend(stats.aadhaar_flags)
+            details["aadhaar_found"] = stats.aadhaar_valid
             
             # Check 3: Date format consistency
-            date_flags = self._check_date_consistency(full_text)
-            flags.extend(date_flags)
+            flags.extend(self._check_date_consistency(stats.dates_slash, stats.dates_dash))
             
             # Check 4: Empty or too short
-            if len(full_text.strip()) < 50:
+            if "length" in checks and stats.stripped_length < 50:
                 flags.append("MINIMAL_TEXT_CONTENT")
                 score = min(score, DEFAULT_SCORES["minor_issue"])
             
@@ -107,6 +199,71 @@ class TextAnalyzer:
             details=details,
         )
     
+    def _available_backend(self) -> Optional[str]:
+        """Configured backend if importable, else pdfplumber, else None."""
+        candidates = [self.backend] + (["pdfplumber"] if self.backend != "pdfplumber" else [])
+        for name in candidates:
+            try:
+                __import__("fitz" if name == "pymupdf" else "pdfplumber")
+                return name
+            except ImportError:
+                continue
+        return None
+    
+    def _extract(
+        self,
+        parsed: ParsedDocument,
+        backend: str,
+        checks: List[str],
+    ) -> Tuple[_TextStats, int, int, str]:
+        """
+        Stream pages through the checks -> (stats, page_count, pages_read, backend).
+        
+        If PyMuPDF cannot open the document, pdfplumber is tried instead.
+        """
+        if backend == "pymupdf":
+            try:
+                with parsed.fitz() as doc:
+                    page_count = len(doc)
+            except Exception as e:
+                logger.info(f"PyMuPDF text extraction unavailable ({e}), using pdfplumber")
+                backend = "pdfplumber"
+        
+        stats = _TextStats(checks)
+        pages_read = 0
+        
+        if backend == "pymupdf":
+            for text in self._pymupdf_pages(parsed, page_count):
+                stats.add_page(self, text)
+                pages_read += 1
+                if self._budget_spent(stats, pages_read):
+                    break
+            return stats, page_count, pages_read, backend
+        
+        with parsed.pdfplumber() as pdf:
+            page_count = len(pdf.pages)
+            for page in pdf.pages:
+                text = page.extract_text() or ""
+                # Drop the parsed layout objects before the next page
+                page.close()
+                stats.add_page(self, text)
+                pages_read += 1
+                if self._budget_spent(stats, pages_read):
+                    break
+        return stats, page_count, pages_read, backend
+    
+    def _pymupdf_pages(self, parsed: ParsedDocument, page_count: int) -> Iterator[str]:
+        """Page texts; the shared PyMuPDF handle is held per page, not for the loop."""
+        for page_num in range(page_count):
+            with parsed.fitz() as doc:
+                text = doc[page_num].get_text("text")
+            yield text
+    
+    def _budget_spent(self, stats: _TextStats, pages_read: int) -> bool:
+        if self.max_pages > 0 and pages_read >= self.max_pages:
+            return True
+        return self.max_chars > 0 and stats.char_count >= self.max_chars
+    
     def _check_pan_format(self, text: str) -> Tuple[List[str], int]:
         """
         Check PAN format (not existence).
@@ -118,8 +275,7 @@ class TextAnalyzer:
         valid_count = 0
         
         # Find all PAN-like patterns
-        pan_pattern = r'[A-Z]{5}[0-9]{4}[A-Z]'
-        pans = re.findall(pan_pattern, text.upper())
+        pans = PAN_CANDIDATE_RE.findall(text.upper())
         
         for pan in pans:
             # Check 4th character (entity type)
@@ -140,17 +296,21 @@ class TextAnalyzer:
         valid_count = 0
         
         # Find 12-digit sequences
-        aadhaar_like = re.findall(r'\b\d{12}\b', text)
+        aadhaar_like = AADHAAR_CANDIDATE_RE.findall(text)
         
         for num in aadhaar_like:
-            if re.match(AADHAAR_PATTERN, num):
+            if AADHAAR_RE.match(num):
                 valid_count += 1
             elif num[0] in '01':
                 flags.append("INVALID_AADHAAR_FORMAT: starts with 0/1")
         
         return flags, valid_count
     
-    def _check_date_consistency(self, text: str) -> List[str]:
+    def _count_dates(self, text: str) -> Tuple[int, int]:
+        """Count DD/MM/YYYY-style and DD-MM-YYYY-style dates."""
+        return len(DATE_SLASH_RE.findall(text)), len(DATE_DASH_RE.findall(text))
+    
+    def _check_date_consistency(self, dates_slash: int, dates_dash: int) -> List[str]:
         """
         Check date format consistency.
         
@@ -158,12 +318,8 @@ class TextAnalyzer:
         """
         flags = []
         
-        dates_slash = re.findall(r'\d{1,2}/\d{1,2}/\d{2,4}', text)
-        dates_dash = re.findall(r'\d{1,2}-\d{1,2}-\d{2,4}', text)
-        
         # Both formats used = potential splicing
         if dates_slash and dates_dash:
-            if len(dates_slash) > 0 and len(dates_dash) > 0:
-                flags.append("INCONSISTENT_DATE_FORMATS")
+            flags.append("INCONSISTENT_DATE_FORMATS")
         
         return flags
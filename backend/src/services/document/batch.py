@@ -0,0 +1,95 @@
+"""
+Batch document analysis.
+
+Fans a set of spooled documents out across the DocumentAnalysisExecutor and
+yields each outcome as soon as it finishes (completion order, not input
+order). At most DOCUMENT_BATCH_CONCURRENCY documents are submitted at a
+time, so a large batch never floods the shared queue; a document that still
+meets a full queue is retried before it is reported as busy.
+
+Environment:
+    DOCUMENT_BATCH_CONCURRENCY  Documents in flight per batch (default: 4)
+    DOCUMENT_BATCH_MAX_FILES    Largest accepted batch (default: 500)
+"""
+
+import os
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from .contracts import DocumentAnalysisResult
+from .executor import (
+    get_document_executor,
+    DocumentAnalysisBusyError,
+    DocumentAnalysisTimeoutError,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = int(os.getenv("DOCUMENT_BATCH_CONCURRENCY", "4"))
+BATCH_MAX_FILES = int(os.getenv("DOCUMENT_BATCH_MAX_FILES", "500"))
+
+# Retries when the shared queue is full (other requests are using it)
+BUSY_RETRIES = 3
+BUSY_RETRY_DELAY = 1.0
+
+
+@dataclass
+class BatchItem:
+    """One document in a batch."""
+    index: int
+    filename: str
+    path: str
+    content_hash: str
+    document_type: str
+    candidate_id: int
+    verification_id: Optional[int] = None
+    file_format: str = "pdf"  # Sniffed: pdf / jpeg / png
+
+
+@dataclass
+class BatchOutcome:
+    """Result (or error) for one BatchItem."""
+    item: BatchItem
+    result: Optional[DocumentAnalysisResult] = None
+    error: Optional[str] = None
+
+
+async def _analyze_item(item: BatchItem, slots: asyncio.Semaphore) -> BatchOutcome:
+    executor = get_document_executor()
+    async with slots:
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                result = await executor.analyze(
+                    item.path, item.document_type, content_hash=item.content_hash
+                )
+                return BatchOutcome(item, result=result)
+            except DocumentAnalysisBusyError:
+                if attempt == BUSY_RETRIES:
+                    return BatchOutcome(item, error="busy")
+                await asyncio.sleep(BUSY_RETRY_DELAY * (attempt + 1))
+            except DocumentAnalysisTimeoutError:
+                return BatchOutcome(item, error="timeout")
+            except Exception as e:
+                logger.error(f"Batch analysis failed for {item.filename}: {e}")
+                return BatchOutcome(item, error="analysis_failed")
+
+
+async def analyze_batch(
+    items: List[BatchItem],
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[BatchOutcome]:
+    """
+    Analyze every item, yielding outcomes as they complete.
+
+    Closing the iterator early cancels the documents not yet finished.
+    """
+    slots = asyncio.Semaphore(concurrency or BATCH_CONCURRENCY)
+    tasks = [asyncio.ensure_future(_analyze_item(item, slots)) for item in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
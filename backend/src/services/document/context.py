@@ -0,0 +1,228 @@
+"""
+Shared parsed-document context for the analyzer layers.
+
+Each PDF library (PyMuPDF, pikepdf, pdfplumber) is opened at most once per
+document, lazily, by whichever layer needs it first. Access goes through a
+per-library lock because none of the three handles are safe to use from
+several threads at once.
+
+PyMuPDF is not thread-safe even across documents (it keeps one global
+context), so its lock is FITZ_LOCK, shared by the whole process and by
+layers that open documents of their own (revisions). The PyMuPDF layers of
+a wave take turns; only their work outside PyMuPDF (NumPy on rendered
+pixels) overlaps with the other layers. A layer abandoned at its timeout
+keeps the lock until it finishes, and later PyMuPDF layers wait for it.
+
+The source is either PDF bytes or a path. Opening by path lets PyMuPDF read
+pages on demand and pikepdf memory-map the file, so a spooled upload is
+never copied into memory.
+
+JPEG and PNG uploads are recognised by their magic bytes (sniff_format) and
+opened with Pillow through the image() handle instead.
+
+buffer() gives the raw file, memory-mapped when it is a path, for layers
+that read a few structures directly (pdf_trailer.py).
+
+Usage:
+    parsed = ParsedDocument(path_or_bytes)
+    with parsed.fitz() as doc:
+        ...
+    parsed.close()
+"""
+
+import os
+import mmap
+import logging
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# PDF bytes or a filesystem path
+DocumentSource = Union[bytes, str, "os.PathLike[str]"]
+
+# Formats the analysis pipeline understands
+SUPPORTED_FORMATS = ("pdf", "jpeg", "png")
+
+# Stored file extension per format
+FORMAT_EXTENSIONS = {"pdf": "pdf", "jpeg": "jpg", "png": "png"}
+
+UNSUPPORTED_FORMAT_MESSAGE = "Only PDF, JPEG and PNG files are supported"
+
+# PDF readers accept a header anywhere in the first 1KB
+_SNIFF_BYTES = 1024
+
+# Every PyMuPDF call in the process (see module docstring)
+FITZ_LOCK = threading.Lock()
+
+
+def sniff_format(source: DocumentSource) -> str:
+    """pdf / jpeg / png from the file's magic bytes, else "unknown"."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        head = bytes(source[:_SNIFF_BYTES])
+    else:
+        with open(source, "rb") as f:
+            head = f.read(_SNIFF_BYTES)
+
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if b"%PDF-" in head:
+        return "pdf"
+    return "unknown"
+
+
+class ParsedDocument:
+    """Lazily-opened, lock-guarded document handles shared by all layers."""
+
+    def __init__(self, source: DocumentSource):
+        self.source = source
+        self.is_path = not isinstance(source, (bytes, bytearray, memoryview))
+        self._locks: Dict[str, threading.Lock] = {
+            "fitz": FITZ_LOCK,
+            "pikepdf": threading.Lock(),
+            "pdfplumber": threading.Lock(),
+            "image": threading.Lock(),
+            "buffer": threading.Lock(),
+        }
+        self._handles: Dict[str, Any] = {}
+        self._errors: Dict[str, Exception] = {}
+        self._closed = False
+        self._format: Optional[str] = None
+        self._revisions: Optional[Tuple[list, bool]] = None
+
+    @property
+    def format(self) -> str:
+        """Sniffed format; "unknown" is analyzed as PDF, as before sniffing."""
+        if self._format is None:
+            try:
+                self._format = sniff_format(self.source)
+            except OSError:
+                self._format = "unknown"
+        return self._format
+
+    @property
+    def is_image(self) -> bool:
+        return self.format in ("jpeg", "png")
+
+    def _open(self, name: str, opener: Callable[[], Any]) -> Any:
+        """Open once; re-raise the original error on later attempts (lock held)."""
+        if self._closed:
+            raise RuntimeError("ParsedDocument is closed")
+        if name in self._errors:
+            raise self._errors[name]
+        if name not in self._handles:
+            try:
+                self._handles[name] = opener()
+            except Exception as e:
+                self._errors[name] = e
+                raise
+        return self._handles[name]
+
+    @contextmanager
+    def fitz(self) -> Iterator[Any]:
+        """PyMuPDF document (shared by the font and forensics layers), under FITZ_LOCK."""
+        import fitz
+        with self._locks["fitz"]:
+            yield self._open("fitz", lambda: (
+                fitz.open(os.fspath(self.source), filetype="pdf") if self.is_path
+                else fitz.open(stream=self.source, filetype="pdf")
+            ))
+
+    @contextmanager
+    def pikepdf(self) -> Iterator[Any]:
+        """pikepdf Pdf."""
+        import pikepdf
+        with self._locks["pikepdf"]:
+            yield self._open("pikepdf", lambda: pikepdf.open(
+                os.fspath(self.source) if self.is_path else BytesIO(self.source)
+            ))
+
+    @contextmanager
+    def pdfplumber(self) -> Iterator[Any]:
+        """pdfplumber PDF."""
+        import pdfplumber
+        with self._locks["pdfplumber"]:
+            yield self._open("pdfplumber", lambda: pdfplumber.open(
+                os.fspath(self.source) if self.is_path else BytesIO(self.source)
+            ))
+
+    @contextmanager
+    def buffer(self) -> Iterator[Any]:
+        """Raw file contents: a read-only mmap for paths, else the bytes."""
+        with self._locks["buffer"]:
+            yield self._open("buffer", self._map)
+
+    def revisions(self) -> Tuple[list, bool]:
+        """(revisions, linearized) from pdf_trailer.scan_revisions, scanned once."""
+        from .pdf_trailer import scan_revisions
+        with self.buffer() as buffer:
+            if self._revisions is None:
+                self._revisions = scan_revisions(buffer)
+        return self._revisions
+
+    def _map(self) -> Any:
+        if not self.is_path:
+            return bytes(self.source)
+        with open(self.source, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @contextmanager
+    def image(self) -> Iterator[Any]:
+        """Pillow Image for JPEG/PNG uploads (header and metadata reads)."""
+        from PIL import Image
+        with self._locks["image"]:
+            yield self._open("image", lambda: self._open_image(Image))
+
+    @contextmanager
+    def decode_image(self) -> Iterator[Any]:
+        """
+        A private Pillow Image for decoding pixels.
+
+        draft() and load() change an Image in place, so layers that decode
+        get their own (no lock needed) instead of the shared handle.
+        """
+        from PIL import Image
+        if self._closed:
+            raise RuntimeError("ParsedDocument is closed")
+        img = self._open_image(Image)
+        try:
+            yield img
+        finally:
+            img.close()
+
+    def _open_image(self, image_module) -> Any:
+        return image_module.open(os.fspath(self.source) if self.is_path else BytesIO(self.source))
+
+    def close(self) -> None:
+        """Close every opened handle. Safe to call more than once."""
+        for name, lock in self._locks.items():
+            with lock:
+                handle = self._handles.pop(name, None)
+                if handle is not None and hasattr(handle, "close"):
+                    try:
+                        handle.close()
+                    except Exception as e:
+                        logger.debug(f"Closing {name} handle failed: {e}")
+        self._closed = True
+
+
+@contextmanager
+def parsed_document(source: Union[DocumentSource, ParsedDocument]) -> Iterator[ParsedDocument]:
+    """
+    Accept raw bytes, a path, or a shared ParsedDocument.
+
+    Handles opened here for bytes or a path are closed on exit; a shared
+    ParsedDocument is left open for the other layers (its owner closes it).
+    """
+    if isinstance(source, ParsedDocument):
+        yield source
+        return
+    parsed = ParsedDocument(source)
+    try:
+        yield parsed
+    finally:
+        parsed.close()
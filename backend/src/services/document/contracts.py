@@ -34,6 +34,8 @@ class LayerResult:
     score: float  # 0-100
     flags: List[str] = field(default_factory=list)
     details: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, Any] = field(default_factory=dict)  # See instrumentation.py
+    applicable: bool = True  # False: nothing to examine, left out of the weighted score
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -41,6 +43,28 @@ class LayerResult:
             "score": round(self.score, 1),
             "flags": self.flags,
         }
+    
+    def to_cache(self) -> Dict[str, Any]:
+        """Lossless form for the result cache (includes details)."""
+        return {
+            "name": self.name,
+            "score": self.score,
+            "flags": self.flags,
+            "details": self.details,
+            "timings": self.timings,
+            "applicable": self.applicable,
+        }
+    
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any]) -> "LayerResult":
+        return cls(
+            name=data["name"],
+            score=data["score"],
+            flags=list(data.get("flags", [])),
+            details=dict(data.get("details", {})),
+            timings=dict(data.get("timings", {})),
+            applicable=data.get("applicable", True),
+        )
 
 
 @dataclass
@@ -54,6 +78,7 @@ class DocumentAnalysisResult:
     analyzed_at: Optional[datetime] = None
     document_type: Optional[DocumentType] = None
     page_count: int = 0
+    timings: Dict[str, Any] = field(default_factory=dict)  # total_ms, cpu_ms, layers
     
     def to_hr_view(self) -> Dict[str, Any]:
         """Return HR-safe summary (no raw forensic data)."""
@@ -76,4 +101,27 @@ class DocumentAnalysisResult:
             "document_type": self.document_type.value if self.document_type else None,
             "page_count": self.page_count,
             "analyzed_at": self.analyzed_at.isoformat() if self.analyzed_at else None,
+            "timings": self.timings,
         }
+    
+    def to_cache(self) -> Dict[str, Any]:
+        """Lossless form for the result cache (round-trips via from_cache)."""
+        audit = self.to_audit()
+        audit["layers"] = [lr.to_cache() for lr in self.layer_results]
+        return audit
+    
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any]) -> "DocumentAnalysisResult":
+        analyzed_at = data.get("analyzed_at")
+        document_type = data.get("document_type")
+        return cls(
+            legitimacy_score=data["legitimacy_score"],
+            status=DocumentStatus(data["status"]),
+            flags=list(data.get("flags", [])),
+            breakdown=dict(data.get("breakdown", {})),
+            layer_results=[LayerResult.from_cache(lr) for lr in data.get("layers", [])],
+            analyzed_at=datetime.fromisoformat(analyzed_at) if analyzed_at else None,
+            document_type=DocumentType(document_type) if document_type else None,
+            page_count=data.get("page_count", 0),
+            timings=dict(data.get("timings", {})),
+        )
@@ -0,0 +1,238 @@
+"""
+Process-pool executor for document analysis.
+
+Document forensics (pikepdf + PyMuPDF + pdfplumber + NumPy) is CPU-bound, so
+it runs in a bounded ProcessPoolExecutor instead of on the event loop.
+
+- Bounded queue: submissions beyond max_queue are rejected immediately
+- Per-job timeout: the caller stops waiting; the worker slot is only freed
+  when the job actually finishes, so the queue bound stays honest
+- DOCUMENT_ANALYSIS_WORKERS=0 runs analysis in a thread instead (dev/tests)
+- Identical files are answered from the result cache without taking a slot
+  (see result_cache.py)
+- Every fresh result is added to the per-layer latency histograms
+  (instrumentation.py); cache hits are marked in result.timings instead
+- Pass a file path rather than bytes to avoid pickling the document into
+  the worker; the worker opens the file itself
+- A job that abandoned a layer at DOCUMENT_LAYER_TIMEOUT retires the pool:
+  the abandoned layer may still hold the process-wide PyMuPDF lock
+  (context.FITZ_LOCK) and would stall every later document in that
+  process. Jobs already submitted finish on the old pool, new jobs start
+  a fresh one, and each old process exits once its work (including the
+  abandoned layer) is done
+
+Environment:
+    DOCUMENT_ANALYSIS_WORKERS       Worker processes (default: min(4, CPU count))
+    DOCUMENT_ANALYSIS_MAX_QUEUE     Max jobs queued or running (default: 32)
+    DOCUMENT_ANALYSIS_TIMEOUT       Seconds to wait for one job (default: 60)
+    DOCUMENT_ANALYSIS_START_METHOD  multiprocessing start method (default: spawn)
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from .context import DocumentSource
+from .contracts import DocumentAnalysisResult
+from .result_cache import get_result_cache, content_hash as hash_content
+from .instrumentation import get_layer_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentAnalysisBusyError(Exception):
+    """Raised when the analysis queue is full."""
+    pass
+
+
+class DocumentAnalysisTimeoutError(Exception):
+    """Raised when a job exceeds DOCUMENT_ANALYSIS_TIMEOUT."""
+    pass
+
+
+def _analyze_in_worker(source: DocumentSource, doc_type: str) -> DocumentAnalysisResult:
+    """Worker entry point - each process keeps its own service singleton."""
+    from .service import get_document_service
+    return get_document_service().analyze(source, doc_type)
+
+
+def _warm_worker() -> None:
+    """Import analyzers once per worker process, not on the first job."""
+    from .service import get_document_service
+    get_document_service()
+
+
+class DocumentAnalysisExecutor:
+    """
+    Bounded off-loop runner for DocumentAnalysisService.analyze.
+
+    Usage:
+        executor = get_document_executor()
+        result = await executor.analyze(upload.path, "education", content_hash=upload.sha256)
+    """
+
+    def __init__(self):
+        self.workers = int(os.getenv(
+            "DOCUMENT_ANALYSIS_WORKERS", str(min(4, os.cpu_count() or 1))
+        ))
+        self.max_queue = int(os.getenv("DOCUMENT_ANALYSIS_MAX_QUEUE", "32"))
+        self.timeout = float(os.getenv("DOCUMENT_ANALYSIS_TIMEOUT", "60"))
+        self.start_method = os.getenv("DOCUMENT_ANALYSIS_START_METHOD", "spawn")
+
+        self._slots = threading.BoundedSemaphore(self.max_queue)
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._cache_hits = 0
+        self._recycled = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_warm_worker,
+                )
+                logger.info(
+                    f"[DocumentAnalysisExecutor] pool started: workers={self.workers}, "
+                    f"max_queue={self.max_queue}, timeout={self.timeout}s"
+                )
+            return self._pool
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def _recycle_if_abandoned(self, pool: ProcessPoolExecutor, future) -> None:
+        """Retire pool if the job left a timed-out layer running in its worker."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        layers = future.result().timings.get("layers", {})
+        abandoned = [name for name, t in layers.items() if t.get("timed_out")]
+        if not abandoned:
+            return
+        with self._lock:
+            if self._pool is not pool:
+                return  # Already retired
+            self._pool = None
+            self._recycled += 1
+        pool.shutdown(wait=False)
+        logger.warning(
+            f"[DocumentAnalysisExecutor] layer(s) {abandoned} abandoned at their timeout; "
+            f"pool retired, new jobs go to a fresh one"
+        )
+
+    async def analyze(
+        self,
+        source: DocumentSource,
+        doc_type: str = "other",
+        content_hash: Optional[str] = None,
+    ) -> DocumentAnalysisResult:
+        """
+        Run analysis off the event loop.
+        
+        source is PDF bytes or a path; content_hash (SHA-256 hex) skips
+        re-hashing when the caller already has it.
+
+        Raises:
+            DocumentAnalysisBusyError: Queue is full
+            DocumentAnalysisTimeoutError: Job exceeded the timeout
+        """
+        loop = asyncio.get_running_loop()
+        cache = get_result_cache()
+        # The cache may hit the database - keep it off the event loop
+        if content_hash is None:
+            content_hash = await loop.run_in_executor(None, hash_content, source)
+        cached = await loop.run_in_executor(None, cache.get, content_hash, doc_type)
+        if cached is not None:
+            with self._lock:
+                self._cache_hits += 1
+            # Timings are from the run that filled the cache
+            cached.timings["cache_hit"] = True
+            return cached
+        
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise DocumentAnalysisBusyError(
+                f"Document analysis queue full ({self.max_queue} jobs)"
+            )
+        with self._lock:
+            self._in_flight += 1
+
+        try:
+            if self.workers > 0:
+                pool = self._get_pool()
+                future = pool.submit(_analyze_in_worker, source, doc_type)
+                future.add_done_callback(lambda f: self._recycle_if_abandoned(pool, f))
+            else:
+                future = loop.run_in_executor(
+                    None, _analyze_in_worker, source, doc_type
+                )
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            # shield: on timeout stop waiting, but let the job finish and free its slot
+            result = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            logger.error(f"Document analysis timed out after {self.timeout}s")
+            raise DocumentAnalysisTimeoutError(
+                f"Document analysis exceeded {self.timeout}s"
+            )
+        
+        get_layer_metrics().record(result)
+        await loop.run_in_executor(None, cache.set, content_hash, doc_type, result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "timeout": self.timeout,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "cache_hits": self._cache_hits,
+                "recycled": self._recycled,
+                "result_cache": get_result_cache().snapshot(),
+                "layer_metrics": get_layer_metrics().snapshot(),
+            }
+
+    def shutdown(self) -> None:
+        """Stop worker processes (called on application shutdown)."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+            logger.info("[DocumentAnalysisExecutor] pool stopped")
+
+
+# Singleton instance
+_executor_instance: Optional[DocumentAnalysisExecutor] = None
+
+
+def get_document_executor() -> DocumentAnalysisExecutor:
+    """Get or create singleton DocumentAnalysisExecutor."""
+    global _executor_instance
+    if _executor_instance is None:
+        _executor_instance = DocumentAnalysisExecutor()
+    return _executor_instance
@@ -0,0 +1,195 @@
+"""
+Per-layer timing and resource counters.
+
+DocumentAnalysisService measures every layer it runs with LayerTimer and
+stores the counters in LayerResult.timings:
+
+- wall_ms        Elapsed time
+- cpu_ms         CPU time of the thread that ran the layer (time.thread_time)
+- process_peak_rss_kb     Peak RSS of the whole process so far (ru_maxrss),
+                          read when the layer finished; not the layer's own
+                          memory use
+- process_peak_growth_kb  How far that process peak rose while the layer
+                          ran. Zero unless the layer pushed the process past
+                          its previous peak, and layers in a wave run
+                          concurrently, so growth is charged to whichever
+                          layer set the new peak. Per-layer allocations are
+                          measured offline by scripts/benchmark_documents.py
+                          (tracemalloc), which runs the layers one at a time
+- pages                   Pages the layer looked at (from its details), when known
+
+DocumentAnalysisResult.timings collects them per document and is persisted
+with the verification row. LayerMetrics aggregates completed analyses into
+latency histograms per layer and doc_type, served at GET /health/documents.
+Analysis runs in worker processes, so the executor records each result as
+it comes back.
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Histogram bucket upper bounds (ms); one more bucket catches the rest
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000)
+
+
+def _process_peak_rss_kb() -> Optional[int]:
+    """ru_maxrss: the process-lifetime peak, never the current RSS (KB on Linux)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class LayerTimer:
+    """
+    Counters for one layer run; start on the thread that runs the layer.
+
+    Usage:
+        timer = LayerTimer()
+        result = analyzer.analyze(parsed)
+        result.timings = timer.stop(result.details)
+    """
+
+    def __init__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        self._peak = _process_peak_rss_kb()
+
+    def stop(self, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        wall_ms = (time.perf_counter() - self._wall) * 1000
+        cpu_ms = (time.thread_time() - self._cpu) * 1000
+        peak = _process_peak_rss_kb()
+
+        details = details or {}
+        pages = details.get("pages_analyzed", details.get("page_count"))
+        return {
+            "wall_ms": round(wall_ms, 2),
+            "cpu_ms": round(cpu_ms, 2),
+            "process_peak_rss_kb": peak,
+            "process_peak_growth_kb": peak - self._peak if peak is not None else None,
+            "pages": pages,
+        }
+
+
+def timed_out(timeout: float) -> Dict[str, Any]:
+    """Timings for a layer abandoned at its deadline (it may still be running)."""
+    return {
+        "wall_ms": round(timeout * 1000, 2),
+        "cpu_ms": None,
+        "process_peak_rss_kb": None,
+        "process_peak_growth_kb": None,
+        "pages": None,
+        "timed_out": True,
+    }
+
+
+class Histogram:
+    """Fixed-bucket histogram, reported with cumulative ("le") counts."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = {}
+        running = 0
+        for bound, n in zip([*self.buckets, "+Inf"], self.counts):
+            running += n
+            cumulative[str(bound)] = running
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 2),
+            "mean": round(self.sum / self.count, 2) if self.count else None,
+            "buckets": cumulative,
+        }
+
+
+class LayerMetrics:
+    """
+    Latency and CPU histograms per (layer, doc_type), plus whole documents.
+
+    Usage:
+        get_layer_metrics().record(result)
+        get_layer_metrics().snapshot()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wall: Dict[Tuple[str, str], Histogram] = {}
+        self._cpu: Dict[Tuple[str, str], Histogram] = {}
+        self._peak_growth: Dict[Tuple[str, str], int] = {}
+        self._timeouts: Dict[Tuple[str, str], int] = {}
+        self._documents: Dict[str, Histogram] = {}
+
+    def record(self, result) -> None:
+        """Add one fresh DocumentAnalysisResult (not a cache hit)."""
+        timings = result.timings or {}
+        doc_type = result.document_type.value if result.document_type else "other"
+
+        with self._lock:
+            if timings.get("total_ms") is not None:
+                self._documents.setdefault(doc_type, Histogram()).observe(timings["total_ms"])
+
+            for layer, counters in timings.get("layers", {}).items():
+                key = (layer, doc_type)
+                if counters.get("timed_out"):
+                    self._timeouts[key] = self._timeouts.get(key, 0) + 1
+                self._wall.setdefault(key, Histogram()).observe(counters["wall_ms"])
+                if counters.get("cpu_ms") is not None:
+                    self._cpu.setdefault(key, Histogram()).observe(counters["cpu_ms"])
+                if counters.get("process_peak_growth_kb") is not None:
+                    self._peak_growth[key] = max(
+                        self._peak_growth.get(key, 0), counters["process_peak_growth_kb"]
+                    )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            layers: Dict[str, Dict[str, Any]] = {}
+            for (layer, doc_type), wall in sorted(self._wall.items()):
+                cpu = self._cpu.get((layer, doc_type))
+                layers.setdefault(layer, {})[doc_type] = {
+                    "wall_ms": wall.snapshot(),
+                    "cpu_ms": cpu.snapshot() if cpu else None,
+                    "max_process_peak_growth_kb": self._peak_growth.get((layer, doc_type)),
+                    "timed_out": self._timeouts.get((layer, doc_type), 0),
+                }
+            return {
+                "buckets_ms": list(LATENCY_BUCKETS_MS),
+                "documents": {
+                    doc_type: hist.snapshot() for doc_type, hist in sorted(self._documents.items())
+                },
+                "layers": layers,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._wall.clear()
+            self._cpu.clear()
+            self._peak_growth.clear()
+            self._timeouts.clear()
+            self._documents.clear()
+
+
+# Singleton instance
+_metrics_instance: Optional[LayerMetrics] = None
+
+
+def get_layer_metrics() -> LayerMetrics:
+    """Get or create singleton LayerMetrics."""
+    global _metrics_instance
+    if _metrics_instance is None:
+        _metrics_instance = LayerMetrics()
+    return _metrics_instance
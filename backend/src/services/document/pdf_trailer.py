@@ -0,0 +1,623 @@
+"""
+Lightweight PDF trailer reader.
+
+Reads the document information dictionary and the XMP metadata stream
+without parsing the whole file: follow startxref to the last cross-reference
+section (table or stream), then look up just the Info, Root and Metadata
+objects, following /Prev into older sections and into object streams when
+needed. Works on any buffer with find() and slicing, so a memory-mapped
+upload is read only where it is touched.
+
+scan_revisions() finds every startxref ... %%EOF section in one linear scan;
+more than one (outside linearization) means the file was updated
+incrementally after it was first written.
+
+Anything unusual - encryption, filters other than Flate, PNG predictors
+other than None/Sub/Up, broken offsets - raises PdfStructureError, and the
+caller falls back to a full parser (pikepdf).
+
+Usage:
+    reader = TrailerReader(buffer)
+    reader.info()    # {"Creator": "...", "Producer": "...", ...}
+    reader.xmp()     # raw XMP packet bytes, or None
+    revisions, linearized = scan_revisions(buffer)
+    reader.section_objects(revisions[-1].startxref)  # objects the last update wrote
+"""
+
+import re
+import zlib
+import functools
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# How far back from the end startxref may be (spec: last 1024 bytes; be lenient)
+_TAIL_BYTES = 4096
+# Read window for one object; grows up to _MAX_WINDOW for large dictionaries
+_WINDOW = 4096
+_MAX_WINDOW = 1 << 20
+# Guards against /Prev loops and absurd files
+_MAX_SECTIONS = 256
+_MAX_DEPTH = 32
+
+_WHITESPACE = b" \t\r\n\x0c\x00"
+_DELIMITERS = b"()<>[]{}/%"
+
+_STARTXREF = re.compile(rb"startxref\s*(\d+)\s*%%EOF")
+_OBJ_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+_SUBSECTION = re.compile(rb"\s*(\d+)\s+(\d+)\s*[\r\n]+")
+_XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+# The "g R" that turns a number into a reference
+_REF_TAIL = re.compile(rb"\s+(\d+)\s+R(?![^\s()<>\[\]{}/%])")
+
+
+class PdfStructureError(Exception):
+    """The fast path cannot resolve the file; use a full parser instead."""
+    pass
+
+
+def _structural(method: Callable) -> Callable:
+    """Report malformed input of any kind as PdfStructureError."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        except PdfStructureError:
+            raise
+        except (ValueError, TypeError, IndexError, KeyError, AttributeError, zlib.error, RecursionError) as e:
+            raise PdfStructureError(f"Malformed PDF structure: {e}") from e
+    return wrapper
+
+
+class Ref(NamedTuple):
+    num: int
+    gen: int
+
+
+class Name(str):
+    """A PDF name (without the leading slash)."""
+    pass
+
+
+@dataclass
+class Revision:
+    """One startxref ... %%EOF section of the file."""
+    end: int              # Offset just past %%EOF
+    startxref: int        # Offset of its cross-reference section
+    signed: bool = False  # Carries a signature (/ByteRange)
+
+
+# ============ REVISIONS ============
+
+def scan_revisions(buffer) -> Tuple[List[Revision], bool]:
+    """
+    (revisions, linearized) from one pass over the file.
+
+    A linearized file has an extra first-page section, which is not an
+    update; it is dropped from the list.
+    """
+    revisions = []
+    start = 0
+    for match in _STARTXREF.finditer(buffer):
+        revisions.append(Revision(
+            end=match.end(),
+            startxref=int(match.group(1)),
+            signed=buffer.find(b"/ByteRange", start, match.end()) != -1,
+        ))
+        start = match.end()
+
+    linearized = buffer.find(b"/Linearized", 0, 1024) != -1
+    if linearized and len(revisions) > 1:
+        revisions = revisions[1:]
+    return revisions, linearized
+
+
+# ============ OBJECT PARSER ============
+
+def _skip(data: bytes, pos: int) -> int:
+    """Skip whitespace and comments."""
+    n = len(data)
+    while pos < n:
+        c = data[pos]
+        if c in _WHITESPACE:
+            pos += 1
+        elif c == 0x25:  # %
+            while pos < n and data[pos] not in b"\r\n":
+                pos += 1
+        else:
+            break
+    return pos
+
+
+def _token_end(data: bytes, pos: int) -> int:
+    n = len(data)
+    while pos < n and data[pos] not in _WHITESPACE and data[pos] not in _DELIMITERS:
+        pos += 1
+    return pos
+
+
+def _literal_string(data: bytes, pos: int) -> Tuple[bytes, int]:
+    """( ... ) with nesting and escapes; pos is just past '('."""
+    out = bytearray()
+    depth = 1
+    n = len(data)
+    while pos < n:
+        c = data[pos]
+        if c == 0x5C:  # backslash
+            pos += 1
+            if pos >= n:
+                break
+            c = data[pos]
+            if c in b"01234567":
+                digits = data[pos:pos + 3]
+                length = 1
+                while length < len(digits) and digits[length] in b"01234567":
+                    length += 1
+                out.append(int(digits[:length], 8) & 0xFF)
+                pos += length
+                continue
+            if c == 0x0D:  # Line continuation
+                pos += 2 if data[pos + 1:pos + 2] == b"\n" else 1
+                continue
+            if c == 0x0A:
+                pos += 1
+                continue
+            out.append({0x6E: 10, 0x72: 13, 0x74: 9, 0x62: 8, 0x66: 12}.get(c, c))
+        elif c == 0x28:
+            depth += 1
+            out.append(c)
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos + 1
+            out.append(c)
+        else:
+            out.append(c)
+        pos += 1
+    raise PdfStructureError("Unterminated string")
+
+
+def parse_object(data: bytes, pos: int = 0, depth: int = 0) -> Tuple[Any, int]:
+    """
+    Parse one PDF object at pos -> (value, end).
+
+    dict -> dict (Name keys), array -> list, string -> bytes, name -> Name,
+    "n g R" -> Ref, numbers, booleans and null as Python values.
+    """
+    if depth > _MAX_DEPTH:
+        raise PdfStructureError("Object nested too deeply")
+    pos = _skip(data, pos)
+    if pos >= len(data):
+        raise PdfStructureError("Unexpected end of object")
+
+    c = data[pos]
+    if data.startswith(b"<<", pos):
+        result = {}
+        pos += 2
+        while True:
+            pos = _skip(data, pos)
+            if data.startswith(b">>", pos):
+                return result, pos + 2
+            key, pos = parse_object(data, pos, depth + 1)
+            if not isinstance(key, Name):
+                raise PdfStructureError("Dictionary key is not a name")
+            result[key], pos = parse_object(data, pos, depth + 1)
+    if c == 0x3C:  # <hex>
+        end = data.find(b">", pos)
+        if end == -1:
+            raise PdfStructureError("Unterminated hex string")
+        digits = bytes(ch for ch in data[pos + 1:end] if ch not in _WHITESPACE)
+        if len(digits) % 2:
+            digits += b"0"
+        try:
+            return bytes.fromhex(digits.decode("ascii")), end + 1
+        except ValueError:
+            raise PdfStructureError("Bad hex string")
+    if c == 0x28:
+        return _literal_string(data, pos + 1)
+    if c == 0x5B:  # [
+        items = []
+        pos += 1
+        while True:
+            pos = _skip(data, pos)
+            if data.startswith(b"]", pos):
+                return items, pos + 1
+            item, pos = parse_object(data, pos, depth + 1)
+            items.append(item)
+    if c == 0x2F:  # /Name
+        end = _token_end(data, pos + 1)
+        raw = data[pos + 1:end]
+        if b"#" in raw:
+            raw = re.sub(rb"#([0-9A-Fa-f]{2})", lambda m: bytes([int(m.group(1), 16)]), raw)
+        return Name(raw.decode("latin-1")), end
+
+    end = _token_end(data, pos)
+    token = data[pos:end]
+    if not token:
+        raise PdfStructureError(f"Unexpected byte {chr(c)!r}")
+    if token == b"true":
+        return True, end
+    if token == b"false":
+        return False, end
+    if token == b"null":
+        return None, end
+    try:
+        number = float(token) if b"." in token else int(token)
+    except ValueError:
+        raise PdfStructureError(f"Unexpected token {token[:20]!r}")
+
+    # "n g R" reference?
+    if isinstance(number, int):
+        match = _REF_TAIL.match(data, end)
+        if match:
+            return Ref(number, int(match.group(1))), match.end()
+    return number, end
+
+
+def decode_text(value: Any) -> Optional[str]:
+    """PDF text string -> str (UTF-16BE or UTF-8 with BOM, else PDFDocEncoding)."""
+    if value is None:
+        return None
+    if isinstance(value, Name):
+        return str(value)
+    if not isinstance(value, bytes):
+        return str(value)
+    if value.startswith(b"\xfe\xff"):
+        return value[2:].decode("utf-16-be", errors="replace")
+    if value.startswith(b"\xef\xbb\xbf"):
+        return value[3:].decode("utf-8", errors="replace")
+    # PDFDocEncoding matches Latin-1 outside 0x80-0xA0, which metadata rarely uses
+    return value.decode("latin-1")
+
+
+# ============ STREAMS ============
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    """Undo PNG row predictors None/Sub/Up (what xref streams use)."""
+    row_size = columns + 1
+    if len(data) % row_size:
+        raise PdfStructureError("Predictor rows do not divide the stream")
+    out = bytearray()
+    previous = bytearray(columns)
+    for start in range(0, len(data), row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + row_size])
+        if kind == 1:
+            for i in range(1, columns):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif kind == 2:
+            for i in range(columns):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif kind != 0:
+            raise PdfStructureError(f"Unsupported PNG predictor {kind}")
+        out += row
+        previous = row
+    return bytes(out)
+
+
+def _decode_stream(stream_dict: Dict[Name, Any], raw: bytes) -> bytes:
+    filters = stream_dict.get("Filter")
+    params = stream_dict.get("DecodeParms")
+    if isinstance(filters, list):
+        if len(filters) > 1:
+            raise PdfStructureError("Chained stream filters")
+        filters = filters[0] if filters else None
+        params = params[0] if isinstance(params, list) and params else params
+    if filters is None:
+        return raw
+    if filters not in ("FlateDecode", "Fl"):
+        raise PdfStructureError(f"Unsupported stream filter {filters}")
+    try:
+        data = zlib.decompress(raw)
+    except zlib.error:
+        # Some writers leave trailing garbage after the zlib stream
+        data = zlib.decompressobj().decompress(raw)
+
+    if isinstance(params, dict) and params.get("Predictor", 1) >= 10:
+        if params.get("Colors", 1) != 1 or params.get("BitsPerComponent", 8) != 8:
+            raise PdfStructureError("Unsupported predictor parameters")
+        data = _png_unpredict(data, int(params.get("Columns", 1)))
+    elif isinstance(params, dict) and params.get("Predictor", 1) != 1:
+        raise PdfStructureError("Unsupported TIFF predictor")
+    return data
+
+
+# ============ READER ============
+
+class TrailerReader:
+    """
+    Resolves the few objects metadata needs, starting from the last trailer.
+
+    buffer: bytes or mmap (anything supporting find, rfind and slicing).
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.size = len(buffer)
+        self._sections: Optional[List[Tuple[str, Any]]] = None
+        self._trailer: Optional[Dict[Name, Any]] = None
+        self._object_streams: Dict[int, Tuple[bytes, Dict[int, int]]] = {}
+
+    # ---- public ----
+
+    @property
+    @_structural
+    def trailer(self) -> Dict[Name, Any]:
+        """Latest trailer dictionary (merged with older ones for missing keys)."""
+        self._load_sections()
+        return self._trailer
+
+    @_structural
+    def info(self) -> Dict[str, Optional[str]]:
+        """Document information dictionary as text, {} if the file has none."""
+        info = self.resolve(self.trailer.get("Info"))
+        if not isinstance(info, dict):
+            return {}
+        return {str(key): decode_text(self.resolve(value)) for key, value in info.items()}
+
+    @_structural
+    def xmp(self) -> Optional[bytes]:
+        """Raw XMP packet from the catalog's /Metadata stream, or None."""
+        root = self.resolve(self.trailer.get("Root"))
+        if not isinstance(root, dict) or not isinstance(root.get("Metadata"), Ref):
+            return None
+        value = self._load(root["Metadata"], want_stream=True)
+        return value[1] if isinstance(value, tuple) else None
+
+    @_structural
+    def section_objects(self, offset: int) -> List[int]:
+        """Objects written by the single cross-reference section at offset (no /Prev)."""
+        (kind, section), trailer = self._read_section(offset)
+        sections = [(kind, section)]
+        hybrid = trailer.get("XRefStm")
+        if isinstance(hybrid, int):
+            sections.append(self._read_section(hybrid)[0])
+        
+        objects = set()
+        for kind, section in sections:
+            if kind == "table":
+                for first, count, entries, width in section:
+                    for i in range(count):
+                        raw = self.buffer[entries + i * width:entries + i * width + 20]
+                        match = _XREF_ENTRY.match(raw)
+                        if match and match.group(3) == b"n":
+                            objects.add(first + i)
+            else:
+                stream_dict, _ = section
+                index = stream_dict.get("Index") or [0, int(stream_dict.get("Size", 0))]
+                for first, count in zip(index[::2], index[1::2]):
+                    for num in range(first, first + count):
+                        entry = self._stream_entry(section, num)
+                        if entry is not None and entry[0] in (1, 2):
+                            objects.add(num)
+        objects.discard(0)
+        return sorted(objects)
+    
+    def resolve(self, value: Any, depth: int = 0) -> Any:
+        """Follow references (a few levels) to a direct value."""
+        while isinstance(value, Ref):
+            if depth > _MAX_DEPTH:
+                raise PdfStructureError("Reference chain too long")
+            value = self._load(value)
+            depth += 1
+        return value
+
+    # ---- cross-reference sections ----
+
+    def _load_sections(self) -> None:
+        if self._sections is not None:
+            return
+        tail = self.buffer[max(0, self.size - _TAIL_BYTES):]
+        found = list(_STARTXREF.finditer(tail))
+        if not found:
+            raise PdfStructureError("No startxref")
+        offset = int(found[-1].group(1))
+
+        sections = []
+        trailer: Dict[Name, Any] = {}
+        seen = set()
+        while offset is not None:
+            if offset in seen:
+                break
+            if len(seen) >= _MAX_SECTIONS or not 0 <= offset < self.size:
+                raise PdfStructureError(f"Bad cross-reference offset {offset}")
+            seen.add(offset)
+
+            section, section_trailer = self._read_section(offset)
+            sections.append(section)
+            for key, value in section_trailer.items():
+                trailer.setdefault(key, value)
+
+            # Hybrid files: the table's objects may also live in an xref stream
+            hybrid = section_trailer.get("XRefStm")
+            if isinstance(hybrid, int) and hybrid not in seen:
+                seen.add(hybrid)
+                sections.append(self._read_section(hybrid)[0])
+
+            prev = section_trailer.get("Prev")
+            offset = int(prev) if isinstance(prev, (int, float)) else None
+
+        if "Encrypt" in trailer:
+            raise PdfStructureError("Encrypted document")
+        self._sections = sections
+        self._trailer = trailer
+
+    def _read_section(self, offset: int) -> Tuple[Tuple[str, Any], Dict[Name, Any]]:
+        head = self.buffer[offset:offset + 4]
+        if head == b"xref":
+            return self._read_table(offset + 4)
+        loaded = self._read_at(offset, want_stream=True)
+        if not isinstance(loaded, tuple) or loaded[0].get("Type") != "XRef":
+            raise PdfStructureError(f"No cross-reference section at {offset}")
+        stream_dict, data = loaded
+        return ("stream", (stream_dict, data)), stream_dict
+
+    def _read_table(self, pos: int) -> Tuple[Tuple[str, Any], Dict[Name, Any]]:
+        """Subsection headers of a classic table; entries are read on lookup."""
+        subsections = []
+        while True:
+            window = self.buffer[pos:pos + 64]
+            if window.lstrip(_WHITESPACE).startswith(b"trailer"):
+                start = pos + window.index(b"trailer") + len(b"trailer")
+                trailer, _ = self._parse_at(start)
+                if not isinstance(trailer, dict):
+                    raise PdfStructureError("Bad trailer")
+                return ("table", subsections), trailer
+
+            match = _SUBSECTION.match(window)
+            if not match:
+                raise PdfStructureError(f"Bad cross-reference table at {pos}")
+            first, count = int(match.group(1)), int(match.group(2))
+            entries = pos + match.end()
+
+            # Entries are 20 bytes; some writers use a one-byte line end
+            sample = self.buffer[entries:entries + 21]
+            width = 20
+            if count and _XREF_ENTRY.match(sample):
+                if sample[18:19] in (b"\r", b"\n") and sample[19:20].isdigit():
+                    width = 19
+            subsections.append((first, count, entries, width))
+            pos = entries + count * width
+
+    def _lookup(self, num: int) -> Optional[Tuple[int, int, int]]:
+        """(type, field2, field3) of the newest entry for num, or None."""
+        self._load_sections()
+        for kind, section in self._sections:
+            if kind == "table":
+                for first, count, entries, width in section:
+                    if first <= num < first + count:
+                        raw = self.buffer[entries + (num - first) * width:][:20]
+                        match = _XREF_ENTRY.match(raw)
+                        if not match:
+                            raise PdfStructureError(f"Bad table entry for object {num}")
+                        if match.group(3) == b"f":
+                            return 0, 0, 0
+                        return 1, int(match.group(1)), int(match.group(2))
+            else:
+                entry = self._stream_entry(section, num)
+                if entry is not None:
+                    return entry
+        return None
+
+    def _stream_entry(self, section, num: int) -> Optional[Tuple[int, int, int]]:
+        stream_dict, data = section
+        widths = stream_dict.get("W")
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise PdfStructureError("Bad /W in cross-reference stream")
+        widths = [int(w) for w in widths]
+        row = sum(widths)
+        index = stream_dict.get("Index") or [0, int(stream_dict.get("Size", 0))]
+
+        base = 0
+        for first, count in zip(index[::2], index[1::2]):
+            if first <= num < first + count:
+                start = (base + num - first) * row
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[start:start + width], "big") if width else None)
+                    start += width
+                kind = 1 if fields[0] is None else fields[0]  # Type defaults to 1
+                return kind, fields[1] or 0, fields[2] or 0
+            base += count
+        return None
+
+    # ---- objects ----
+
+    def _load(self, ref: Ref, want_stream: bool = False) -> Any:
+        entry = self._lookup(ref.num)
+        if entry is None or entry[0] == 0:
+            return None  # Free or missing objects are null
+        kind, field2, field3 = entry
+        if kind == 1:
+            return self._read_at(field2, expect=ref.num, want_stream=want_stream)
+        if kind == 2:
+            if want_stream:
+                raise PdfStructureError("Stream inside an object stream")
+            return self._from_object_stream(field2, ref.num)
+        raise PdfStructureError(f"Unknown cross-reference entry type {kind}")
+
+    def _parse_at(self, offset: int) -> Tuple[Any, int]:
+        """Parse one object at offset, widening the window as needed -> (value, end offset)."""
+        window = _WINDOW
+        while True:
+            data = self.buffer[offset:offset + window]
+            try:
+                value, end = parse_object(data)
+                return value, offset + end
+            except PdfStructureError:
+                if window >= _MAX_WINDOW or offset + window >= self.size:
+                    raise
+                window *= 4
+
+    def _read_at(self, offset: int, expect: Optional[int] = None, want_stream: bool = False) -> Any:
+        """The indirect object at offset; streams as (dict, decoded data) when wanted."""
+        header = _OBJ_HEADER.match(self.buffer[offset:offset + 64])
+        if not header or (expect is not None and int(header.group(1)) != expect):
+            raise PdfStructureError(f"No object {expect} at offset {offset}")
+
+        value, end = self._parse_at(offset + header.end())
+        if not want_stream:
+            return value
+
+        after = self.buffer[end:end + 32]
+        match = re.match(rb"\s*stream(\r\n|\n|\r)", after)
+        if not isinstance(value, dict) or not match:
+            return value
+        length = value.get("Length")
+        if isinstance(length, Ref) and self._sections is None:
+            # Only reachable for an xref stream, whose /Length must be direct
+            raise PdfStructureError("Indirect /Length in cross-reference stream")
+        length = self.resolve(length)
+        if not isinstance(length, int) or length < 0:
+            raise PdfStructureError("Bad stream /Length")
+        start = end + match.end()
+        return value, _decode_stream(value, self.buffer[start:start + length])
+
+    def _from_object_stream(self, stream_num: int, num: int) -> Any:
+        if stream_num not in self._object_streams:
+            loaded = self._load(Ref(stream_num, 0), want_stream=True)
+            if not isinstance(loaded, tuple):
+                raise PdfStructureError(f"Object stream {stream_num} not found")
+            stream_dict, data = loaded
+            first = int(stream_dict.get("First", 0))
+            count = int(stream_dict.get("N", 0))
+            numbers = [int(n) for n in data[:first].split()]
+            offsets = {numbers[i]: first + numbers[i + 1] for i in range(0, min(len(numbers), count * 2) - 1, 2)}
+            self._object_streams[stream_num] = (data, offsets)
+
+        data, offsets = self._object_streams[stream_num]
+        if num not in offsets:
+            raise PdfStructureError(f"Object {num} not in object stream {stream_num}")
+        return parse_object(data, offsets[num])[0]
+
+
+# ============ XMP ============
+
+_XMP_FIELDS = {
+    "creator_tool": "xmp:CreatorTool",
+    "producer": "pdf:Producer",
+    "create_date": "xmp:CreateDate",
+    "modify_date": "xmp:ModifyDate",
+}
+
+
+def parse_xmp(packet: Optional[bytes]) -> Dict[str, Optional[str]]:
+    """
+    The XMP properties the metadata checks use (element or attribute form).
+
+    Elements may declare their namespace inline, as pikepdf and some
+    editors write them: <xmp:CreatorTool xmlns:xmp="...">.
+    """
+    from html import unescape
+
+    result: Dict[str, Optional[str]] = {key: None for key in _XMP_FIELDS}
+    if not packet:
+        return result
+    text = packet.decode("utf-8", errors="replace")
+    for key, prop in _XMP_FIELDS.items():
+        match = (
+            re.search(rf"<{prop}(?:\s[^>]*)?>\s*([^<]*?)\s*</{prop}>", text)
+            or re.search(rf"{prop}\s*=\s*\"([^\"]*)\"", text)
+        )
+        if match:
+            result[key] = unescape(match.group(1)) or None
+    return result
@@ -0,0 +1,233 @@
+"""
+Analyzer plugin registry.
+
+Each layer is declared once with:
+- cost class    Scheduling order; cheaper layers run first
+- requires      ParsedDocument handles it reads (fitz / pikepdf / pdfplumber / image / buffer)
+- doc_types     Document types it applies to (None = all)
+- formats       Sniffed file formats it applies to (default: pdf)
+- weight        Share of the legitimacy score (default: rules.WEIGHTS,
+                or rules.IMAGE_WEIGHTS for JPEG/PNG)
+
+rules.LAYER_PROFILES (PDFs) and rules.IMAGE_LAYER_PROFILES (JPEG/PNG) then
+select the layers for each doc_type.
+
+Adding a layer:
+    get_analyzer_registry().register(AnalyzerSpec(
+        name="qr_code",
+        factory=QRCodeAnalyzer,
+        cost=CostClass.MODERATE,
+        requires=("fitz",),
+        weight=0.10,
+    ))
+    ...and add "qr_code" to the relevant LAYER_PROFILES entries.
+
+Environment:
+    DOCUMENT_LAYERS_DISABLED  Comma-separated layer names never to run
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .rules import WEIGHTS, LAYER_PROFILES, IMAGE_WEIGHTS, IMAGE_LAYER_PROFILES
+
+logger = logging.getLogger(__name__)
+
+# Handles a ParsedDocument can provide
+PARSED_HANDLES = ("fitz", "pikepdf", "pdfplumber", "image", "buffer")
+
+IMAGE_FORMATS = frozenset({"jpeg", "png"})
+
+
+class CostClass(IntEnum):
+    """Relative cost of a layer; lower runs earlier."""
+    CHEAP = 1       # Header/metadata reads
+    MODERATE = 2    # Per-page text or font walks
+    EXPENSIVE = 3   # Rasterizing pages
+
+
+@dataclass(frozen=True)
+class AnalyzerSpec:
+    """Declaration of one analyzer layer."""
+    name: str
+    factory: Callable[[], Any]
+    cost: CostClass
+    requires: Tuple[str, ...] = ()
+    doc_types: Optional[FrozenSet[str]] = None
+    weight: Optional[float] = None
+    # analyze(source, doc_type) instead of analyze(source)
+    takes_doc_type: bool = False
+    formats: FrozenSet[str] = frozenset({"pdf"})
+
+    def applies_to(self, doc_type: str, fmt: str = "pdf") -> bool:
+        return (self.doc_types is None or doc_type in self.doc_types) and fmt in self.formats
+
+    @property
+    def layer_weight(self) -> float:
+        """Weight for the layer's primary format (PDF, if it handles PDFs)."""
+        return self.weight_for("pdf" if "pdf" in self.formats else min(self.formats))
+
+    def weight_for(self, fmt: str) -> float:
+        if self.weight is not None:
+            return self.weight
+        weights = IMAGE_WEIGHTS if fmt in IMAGE_FORMATS else WEIGHTS
+        return weights.get(self.name, 0.0)
+
+
+class AnalyzerRegistry:
+    """
+    Registered layers plus per-doc_type profile selection.
+
+    Usage:
+        registry = get_analyzer_registry()
+        for spec in registry.profile("education", parsed.format):
+            ...
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, AnalyzerSpec] = {}
+        self.disabled = {
+            name.strip()
+            for name in os.getenv("DOCUMENT_LAYERS_DISABLED", "").split(",")
+            if name.strip()
+        }
+
+    def register(self, spec: AnalyzerSpec) -> None:
+        unknown = set(spec.requires) - set(PARSED_HANDLES)
+        if unknown:
+            raise ValueError(f"Layer '{spec.name}' requires unknown handles: {sorted(unknown)}")
+        if spec.name in self._specs:
+            logger.info(f"Replacing document layer '{spec.name}'")
+        self._specs[spec.name] = spec
+
+    def unregister(self, name: str) -> None:
+        self._specs.pop(name, None)
+
+    def get(self, name: str) -> Optional[AnalyzerSpec]:
+        return self._specs.get(name)
+
+    def profile(self, doc_type: str, fmt: str = "pdf") -> List[AnalyzerSpec]:
+        """
+        Layers for a doc_type and file format, in report order.
+        
+        Formats that are neither JPEG nor PNG use the PDF profiles.
+        """
+        if fmt in IMAGE_FORMATS:
+            profiles = IMAGE_LAYER_PROFILES
+        else:
+            profiles, fmt = LAYER_PROFILES, "pdf"
+        names = profiles.get(doc_type, profiles["default"])
+        specs = []
+        for name in names:
+            spec = self._specs.get(name)
+            if spec is None:
+                logger.warning(f"Profile '{doc_type}' names unregistered layer '{name}'")
+                continue
+            if name in self.disabled or not spec.applies_to(doc_type, fmt):
+                continue
+            specs.append(spec)
+        return specs
+
+    def waves(self, specs: List[AnalyzerSpec]) -> List[List[AnalyzerSpec]]:
+        """Group layers by cost class, cheapest first."""
+        by_cost: Dict[CostClass, List[AnalyzerSpec]] = {}
+        for spec in specs:
+            by_cost.setdefault(spec.cost, []).append(spec)
+        return [by_cost[cost] for cost in sorted(by_cost)]
+
+    def describe(self) -> Dict[str, dict]:
+        """Registered layers (for /health/documents)."""
+        return {
+            name: {
+                "cost": spec.cost.name.lower(),
+                "requires": list(spec.requires),
+                "doc_types": sorted(spec.doc_types) if spec.doc_types else None,
+                "formats": sorted(spec.formats),
+                "weight": spec.layer_weight,
+                "disabled": name in self.disabled,
+            }
+            for name, spec in self._specs.items()
+        }
+
+
+def _register_builtin_layers(registry: AnalyzerRegistry) -> None:
+    from .analyzers import (
+        MetadataAnalyzer,
+        FontAnalyzer,
+        TextAnalyzer,
+        ForensicsAnalyzer,
+        ImageMetadataAnalyzer,
+        CompressionAnalyzer,
+        ErrorLevelAnalyzer,
+        RevisionAnalyzer,
+    )
+
+    registry.register(AnalyzerSpec(
+        name="metadata",
+        factory=MetadataAnalyzer,
+        cost=CostClass.CHEAP,
+        requires=("buffer", "pikepdf"),  # pikepdf only when the trailer reader gives up
+    ))
+    registry.register(AnalyzerSpec(
+        name="fonts",
+        factory=FontAnalyzer,
+        cost=CostClass.MODERATE,
+        requires=("fitz",),
+    ))
+    registry.register(AnalyzerSpec(
+        name="text",
+        factory=TextAnalyzer,
+        cost=CostClass.MODERATE,
+        requires=("fitz", "pdfplumber"),
+        takes_doc_type=True,
+    ))
+    registry.register(AnalyzerSpec(
+        name="revisions",
+        factory=RevisionAnalyzer,
+        cost=CostClass.MODERATE,
+        requires=("buffer",),  # Opens each revision itself; a single revision is never parsed
+    ))
+    registry.register(AnalyzerSpec(
+        name="forensics",
+        factory=ForensicsAnalyzer,
+        cost=CostClass.EXPENSIVE,
+        requires=("fitz", "image"),
+        formats=frozenset({"pdf"}) | IMAGE_FORMATS,
+    ))
+    registry.register(AnalyzerSpec(
+        name="image_metadata",
+        factory=ImageMetadataAnalyzer,
+        cost=CostClass.CHEAP,
+        requires=("image",),
+        formats=IMAGE_FORMATS,
+    ))
+    registry.register(AnalyzerSpec(
+        name="compression",
+        factory=CompressionAnalyzer,
+        cost=CostClass.MODERATE,
+        requires=("image",),
+        formats=frozenset({"jpeg"}),
+    ))
+    registry.register(AnalyzerSpec(
+        name="ela",
+        factory=ErrorLevelAnalyzer,
+        cost=CostClass.EXPENSIVE,
+        requires=("fitz", "image"),
+        formats=frozenset({"pdf"}) | IMAGE_FORMATS,
+    ))
+
+
+# Singleton instance
+_registry_instance: Optional[AnalyzerRegistry] = None
+
+
+def get_analyzer_registry() -> AnalyzerRegistry:
+    """Get or create the registry, with the built-in layers registered."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = AnalyzerRegistry()
+        _register_builtin_layers(_registry_instance)
+    return _registry_instance
@@ -0,0 +1,236 @@
+"""
+Content-addressed cache of document analysis results.
+
+The same certificate is often uploaded several times (candidate, HR,
+re-verification). Results are keyed on:
+
+    SHA-256(file bytes) + doc_type + rules version
+
+The rules version hashes every constant in rules.py together with the
+analyzer env settings (forensics, text, ELA, layer selection), so changing any
+rule invalidates the cache without a manual flush.
+
+Tiers:
+    memory  In-process LRU (checked first)
+    db      document_analysis_cache table, shared by every process
+
+Environment:
+    DOCUMENT_CACHE_ENABLED      true/false (default: true)
+    DOCUMENT_CACHE_MAX_ENTRIES  In-process LRU size (default: 256)
+    DOCUMENT_CACHE_DB           Use the database tier (default: true)
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from . import rules
+from .context import DocumentSource
+from .contracts import DocumentAnalysisResult, DocumentStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    """NumPy scalars/arrays appear in layer details."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def rules_version() -> str:
+    """SHA-256 of every rules.py constant plus the analyzer env settings."""
+    constants = {
+        name: getattr(rules, name)
+        for name in dir(rules)
+        if name.isupper()
+    }
+    settings = {
+        key: value
+        for key, value in os.environ.items()
+        if key.startswith((
+            "DOCUMENT_METADATA_",
+            "DOCUMENT_FORENSICS_",
+            "DOCUMENT_TEXT_",
+            "DOCUMENT_ELA_",
+            "DOCUMENT_FONT_",
+            "DOCUMENT_REVISION_",
+            "DOCUMENT_LAYERS_DISABLED",
+            "DOCUMENT_LAYER_SHORT_CIRCUIT",
+        ))
+    }
+    body = json.dumps(
+        {"rules": constants, "settings": settings},
+        sort_keys=True,
+        default=_json_default,
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def content_hash(source: DocumentSource) -> str:
+    """SHA-256 of PDF bytes, or of a file read in chunks."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentResultCache:
+    """
+    Two-tier cache for DocumentAnalysisResult.
+
+    Usage:
+        cache = get_result_cache()
+        digest = content_hash(file_bytes)
+        result = cache.get(digest, "education")
+        if result is None:
+            result = service.analyze(file_bytes, "education")
+            cache.set(digest, "education", result)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("DOCUMENT_CACHE_ENABLED", "true").lower() == "true"
+        self.use_db = os.getenv("DOCUMENT_CACHE_DB", "true").lower() == "true"
+        self.max_entries = int(os.getenv("DOCUMENT_CACHE_MAX_ENTRIES", "256"))
+        self.rules_version = rules_version()
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._metrics = {"hits_memory": 0, "hits_db": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _count(self, metric: str, n: int = 1) -> None:
+        with self._lock:
+            self._metrics[metric] += n
+
+    def _remember(self, key: str, data: Dict[str, Any]) -> None:
+        evicted = 0
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._count("evictions", evicted)
+
+    def get(self, digest: str, doc_type: str) -> Optional[DocumentAnalysisResult]:
+        """Cached result for identical content under the current rules, or None."""
+        if not self.enabled:
+            return None
+
+        key = f"{digest}:{doc_type}"
+
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        if data is not None:
+            self._count("hits_memory")
+            return DocumentAnalysisResult.from_cache(data)
+
+        if self.use_db:
+            data = self._db_get(digest, doc_type)
+            if data is not None:
+                self._remember(key, data)
+                self._count("hits_db")
+                return DocumentAnalysisResult.from_cache(data)
+
+        self._count("misses")
+        return None
+
+    def set(self, digest: str, doc_type: str, result: DocumentAnalysisResult) -> None:
+        """Store a completed analysis. ERROR results are never cached."""
+        if not self.enabled or result.status == DocumentStatus.ERROR:
+            return
+
+        data = json.loads(json.dumps(result.to_cache(), default=_json_default))
+
+        self._remember(f"{digest}:{doc_type}", data)
+        if self.use_db:
+            self._db_set(digest, doc_type, data)
+        self._count("stores")
+
+    def clear(self) -> None:
+        """Empty the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+    # ============ Database Tier ============
+
+    def _db_get(self, digest: str, doc_type: str) -> Optional[Dict[str, Any]]:
+        from ...database import SessionLocal
+        from ...models.document_analysis_cache import DocumentAnalysisCache
+
+        db = SessionLocal()
+        try:
+            row = db.query(DocumentAnalysisCache.result).filter(
+                DocumentAnalysisCache.content_hash == digest,
+                DocumentAnalysisCache.document_type == doc_type,
+                DocumentAnalysisCache.rules_version == self.rules_version,
+            ).first()
+            return row[0] if row else None
+        except SQLAlchemyError as e:
+            logger.warning(f"Document result cache read failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _db_set(self, digest: str, doc_type: str, data: Dict[str, Any]) -> None:
+        from ...database import SessionLocal
+        from ...models.document_analysis_cache import DocumentAnalysisCache
+
+        db = SessionLocal()
+        try:
+            db.add(DocumentAnalysisCache(
+                content_hash=digest,
+                document_type=doc_type,
+                rules_version=self.rules_version,
+                result=data,
+            ))
+            db.commit()
+        except IntegrityError:
+            # Another process stored the same analysis first
+            db.rollback()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Document result cache write failed: {e}")
+        finally:
+            db.close()
+
+    def snapshot(self) -> dict:
+        """Configuration plus hit/miss counters."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            size = len(self._entries)
+        lookups = metrics["hits_memory"] + metrics["hits_db"] + metrics["misses"]
+        hits = metrics["hits_memory"] + metrics["hits_db"]
+        return {
+            "enabled": self.enabled,
+            "db_tier": self.use_db,
+            "rules_version": self.rules_version[:12],
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            **metrics,
+        }
+
+
+# Singleton instance
+_result_cache_instance: Optional[DocumentResultCache] = None
+
+
+def get_result_cache() -> DocumentResultCache:
+    """Get or create singleton DocumentResultCache."""
+    global _result_cache_instance
+    if _result_cache_instance is None:
+        _result_cache_instance = DocumentResultCache()
+    return _result_cache_instance
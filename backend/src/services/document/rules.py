@@ -8,13 +8,40 @@ Easy to tune without changing code.
 # ============ SCORING WEIGHTS ============
 # Total must equal 1.0
 
+# Layers with nothing to examine are left out and the rest renormalized
+# (see service.py): "revisions" only counts for files with incremental
+# updates, "ela" only for scanned/photographed pages or when it flags
+
 WEIGHTS = {
-    "metadata": 0.30,   # PDF creator, dates, producer
-    "fonts": 0.25,      # Font consistency
-    "forensics": 0.25,  # Image manipulation signals
-    "text": 0.20,       # Format validation
+    "metadata": 0.25,   # PDF creator, dates, producer
+    "fonts": 0.15,      # Font consistency
+    "forensics": 0.10,  # Image manipulation signals
+    "text": 0.10,       # Format validation
+    "ela": 0.20,        # Local recompression/noise anomalies
+    "revisions": 0.20,  # Changes made by incremental updates
+}
+
+# ============ LAYER PROFILES ============
+# Layers run per doc_type, in report order (see registry.py).
+# Unknown doc_types use "default".
+
+LAYER_PROFILES = {
+    "default": ["metadata", "fonts", "text", "revisions", "forensics", "ela"],
+    # Certificates and marksheets come both from university portals
+    # (born-digital) and from scanners: every layer applies
+    "education": ["metadata", "fonts", "text", "revisions", "forensics", "ela"],
+    # Offer/relieving letters and payslips are mostly exported from HR
+    # systems; an appended edit (revisions) is the usual forgery
+    "experience": ["metadata", "fonts", "text", "revisions", "forensics", "ela"],
+    # Card templates print a value larger than its label on the same line
+    # ("EMP ID 10234"), which the font layer would flag on every genuine card
+    "id_card": ["metadata", "text", "revisions", "forensics", "ela"],
 }
 
+# Stop before the next (costlier) layers once the score is already
+# SUSPICIOUS even if every remaining layer came back clean
+SHORT_CIRCUIT_SUSPICIOUS = True
+
 # ============ STATUS THRESHOLDS ============
 
 THRESHOLDS = {
@@ -54,13 +81,123 @@ TRUSTED_CREATORS = [
     "safari",
 ]
 
+# Read Info/XMP by following the trailer instead of opening the file with
+# pikepdf (env: DOCUMENT_METADATA_FAST_PATH)
+METADATA_FAST_PATH = True
+
 # ============ FONT RULES ============
 
 # Normal documents rarely use more than this many fonts
 MAX_NORMAL_FONTS = 4
 
+# Span checks: a run inside one line of text set in another family or size
+# than the rest of the line (a pasted-in or retyped value)
+FONT_SPAN_MAX_PAGES = 5        # First N pages with text (env: DOCUMENT_FONT_SPAN_PAGES)
+FONT_SIZE_TOLERANCE = 0.5      # Points
+FONT_SWITCH_MIN_CHARS = 2      # Shorter runs (bullets, marks) are ignored
+FONT_BASELINE_TOLERANCE = 1.0  # Points between baselines of one line
+FONT_LINE_GAP = 3.0            # Wider gaps (in font sizes) start a new line (columns, tables)
+FONT_SYMBOL_FAMILIES = ["symbol", "zapfdingbats", "wingdings", "webdings"]
+FONT_SWITCH_EXAMPLES = 5       # Lines listed in details
+
+# ============ FORENSICS RULES ============
+
+# Block variance analysis (grayscale pixels)
+FORENSICS_BLOCK_SIZE = 50       # Block edge in pixels
+FORENSICS_BLOCK_OVERLAP = 0     # Pixels shared by neighbouring blocks (0 = tiled)
+BLOCK_VARIANCE_STD_THRESHOLD = 1500.0  # Std of block variances above this = suspicious
+
+# Page selection (env overrides: DOCUMENT_FORENSICS_PAGES / _DPI / _MAX_PAGES)
+FORENSICS_PAGE_MODE = "first"  # first | all | sample
+FORENSICS_DPI = 72              # 72 dpi = 1x PDF scale
+FORENSICS_MAX_PAGES = 10        # Pages analyzed in sample mode
+
+# ============ IMAGE RULES ============
+# JPEG/PNG uploads (scans and phone photos) run their own layer set.
+# Total must equal 1.0
+
+IMAGE_WEIGHTS = {
+    "image_metadata": 0.30,  # EXIF/PNG software, dates
+    "compression": 0.20,     # JPEG quantization, double compression
+    "forensics": 0.25,       # Same block variance/edge/entropy checks as PDFs
+    "ela": 0.25,             # Local recompression/noise anomalies
+}
+
+# Photos of any doc_type go through the same capture/recompression path
+# (phone camera, messaging apps), so images share one profile
+IMAGE_LAYER_PROFILES = {
+    "default": ["image_metadata", "compression", "forensics", "ela"],
+}
+
+# Images are downscaled to this longest side before the forensics checks
+# (a 12MP photo otherwise costs ~100MB of float pixels)
+FORENSICS_IMAGE_MAX_SIDE = 2000
+
+# Double JPEG compression: periodicity of the DCT coefficient histograms.
+# Single-compressed images measure ~1-2, recompressed at a higher quality ~3+
+JPEG_DOUBLE_COMPRESSION_THRESHOLD = 2.8
+JPEG_DCT_FREQUENCIES = [(0, 1), (1, 0), (1, 1), (0, 2), (2, 0), (2, 1), (1, 2), (0, 3), (3, 0)]
+JPEG_DCT_MAX_BIN = 24         # Histogram of |quantized coefficient| 1..24
+JPEG_DCT_MIN_COEFFS = 500     # Frequencies with fewer non-zero values are skipped
+JPEG_ANALYSIS_MAX_SIDE = 2048  # Centre crop (8-aligned) for the DCT pass
+
+# ============ ERROR LEVEL ANALYSIS ============
+# Per-region recompression ("JPEG ghost") and noise-residual checks.
+
+# Env overrides: DOCUMENT_ELA_DPI / _MAX_PAGES
+ELA_DPI = 150                  # PDF render resolution; pasted marks need detail
+ELA_MAX_PAGES = 1              # First N pages
+ELA_MAX_SIDE = 4096            # Larger images are downscaled (loses the JPEG grid)
+ELA_QUALITIES = [50, 60, 70, 80, 90]  # Recompression qualities, ascending
+ELA_REGION_SIZE = 32           # Region edge in pixels
+
+# Ghost: error should fall as the recompression quality rises. A region
+# saved earlier at a lower quality shows a dip at that quality instead.
+ELA_MIN_ERROR_SPAN = 1.0       # Regions whose error barely varies (blank paper) are skipped
+ELA_GHOST_THRESHOLD = 0.5      # Rise of the normalized error curve (0-1)
+ELA_GHOST_MIN_REGIONS = 1
+
+# Noise residual: a pasted digital mark is cleaner than the scanned page
+ELA_NOISE_MIN_LEVEL = 0.5      # Page noise below this = born-digital, check skipped
+ELA_NOISE_RATIO = 0.4          # Region noise below this share of the page's
+ELA_NOISE_MIN_REGIONS = 2
+ELA_MAX_REGION_FRACTION = 0.25  # More anomalous regions than this = page-wide, not local
+
+ELA_HEATMAP_MAX_CELLS = 32     # Heatmap is max-pooled to at most this many cells per side
+
+# ============ INCREMENTAL REVISIONS ============
+# Diff of each incremental update against the revision before it.
+
+# Env overrides: DOCUMENT_REVISION_MAX_DIFFS / _MAX_PAGES / _DPI
+REVISION_MAX_DIFFS = 5          # Latest updates diffed
+REVISION_MAX_PAGES = 10         # Changed pages compared per update
+REVISION_MAX_REGIONS = 10       # Changed regions kept per page
+REVISION_DPI = 72               # Render resolution for changed regions
+REVISION_SCAN_DPI = 36          # Whole-page pass when the words did not change
+REVISION_SCAN_CELL = 8          # Cell edge (pixels) of the whole-page pass
+REVISION_REGION_MARGIN = 4.0    # Points; closer changes are one region
+REVISION_PIXEL_THRESHOLD = 24   # Gray levels; smaller differences are antialiasing
+REVISION_VISIBLE_FRACTION = 0.01  # Changed pixels in a region for a visible change
+REVISION_TEXT_EXAMPLE_CHARS = 200  # Words added/removed kept per region
+
+# ============ TEXT EXTRACTION ============
+
+# Env overrides: DOCUMENT_TEXT_BACKEND / _MAX_PAGES / _MAX_CHARS
+TEXT_BACKEND = "pymupdf"     # pymupdf | pdfplumber (pdfplumber is the fallback)
+TEXT_MAX_PAGES = 200         # Pages checked per document (0 = all)
+TEXT_MAX_CHARS = 2_000_000   # Characters checked per document (0 = all)
+
 # ============ TEXT VALIDATION PATTERNS ============
 
+# Text checks per doc_type; unknown doc_types use "default"
+TEXT_CHECKS = {
+    "default": ["pan", "aadhaar", "dates", "length"],
+    # Certificates and letters carry no Aadhaar; 12-digit roll and
+    # employee numbers would only trip the Aadhaar format check
+    "education": ["pan", "dates", "length"],
+    "experience": ["pan", "dates", "length"],
+}
+
 # PAN format: 5 letters + 4 digits + 1 letter
 # 4th character must be valid entity type
 VALID_PAN_ENTITY_TYPES = ['P', 'C', 'H', 'F', 'A', 'T', 'B', 'L', 'J', 'G']
@@ -2,11 +2,42 @@
 Document Analysis Service.
 
 Orchestrates multi-layer document forensics.
+
+The layers for a doc_type come from the analyzer registry (registry.py) and
+rules.LAYER_PROFILES, or rules.IMAGE_LAYER_PROFILES for JPEG/PNG uploads
+(recognised by their magic bytes). They run in waves by cost class,
+cheapest first; the layers inside a wave are submitted together to a
+thread pool, on a shared ParsedDocument, each within a timeout budget.
+Every PyMuPDF call in the process holds context.FITZ_LOCK, so the fonts,
+text, revisions, forensics and ELA layers run one after another; only
+the pikepdf/pdfplumber reads (metadata) and NumPy work outside the lock
+overlap. A layer that overruns degrades to an ANALYSIS_ERROR result; it
+keeps running (and may keep FITZ_LOCK), so the executor retires that
+worker process. Once the score is SUSPICIOUS even with every remaining
+layer clean, the remaining (costlier) waves are skipped.
+
+A layer with nothing to examine (a PDF saved once has no revisions to
+diff) reports applicable=False and is left out of the weighted score, so
+the layers that did look carry their full share.
+
+Every layer run is timed (instrumentation.py): LayerResult.timings holds its
+wall/CPU time, RSS and page count, and DocumentAnalysisResult.timings the
+whole document's.
+
+Environment:
+    DOCUMENT_LAYER_THREADS        Threads for concurrent layers (default: 8, 0 = sequential)
+    DOCUMENT_LAYER_TIMEOUT        Seconds each layer may take (default: 20)
+    DOCUMENT_LAYER_SHORT_CIRCUIT  Skip layers once SUSPICIOUS is decided
+                                  (default: rules.SHORT_CIRCUIT_SUSPICIOUS)
 """
 
+import os
+import time
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from .contracts import (
     DocumentAnalysisResult,
@@ -14,13 +45,10 @@ from .contracts import (
     DocumentType,
     LayerResult,
 )
-from .rules import WEIGHTS, THRESHOLDS, DEFAULT_SCORES
-from .analyzers import (
-    MetadataAnalyzer,
-    FontAnalyzer,
-    TextAnalyzer,
-    ForensicsAnalyzer,
-)
+from .rules import THRESHOLDS, DEFAULT_SCORES, SHORT_CIRCUIT_SUSPICIOUS
+from .context import DocumentSource, ParsedDocument
+from .registry import AnalyzerSpec, get_analyzer_registry
+from .instrumentation import LayerTimer, timed_out
 
 logger = logging.getLogger(__name__)
 
@@ -29,69 +57,108 @@ class DocumentAnalysisService:
     """
     Multi-layer document forensics service.
     
-    Combines metadata, font, text, and forensics analysis
-    to calculate legitimacy score.
+    Combines the registered layers (metadata, font, text, and forensics
+    analysis by default) to calculate legitimacy score.
     """
     
     def __init__(self):
-        self.metadata_analyzer = MetadataAnalyzer()
-        self.font_analyzer = FontAnalyzer()
-        self.text_analyzer = TextAnalyzer()
-        self.forensics_analyzer = ForensicsAnalyzer()
+        self.registry = get_analyzer_registry()
+        self._analyzers: Dict[str, Any] = {}
+        
+        self.layer_timeout = float(os.getenv("DOCUMENT_LAYER_TIMEOUT", "20"))
+        layer_threads = int(os.getenv("DOCUMENT_LAYER_THREADS", "8"))
+        self._layer_pool = (
+            ThreadPoolExecutor(max_workers=layer_threads, thread_name_prefix="doc-layer")
+            if layer_threads > 0 else None
+        )
+        self.short_circuit = os.getenv(
+            "DOCUMENT_LAYER_SHORT_CIRCUIT", str(SHORT_CIRCUIT_SUSPICIOUS)
+        ).lower() == "true"
         
         logger.info("DocumentAnalysisService initialized")
     
+    def _analyzer(self, spec: AnalyzerSpec) -> Any:
+        """One analyzer instance per layer, created on first use."""
+        analyzer = self._analyzers.get(spec.name)
+        if analyzer is None:
+            analyzer = self._analyzers[spec.name] = spec.factory()
+        return analyzer
+    
     def analyze(
         self,
-        file_bytes: bytes,
+        source: DocumentSource,
         doc_type: str = "other",
     ) -> DocumentAnalysisResult:
         """
         Perform complete document analysis.
         
         Args:
-            file_bytes: PDF file as bytes
+            source: PDF/JPEG/PNG file as bytes, or a path to it (opened without copying)
             doc_type: Type of document (education, experience, id_card, other)
             
         Returns:
             DocumentAnalysisResult with legitimacy score and breakdown
         """
+        started = time.perf_counter()
         layer_results = []
         all_flags = []
         breakdown = {}
         
-        # Layer 1: Metadata analysis
-        metadata_result = self.metadata_analyzer.analyze(file_bytes)
-        layer_results.append(metadata_result)
-        all_flags.extend(metadata_result.flags)
-        breakdown["metadata"] = metadata_result.score
-        
-        # Layer 2: Font analysis
-        font_result = self.font_analyzer.analyze(file_bytes)
-        layer_results.append(font_result)
-        all_flags.extend(font_result.flags)
-        breakdown["fonts"] = font_result.score
-        
-        # Layer 3: Text analysis
-        text_result = self.text_analyzer.analyze(file_bytes, doc_type)
-        layer_results.append(text_result)
-        all_flags.extend(text_result.flags)
-        breakdown["text"] = text_result.score
-        
-        # Layer 4: Forensics analysis
-        forensics_result = self.forensics_analyzer.analyze(file_bytes)
-        layer_results.append(forensics_result)
-        all_flags.extend(forensics_result.flags)
-        breakdown["forensics"] = forensics_result.score
-        
-        # Calculate weighted score
-        legitimacy_score = self._calculate_weighted_score(breakdown)
+        # Each library (PDF or image) is opened once and shared by the layers
+        parsed = ParsedDocument(source)
+        
+        specs = self.registry.profile(doc_type, parsed.format)
+        weights = {spec.name: spec.weight_for(parsed.format) for spec in specs}
+        waves = self.registry.waves(specs) if self.short_circuit else [specs]
+        
+        def layer_fn(spec: AnalyzerSpec) -> Callable[[], LayerResult]:
+            analyzer = self._analyzer(spec)
+            if spec.takes_doc_type:
+                return lambda: analyzer.analyze(parsed, doc_type)
+            return lambda: analyzer.analyze(parsed)
+        
+        results = self._run_layers(
+            parsed,
+            [{spec.name: layer_fn(spec) for spec in wave} for wave in waves],
+            decided=lambda done: self._is_decided(done, weights),
+        )
+        
+        for spec in specs:
+            result = results.get(spec.name)
+            if result is None:
+                # Short-circuited: recorded for audit, kept out of the breakdown
+                layer_results.append(LayerResult(
+                    name=spec.name,
+                    score=DEFAULT_SCORES["clean"],
+                    details={"skipped": "score already SUSPICIOUS"},
+                ))
+                continue
+            layer_results.append(result)
+            all_flags.extend(result.flags)
+            breakdown[spec.name] = result.score
+        
+        # Calculate weighted score over the layers that had something to examine
+        legitimacy_score = self._calculate_weighted_score(
+            breakdown, self._applicable(weights, results)
+        )
         
         # Determine status
         status = self._get_status(legitimacy_score)
         
-        # Get page count from text result
-        page_count = text_result.details.get("page_count", 0)
+        # Page count from the first layer that reports it (text by default)
+        page_count = next(
+            (r.details["page_count"] for r in layer_results if "page_count" in r.details),
+            0,
+        )
+        
+        layer_timings = {r.name: r.timings for r in layer_results if r.timings}
+        cpu = [t["cpu_ms"] for t in layer_timings.values() if t.get("cpu_ms") is not None]
+        timings = {
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            "cpu_ms": round(sum(cpu), 2),
+            "format": parsed.format,
+            "layers": layer_timings,
+        }
         
         return DocumentAnalysisResult(
             legitimacy_score=legitimacy_score,
@@ -102,21 +169,134 @@ class DocumentAnalysisService:
             analyzed_at=datetime.utcnow(),
             document_type=DocumentType(doc_type) if doc_type in [e.value for e in DocumentType] else DocumentType.OTHER,
             page_count=page_count,
+            timings=timings,
+        )
+    
+    def _is_decided(self, done: Dict[str, LayerResult], weights: Dict[str, float]) -> bool:
+        """True when the best possible score is already below review_required."""
+        best_case = self._calculate_weighted_score(
+            {name: result.score for name, result in done.items()},
+            self._applicable(weights, done),
+        )
+        return best_case < THRESHOLDS["review_required"]
+    
+    @staticmethod
+    def _applicable(weights: Dict[str, float], results: Dict[str, LayerResult]) -> Dict[str, float]:
+        """weights without the layers that reported nothing to examine."""
+        return {
+            name: weight for name, weight in weights.items()
+            if name not in results or results[name].applicable
+        }
+    
+    def _run_layers(
+        self,
+        parsed: ParsedDocument,
+        waves: List[Dict[str, Callable[[], LayerResult]]],
+        decided: Callable[[Dict[str, LayerResult]], bool],
+    ) -> Dict[str, LayerResult]:
+        """
+        Run analyzer layers wave by wave, each layer within the timeout budget.
+        
+        Layers in a wave are submitted together (PyMuPDF work still takes
+        turns, see context.FITZ_LOCK). Before each later wave, decided()
+        may stop the run; the skipped layers are absent from the result.
+        Layers still running at the deadline are reported as ANALYSIS_ERROR
+        (their timings say timed_out, which makes the executor retire this
+        process); the shared document is closed once the last of them finishes.
+        """
+        results: Dict[str, LayerResult] = {}
+        stragglers: List[Future] = []
+        try:
+            for i, layers in enumerate(waves):
+                if i > 0 and decided(results):
+                    logger.info(f"Document already SUSPICIOUS, skipping layers: "
+                                f"{[name for wave in waves[i:] for name in wave]}")
+                    break
+                
+                if self._layer_pool is None:
+                    for name, fn in layers.items():
+                        results[name] = self._run_layer(name, fn)
+                    continue
+                
+                futures = {
+                    name: self._layer_pool.submit(self._run_layer, name, fn)
+                    for name, fn in layers.items()
+                }
+                _, pending = wait(futures.values(), timeout=self.layer_timeout)
+                
+                for name, future in futures.items():
+                    if future in pending:
+                        logger.warning(f"Document layer '{name}' timed out after {self.layer_timeout}s")
+                        results[name] = self._error_result(name, f"Timed out after {self.layer_timeout}s")
+                        results[name].timings = timed_out(self.layer_timeout)
+                    else:
+                        results[name] = future.result()
+                stragglers.extend(pending)
+        finally:
+            self._close_when_drained(parsed, stragglers)
+        
+        return results
+    
+    @staticmethod
+    def _close_when_drained(parsed: ParsedDocument, pending: List[Future]) -> None:
+        """Close the shared document now, or after the last straggler ends."""
+        if not pending:
+            parsed.close()
+            return
+        
+        remaining = [len(pending)]
+        lock = threading.Lock()
+        
+        def _on_done(_future):
+            with lock:
+                remaining[0] -= 1
+                drained = remaining[0] == 0
+            if drained:
+                parsed.close()
+        
+        for future in pending:
+            future.add_done_callback(_on_done)
+    
+    def _run_layer(self, name: str, fn: Callable[[], LayerResult]) -> LayerResult:
+        """Run and time one layer; analyzers catch their own errors, this is a backstop."""
+        timer = LayerTimer()
+        try:
+            result = fn()
+        except Exception as e:
+            logger.warning(f"Document layer '{name}' failed: {e}")
+            result = self._error_result(name, str(e))
+        result.timings = timer.stop(result.details)
+        return result
+    
+    @staticmethod
+    def _error_result(name: str, error: str) -> LayerResult:
+        """Same degraded result the analyzers return on internal errors."""
+        return LayerResult(
+            name=name,
+            score=DEFAULT_SCORES["minor_issue"],
+            flags=["ANALYSIS_ERROR"],
+            details={"error": error},
         )
     
-    def _calculate_weighted_score(self, breakdown: dict) -> float:
+    def _calculate_weighted_score(self, breakdown: dict, weights: Dict[str, float]) -> float:
         """
         Calculate weighted legitimacy score.
         
-        Uses centralized weights from rules.py.
+        weights covers the layers in the doc_type's profile (rules.WEIGHTS
+        by default), less those that were not applicable, and is normalized,
+        so a profile that leaves layers out still scores on 0-100. Layers
+        missing from breakdown count as clean.
         """
         total = 0.0
+        total_weight = sum(weights.values())
         
-        for layer, weight in WEIGHTS.items():
+        for layer, weight in weights.items():
             score = breakdown.get(layer, DEFAULT_SCORES["clean"])
             total += score * weight
         
-        return round(total, 2)
+        if total_weight <= 0:
+            return DEFAULT_SCORES["clean"]
+        return round(total / total_weight, 2)
     
     def _get_status(self, score: float) -> DocumentStatus:
         """
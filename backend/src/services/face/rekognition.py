@@ -138,3 +138,15 @@ class RekognitionProvider:
                 flags=["PROVIDER_ERROR", str(e)],
                 compared_at=datetime.utcnow(),
             )
+
+
+# Singleton instance (one boto3 client per process)
+_provider_instance: Optional[RekognitionProvider] = None
+
+
+def get_rekognition_provider() -> RekognitionProvider:
+    """Get or create singleton RekognitionProvider instance."""
+    global _provider_instance
+    if _provider_instance is None:
+        _provider_instance = RekognitionProvider()
+    return _provider_instance
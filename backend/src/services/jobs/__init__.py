@@ -0,0 +1,19 @@
+"""
+Background Job Package.
+
+Durable queue for post-submission work (face comparison, document
+analysis, trust-score recompute), run by `python -m src.worker`.
+"""
+
+from .queue import JobQueue, JobType, PermanentJobError, get_job_queue
+from .handlers import HANDLERS, JobHandler, queue_trust_score
+
+__all__ = [
+    "JobQueue",
+    "JobType",
+    "PermanentJobError",
+    "get_job_queue",
+    "HANDLERS",
+    "JobHandler",
+    "queue_trust_score",
+]
@@ -0,0 +1,250 @@
+"""
+Job handlers run by the background worker.
+
+Each handler takes the worker's session and the job payload. It makes
+its changes in that session; the worker commits them together with the
+job's DONE state. Raising retries the job with backoff;
+PermanentJobError dead-letters it at once. on_dead settles the rows a
+job owns once it is out of attempts, so nothing is left PENDING.
+
+Jobs chain through trust_score/events.py: the rows a face comparison or
+a candidate document analysis writes queue a trust_score job for the
+verifications they feed, limited to the components that changed and
+deduplicated per verification.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from ...models import Verification, VerificationStep, StepStatus, Candidate
+from ...models.document_verification import DocumentVerification
+from ...models.hr_review import HRDocument
+from ..document import DocumentStatus
+from ..document.executor import get_document_executor
+from ..face.contracts import FaceDecision
+from ..face.rekognition import get_rekognition_provider
+from ..trust_score.store import recalculate_trust_score
+from ...utils.face_storage import get_face_storage
+from .queue import JobType, PermanentJobError, get_job_queue
+
+logger = logging.getLogger(__name__)
+
+# Rows a document_analysis job writes its result to
+DOCUMENT_TARGETS = ("document_verification", "hr_document")
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    """How to run one job type."""
+    run: Callable[[Session, Dict[str, Any]], Awaitable[None]]
+    # Called (in a fresh transaction) once the job is dead-lettered
+    on_dead: Optional[Callable[[Session, Dict[str, Any], str], None]] = None
+
+
+def queue_trust_score(
+    db: Session,
+    verification_id: Optional[int],
+    components: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Queue a trust-score recompute for a verification (one per verification).
+
+    components limits it to the score components whose inputs changed;
+    None recomputes all of them. A queued job's components are merged.
+    """
+    if verification_id is None:
+        return
+    payload: Dict[str, Any] = {"verification_id": verification_id}
+    if components is not None:
+        payload["components"] = sorted(components)
+    get_job_queue().enqueue(
+        db,
+        JobType.TRUST_SCORE,
+        payload,
+        dedupe_key=f"trust_score:{verification_id}",
+        merge=_merge_trust_score,
+    )
+
+
+def _merge_trust_score(queued: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Union of the components; a full recompute absorbs any partial one."""
+    if "components" not in queued or "components" not in payload:
+        return {"verification_id": payload["verification_id"]}
+    return {
+        "verification_id": payload["verification_id"],
+        "components": sorted(set(queued["components"]) | set(payload["components"])),
+    }
+
+
+# ============ FACE COMPARISON ============
+
+async def run_face_comparison(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Compare the selfie with the reference image and record it on the step.
+
+    Payload: verification_id, face_step_id, selfie_key, reference_key.
+    """
+    verification_id = payload["verification_id"]
+    face_step = db.query(VerificationStep).filter(
+        VerificationStep.id == payload["face_step_id"]
+    ).first()
+    if face_step is None:
+        raise PermanentJobError(f"Face step {payload['face_step_id']} not found")
+
+    # Get images
+    storage = get_face_storage()
+    selfie_bytes = storage.get_image(payload["selfie_key"])
+    reference_bytes = storage.get_image(payload["reference_key"])
+
+    if not selfie_bytes or not reference_bytes:
+        raise PermanentJobError(f"Missing image bytes for verification {verification_id}")
+
+    # Run comparison (one Rekognition client per worker process)
+    result = get_rekognition_provider().compare_faces(
+        source_bytes=selfie_bytes,
+        target_bytes=reference_bytes,
+        source_key=payload["selfie_key"],
+        target_key=payload["reference_key"],
+    )
+
+    # Provider unreachable or throttled: try again later
+    if result.decision == FaceDecision.NOT_AVAILABLE:
+        raise RuntimeError(f"Face comparison unavailable: {result.flags}")
+
+    # Update step based on result
+    face_step.score_contribution = result.confidence_score
+
+    # Update metadata
+    input_data = dict(face_step.input_data or {})
+    input_data.update({
+        "comparison_status": result.decision.value,
+        "confidence_score": result.confidence_score,
+        "flags": result.flags,
+        "compared_at": result.compared_at.isoformat(),
+        "reference_source": result.reference_source.value,
+    })
+    face_step.input_data = input_data
+
+    # Mark step status
+    # We mark as COMPLETED even on mismatch so the verification can proceed.
+    # The mismatch / low confidence is flagged in metadata for HR review.
+    face_step.status = StepStatus.COMPLETED
+    if result.decision.value == "MATCH":
+        logger.info(f"Face MATCH for verification {verification_id} ({result.confidence_score}%)")
+    elif result.decision.value == "MISMATCH":
+        logger.warning(f"Face MISMATCH for verification {verification_id} ({result.confidence_score}%)")
+    else:
+        logger.warning(f"Face LOW_CONFIDENCE for verification {verification_id} ({result.confidence_score}%)")
+
+
+def face_comparison_dead(db: Session, payload: Dict[str, Any], error: str) -> None:
+    """Record the failure on the step for HR review (the score still updates)."""
+    face_step = db.query(VerificationStep).filter(
+        VerificationStep.id == payload["face_step_id"]
+    ).first()
+    if face_step is not None:
+        input_data = dict(face_step.input_data or {})
+        input_data.update({
+            "comparison_status": FaceDecision.NOT_AVAILABLE.value,
+            "flags": ["COMPARISON_FAILED"],
+        })
+        face_step.input_data = input_data
+
+
+# ============ DOCUMENT ANALYSIS ============
+
+async def run_document_analysis(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Analyze a stored document and write the result onto its row.
+
+    Payload: target (document_verification | hr_document), document_id,
+    s3_key, document_type, content_hash (optional).
+    """
+    row = _document_row(db, payload)
+    if row is None:
+        raise PermanentJobError(f"{payload['target']} {payload['document_id']} not found")
+
+    # Local storage is read in place; S3 objects are fetched
+    storage = get_face_storage()
+    if storage._storage_type == "local":
+        path = storage._local_path / payload["s3_key"]
+        if not path.exists():
+            raise PermanentJobError(f"Document {payload['s3_key']} not in storage")
+        source = str(path)
+    else:
+        source = storage.get_image(payload["s3_key"])
+        if source is None:
+            raise RuntimeError(f"Could not fetch document {payload['s3_key']}")
+
+    # Busy / timeout propagate and are retried with backoff
+    result = await get_document_executor().analyze(
+        source, payload["document_type"], content_hash=payload.get("content_hash")
+    )
+
+    if payload["target"] == "hr_document":
+        # HR uploads never change the trust score on their own
+        row.is_analyzed = True
+        row.analysis_status = result.status.value
+        row.legitimacy_score = result.legitimacy_score
+        return
+
+    row.legitimacy_score = result.legitimacy_score
+    row.status = result.status.value
+    row.breakdown = result.breakdown
+    row.flags = result.flags
+    row.timings = result.timings
+    row.analyzed_at = result.analyzed_at
+
+
+def document_analysis_dead(db: Session, payload: Dict[str, Any], error: str) -> None:
+    """Mark a queued analysis as failed so pollers stop waiting."""
+    row = _document_row(db, payload)
+    if row is None or payload["target"] == "hr_document":
+        return  # HR documents stay "analysis pending"
+    row.status = DocumentStatus.ERROR.value
+    row.analyzed_at = datetime.utcnow()
+
+
+def _document_row(db: Session, payload: Dict[str, Any]):
+    if payload.get("target") not in DOCUMENT_TARGETS:
+        raise PermanentJobError(f"Unknown document target {payload.get('target')}")
+    model = HRDocument if payload["target"] == "hr_document" else DocumentVerification
+    return db.query(model).filter(model.id == payload["document_id"]).first()
+
+
+# ============ TRUST SCORE ============
+
+async def run_trust_score(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Recompute and store a verification's trust score.
+
+    Payload: verification_id, components (optional; default all).
+
+    The verification row stays locked until the worker commits, so two
+    jobs for it (one RUNNING, one queued behind it) recalculate in turn
+    and the later one starts from the earlier one's cached components.
+    """
+    verification = db.query(Verification).filter(
+        Verification.id == payload["verification_id"]
+    ).with_for_update().first()
+    if verification is None:
+        raise PermanentJobError(f"Verification {payload['verification_id']} not found")
+
+    candidate = db.query(Candidate).filter(
+        Candidate.id == verification.candidate_id
+    ).first()
+    if candidate is None:
+        raise PermanentJobError(f"Candidate {verification.candidate_id} not found")
+
+    recalculate_trust_score(db, verification, candidate, payload.get("components"))
+
+
+HANDLERS: Dict[str, JobHandler] = {
+    JobType.FACE_COMPARE.value: JobHandler(run_face_comparison, face_comparison_dead),
+    JobType.DOCUMENT_ANALYSIS.value: JobHandler(run_document_analysis, document_analysis_dead),
+    JobType.TRUST_SCORE.value: JobHandler(run_trust_score),
+}
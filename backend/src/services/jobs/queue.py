@@ -0,0 +1,350 @@
+"""
+Durable job queue on the jobs table.
+
+Requests enqueue work in their own transaction, so a job exists exactly
+when the change that needs it was committed. Worker processes
+(src/worker.py) claim due jobs with SELECT ... FOR UPDATE SKIP LOCKED and
+a guarded UPDATE, so any number of workers can share the table. SQLite
+(a stand-in for local runs) has no row locks; the guarded UPDATE alone
+keeps two workers from claiming the same job there.
+
+- Failed jobs are retried with exponential backoff
+  (JOB_BACKOFF_BASE * 2^(attempt - 1), capped at JOB_BACKOFF_MAX)
+- After JOB_MAX_ATTEMPTS, or on PermanentJobError, a job is dead-lettered
+  (status DEAD, last_error kept) until requeue_dead() is called
+- A RUNNING job whose lease is older than JOB_LOCK_TIMEOUT (the worker
+  died) counts as a failed attempt and is retried
+
+Environment:
+    JOB_MAX_ATTEMPTS   Attempts before a job is dead-lettered (default: 5)
+    JOB_BACKOFF_BASE   Seconds before the first retry (default: 10)
+    JOB_BACKOFF_MAX    Longest delay between retries (default: 900)
+    JOB_LOCK_TIMEOUT   Seconds a claimed job may run before it is retried (default: 600)
+"""
+
+import os
+import enum
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ...models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Longest last_error kept on a row
+MAX_ERROR_CHARS = 2000
+
+# Inserts retried when concurrent transactions race for a dedupe_key
+ENQUEUE_ATTEMPTS = 3
+
+
+class JobType(str, enum.Enum):
+    """Work the background worker knows how to run."""
+    FACE_COMPARE = "face_compare"
+    DOCUMENT_ANALYSIS = "document_analysis"
+    TRUST_SCORE = "trust_score"
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (e.g. the row is gone)."""
+    pass
+
+
+class JobQueue:
+    """
+    Enqueue, claim and settle jobs.
+
+    Usage:
+        queue = get_job_queue()
+        queue.enqueue(db, JobType.TRUST_SCORE, {"verification_id": 42},
+                      dedupe_key="trust_score:42")
+        db.commit()  # The job is committed with the caller's changes
+    """
+
+    def __init__(self):
+        self.max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+        self.backoff_base = float(os.getenv("JOB_BACKOFF_BASE", "10"))
+        self.backoff_max = float(os.getenv("JOB_BACKOFF_MAX", "900"))
+        self.lock_timeout = float(os.getenv("JOB_LOCK_TIMEOUT", "600"))
+
+    def enqueue(
+        self,
+        db: Session,
+        job_type: JobType,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+        delay: float = 0.0,
+        merge: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = None,
+    ) -> Job:
+        """
+        Add a job to the caller's session; it is committed with the caller.
+
+        With dedupe_key, a job that is still QUEUED under the same key is
+        returned instead of adding another (a RUNNING one does not count:
+        it may have read its inputs already). Its payload is replaced, or
+        with merge, becomes merge(queued_payload, payload).
+
+        The ux_jobs_dedupe_queued index enforces one QUEUED job per key
+        across transactions: the new job is inserted in a savepoint, and if
+        a concurrent transaction queued the key first, the payload is
+        merged into that job instead.
+        """
+        run_at = datetime.utcnow() + timedelta(seconds=delay)
+        if not dedupe_key:
+            job = self._new_job(job_type, payload, None, run_at)
+            db.add(job)
+            return job
+
+        db.flush()  # The caller's own pending rows fail outside the savepoint
+        for attempt in range(ENQUEUE_ATTEMPTS):
+            existing = self._queued(db, dedupe_key)
+            if existing is not None:
+                existing.payload = merge(dict(existing.payload or {}), payload) if merge else payload
+                existing.run_at = min(existing.run_at, run_at)
+                return existing
+
+            job = self._new_job(job_type, payload, dedupe_key, run_at)
+            try:
+                with db.begin_nested():
+                    db.add(job)
+                return job
+            except IntegrityError:
+                if attempt == ENQUEUE_ATTEMPTS - 1:
+                    raise
+                logger.debug(f"[JobQueue] {dedupe_key} queued concurrently, merging")
+
+    def _new_job(
+        self,
+        job_type: JobType,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str],
+        run_at: datetime,
+    ) -> Job:
+        return Job(
+            job_type=JobType(job_type).value,
+            payload=payload,
+            dedupe_key=dedupe_key,
+            status=JobStatus.QUEUED.value,
+            run_at=run_at,
+            attempts=0,
+            max_attempts=self.max_attempts,
+        )
+
+    def _queued(self, db: Session, dedupe_key: str, exclude: Optional[int] = None) -> Optional[Job]:
+        """The QUEUED job holding dedupe_key, locked so no worker claims it meanwhile."""
+        query = db.query(Job).filter(
+            Job.dedupe_key == dedupe_key,
+            Job.status == JobStatus.QUEUED.value,
+        )
+        if exclude is not None:
+            query = query.filter(Job.id != exclude)
+        return query.with_for_update().first()
+
+    def claim(
+        self,
+        db: Session,
+        worker_id: str,
+        job_types: Optional[Sequence[str]] = None,
+        limit: int = 1,
+    ) -> List[Job]:
+        """Lease up to limit due jobs to worker_id (commits)."""
+        now = datetime.utcnow()
+        query = db.query(Job.id).filter(
+            Job.status == JobStatus.QUEUED.value,
+            Job.run_at <= now,
+        )
+        if job_types:
+            query = query.filter(Job.job_type.in_(list(job_types)))
+        candidates = [
+            row.id
+            for row in query.order_by(Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ]
+
+        claimed = []
+        for job_id in candidates:
+            # Guarded: another worker may have taken it (SQLite has no row locks)
+            updated = db.query(Job).filter(
+                Job.id == job_id,
+                Job.status == JobStatus.QUEUED.value,
+            ).update({
+                Job.status: JobStatus.RUNNING.value,
+                Job.locked_by: worker_id,
+                Job.locked_at: now,
+                Job.attempts: Job.attempts + 1,
+                Job.updated_at: now,
+            }, synchronize_session=False)
+            if updated:
+                claimed.append(job_id)
+        db.commit()
+
+        if not claimed:
+            return []
+        return db.query(Job).filter(Job.id.in_(claimed)).order_by(Job.run_at, Job.id).all()
+
+    def complete(self, db: Session, job: Job, worker_id: str) -> bool:
+        """
+        Mark a job DONE, committing the handler's changes with it.
+
+        Returns False if worker_id no longer holds the lease (it expired and
+        the job was reclaimed); the handler's changes are still committed.
+        """
+        now = datetime.utcnow()
+        updated = db.query(Job).filter(
+            Job.id == job.id,
+            Job.status == JobStatus.RUNNING.value,
+            Job.locked_by == worker_id,
+        ).update({
+            Job.status: JobStatus.DONE.value,
+            Job.locked_by: None,
+            Job.locked_at: None,
+            Job.last_error: None,
+            Job.finished_at: now,
+            Job.updated_at: now,
+        }, synchronize_session=False)
+        db.commit()
+        if not updated:
+            logger.warning(f"[JobQueue] job {job.id} finished after its lease was lost")
+        return bool(updated)
+
+    def fail(
+        self,
+        db: Session,
+        job: Job,
+        worker_id: str,
+        error: str,
+        permanent: bool = False,
+    ) -> Optional[JobStatus]:
+        """
+        Record a failed attempt (commits).
+
+        Returns QUEUED when the job will be retried, DEAD when it was
+        dead-lettered, None if worker_id no longer holds the lease.
+        """
+        current = db.query(Job).filter(
+            Job.id == job.id,
+            Job.status == JobStatus.RUNNING.value,
+            Job.locked_by == worker_id,
+        ).with_for_update().first()
+        if current is None:
+            db.commit()
+            logger.warning(f"[JobQueue] job {job.id} failed after its lease was lost: {error}")
+            return None
+        status = self._record_failure(db, current, error, permanent)
+        db.commit()
+        return status
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the retry that follows attempt number attempts."""
+        return min(self.backoff_base * (2 ** max(attempts - 1, 0)), self.backoff_max)
+
+    def reclaim_stale(self, db: Session) -> List[Job]:
+        """
+        Fail jobs whose lease expired (their worker died mid-run; commits).
+
+        Returns the jobs that were dead-lettered, so their handlers can
+        settle the rows they own.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lock_timeout)
+        stale = db.query(Job).filter(
+            Job.status == JobStatus.RUNNING.value,
+            Job.locked_at < cutoff,
+        ).with_for_update(skip_locked=True).all()
+
+        dead = [
+            job for job in stale
+            if self._record_failure(db, job, f"Lease expired (worker {job.locked_by})") == JobStatus.DEAD
+        ]
+        db.commit()
+        return dead
+
+    def _record_failure(self, db: Session, job: Job, error: str, permanent: bool = False) -> JobStatus:
+        """
+        Requeue with backoff, or dead-letter; the caller commits.
+
+        A job requeued while a newer one holds its dedupe_key drops the key
+        and is retried alongside it, instead of losing its payload.
+        """
+        job.last_error = error[:MAX_ERROR_CHARS]
+        job.locked_by = None
+        job.locked_at = None
+        if permanent or job.attempts >= job.max_attempts:
+            job.status = JobStatus.DEAD.value
+            job.finished_at = datetime.utcnow()
+            logger.error(
+                f"[JobQueue] job {job.id} ({job.job_type}) dead after "
+                f"{job.attempts} attempt(s): {job.last_error}"
+            )
+        else:
+            if job.dedupe_key and self._queued(db, job.dedupe_key, exclude=job.id) is not None:
+                job.dedupe_key = None
+            delay = self.backoff(job.attempts)
+            job.status = JobStatus.QUEUED.value
+            job.run_at = datetime.utcnow() + timedelta(seconds=delay)
+            logger.warning(
+                f"[JobQueue] job {job.id} ({job.job_type}) attempt {job.attempts} "
+                f"failed, retrying in {delay:.0f}s: {job.last_error}"
+            )
+        db.flush()  # Visible to the next _queued() lookup (no autoflush)
+        return JobStatus(job.status)
+
+    def requeue_dead(self, db: Session, job_type: Optional[str] = None) -> int:
+        """
+        Give dead-lettered jobs a fresh set of attempts (commits).
+
+        Their dedupe keys are dropped: a newer job may hold the key by now.
+        """
+        query = db.query(Job).filter(Job.status == JobStatus.DEAD.value)
+        if job_type:
+            query = query.filter(Job.job_type == job_type)
+        now = datetime.utcnow()
+        count = query.update({
+            Job.status: JobStatus.QUEUED.value,
+            Job.dedupe_key: None,
+            Job.attempts: 0,
+            Job.run_at: now,
+            Job.finished_at: None,
+            Job.updated_at: now,
+        }, synchronize_session=False)
+        db.commit()
+        return count
+
+    def stats(self, db: Session) -> dict:
+        """Job counts by type and status, plus the oldest due job's wait."""
+        counts: Dict[str, Dict[str, int]] = {}
+        rows = db.query(Job.job_type, Job.status, func.count(Job.id)).group_by(
+            Job.job_type, Job.status
+        )
+        for job_type, status, count in rows:
+            counts.setdefault(job_type, {})[status] = count
+
+        oldest = db.query(func.min(Job.run_at)).filter(
+            Job.status == JobStatus.QUEUED.value,
+            Job.run_at <= datetime.utcnow(),
+        ).scalar()
+        return {
+            "counts": counts,
+            "oldest_due_seconds": (
+                round((datetime.utcnow() - oldest).total_seconds(), 1) if oldest else None
+            ),
+            "max_attempts": self.max_attempts,
+            "lock_timeout": self.lock_timeout,
+        }
+
+
+# Singleton instance
+_queue_instance: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create singleton JobQueue."""
+    global _queue_instance
+    if _queue_instance is None:
+        _queue_instance = JobQueue()
+    return _queue_instance
@@ -1,18 +1,22 @@
 # Surepass service package
-from .client import SurepassClient
+from .client import SurepassClient, AsyncSurepassClient
 from .aadhaar import AadhaarService
 from .pan import PANService
 from .uan import UANService
 from .digilocker import DigilockerService
+from .ratelimit import Priority, surepass_priority
 from .exceptions import (
     SurepassError, 
     SurepassTimeoutError, 
     SurepassInvalidInputError,
     SurepassNotAvailableError,
+    SurepassCircuitOpenError,
+    SurepassRateLimitError,
 )
 
 __all__ = [
     "SurepassClient",
+    "AsyncSurepassClient",
     "AadhaarService",
     "PANService", 
     "UANService",
@@ -21,6 +25,10 @@ __all__ = [
     "SurepassTimeoutError",
     "SurepassInvalidInputError",
     "SurepassNotAvailableError",
+    "SurepassCircuitOpenError",
+    "SurepassRateLimitError",
+    "Priority",
+    "surepass_priority",
 ]
 
 
@@ -5,13 +5,15 @@ Flow:
 1. generate_otp(aadhaar_number) → Returns client_id
 2. submit_otp(client_id, otp) → Returns verified Aadhaar data
 3. compare_aadhaar(surepass_data, candidate_data) → Returns comparison result
+
+Every vendor call also has an `*_async` variant for use from async routes.
 """
 
 import logging
 from typing import Optional
 from datetime import datetime
 
-from .client import get_surepass_client
+from .client import get_surepass_client, get_async_surepass_client
 from .exceptions import SurepassError, SurepassInvalidInputError, SurepassNotAvailableError
 from . import mock_responses
 
@@ -23,6 +25,7 @@ class AadhaarService:
     
     def __init__(self):
         self.client = get_surepass_client()
+        self.async_client = get_async_surepass_client()
     
     def validate_aadhaar_number(self, aadhaar_number: str) -> str:
         """Validate and clean Aadhaar number."""
@@ -63,16 +66,37 @@ class AadhaarService:
                 "id_number": cleaned
             })
         except SurepassNotAvailableError as e:
-            logger.warning(f"Aadhaar OTP API not available: {e.message}")
-            return {
-                "status": "NOT_AVAILABLE",
-                "client_id": None,
-                "message": "Aadhaar verification service temporarily unavailable",
-                "error": "API_NOT_AVAILABLE",
-            }
+            return self._otp_not_available(e)
         
         return response
     
+    async def generate_otp_async(self, aadhaar_number: str) -> dict:
+        """Async variant of generate_otp()."""
+        cleaned = self.validate_aadhaar_number(aadhaar_number)
+        
+        if self.async_client.is_mock_mode():
+            logger.info(f"Mock: Generating OTP for Aadhaar XXXX-XXXX-{cleaned[-4:]}")
+            return mock_responses.mock_aadhaar_generate_otp(cleaned)["data"]
+        
+        try:
+            response = await self.async_client.post("aadhaar-v2/generate-otp", {
+                "id_number": cleaned
+            })
+        except SurepassNotAvailableError as e:
+            return self._otp_not_available(e)
+        
+        return response
+    
+    def _otp_not_available(self, error: SurepassNotAvailableError) -> dict:
+        """Graceful degradation for the OTP generation endpoint."""
+        logger.warning(f"Aadhaar OTP API not available: {error.message}")
+        return {
+            "status": "NOT_AVAILABLE",
+            "client_id": None,
+            "message": "Aadhaar verification service temporarily unavailable",
+            "error": "API_NOT_AVAILABLE",
+        }
+    
     def submit_otp(self, client_id: str, otp: str) -> dict:
         """
         Submit OTP and get verified Aadhaar data.
@@ -84,8 +108,7 @@ class AadhaarService:
         Returns:
             Verified Aadhaar data (name, DOB, address, photo, etc.)
         """
-        if not otp or len(otp) != 6 or not otp.isdigit():
-            raise SurepassInvalidInputError("otp", "Must be exactly 6 digits")
+        self._validate_otp(otp)
         
         if self.client.is_mock_mode():
             logger.info(f"Mock: Submitting OTP for client_id {client_id}")
@@ -97,15 +120,42 @@ class AadhaarService:
                 "otp": otp
             })
         except SurepassNotAvailableError as e:
-            logger.warning(f"Aadhaar submit OTP API not available: {e.message}")
-            return {
-                "status": "NOT_AVAILABLE",
-                "message": "Aadhaar verification service temporarily unavailable",
-                "error": "API_NOT_AVAILABLE",
-            }
+            return self._submit_not_available(e)
         
         return response
     
+    async def submit_otp_async(self, client_id: str, otp: str) -> dict:
+        """Async variant of submit_otp()."""
+        self._validate_otp(otp)
+        
+        if self.async_client.is_mock_mode():
+            logger.info(f"Mock: Submitting OTP for client_id {client_id}")
+            return mock_responses.mock_aadhaar_submit_otp(client_id, otp)["data"]
+        
+        try:
+            response = await self.async_client.post("aadhaar-v2/submit-otp", {
+                "client_id": client_id,
+                "otp": otp
+            })
+        except SurepassNotAvailableError as e:
+            return self._submit_not_available(e)
+        
+        return response
+    
+    def _validate_otp(self, otp: str) -> None:
+        """Validate OTP format."""
+        if not otp or len(otp) != 6 or not otp.isdigit():
+            raise SurepassInvalidInputError("otp", "Must be exactly 6 digits")
+    
+    def _submit_not_available(self, error: SurepassNotAvailableError) -> dict:
+        """Graceful degradation for the OTP submission endpoint."""
+        logger.warning(f"Aadhaar submit OTP API not available: {error.message}")
+        return {
+            "status": "NOT_AVAILABLE",
+            "message": "Aadhaar verification service temporarily unavailable",
+            "error": "API_NOT_AVAILABLE",
+        }
+    
     def compare(
         self, 
         surepass_data: dict, 
@@ -194,20 +244,10 @@ class AadhaarService:
         Returns:
             dict containing client_id, token, and redirect url
         """
-        if "localhost" in redirect_url or "127.0.0.1" in redirect_url:
-            logger.warning(
-                f"Aadhaar DigiLocker initiation with local redirect_url: {redirect_url}. "
-                "Note: Surepass Production APIs usually reject localhost/127.0.0.1 and return 403 Forbidden. "
-                "Consider using a tunnel (ngrok) for local testing."
-            )
+        self._warn_local_redirect(redirect_url)
 
         if self.client.is_mock_mode():
-            logger.info("Mock: Initializing DigiLocker flow")
-            return {
-                "client_id": "mock_client_id",
-                "url": redirect_url + "?status=success&client_id=mock_client_id",
-                "expiry_seconds": 1800
-            }
+            return self._mock_digilocker_init(redirect_url)
             
         try:
             response = self.client.post("digilocker/initialize", {
@@ -220,6 +260,43 @@ class AadhaarService:
         except SurepassNotAvailableError as e:
             logger.warning(f"DigiLocker init failed: {e.message}")
             raise
+    
+    async def initiate_digilocker_flow_async(self, redirect_url: str) -> dict:
+        """Async variant of initiate_digilocker_flow()."""
+        self._warn_local_redirect(redirect_url)
+
+        if self.async_client.is_mock_mode():
+            return self._mock_digilocker_init(redirect_url)
+            
+        try:
+            response = await self.async_client.post("digilocker/initialize", {
+                "data": {
+                    "signup_flow": True,
+                    "redirect_url": redirect_url
+                }
+            })
+            return response.get("data", response)
+        except SurepassNotAvailableError as e:
+            logger.warning(f"DigiLocker init failed: {e.message}")
+            raise
+    
+    def _warn_local_redirect(self, redirect_url: str) -> None:
+        """Warn when the redirect URL points at a local host."""
+        if "localhost" in redirect_url or "127.0.0.1" in redirect_url:
+            logger.warning(
+                f"Aadhaar DigiLocker initiation with local redirect_url: {redirect_url}. "
+                "Note: Surepass Production APIs usually reject localhost/127.0.0.1 and return 403 Forbidden. "
+                "Consider using a tunnel (ngrok) for local testing."
+            )
+    
+    def _mock_digilocker_init(self, redirect_url: str) -> dict:
+        """Mock DigiLocker initialization response."""
+        logger.info("Mock: Initializing DigiLocker flow")
+        return {
+            "client_id": "mock_client_id",
+            "url": redirect_url + "?status=success&client_id=mock_client_id",
+            "expiry_seconds": 1800
+        }
             
     def fetch_digilocker_data(self, client_id: str) -> dict:
         """
@@ -242,6 +319,19 @@ class AadhaarService:
         except SurepassNotAvailableError as e:
             logger.warning(f"DigiLocker fetch failed: {e.message}")
             raise
+    
+    async def fetch_digilocker_data_async(self, client_id: str) -> dict:
+        """Async variant of fetch_digilocker_data()."""
+        if self.async_client.is_mock_mode():
+            logger.info(f"Mock: Fetching DigiLocker data for {client_id}")
+            return mock_responses.mock_aadhaar_submit_otp(client_id, "123456")["data"]
+            
+        try:
+            response = await self.async_client.get(f"digilocker/download-aadhaar/{client_id}")
+            return response
+        except SurepassNotAvailableError as e:
+            logger.warning(f"DigiLocker fetch failed: {e.message}")
+            raise
 
 # Singleton instance
 _service_instance: Optional[AadhaarService] = None
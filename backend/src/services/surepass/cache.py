@@ -0,0 +1,372 @@
+"""
+Encrypted, TTL-bounded response cache for Surepass lookups.
+
+Keys are HMAC-SHA256 digests of the endpoint and normalized identifiers, so
+no PAN/UAN ever appears in a cache key. Values are encrypted with
+utils/crypto.encrypt before they are stored in either tier.
+
+Tiers:
+    memory  In-process LRU (always on when the cache is enabled)
+    sqlite  Optional shared tier across processes via a SQLite file
+
+Only successful vendor responses are cached; errors and mock responses
+never are. A 200 OK that reports the record as not found or invalid is
+kept for SUREPASS_CACHE_NEGATIVE_TTL only, so a corrected input or a
+record the vendor updates is seen again within minutes. The cache is
+disabled when DATA_ENCRYPTION_KEY is not set.
+
+The async routes use aget()/aset(), which do shared-tier I/O in a worker
+thread; the in-process tier is read on the calling thread either way.
+
+Environment:
+    SUREPASS_CACHE_ENABLED          true/false (default: true)
+    SUREPASS_CACHE_MAX_ENTRIES      In-process LRU size (default: 1000)
+    SUREPASS_CACHE_TTLS             JSON per-endpoint TTL overrides in seconds,
+                                    e.g. {"pan-verification": 86400}
+    SUREPASS_CACHE_NEGATIVE_TTL     Seconds a not-found/invalid answer stays
+                                    fresh (default: 300, 0 = never cached)
+    SUREPASS_CACHE_SHARED           none | sqlite (default: none)
+    SUREPASS_CACHE_SQLITE_PATH      SQLite file for the shared tier
+    SUREPASS_CACHE_HMAC_KEY         Key for cache-key hashing (default: derived
+                                    from DATA_ENCRYPTION_KEY)
+"""
+
+import os
+import hmac
+import json
+import time
+import asyncio
+import base64
+import hashlib
+import sqlite3
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from ...utils.crypto import encrypt, decrypt, is_encryption_configured, EncryptionError
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds each endpoint's responses stay fresh
+DEFAULT_CACHE_TTLS: Dict[str, int] = {
+    "pan-verification": 24 * 3600,
+    # Employment history changes when a candidate switches jobs
+    "uan-verification": 6 * 3600,
+}
+
+# Field that is truthy only when the vendor found a valid record
+POSITIVE_RESPONSE_FIELDS: Dict[str, str] = {
+    "pan-verification": "valid",
+    "uan-verification": "member_name",
+}
+
+NEGATIVE_CACHE_TTL = int(os.getenv("SUREPASS_CACHE_NEGATIVE_TTL", "300"))
+
+
+def _load_ttls() -> Dict[str, int]:
+    ttls = dict(DEFAULT_CACHE_TTLS)
+    raw = os.getenv("SUREPASS_CACHE_TTLS", "")
+    if raw:
+        try:
+            ttls.update({k: int(v) for k, v in json.loads(raw).items()})
+        except (ValueError, AttributeError):
+            logger.error("SUREPASS_CACHE_TTLS is not valid JSON - using defaults")
+    return ttls
+
+
+def _hmac_key() -> bytes:
+    explicit = os.getenv("SUREPASS_CACHE_HMAC_KEY")
+    if explicit:
+        return explicit.encode("utf-8")
+    # Separate the hashing key from the encryption key it is derived from
+    data_key = base64.b64decode(os.getenv("DATA_ENCRYPTION_KEY", ""))
+    return hmac.new(data_key, b"surepass-cache-key", hashlib.sha256).digest()
+
+
+def normalize_part(value) -> str:
+    """Upper-case and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(str(value or "").upper().split())
+
+
+# ============ Shared Tier ============
+
+class SQLiteCacheTier:
+    """Shared encrypted cache across processes on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv(
+            "SUREPASS_CACHE_SQLITE_PATH",
+            os.path.join(tempfile.gettempdir(), "surepass_cache.sqlite3"),
+        )
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS surepass_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM surepass_cache WHERE key = ?", (key,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO surepass_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM surepass_cache WHERE key = ?", (key,))
+
+    def purge_expired(self) -> None:
+        self._connection().execute(
+            "DELETE FROM surepass_cache WHERE expires_at <= ?", (time.time(),)
+        )
+
+
+def _shared_tier_from_env() -> Optional[SQLiteCacheTier]:
+    shared = os.getenv("SUREPASS_CACHE_SHARED", "none").lower()
+    if shared == "sqlite":
+        return SQLiteCacheTier()
+    if shared != "none":
+        logger.warning(f"Unknown SUREPASS_CACHE_SHARED={shared} - shared tier disabled")
+    return None
+
+
+# ============ Response Cache ============
+
+class SurepassResponseCache:
+    """
+    Two-tier encrypted LRU cache for vendor responses.
+
+    Usage:
+        cache = get_response_cache()
+        response = cache.get("pan-verification", pan, name, dob)
+        if response is None:
+            response = client.post(...)
+            cache.set("pan-verification", response, pan, name, dob)
+    """
+
+    def __init__(self, shared: Optional[SQLiteCacheTier] = None):
+        self.enabled = (
+            os.getenv("SUREPASS_CACHE_ENABLED", "true").lower() == "true"
+            and is_encryption_configured()
+        )
+        if os.getenv("SUREPASS_CACHE_ENABLED", "true").lower() == "true" and not self.enabled:
+            logger.warning("Surepass response cache disabled: DATA_ENCRYPTION_KEY not set")
+
+        self.max_entries = int(os.getenv("SUREPASS_CACHE_MAX_ENTRIES", "1000"))
+        self.ttls = _load_ttls()
+        self.shared = (shared or _shared_tier_from_env()) if self.enabled else None
+        self._key = _hmac_key() if self.enabled else b""
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def is_cacheable(self, endpoint: str) -> bool:
+        return self.enabled and endpoint in self.ttls
+
+    def cache_key(self, endpoint: str, *parts) -> str:
+        """HMAC of the endpoint and normalized identifier parts."""
+        message = "|".join([endpoint, *(normalize_part(p) for p in parts)])
+        return hmac.new(self._key, message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _count(self, endpoint: str, metric: str) -> None:
+        with self._lock:
+            counters = self._metrics.setdefault(
+                endpoint,
+                {"hits_memory": 0, "hits_shared": 0, "misses": 0, "stores": 0, "evictions": 0},
+            )
+            counters[metric] += 1
+
+    def _remember(self, endpoint: str, key: str, value: str, expires_at: float) -> None:
+        """Insert into the in-process LRU, evicting the oldest entries."""
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        for _ in range(evicted):
+            self._count(endpoint, "evictions")
+
+    def _decrypt(self, key: str, value: str) -> Optional[dict]:
+        try:
+            return decrypt(value)
+        except EncryptionError:
+            # Key rotated or entry corrupted - treat as a miss
+            self.invalidate_key(key)
+            return None
+
+    def _get_memory(self, endpoint: str, key: str, now: float) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                else:
+                    del self._entries[key]
+                    entry = None
+
+        if entry is None:
+            return None
+        try:
+            value = decrypt(entry[0])
+        except EncryptionError:
+            # Drop it here only; the shared tier's copy is checked (and dropped) next
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        self._count(endpoint, "hits_memory")
+        return value
+
+    def _get_shared(self, endpoint: str, key: str, now: float) -> Optional[dict]:
+        try:
+            shared_entry = self.shared.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"Surepass shared cache read failed: {e}")
+            return None
+        if shared_entry is None or shared_entry[1] <= now:
+            return None
+        value = self._decrypt(key, shared_entry[0])
+        if value is not None:
+            self._remember(endpoint, key, shared_entry[0], shared_entry[1])
+            self._count(endpoint, "hits_shared")
+        return value
+
+    def get(self, endpoint: str, *parts) -> Optional[dict]:
+        """Return the cached response, or None on miss/expiry/disabled."""
+        if not self.is_cacheable(endpoint):
+            return None
+
+        key = self.cache_key(endpoint, *parts)
+        now = time.time()
+        value = self._get_memory(endpoint, key, now)
+        if value is None and self.shared is not None:
+            value = self._get_shared(endpoint, key, now)
+        if value is None:
+            self._count(endpoint, "misses")
+        return value
+
+    async def aget(self, endpoint: str, *parts) -> Optional[dict]:
+        """get() for the event loop: the shared tier is read in a worker thread."""
+        if not self.is_cacheable(endpoint):
+            return None
+
+        key = self.cache_key(endpoint, *parts)
+        now = time.time()
+        value = self._get_memory(endpoint, key, now)
+        if value is None and self.shared is not None:
+            value = await asyncio.to_thread(self._get_shared, endpoint, key, now)
+        if value is None:
+            self._count(endpoint, "misses")
+        return value
+
+    def ttl_for(self, endpoint: str, response: dict) -> int:
+        """Endpoint TTL, or NEGATIVE_CACHE_TTL for a not-found/invalid answer."""
+        field = POSITIVE_RESPONSE_FIELDS.get(endpoint)
+        if field is not None and not response.get(field):
+            return min(NEGATIVE_CACHE_TTL, self.ttls[endpoint])
+        return self.ttls[endpoint]
+
+    def _prepare(self, endpoint: str, response: dict, parts) -> Optional[Tuple[str, str, float]]:
+        """(key, encrypted value, expiry) for a response worth caching, else None."""
+        if not self.is_cacheable(endpoint) or not isinstance(response, dict):
+            return None
+        ttl = self.ttl_for(endpoint, response)
+        if ttl <= 0:
+            return None
+        return self.cache_key(endpoint, *parts), encrypt(response), time.time() + ttl
+
+    def _set_shared(self, key: str, value: str, expires_at: float) -> None:
+        try:
+            self.shared.set(key, value, expires_at)
+        except sqlite3.Error as e:
+            logger.warning(f"Surepass shared cache write failed: {e}")
+
+    def set(self, endpoint: str, response: dict, *parts) -> None:
+        """Encrypt and store a vendor response (see ttl_for for how long)."""
+        entry = self._prepare(endpoint, response, parts)
+        if entry is None:
+            return
+
+        self._remember(endpoint, *entry)
+        if self.shared is not None:
+            self._set_shared(*entry)
+        self._count(endpoint, "stores")
+
+    async def aset(self, endpoint: str, response: dict, *parts) -> None:
+        """set() for the event loop: the shared tier is written in a worker thread."""
+        entry = self._prepare(endpoint, response, parts)
+        if entry is None:
+            return
+
+        self._remember(endpoint, *entry)
+        if self.shared is not None:
+            await asyncio.to_thread(self._set_shared, *entry)
+        self._count(endpoint, "stores")
+
+    def invalidate(self, endpoint: str, *parts) -> None:
+        """Drop one cached response from both tiers."""
+        if self.enabled:
+            self.invalidate_key(self.cache_key(endpoint, *parts))
+
+    def invalidate_key(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.shared is not None:
+            try:
+                self.shared.delete(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Surepass shared cache delete failed: {e}")
+
+    def clear(self) -> None:
+        """Empty the in-process tier."""
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Configuration plus per-endpoint hit/miss counters."""
+        with self._lock:
+            metrics = {k: dict(v) for k, v in self._metrics.items()}
+            size = len(self._entries)
+        for counters in metrics.values():
+            lookups = counters["hits_memory"] + counters["hits_shared"] + counters["misses"]
+            hits = counters["hits_memory"] + counters["hits_shared"]
+            counters["hit_ratio"] = round(hits / lookups, 3) if lookups else 0.0
+        return {
+            "enabled": self.enabled,
+            "shared_tier": self.shared.name if self.shared else None,
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttls": dict(self.ttls),
+            "negative_ttl": NEGATIVE_CACHE_TTL,
+            "endpoints": metrics,
+        }
+
+
+# Singleton instance
+_cache_instance: Optional[SurepassResponseCache] = None
+
+
+def get_response_cache() -> SurepassResponseCache:
+    """Get or create the process-wide SurepassResponseCache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = SurepassResponseCache()
+    return _cache_instance
@@ -4,13 +4,20 @@ Surepass API client with mock support.
 Features:
 - Bearer token authentication
 - Configurable base URL (sandbox/production)
-- Timeout + single retry
+- Shared keep-alive connection pool (HTTP/2 when available)
+- Async client for use from async routes (AsyncSurepassClient)
+- Per-endpoint retries with capped exponential backoff, jitter and Retry-After
+- Per-endpoint circuit breaker (fail fast during vendor outages)
+- Client-side token-bucket rate limiting per endpoint quota
+- Single-flight coalescing of concurrent identical requests
 - Masked logging (never log full Aadhaar/PAN)
 - Mock mode via SUREPASS_ENABLED flag
 """
 
 import os
 import re
+import time
+import asyncio
 import logging
 import httpx
 from typing import Optional
@@ -25,6 +32,22 @@ from .exceptions import (
     SurepassAuthError,
     SurepassRateLimitError,
     SurepassNotAvailableError,
+    SurepassCircuitOpenError,
+)
+from .resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    get_circuit_breakers,
+    get_retry_policies,
+    parse_retry_after,
+)
+from .ratelimit import get_rate_limiter
+from .singleflight import flight_key, get_single_flight, get_async_single_flight
+from .transport import (
+    endpoint_key,
+    get_surepass_transport,
+    get_async_surepass_transport,
+    aclose_surepass_transports,
 )
 
 # Configure module logger
@@ -41,17 +64,12 @@ def mask_sensitive_data(data: str) -> str:
     return data
 
 
-class SurepassClient:
+class _SurepassClientBase:
     """
-    HTTP client for Surepass API.
-    
-    Usage:
-        client = SurepassClient()
-        response = client.post("pan-verification", {"pan_number": "ABCDE1234F"})
+    Configuration and response handling shared by the sync and async clients.
     """
     
     DEFAULT_TIMEOUT = 10.0  # seconds
-    MAX_RETRIES = 1
     
     def __init__(self):
         self.enabled = os.getenv("SUREPASS_ENABLED", "false").lower() == "true"
@@ -60,11 +78,14 @@ class SurepassClient:
             "https://sandbox.surepass.io/api/v1"
         ).rstrip("/")
         self.api_key = os.getenv("SUREPASS_API_KEY", "")
+        self.retry_policies = get_retry_policies()
+        self.breakers = get_circuit_breakers()
+        self.rate_limiter = get_rate_limiter()
         
         # LOGGING REINFORCEMENT
-        logger.info(f"[SurepassClient Init] enabled={self.enabled}, base_url={self.base_url}")
-        logger.info(f"[SurepassClient Init] api_key_length={len(self.api_key)}")
-        logger.info(f"[SurepassClient Init] environment={os.getenv('ENVIRONMENT')}")
+        logger.info(f"[{type(self).__name__} Init] enabled={self.enabled}, base_url={self.base_url}")
+        logger.info(f"[{type(self).__name__} Init] api_key_length={len(self.api_key)}")
+        logger.info(f"[{type(self).__name__} Init] environment={os.getenv('ENVIRONMENT')}")
         
         if self.enabled and not self.api_key:
             logger.warning("SUREPASS_ENABLED=true but SUREPASS_API_KEY is not set!")
@@ -77,21 +98,164 @@ class SurepassClient:
             "Accept": "application/json",
         }
     
+    def _build_url(self, method: str, endpoint: str, payload: Optional[dict]) -> str:
+        """Build the full URL and log the request (masked)."""
+        masked_payload = mask_sensitive_data(str(payload)) if payload else "{}"
+        logger.info(f"Surepass request: {method} {endpoint} - {masked_payload}")
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+    
+    def _acquire_breaker(self, endpoint: str) -> CircuitBreaker:
+        """
+        Get the endpoint's circuit breaker, failing fast if it is open.
+        
+        Raises:
+            SurepassCircuitOpenError: If the breaker rejects the call
+        """
+        breaker = self.breakers.get(endpoint_key(endpoint))
+        if not breaker.allow_request():
+            logger.warning(f"Surepass circuit open, failing fast: {endpoint}")
+            raise SurepassCircuitOpenError(endpoint, retry_after=breaker.retry_after())
+        return breaker
+    
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker, status_code: Optional[int]) -> None:
+        """Timeouts, transport errors and 5xx count against the breaker; any other response closes it."""
+        if status_code is None or status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    
+    def _retry_delay(
+        self,
+        policy: RetryPolicy,
+        attempt: int,
+        endpoint: str,
+        response: Optional[httpx.Response] = None
+    ) -> Optional[float]:
+        """
+        Seconds to back off before the next attempt, or None to stop retrying.
+        
+        `response` is None for a timeout.
+        """
+        if response is None:
+            if not policy.retry_timeouts:
+                return None
+            reason = "timeout"
+            delay = policy.next_delay(attempt)
+        else:
+            if response.status_code not in policy.retry_statuses:
+                return None
+            reason = f"HTTP {response.status_code}"
+            delay = policy.next_delay(
+                attempt, parse_retry_after(response.headers.get("Retry-After"))
+            )
+        
+        if delay is not None:
+            logger.warning(
+                f"Surepass {reason} on {endpoint}, retrying in {delay:.2f}s "
+                f"({attempt + 1}/{policy.max_retries})"
+            )
+        return delay
+    
+    def _parse_response(self, response: httpx.Response, endpoint: str) -> dict:
+        """
+        Map HTTP status to Surepass exceptions and parse the JSON body.
+        
+        Raises:
+            SurepassNotAvailableError: On 404
+            SurepassAuthError: On 401
+            SurepassRateLimitError: On 429
+            SurepassError: On 5xx or invalid JSON
+        """
+        # Log response status
+        logger.info(f"Surepass response ({endpoint}): {response.status_code}")
+        
+        # Handle HTTP errors
+        if response.status_code == 404:
+            # Endpoint not available - graceful degradation
+            logger.warning(f"Surepass endpoint not available (404): {endpoint}")
+            raise SurepassNotAvailableError(endpoint)
+        elif response.status_code == 401:
+            logger.error(f"Surepass Auth Failed (401) for {endpoint}")
+            raise SurepassAuthError()
+        elif response.status_code == 429:
+            raise SurepassRateLimitError(
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
+        elif response.status_code >= 500:
+            raise SurepassError(
+                message=f"Surepass server error: {response.status_code}",
+                status_code=response.status_code
+            )
+        
+        # Parse response
+        try:
+            data = response.json()
+            if not isinstance(data, (dict, list)):
+                logger.error(f"Surepass returned non-json-object ({type(data)}): {data}")
+            return data
+        except Exception as e:
+            logger.error(f"Failed to parse Surepass response: {str(e)}")
+            raise SurepassError(
+                message="Invalid JSON response from Surepass",
+                status_code=response.status_code
+            )
+    
+    @staticmethod
+    def _unwrap(response):
+        """Extract data if wrapped in a "data" key."""
+        if isinstance(response, dict) and "data" in response:
+            return response["data"]
+        return response
+    
+    def is_mock_mode(self) -> bool:
+        """Check if client is in mock mode."""
+        return not self.enabled
+    
+    def pool_stats(self) -> dict:
+        """Connection pool and per-endpoint request stats."""
+        return get_surepass_transport().pool_stats()
+    
+    def breaker_states(self) -> dict:
+        """Per-endpoint circuit breaker state."""
+        return self.breakers.snapshot()
+    
+    def rate_limit_stats(self) -> dict:
+        """Configured quotas and grant/queue/shed counters."""
+        return self.rate_limiter.snapshot()
+    
+    def single_flight_stats(self) -> dict:
+        """Upstream calls vs. coalesced followers per endpoint."""
+        return get_single_flight().stats.snapshot()
+
+
+class SurepassClient(_SurepassClientBase):
+    """
+    HTTP client for Surepass API.
+    
+    Usage:
+        client = SurepassClient()
+        response = client.post("pan-verification", {"pan_number": "ABCDE1234F"})
+    """
+    
+    def __init__(self):
+        self.transport = get_surepass_transport()
+        self.single_flight = get_single_flight()
+        super().__init__()
+    
     def _make_request(
         self, 
         method: str, 
         endpoint: str, 
-        payload: Optional[dict] = None,
-        retry_count: int = 0
+        payload: Optional[dict] = None
     ) -> dict:
         """
-        Make HTTP request to Surepass API.
+        Make HTTP request to Surepass API, retrying per the endpoint's policy.
         
         Args:
             method: HTTP method (GET, POST)
             endpoint: API endpoint (e.g., "pan-verification")
             payload: Request body (for POST)
-            retry_count: Current retry attempt
             
         Returns:
             Response JSON as dict
@@ -99,63 +263,57 @@ class SurepassClient:
         Raises:
             SurepassError: On API errors
             SurepassTimeoutError: On timeout
+            SurepassCircuitOpenError: If the endpoint's circuit breaker is open
+            SurepassRateLimitError: If the local quota sheds the request
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        
-        # Log request (masked)
-        masked_payload = mask_sensitive_data(str(payload)) if payload else "{}"
-        logger.info(f"Surepass request: {method} {endpoint} - {masked_payload}")
+        url = self._build_url(method, endpoint, payload)
+        key = endpoint_key(endpoint)
+        policy = self.retry_policies.for_endpoint(key)
+        attempt = 0
         
-        try:
-            with httpx.Client(timeout=self.DEFAULT_TIMEOUT) as client:
+        while True:
+            breaker = self._acquire_breaker(endpoint)
+            try:
+                self.rate_limiter.acquire(key)
+            except BaseException:
+                # Shed or cancelled before sending: free a half-open trial slot
+                breaker.release()
+                raise
+            
+            try:
                 if method.upper() == "GET":
-                    response = client.get(url, headers=self._get_headers())
-                else:  # POST
-                    response = client.post(url, headers=self._get_headers(), json=payload)
-                
-                # Log response status
-                logger.info(f"Surepass response ({endpoint}): {response.status_code}")
-                
-                # Handle HTTP errors
-                if response.status_code == 404:
-                    # Endpoint not available - graceful degradation
-                    logger.warning(f"Surepass endpoint not available (404): {endpoint}")
-                    raise SurepassNotAvailableError(endpoint)
-                elif response.status_code == 401:
-                    logger.error(f"Surepass Auth Failed (401) for {endpoint}")
-                    raise SurepassAuthError()
-                elif response.status_code == 429:
-                    raise SurepassRateLimitError()
-                elif response.status_code >= 500:
-                    if retry_count < self.MAX_RETRIES:
-                        logger.warning(f"Surepass 5xx error, retrying ({retry_count + 1}/{self.MAX_RETRIES})")
-                        return self._make_request(method, endpoint, payload, retry_count + 1)
-                    raise SurepassError(
-                        message=f"Surepass server error: {response.status_code}",
-                        status_code=response.status_code
+                    response = self.transport.request(
+                        "GET", url, endpoint, headers=self._get_headers()
                     )
-                
-                # Parse response
-                try:
-                    data = response.json()
-                    if not isinstance(data, (dict, list)):
-                        logger.error(f"Surepass returned non-json-object ({type(data)}): {data}")
-                    return data
-                except Exception as e:
-                    logger.error(f"Failed to parse Surepass response: {str(e)}")
-                    raise SurepassError(
-                        message="Invalid JSON response from Surepass",
-                        status_code=response.status_code
+                else:  # POST
+                    response = self.transport.request(
+                        "POST", url, endpoint, headers=self._get_headers(), json=payload
                     )
-                    
-        except httpx.TimeoutException:
-            if retry_count < self.MAX_RETRIES:
-                logger.warning(f"Surepass timeout, retrying ({retry_count + 1}/{self.MAX_RETRIES})")
-                return self._make_request(method, endpoint, payload, retry_count + 1)
-            raise SurepassTimeoutError(endpoint)
-        except httpx.RequestError as e:
-            logger.error(f"Surepass request failed: {str(e)}")
-            raise SurepassError(message=f"Request failed: {str(e)}")
+            except httpx.TimeoutException:
+                self._record_outcome(breaker, None)
+                delay = self._retry_delay(policy, attempt, endpoint)
+                if delay is None:
+                    raise SurepassTimeoutError(endpoint)
+            except httpx.RequestError as e:
+                self._record_outcome(breaker, None)
+                logger.error(f"Surepass request failed: {str(e)}")
+                raise SurepassError(message=f"Request failed: {str(e)}")
+            except Exception:
+                # Anything else the transport raises (e.g. h2 protocol errors) is a failed call
+                self._record_outcome(breaker, None)
+                raise
+            except BaseException:
+                # Cancelled mid-call: no outcome, but a half-open trial must not stay taken
+                breaker.release()
+                raise
+            else:
+                self._record_outcome(breaker, response.status_code)
+                delay = self._retry_delay(policy, attempt, endpoint, response)
+                if delay is None:
+                    return self._parse_response(response, endpoint)
+            
+            time.sleep(delay)
+            attempt += 1
     
     def post(self, endpoint: str, payload: dict) -> dict:
         """
@@ -172,12 +330,11 @@ class SurepassClient:
             logger.info(f"[SurepassClient] MOCK MODE ACTIVE for POST {endpoint}")
             return None
         
-        response = self._make_request("POST", endpoint, payload)
-        
-        # Extract data if wrapped
-        if isinstance(response, dict) and "data" in response:
-            return response["data"]
-        return response
+        response = self.single_flight.do(
+            flight_key("POST", endpoint, payload),
+            lambda: self._make_request("POST", endpoint, payload),
+        )
+        return self._unwrap(response)
     
     def get(self, endpoint: str) -> dict:
         """Make GET request to Surepass API."""
@@ -185,19 +342,114 @@ class SurepassClient:
             logger.info(f"[SurepassClient] MOCK MODE ACTIVE for GET {endpoint}")
             return None
         
-        response = self._make_request("GET", endpoint)
+        response = self.single_flight.do(
+            flight_key("GET", endpoint),
+            lambda: self._make_request("GET", endpoint),
+        )
+        return self._unwrap(response)
+
+
+class AsyncSurepassClient(_SurepassClientBase):
+    """
+    Async HTTP client for Surepass API, built on httpx.AsyncClient.
+    
+    Same behaviour as SurepassClient, but awaits vendor calls so async
+    routes don't block the event loop while Surepass responds.
+    
+    Usage:
+        client = get_async_surepass_client()
+        response = await client.post("pan-verification", {"pan_number": "ABCDE1234F"})
+    """
+    
+    def __init__(self):
+        self.transport = get_async_surepass_transport()
+        self.single_flight = get_async_single_flight()
+        super().__init__()
+    
+    async def _make_request(
+        self, 
+        method: str, 
+        endpoint: str, 
+        payload: Optional[dict] = None
+    ) -> dict:
+        """Async variant of SurepassClient._make_request (backs off with asyncio.sleep)."""
+        url = self._build_url(method, endpoint, payload)
+        key = endpoint_key(endpoint)
+        policy = self.retry_policies.for_endpoint(key)
+        attempt = 0
+        
+        while True:
+            breaker = self._acquire_breaker(endpoint)
+            try:
+                await self.rate_limiter.acquire_async(key)
+            except BaseException:
+                # Shed or cancelled before sending: free a half-open trial slot
+                breaker.release()
+                raise
+            
+            try:
+                if method.upper() == "GET":
+                    response = await self.transport.request(
+                        "GET", url, endpoint, headers=self._get_headers()
+                    )
+                else:  # POST
+                    response = await self.transport.request(
+                        "POST", url, endpoint, headers=self._get_headers(), json=payload
+                    )
+            except httpx.TimeoutException:
+                self._record_outcome(breaker, None)
+                delay = self._retry_delay(policy, attempt, endpoint)
+                if delay is None:
+                    raise SurepassTimeoutError(endpoint)
+            except httpx.RequestError as e:
+                self._record_outcome(breaker, None)
+                logger.error(f"Surepass request failed: {str(e)}")
+                raise SurepassError(message=f"Request failed: {str(e)}")
+            except Exception:
+                # Anything else the transport raises (e.g. h2 protocol errors) is a failed call
+                self._record_outcome(breaker, None)
+                raise
+            except BaseException:
+                # Cancelled mid-call: no outcome, but a half-open trial must not stay taken
+                breaker.release()
+                raise
+            else:
+                self._record_outcome(breaker, response.status_code)
+                delay = self._retry_delay(policy, attempt, endpoint, response)
+                if delay is None:
+                    return self._parse_response(response, endpoint)
+            
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def post(self, endpoint: str, payload: dict) -> dict:
+        """Make async POST request to Surepass API."""
+        if not self.enabled:
+            logger.info(f"[AsyncSurepassClient] MOCK MODE ACTIVE for POST {endpoint}")
+            return None
         
-        if isinstance(response, dict) and "data" in response:
-            return response["data"]
-        return response
+        response = await self.single_flight.do(
+            flight_key("POST", endpoint, payload),
+            lambda: self._make_request("POST", endpoint, payload),
+        )
+        return self._unwrap(response)
     
-    def is_mock_mode(self) -> bool:
-        """Check if client is in mock mode."""
-        return not self.enabled
+    async def get(self, endpoint: str) -> dict:
+        """Make async GET request to Surepass API."""
+        if not self.enabled:
+            logger.info(f"[AsyncSurepassClient] MOCK MODE ACTIVE for GET {endpoint}")
+            return None
+        
+        response = await self.single_flight.do(
+            flight_key("GET", endpoint),
+            lambda: self._make_request("GET", endpoint),
+        )
+        return self._unwrap(response)
 
 
-# Singleton instance for easy import
+# Singleton instances for easy import
 _client_instance: Optional[SurepassClient] = None
+_async_client_instance: Optional[AsyncSurepassClient] = None
 
 
 def get_surepass_client() -> SurepassClient:
@@ -206,3 +458,16 @@ def get_surepass_client() -> SurepassClient:
     if _client_instance is None:
         _client_instance = SurepassClient()
     return _client_instance
+
+
+def get_async_surepass_client() -> AsyncSurepassClient:
+    """Get or create singleton AsyncSurepassClient instance."""
+    global _async_client_instance
+    if _async_client_instance is None:
+        _async_client_instance = AsyncSurepassClient()
+    return _async_client_instance
+
+
+async def close_surepass_clients() -> None:
+    """Release pooled Surepass connections (FastAPI shutdown hook)."""
+    await aclose_surepass_transports()
@@ -15,7 +15,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
-from .client import get_surepass_client
+from .client import get_surepass_client, get_async_surepass_client
 from .exceptions import SurepassInvalidInputError, SurepassNotAvailableError
 from .contracts import VerificationStepStatus, not_available_result
 
@@ -46,6 +46,7 @@ class DigilockerService:
     
     def __init__(self):
         self.client = get_surepass_client()
+        self.async_client = get_async_surepass_client()
     
     def init_session(
         self, 
@@ -77,14 +78,32 @@ class DigilockerService:
                 "documents": doc_codes,
             })
         except SurepassNotAvailableError as e:
-            logger.warning(f"DigiLocker init API not available: {e.message}")
-            return {
-                "status": "NOT_AVAILABLE",
-                "redirect_url": None,
-                "session_id": None,
-                "message": "DigiLocker service temporarily unavailable",
-                "error": "API_NOT_AVAILABLE",
-            }
+            return self._init_not_available(e)
+        
+        return response
+    
+    async def init_session_async(
+        self, 
+        callback_url: str,
+        documents: List[DigilockerDocType] = None
+    ) -> dict:
+        """Async variant of init_session()."""
+        if documents is None:
+            documents = [DigilockerDocType.AADHAAR]
+        
+        doc_codes = [d.value for d in documents]
+        
+        if self.async_client.is_mock_mode():
+            logger.info(f"Mock: Initializing DigiLocker for docs={doc_codes}")
+            return self._mock_init_response(callback_url, doc_codes)
+        
+        try:
+            response = await self.async_client.post(self.ENDPOINT_INIT, {
+                "callback_url": callback_url,
+                "documents": doc_codes,
+            })
+        except SurepassNotAvailableError as e:
+            return self._init_not_available(e)
         
         return response
     
@@ -110,16 +129,49 @@ class DigilockerService:
                 "session_id": session_id,
             })
         except SurepassNotAvailableError as e:
-            logger.warning(f"DigiLocker fetch API not available: {e.message}")
-            return {
-                "status": "NOT_AVAILABLE",
-                "documents": [],
-                "message": "DigiLocker service temporarily unavailable",
-                "error": "API_NOT_AVAILABLE",
-            }
+            return self._fetch_not_available(e)
         
         return response
     
+    async def fetch_documents_async(self, session_id: str) -> dict:
+        """Async variant of fetch_documents()."""
+        if not session_id:
+            raise SurepassInvalidInputError("session_id", "Required")
+        
+        if self.async_client.is_mock_mode():
+            logger.info(f"Mock: Fetching DigiLocker docs for session={session_id}")
+            return self._mock_fetch_response(session_id)
+        
+        try:
+            response = await self.async_client.post(self.ENDPOINT_FETCH, {
+                "session_id": session_id,
+            })
+        except SurepassNotAvailableError as e:
+            return self._fetch_not_available(e)
+        
+        return response
+    
+    def _init_not_available(self, error: SurepassNotAvailableError) -> dict:
+        """Graceful degradation for the init endpoint."""
+        logger.warning(f"DigiLocker init API not available: {error.message}")
+        return {
+            "status": "NOT_AVAILABLE",
+            "redirect_url": None,
+            "session_id": None,
+            "message": "DigiLocker service temporarily unavailable",
+            "error": "API_NOT_AVAILABLE",
+        }
+    
+    def _fetch_not_available(self, error: SurepassNotAvailableError) -> dict:
+        """Graceful degradation for the fetch endpoint."""
+        logger.warning(f"DigiLocker fetch API not available: {error.message}")
+        return {
+            "status": "NOT_AVAILABLE",
+            "documents": [],
+            "message": "DigiLocker service temporarily unavailable",
+            "error": "API_NOT_AVAILABLE",
+        }
+    
     def parse_document(self, doc_type: DigilockerDocType, doc_data: dict) -> dict:
         """
         Parse identity fields from DigiLocker document.
@@ -46,11 +46,12 @@ class SurepassAuthError(SurepassError):
 class SurepassRateLimitError(SurepassError):
     """Raised when rate limit is exceeded."""
     
-    def __init__(self):
+    def __init__(self, retry_after: float = None):
         super().__init__(
             message="Surepass rate limit exceeded - try again later",
             status_code=429
         )
+        self.retry_after = retry_after
 
 
 class SurepassNotAvailableError(SurepassError):
@@ -72,3 +73,18 @@ class SurepassNotAvailableError(SurepassError):
         )
         self.endpoint = endpoint
 
+
+class SurepassCircuitOpenError(SurepassNotAvailableError):
+    """
+    Raised without calling Surepass when the endpoint's circuit breaker is open.
+    
+    Subclasses SurepassNotAvailableError so services degrade to NOT_AVAILABLE
+    exactly as they do for a missing endpoint.
+    """
+    
+    def __init__(self, endpoint: str, retry_after: float = None):
+        super().__init__(endpoint)
+        self.message = f"Surepass endpoint temporarily disabled (circuit open): {endpoint}"
+        self.status_code = 503
+        self.retry_after = retry_after
+        self.args = (self.message,)
@@ -10,7 +10,8 @@ import re
 from typing import Optional
 from datetime import datetime
 
-from .client import get_surepass_client
+from .client import get_surepass_client, get_async_surepass_client
+from .cache import get_response_cache
 from .exceptions import SurepassInvalidInputError, SurepassNotAvailableError
 from . import mock_responses
 
@@ -22,6 +23,8 @@ class PANService:
     
     def __init__(self):
         self.client = get_surepass_client()
+        self.async_client = get_async_surepass_client()
+        self.cache = get_response_cache()
     
     def validate_pan_number(self, pan_number: str) -> str:
         """Validate and clean PAN number."""
@@ -57,32 +60,69 @@ class PANService:
         cleaned_pan = self.validate_pan_number(pan_number)
         
         if self.client.is_mock_mode():
-            logger.info(f"Mock: Verifying PAN XXXXX{cleaned_pan[5:9]}X")
-            response = mock_responses.mock_pan_verification(cleaned_pan, name, dob)["data"]
+            response = self._mock_response(cleaned_pan, name, dob)
         else:
-            try:
-                response = self.client.post("pan-verification", {
-                    "pan_number": cleaned_pan,
-                    "name": name,
-                    "dob": dob
-                })
-            except SurepassNotAvailableError as e:
-                # Graceful degradation - API endpoint not available
-                logger.warning(f"PAN API not available: {e.message}")
-                return {
-                    "status": "NOT_AVAILABLE",
-                    "score": 0,
-                    "message": "PAN verification service temporarily unavailable",
-                    "details": {
+            # name/dob are part of the key: Surepass returns name_match/dob_match for them
+            response = self.cache.get("pan-verification", cleaned_pan, name, dob)
+            if response is None:
+                try:
+                    response = self.client.post("pan-verification", {
                         "pan_number": cleaned_pan,
-                        "error": "API_NOT_AVAILABLE",
-                        "reason": "Surepass endpoint not configured",
-                    },
-                    "verified_at": None,
-                }
+                        "name": name,
+                        "dob": dob
+                    })
+                except SurepassNotAvailableError as e:
+                    return self._not_available_result(cleaned_pan, e)
+                self.cache.set("pan-verification", response, cleaned_pan, name, dob)
         
         return self._process_response(response, cleaned_pan)
     
+    async def verify_async(
+        self, 
+        pan_number: str, 
+        name: str, 
+        dob: str
+    ) -> dict:
+        """Async variant of verify() - awaits Surepass instead of blocking."""
+        cleaned_pan = self.validate_pan_number(pan_number)
+        
+        if self.async_client.is_mock_mode():
+            response = self._mock_response(cleaned_pan, name, dob)
+        else:
+            response = await self.cache.aget("pan-verification", cleaned_pan, name, dob)
+            if response is None:
+                try:
+                    response = await self.async_client.post("pan-verification", {
+                        "pan_number": cleaned_pan,
+                        "name": name,
+                        "dob": dob
+                    })
+                except SurepassNotAvailableError as e:
+                    return self._not_available_result(cleaned_pan, e)
+                await self.cache.aset("pan-verification", response, cleaned_pan, name, dob)
+        
+        return self._process_response(response, cleaned_pan)
+    
+    def _mock_response(self, pan_number: str, name: str, dob: str) -> dict:
+        """Mock Surepass PAN response."""
+        logger.info(f"Mock: Verifying PAN XXXXX{pan_number[5:9]}X")
+        return mock_responses.mock_pan_verification(pan_number, name, dob)["data"]
+    
+    def _not_available_result(self, pan_number: str, error: SurepassNotAvailableError) -> dict:
+        """Graceful degradation - API endpoint not available."""
+        logger.warning(f"PAN API not available: {error.message}")
+        return {
+            "status": "NOT_AVAILABLE",
+            "score": 0,
+            "message": "PAN verification service temporarily unavailable",
+            "details": {
+                "pan_number": pan_number,
+                "error": "API_NOT_AVAILABLE",
+                "reason": "Surepass endpoint not configured",
+            },
+            "verified_at": None,
+        }
+    
     def _process_response(self, response: dict, pan_number: str) -> dict:
         """Process Surepass response and determine verification status."""
         
@@ -0,0 +1,401 @@
+"""
+Client-side token-bucket rate limiter for Surepass quotas.
+
+Each configured endpoint (or endpoint family such as "aadhaar-v2/*") has:
+- a per-second token bucket (rate + burst)
+- an optional per-day quota (fixed UTC-day window)
+
+Requests that would exceed the bucket wait for a token (queue) up to a
+maximum wait, then are shed with SurepassRateLimitError. An exhausted daily
+quota is shed immediately.
+
+Priorities:
+    Live candidate traffic may drain the bucket completely. Batch traffic
+    (wrap it in `with surepass_priority(Priority.BATCH):`) must leave a
+    reserve of the burst and the daily quota for live traffic.
+
+Backends:
+    memory  In-process (default)
+    sqlite  Shared across processes via a SQLite file
+
+Environment:
+    SUREPASS_RATE_LIMIT_ENABLED         true/false (default: true)
+    SUREPASS_RATE_LIMIT_BACKEND         memory | sqlite (default: memory)
+    SUREPASS_RATE_LIMIT_SQLITE_PATH     SQLite file for the shared backend
+    SUREPASS_RATE_LIMITS                JSON overrides, e.g.
+                                        {"pan-verification": {"per_second": 5, "burst": 10, "per_day": 50000}}
+    SUREPASS_RATE_LIMIT_MAX_WAIT        Max queueing for live traffic in seconds (default: 2)
+    SUREPASS_RATE_LIMIT_BATCH_MAX_WAIT  Max queueing for batch traffic in seconds (default: 30)
+    SUREPASS_RATE_LIMIT_BATCH_RESERVE   Fraction kept back from batch traffic (default: 0.2)
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from fnmatch import fnmatchcase
+from typing import Dict, Optional, Tuple
+
+from .exceptions import SurepassRateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+# ============ Configuration ============
+
+class Priority(str, Enum):
+    LIVE = "live"
+    BATCH = "batch"
+
+
+_current_priority: ContextVar[Priority] = ContextVar("surepass_priority", default=Priority.LIVE)
+
+
+@contextmanager
+def surepass_priority(priority: Priority):
+    """
+    Run Surepass calls in this block (sync or async) at the given priority.
+
+    Usage:
+        with surepass_priority(Priority.BATCH):
+            get_pan_service().verify(...)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+@dataclass(frozen=True)
+class EndpointLimit:
+    """Quota for one endpoint or endpoint family."""
+    per_second: float
+    burst: int
+    per_day: Optional[int] = None
+
+
+# Keys are endpoint templates (see transport.endpoint_key) or fnmatch patterns.
+# Every endpoint matching a pattern shares that pattern's bucket.
+DEFAULT_ENDPOINT_LIMITS: Dict[str, EndpointLimit] = {
+    "pan-verification": EndpointLimit(per_second=3.0, burst=5),
+    "uan-verification": EndpointLimit(per_second=2.0, burst=5),
+    "aadhaar-v2/*": EndpointLimit(per_second=1.5, burst=3),
+    "digilocker/*": EndpointLimit(per_second=2.0, burst=5),
+}
+
+
+def _load_limits() -> Dict[str, EndpointLimit]:
+    """Defaults merged with SUREPASS_RATE_LIMITS JSON overrides."""
+    limits = dict(DEFAULT_ENDPOINT_LIMITS)
+    raw = os.getenv("SUREPASS_RATE_LIMITS", "")
+    if not raw:
+        return limits
+    try:
+        overrides = json.loads(raw)
+    except ValueError:
+        logger.error("SUREPASS_RATE_LIMITS is not valid JSON - using defaults")
+        return limits
+    for pattern, fields in overrides.items():
+        base = limits.get(pattern)
+        merged = {**asdict(base), **fields} if base else fields
+        limits[pattern] = EndpointLimit(**merged)
+    return limits
+
+
+# ============ Token Bucket ============
+
+@dataclass
+class BucketState:
+    tokens: float
+    updated: float
+    day: str = ""
+    day_count: int = 0
+
+
+def _utc_day(now: float) -> str:
+    return datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _seconds_until_utc_midnight(now: float) -> float:
+    current = datetime.fromtimestamp(now, timezone.utc)
+    midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - current).total_seconds()
+
+
+def take_token(
+    state: Optional[BucketState],
+    limit: EndpointLimit,
+    now: float,
+    reserve: float = 0.0,
+) -> Tuple[BucketState, Optional[float]]:
+    """
+    Try to take one token. Pure function shared by every backend.
+
+    `reserve` is the fraction of burst and daily quota the caller must leave
+    untouched (0 for live traffic).
+
+    Returns:
+        (new_state, wait) where wait is 0.0 if the token was taken, the
+        seconds until one is available, or None if the daily quota is spent.
+    """
+    if state is None:
+        state = BucketState(tokens=float(limit.burst), updated=now)
+
+    tokens = min(float(limit.burst), state.tokens + max(0.0, now - state.updated) * limit.per_second)
+    today = _utc_day(now)
+    day_count = state.day_count if state.day == today else 0
+    new_state = BucketState(tokens=tokens, updated=now, day=today, day_count=day_count)
+
+    if limit.per_day is not None and day_count + 1 > limit.per_day * (1 - reserve):
+        return new_state, None
+
+    floor = limit.burst * reserve
+    if tokens - 1 < floor:
+        return new_state, (floor + 1 - tokens) / limit.per_second
+
+    new_state.tokens = tokens - 1
+    new_state.day_count = day_count + 1
+    return new_state, 0.0
+
+
+# ============ Backends ============
+
+class RateLimitBackend:
+    """Stores bucket state; `acquire` must be atomic for its scope."""
+
+    name = "base"
+    # acquire may block on I/O (async callers run it in a thread)
+    blocking = False
+
+    def acquire(self, key: str, limit: EndpointLimit, reserve: float) -> Optional[float]:
+        raise NotImplementedError
+
+
+class MemoryBackend(RateLimitBackend):
+    """Per-process buckets (default)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, BucketState] = {}
+
+    def acquire(self, key: str, limit: EndpointLimit, reserve: float) -> Optional[float]:
+        with self._lock:
+            state, wait = take_token(self._buckets.get(key), limit, time.time(), reserve)
+            self._buckets[key] = state
+            return wait
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Buckets shared by every process on the host through a SQLite file.
+
+    Each acquire runs in a BEGIN IMMEDIATE transaction, so read-modify-write
+    is serialized across processes.
+    """
+
+    name = "sqlite"
+    blocking = True  # BEGIN IMMEDIATE waits up to 5s for other processes
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv(
+            "SUREPASS_RATE_LIMIT_SQLITE_PATH",
+            os.path.join(tempfile.gettempdir(), "surepass_ratelimit.sqlite3"),
+        )
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS surepass_buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL,"
+            " day TEXT NOT NULL, day_count INTEGER NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key: str, limit: EndpointLimit, reserve: float) -> Optional[float]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated, day, day_count FROM surepass_buckets WHERE key = ?",
+                (key,),
+            ).fetchone()
+            state, wait = take_token(BucketState(*row) if row else None, limit, time.time(), reserve)
+            conn.execute(
+                "INSERT OR REPLACE INTO surepass_buckets (key, tokens, updated, day, day_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, state.tokens, state.updated, state.day, state.day_count),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+def _backend_from_env() -> RateLimitBackend:
+    backend = os.getenv("SUREPASS_RATE_LIMIT_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        return SQLiteBackend()
+    if backend != "memory":
+        logger.warning(f"Unknown SUREPASS_RATE_LIMIT_BACKEND={backend} - using memory")
+    return MemoryBackend()
+
+
+# ============ Limiter ============
+
+class SurepassRateLimiter:
+    """
+    Resolves an endpoint to its quota and blocks (or sheds) until a token is free.
+
+    Usage:
+        limiter = get_rate_limiter()
+        limiter.acquire("pan-verification")          # sync callers
+        await limiter.acquire_async("pan-verification")
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, EndpointLimit]] = None,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.enabled = os.getenv("SUREPASS_RATE_LIMIT_ENABLED", "true").lower() == "true"
+        self.limits = limits if limits is not None else _load_limits()
+        self.backend = backend or _backend_from_env()
+        self.max_wait = {
+            Priority.LIVE: float(os.getenv("SUREPASS_RATE_LIMIT_MAX_WAIT", "2")),
+            Priority.BATCH: float(os.getenv("SUREPASS_RATE_LIMIT_BATCH_MAX_WAIT", "30")),
+        }
+        self.batch_reserve = float(os.getenv("SUREPASS_RATE_LIMIT_BATCH_RESERVE", "0.2"))
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def resolve(self, endpoint: str) -> Optional[Tuple[str, EndpointLimit]]:
+        """Find the quota key and limit for an endpoint template."""
+        if endpoint in self.limits:
+            return endpoint, self.limits[endpoint]
+        for pattern, limit in self.limits.items():
+            if fnmatchcase(endpoint, pattern):
+                return pattern, limit
+        return None
+
+    def _count(self, key: str, outcome: str) -> None:
+        with self._stats_lock:
+            counters = self._stats.setdefault(key, {"granted": 0, "queued": 0, "shed": 0})
+            counters[outcome] += 1
+
+    def _poll(self, endpoint: str) -> Tuple[Optional[str], Optional[float], float]:
+        """
+        One acquisition attempt.
+
+        Returns:
+            (key, wait, budget) - key None means unlimited; wait as in take_token.
+        """
+        if not self.enabled:
+            return None, 0.0, 0.0
+        resolved = self.resolve(endpoint)
+        if resolved is None:
+            return None, 0.0, 0.0
+        key, limit = resolved
+        priority = _current_priority.get()
+        reserve = self.batch_reserve if priority == Priority.BATCH else 0.0
+        return key, self.backend.acquire(key, limit, reserve), self.max_wait[priority]
+
+    def _shed(self, key: str, endpoint: str, retry_after: float) -> SurepassRateLimitError:
+        self._count(key, "shed")
+        logger.warning(
+            f"Surepass rate limit: shedding {_current_priority.get().value} request "
+            f"to {endpoint} (retry in {retry_after:.1f}s)"
+        )
+        return SurepassRateLimitError(retry_after=retry_after)
+
+    def acquire(self, endpoint: str) -> None:
+        """
+        Take a token for `endpoint`, sleeping while one becomes available.
+
+        Raises:
+            SurepassRateLimitError: If the daily quota is spent or the wait
+                would exceed the priority's max wait
+        """
+        waited = 0.0
+        while True:
+            key, wait, budget = self._poll(endpoint)
+            if key is None:
+                return
+            if wait == 0.0:
+                self._count(key, "queued" if waited else "granted")
+                return
+            if wait is None:
+                raise self._shed(key, endpoint, _seconds_until_utc_midnight(time.time()))
+            if waited + wait > budget:
+                raise self._shed(key, endpoint, wait)
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, endpoint: str) -> None:
+        """
+        Async variant of acquire() (waits with asyncio.sleep).
+
+        A blocking backend (SQLite) is polled from a thread so the event
+        loop keeps running; to_thread copies the context, so the caller's
+        priority still applies.
+        """
+        waited = 0.0
+        while True:
+            if self.backend.blocking:
+                key, wait, budget = await asyncio.to_thread(self._poll, endpoint)
+            else:
+                key, wait, budget = self._poll(endpoint)
+            if key is None:
+                return
+            if wait == 0.0:
+                self._count(key, "queued" if waited else "granted")
+                return
+            if wait is None:
+                raise self._shed(key, endpoint, _seconds_until_utc_midnight(time.time()))
+            if waited + wait > budget:
+                raise self._shed(key, endpoint, wait)
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def snapshot(self) -> dict:
+        """Configured limits and local grant/queue/shed counters."""
+        with self._stats_lock:
+            stats = {key: dict(counters) for key, counters in self._stats.items()}
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "limits": {
+                key: {**asdict(limit), **stats.get(key, {"granted": 0, "queued": 0, "shed": 0})}
+                for key, limit in self.limits.items()
+            },
+        }
+
+
+# Singleton instance (shared by the sync and async clients)
+_limiter_instance: Optional[SurepassRateLimiter] = None
+
+
+def get_rate_limiter() -> SurepassRateLimiter:
+    """Get or create the process-wide SurepassRateLimiter."""
+    global _limiter_instance
+    if _limiter_instance is None:
+        _limiter_instance = SurepassRateLimiter()
+    return _limiter_instance
@@ -0,0 +1,299 @@
+"""
+Retry policy and circuit breaker for Surepass API calls.
+
+Features:
+- Per-endpoint retry policy with capped exponential backoff + full jitter
+- Retry-After support (seconds or HTTP-date) on 429/503
+- Per-endpoint circuit breaker (closed → open → half-open → closed)
+
+Environment:
+    SUREPASS_RETRY_MAX_RETRIES          Retries after the first attempt (default: 2)
+    SUREPASS_RETRY_BASE_DELAY           Backoff base in seconds (default: 0.5)
+    SUREPASS_RETRY_MAX_DELAY            Backoff cap in seconds (default: 8)
+    SUREPASS_RETRY_AFTER_MAX            Longest Retry-After we will wait (default: 30)
+    SUREPASS_BREAKER_FAILURE_THRESHOLD  Consecutive failures that open the breaker (default: 5)
+    SUREPASS_BREAKER_RECOVERY_TIMEOUT   Seconds before an open breaker allows a trial call (default: 30)
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, FrozenSet, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ============ Retry Policy ============
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How a single endpoint retries transient failures."""
+    max_retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    max_retry_after: float = 30.0
+    retry_statuses: FrozenSet[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+    retry_timeouts: bool = True
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.getenv("SUREPASS_RETRY_MAX_RETRIES", "2")),
+            base_delay=float(os.getenv("SUREPASS_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("SUREPASS_RETRY_MAX_DELAY", "8")),
+            max_retry_after=float(os.getenv("SUREPASS_RETRY_AFTER_MAX", "30")),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter backoff: uniform(0, min(max_delay, base * 2^attempt))."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds to wait before retry number `attempt + 1`, or None to give up.
+
+        A server-supplied Retry-After is treated as a floor; if it exceeds
+        max_retry_after we give up instead of parking the worker.
+        """
+        if attempt >= self.max_retries:
+            return None
+        delay = self.backoff(attempt)
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+# Endpoints whose side effects make blind retries unsafe.
+ENDPOINT_RETRY_OVERRIDES: Dict[str, dict] = {
+    # Any retried request (a 5xx or 429 included) may have sent an SMS
+    # already, and a new one invalidates the OTP the candidate received
+    "aadhaar-v2/generate-otp": {"max_retries": 0},
+    # OTPs are single-use; a replayed submission is rejected by UIDAI
+    "aadhaar-v2/submit-otp": {"max_retries": 0},
+}
+
+
+class RetryPolicies:
+    """Default policy plus per-endpoint overrides, keyed on endpoint template."""
+
+    def __init__(
+        self,
+        default: Optional[RetryPolicy] = None,
+        overrides: Optional[Dict[str, dict]] = None,
+    ):
+        self.default = default or RetryPolicy.from_env()
+        overrides = ENDPOINT_RETRY_OVERRIDES if overrides is None else overrides
+        self._policies = {
+            endpoint: replace(self.default, **fields)
+            for endpoint, fields in overrides.items()
+        }
+
+    def for_endpoint(self, endpoint: str) -> RetryPolicy:
+        return self._policies.get(endpoint, self.default)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# ============ Circuit Breaker ============
+
+class CircuitState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one endpoint.
+
+    - CLOSED: calls flow; `failure_threshold` consecutive failures → OPEN
+    - OPEN: calls are rejected until `recovery_timeout` has elapsed → HALF_OPEN
+    - HALF_OPEN: one trial call; success → CLOSED, failure → OPEN
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Resolve OPEN → HALF_OPEN once the recovery timeout has passed (lock held)."""
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+            logger.info(f"[CircuitBreaker] {self.name}: open → half_open")
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may proceed; False means fail fast."""
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds until an open breaker will allow a trial call."""
+        with self._lock:
+            if self._current_state() != CircuitState.OPEN:
+                return None
+            return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def release(self) -> None:
+        """Give back a half-open trial slot when the call was never sent or was cancelled."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info(f"[CircuitBreaker] {self.name}: {self._state} → closed")
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if (
+                self._state == CircuitState.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                if self._state != CircuitState.OPEN:
+                    self._times_opened += 1
+                    logger.warning(
+                        f"[CircuitBreaker] {self.name}: {self._state} → open "
+                        f"after {self._consecutive_failures} consecutive failures"
+                    )
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            retry_after = None
+            if state == CircuitState.OPEN:
+                retry_after = round(
+                    max(0.0, self.recovery_timeout - (self._clock() - self._opened_at)), 1
+                )
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+                "retry_after": retry_after,
+            }
+
+
+class CircuitBreakerRegistry:
+    """Lazily creates one CircuitBreaker per endpoint template."""
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+    ):
+        self.failure_threshold = failure_threshold or int(
+            os.getenv("SUREPASS_BREAKER_FAILURE_THRESHOLD", "5")
+        )
+        self.recovery_timeout = recovery_timeout or float(
+            os.getenv("SUREPASS_BREAKER_RECOVERY_TIMEOUT", "30")
+        )
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    endpoint,
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                )
+                self._breakers[endpoint] = breaker
+            return breaker
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: b.snapshot() for b in breakers}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+# Singleton instances (shared by the sync and async clients)
+_policies_instance: Optional[RetryPolicies] = None
+_breakers_instance: Optional[CircuitBreakerRegistry] = None
+
+
+def get_retry_policies() -> RetryPolicies:
+    """Get or create the process-wide retry policies."""
+    global _policies_instance
+    if _policies_instance is None:
+        _policies_instance = RetryPolicies()
+    return _policies_instance
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get or create the process-wide circuit breaker registry."""
+    global _breakers_instance
+    if _breakers_instance is None:
+        _breakers_instance = CircuitBreakerRegistry()
+    return _breakers_instance
@@ -0,0 +1,184 @@
+"""
+In-flight request coalescing (single-flight) for Surepass calls.
+
+Concurrent identical requests - same method, endpoint and normalized payload -
+share one upstream call. Followers receive a copy of the leader's result, or
+the same exception. Nothing is remembered once the call completes; see
+cache.py for that.
+
+SingleFlight coalesces across threads (sync client); AsyncSingleFlight
+coalesces across tasks on one event loop (async client). If an async
+leader is cancelled (its client disconnected), only that caller sees
+CancelledError: its followers start the call again, one of them leading.
+"""
+
+import copy
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .transport import endpoint_key
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def flight_key(method: str, endpoint: str, payload: Optional[dict] = None) -> str:
+    """Method + endpoint + SHA-256 of the normalized payload."""
+    body = json.dumps(_normalize(payload or {}), sort_keys=True, default=str)
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    return f"{method.upper()} {endpoint.strip('/')} {digest}"
+
+
+class FlightStats:
+    """Thread-safe leader/follower counters per endpoint template."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def record(self, key: str, coalesced: bool) -> None:
+        endpoint = endpoint_key(key.split(" ", 2)[1])
+        with self._lock:
+            counters = self._endpoints.setdefault(endpoint, {"calls": 0, "coalesced": 0})
+            counters["coalesced" if coalesced else "calls"] += 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: dict(c) for name, c in self._endpoints.items()}
+
+
+class _LeaderCancelled(Exception):
+    """Set on a flight whose leader was cancelled; its followers retry."""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-based single-flight group.
+
+    Usage:
+        group = SingleFlight()
+        data = group.do(flight_key("POST", endpoint, payload), lambda: send(...))
+    """
+
+    def __init__(self, stats: Optional[FlightStats] = None):
+        self.stats = stats or FlightStats()
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        self.stats.record(key, coalesced=not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            # Followers copy call.result after we return; hand the leader its own copy
+            return copy.deepcopy(call.result)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    asyncio single-flight group. In-flight calls are tracked per event loop.
+
+    Usage:
+        group = AsyncSingleFlight()
+        data = await group.do(key, lambda: send_async(...))
+    """
+
+    def __init__(self, stats: Optional[FlightStats] = None):
+        self.stats = stats or FlightStats()
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            future = self._calls.get(key)
+            if future is None or future.get_loop() is not asyncio.get_running_loop():
+                return await self._lead(key, fn)
+
+            self.stats.record(key, coalesced=True)
+            try:
+                # shield: a cancelled follower must not cancel the leader's call
+                result = await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue  # Lead the retry, or follow whoever got there first
+            return copy.deepcopy(result)
+
+    async def _lead(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats.record(key, coalesced=False)
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except BaseException as e:
+            # Our own cancellation is not the followers' to share
+            future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            # Followers may not exist; avoid "exception never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return copy.deepcopy(result)
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+# Singleton instances (stats shared by the sync and async groups)
+_flight_stats = FlightStats()
+_single_flight_instance: Optional[SingleFlight] = None
+_async_single_flight_instance: Optional[AsyncSingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get or create the process-wide thread single-flight group."""
+    global _single_flight_instance
+    if _single_flight_instance is None:
+        _single_flight_instance = SingleFlight(_flight_stats)
+    return _single_flight_instance
+
+
+def get_async_single_flight() -> AsyncSingleFlight:
+    """Get or create the process-wide asyncio single-flight group."""
+    global _async_single_flight_instance
+    if _async_single_flight_instance is None:
+        _async_single_flight_instance = AsyncSingleFlight(_flight_stats)
+    return _async_single_flight_instance
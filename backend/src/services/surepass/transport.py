@@ -0,0 +1,339 @@
+"""
+Shared HTTP transport for Surepass API calls.
+
+Features:
+- One process-wide httpx.Client (connection pool + keep-alive)
+- Matching httpx.AsyncClient pool for async routes
+- HTTP/2 multiplexing when the `h2` package is installed
+- Configurable pool limits via environment
+- Per-endpoint request stats for ops visibility
+
+Environment:
+    SUREPASS_HTTP2                  true/false (default: true)
+    SUREPASS_POOL_MAX_CONNECTIONS   Max open connections (default: 20)
+    SUREPASS_POOL_MAX_KEEPALIVE     Max idle keep-alive connections (default: 10)
+    SUREPASS_POOL_KEEPALIVE_EXPIRY  Idle connection lifetime in seconds (default: 60)
+"""
+
+import os
+import re
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TIMEOUT = 10.0  # seconds
+
+
+_PATH_SEGMENT = re.compile(r'^[a-z][a-z-]*$')
+
+
+def endpoint_key(endpoint: str) -> str:
+    """
+    Collapse an endpoint path to its template for per-endpoint bookkeeping.
+
+    Keeps the service/action prefix and replaces trailing ID segments, so
+    "digilocker/download-aadhaar/abc_123" becomes "digilocker/download-aadhaar/{id}".
+    """
+    segments = endpoint.strip("/").split("/")
+    return "/".join(
+        seg if i < 2 or _PATH_SEGMENT.match(seg) else "{id}"
+        for i, seg in enumerate(segments)
+    )
+
+
+def _http2_available() -> bool:
+    """Check whether the optional `h2` dependency is installed."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings (loaded from environment)."""
+    http2: bool = True
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    timeout: float = DEFAULT_TIMEOUT
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        return cls(
+            http2=os.getenv("SUREPASS_HTTP2", "true").lower() == "true",
+            max_connections=int(os.getenv("SUREPASS_POOL_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("SUREPASS_POOL_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("SUREPASS_POOL_KEEPALIVE_EXPIRY", "60")),
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+@dataclass
+class EndpointStats:
+    """Request counters for a single Surepass endpoint."""
+    requests: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_status: Optional[int] = None
+    http_versions: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "last_status": self.last_status,
+            "http_versions": dict(self.http_versions),
+        }
+
+
+class PoolStats:
+    """Thread-safe per-endpoint stats registry."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointStats] = {}
+
+    def record(
+        self,
+        endpoint: str,
+        elapsed_ms: float,
+        status_code: Optional[int] = None,
+        http_version: Optional[str] = None,
+    ) -> None:
+        """Record one completed (or failed) request."""
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.last_status = status_code
+            if status_code is None or status_code >= 500:
+                stats.errors += 1
+            if http_version:
+                stats.http_versions[http_version] = stats.http_versions.get(http_version, 0) + 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: s.to_dict() for name, s in self._endpoints.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _open_connection_count(client: httpx.Client) -> Optional[int]:
+    """
+    Best-effort count of open pooled connections.
+
+    httpx does not expose this publicly, so read it from the underlying
+    httpcore pool and return None if the internals change.
+    """
+    try:
+        pool = client._transport._pool
+        return len(pool.connections)
+    except Exception:
+        return None
+
+
+class SurepassTransport:
+    """
+    Long-lived pooled HTTP client shared by every SurepassClient.
+
+    Usage:
+        transport = get_surepass_transport()
+        response = transport.request("POST", url, "pan-verification", headers=..., json=...)
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None):
+        self.config = config or PoolConfig.from_env()
+        self.stats = PoolStats()
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+
+        self.http2 = self.config.http2 and _http2_available()
+        if self.config.http2 and not self.http2:
+            logger.warning("SUREPASS_HTTP2=true but `h2` is not installed - falling back to HTTP/1.1")
+
+    @property
+    def client(self) -> httpx.Client:
+        """Lazy-create the pooled client on first use."""
+        if self._client is None or self._client.is_closed:
+            with self._lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = httpx.Client(
+                        timeout=self.config.timeout,
+                        limits=self.config.limits(),
+                        http2=self.http2,
+                    )
+                    logger.info(
+                        f"[SurepassTransport] pool opened: http2={self.http2}, "
+                        f"max_connections={self.config.max_connections}, "
+                        f"max_keepalive={self.config.max_keepalive_connections}"
+                    )
+        return self._client
+
+    def request(self, method: str, url: str, endpoint: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the shared pool and record stats.
+
+        `endpoint` is the Surepass endpoint path; stats are keyed on its
+        template (see endpoint_key). httpx exceptions propagate unchanged.
+        """
+        endpoint = endpoint_key(endpoint)
+        started = time.perf_counter()
+        try:
+            response = self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, (time.perf_counter() - started) * 1000)
+            raise
+
+        self.stats.record(
+            endpoint,
+            (time.perf_counter() - started) * 1000,
+            status_code=response.status_code,
+            http_version=response.http_version,
+        )
+        return response
+
+    def pool_stats(self) -> dict:
+        """Pool configuration, open connections and per-endpoint counters."""
+        open_connections = None
+        if self._client is not None and not self._client.is_closed:
+            open_connections = _open_connection_count(self._client)
+
+        return {
+            "http2": self.http2,
+            "max_connections": self.config.max_connections,
+            "max_keepalive_connections": self.config.max_keepalive_connections,
+            "keepalive_expiry": self.config.keepalive_expiry,
+            "open_connections": open_connections,
+            "endpoints": self.stats.snapshot(),
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections. Safe to call more than once."""
+        with self._lock:
+            if self._client is not None and not self._client.is_closed:
+                self._client.close()
+                logger.info("[SurepassTransport] pool closed")
+            self._client = None
+
+
+class AsyncSurepassTransport:
+    """
+    Async counterpart of SurepassTransport, built on httpx.AsyncClient.
+
+    Shares pool settings with the sync transport and records into the same
+    per-endpoint stats. The client is bound to the running event loop, so
+    it is created lazily on first use inside the loop.
+
+    Usage:
+        transport = get_async_surepass_transport()
+        response = await transport.request("POST", url, "pan-verification", json=...)
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None, stats: Optional[PoolStats] = None):
+        self.config = config or PoolConfig.from_env()
+        self.stats = stats or PoolStats()
+        self.http2 = self.config.http2 and _http2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Lazy-create the pooled async client on first use."""
+        if self._client is None or self._client.is_closed:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = httpx.AsyncClient(
+                        timeout=self.config.timeout,
+                        limits=self.config.limits(),
+                        http2=self.http2,
+                    )
+                    logger.info(f"[AsyncSurepassTransport] pool opened: http2={self.http2}")
+        return self._client
+
+    async def request(self, method: str, url: str, endpoint: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared async pool and record stats."""
+        endpoint = endpoint_key(endpoint)
+        client = await self._get_client()
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, (time.perf_counter() - started) * 1000)
+            raise
+
+        self.stats.record(
+            endpoint,
+            (time.perf_counter() - started) * 1000,
+            status_code=response.status_code,
+            http_version=response.http_version,
+        )
+        return response
+
+    async def aclose(self) -> None:
+        """Close all pooled async connections. Safe to call more than once."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("[AsyncSurepassTransport] pool closed")
+        self._client = None
+        self._lock = None
+
+
+# Singleton instances (one pool per process)
+_transport_instance: Optional[SurepassTransport] = None
+_async_transport_instance: Optional[AsyncSurepassTransport] = None
+
+
+def get_surepass_transport() -> SurepassTransport:
+    """Get or create the process-wide SurepassTransport."""
+    global _transport_instance
+    if _transport_instance is None:
+        _transport_instance = SurepassTransport()
+    return _transport_instance
+
+
+def get_async_surepass_transport() -> AsyncSurepassTransport:
+    """Get or create the process-wide AsyncSurepassTransport."""
+    global _async_transport_instance
+    if _async_transport_instance is None:
+        sync_transport = get_surepass_transport()
+        _async_transport_instance = AsyncSurepassTransport(
+            config=sync_transport.config,
+            stats=sync_transport.stats,
+        )
+    return _async_transport_instance
+
+
+def close_surepass_transport() -> None:
+    """Close the process-wide pool (called on application shutdown)."""
+    if _transport_instance is not None:
+        _transport_instance.close()
+
+
+async def aclose_surepass_transports() -> None:
+    """Close both the sync and async pools (called on application shutdown)."""
+    close_surepass_transport()
+    if _async_transport_instance is not None:
+        await _async_transport_instance.aclose()
@@ -11,7 +11,8 @@ from datetime import datetime, date
 from dateutil.parser import parse as parse_date
 from dateutil.relativedelta import relativedelta
 
-from .client import get_surepass_client
+from .client import get_surepass_client, get_async_surepass_client
+from .cache import get_response_cache
 from .exceptions import SurepassInvalidInputError, SurepassNotAvailableError
 from . import mock_responses
 
@@ -23,6 +24,8 @@ class UANService:
     
     def __init__(self):
         self.client = get_surepass_client()
+        self.async_client = get_async_surepass_client()
+        self.cache = get_response_cache()
     
     def validate_uan_number(self, uan_number: str) -> str:
         """Validate and clean UAN number."""
@@ -49,24 +52,58 @@ class UANService:
         cleaned = self.validate_uan_number(uan_number)
         
         if self.client.is_mock_mode():
-            logger.info(f"Mock: Verifying UAN XXXX-XXXX-{cleaned[-4:]}")
-            return mock_responses.mock_uan_verification(cleaned)["data"]
+            return self._mock_response(cleaned)
+        
+        response = self.cache.get("uan-verification", cleaned)
+        if response is not None:
+            return response
         
         try:
             response = self.client.post("uan-verification", {
                 "uan_number": cleaned
             })
         except SurepassNotAvailableError as e:
-            logger.warning(f"UAN API not available: {e.message}")
-            return {
-                "status": "NOT_AVAILABLE",
-                "message": "UAN verification service temporarily unavailable",
-                "error": "API_NOT_AVAILABLE",
-                "establishments": [],
-            }
+            return self._not_available_result(e)
+        
+        self.cache.set("uan-verification", response, cleaned)
+        return response
+    
+    async def verify_async(self, uan_number: str) -> dict:
+        """Async variant of verify() - awaits Surepass instead of blocking."""
+        cleaned = self.validate_uan_number(uan_number)
+        
+        if self.async_client.is_mock_mode():
+            return self._mock_response(cleaned)
+        
+        response = await self.cache.aget("uan-verification", cleaned)
+        if response is not None:
+            return response
         
+        try:
+            response = await self.async_client.post("uan-verification", {
+                "uan_number": cleaned
+            })
+        except SurepassNotAvailableError as e:
+            return self._not_available_result(e)
+        
+        await self.cache.aset("uan-verification", response, cleaned)
         return response
     
+    def _mock_response(self, uan_number: str) -> dict:
+        """Mock Surepass UAN response."""
+        logger.info(f"Mock: Verifying UAN XXXX-XXXX-{uan_number[-4:]}")
+        return mock_responses.mock_uan_verification(uan_number)["data"]
+    
+    def _not_available_result(self, error: SurepassNotAvailableError) -> dict:
+        """Graceful degradation - API endpoint not available."""
+        logger.warning(f"UAN API not available: {error.message}")
+        return {
+            "status": "NOT_AVAILABLE",
+            "message": "UAN verification service temporarily unavailable",
+            "error": "API_NOT_AVAILABLE",
+            "establishments": [],
+        }
+    
     def analyze(
         self, 
         surepass_data: dict,
@@ -5,13 +5,21 @@ Phase 5: Professional trust score calculation with explainable deductions.
 """
 
 from .calculator import TrustScoreCalculator, get_trust_calculator, TrustScoreResult
+from .batch import BatchTrustScorer, BatchTrustScores, get_batch_scorer
 from .rules import TrustScoreStatus, WEIGHTS, THRESHOLDS
+from .store import recalculate_trust_score
+from .events import install_trust_score_events
 
 __all__ = [
     "TrustScoreCalculator",
     "get_trust_calculator",
     "TrustScoreResult",
+    "BatchTrustScorer",
+    "BatchTrustScores",
+    "get_batch_scorer",
     "TrustScoreStatus",
     "WEIGHTS",
     "THRESHOLDS",
+    "recalculate_trust_score",
+    "install_trust_score_events",
 ]
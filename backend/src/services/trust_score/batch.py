@@ -0,0 +1,513 @@
+"""
+Batch Trust Score Scoring.
+
+Columnar version of TrustScoreCalculator for re-scoring many verifications
+at once (e.g. after tuning rules.py). Each component's inputs are pulled
+into NumPy arrays and every deduction rule is applied as a mask over all
+rows; the result matches calculate() row for row:
+
+- Deductions are applied in the calculator's order (documents column by
+  column), so scores are bit-identical, not just close
+- The final round(score, 2) uses Python's round: np.round rounds
+  score * 100 and can differ in the last place
+- Name similarity (SequenceMatcher) is string work and runs per row, only
+  where both names are present
+- Flags are the same set; calculate() returns them in arbitrary (set)
+  order, here they keep component order
+
+Usage:
+    scores = get_batch_scorer().score(verification_data_list)
+    scores.scores[i], scores.statuses[i], scores.flags[i]
+    scores.result(i)       # TrustScoreResult, as calculate() returns
+    scores.components(i)   # ComponentResults, as cached by store.py
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .calculator import TrustScoreResult, ComponentResult, get_trust_calculator
+from .rules import (
+    TrustScoreStatus,
+    WEIGHTS,
+    THRESHOLDS,
+    COMPONENTS,
+    REQUIRED_COMPONENTS,
+    MIN_COMPLETION_RATE,
+    AADHAAR_DEDUCTIONS,
+    AADHAAR_LOW_MATCH_SCORE,
+    PAN_DEDUCTIONS,
+    UAN_DEDUCTIONS,
+    UAN_EXPERIENCE_THRESHOLDS,
+    UAN_MAX_GAP_DEDUCTION,
+    FACE_DEDUCTIONS,
+    FACE_MODERATE_CONFIDENCE,
+    DOCUMENT_DEDUCTIONS,
+    DOCUMENT_LEGITIMACY_THRESHOLDS,
+    CROSS_MATCH_DEDUCTIONS,
+    FUZZY_MATCH_THRESHOLDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Per-row flag lists for one component
+FlagLists = List[List[str]]
+
+# A flag: fixed text, or built from the row index (formatted values)
+Flag = Union[str, Callable[[int], str]]
+
+
+@dataclass
+class BatchTrustScores:
+    """Scores for a batch of verifications, one entry per input row."""
+    scores: np.ndarray                      # Final score (0 for incomplete rows)
+    statuses: List[TrustScoreStatus]
+    completion_rates: np.ndarray
+    complete: np.ndarray                    # False where INCOMPLETE
+    breakdown: Dict[str, np.ndarray]        # Component scores (all rows)
+    component_flags: Dict[str, FlagLists]
+    present: Dict[str, np.ndarray]          # REQUIRED_COMPONENTS inputs supplied
+    flags: List[List[str]]
+    recommendations: List[List[str]]
+    calculated_at: datetime
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def result(self, i: int) -> TrustScoreResult:
+        """Row i as the TrustScoreResult calculate() returns."""
+        breakdown = {}
+        if self.complete[i]:
+            breakdown = {name: float(self.breakdown[name][i]) for name in COMPONENTS}
+        return TrustScoreResult(
+            score=float(self.scores[i]),
+            status=self.statuses[i],
+            flags=list(self.flags[i]),
+            breakdown=breakdown,
+            completion_rate=float(self.completion_rates[i]),
+            recommendations=list(self.recommendations[i]),
+            calculated_at=self.calculated_at,
+        )
+
+    def components(self, i: int) -> Dict[str, ComponentResult]:
+        """Row i's component results (what calculate_incremental caches)."""
+        return {
+            name: ComponentResult(
+                score=float(self.breakdown[name][i]),
+                flags=list(self.component_flags[name][i]),
+                present=bool(self.present[name][i]) if name in self.present else True,
+            )
+            for name in COMPONENTS
+        }
+
+    def status_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for status in self.statuses:
+            counts[status.value] = counts.get(status.value, 0) + 1
+        return counts
+
+
+class BatchTrustScorer:
+    """
+    Vectorized trust score calculation over many verifications.
+
+    Takes the same verification data dicts as TrustScoreCalculator.calculate
+    (see store.gather_verification_data_bulk for loading them in bulk).
+    """
+
+    def __init__(self):
+        # Scalar helpers shared with the calculator (fuzzy match, recommendations)
+        self._calculator = get_trust_calculator()
+
+    def score(self, rows: Sequence[Dict[str, Any]]) -> BatchTrustScores:
+        """Score every row in one pass."""
+        n = len(rows)
+        experience = [
+            (row.get("candidate", {}) or {}).get("experience_years", 0) for row in rows
+        ]
+
+        component_scores: Dict[str, np.ndarray] = {}
+        component_flags: Dict[str, FlagLists] = {}
+        evaluators = {
+            "aadhaar": lambda: self._aadhaar(rows),
+            "pan": lambda: self._pan(rows),
+            "uan": lambda: self._uan(rows, experience),
+            "face": lambda: self._face(rows),
+            "documents": lambda: self._documents(rows, experience),
+            "cross_match": lambda: self._cross_match(rows),
+        }
+        for name in COMPONENTS:
+            component_scores[name], component_flags[name] = evaluators[name]()
+
+        # Completion
+        present = {
+            name: np.array(
+                [self._calculator._input_present(name, row) for row in rows], dtype=bool
+            ).reshape(n)
+            for name in REQUIRED_COMPONENTS
+        }
+        completed = np.array([row.get("candidate") is not None for row in rows], dtype=np.int64).reshape(n)
+        for name in REQUIRED_COMPONENTS:
+            completed = completed + present[name]
+        completion_rates = completed / (1 + len(REQUIRED_COMPONENTS))
+        complete = completion_rates >= MIN_COMPLETION_RATE
+
+        # Weighted deductions, in WEIGHTS order
+        total = np.full(n, 100.0)
+        for name in COMPONENTS:
+            total -= (100 - component_scores[name]) * (WEIGHTS[name] / 100)
+        final = np.array([max(0, round(s, 2)) for s in total.tolist()], dtype=float).reshape(n)
+        final[~complete] = 0.0
+
+        statuses = self._statuses(final, complete)
+
+        # Flags and recommendations
+        flags: List[List[str]] = []
+        recommendations: List[List[str]] = []
+        for i in range(n):
+            if not complete[i]:
+                flags.append(["INCOMPLETE_VERIFICATION"])
+                recommendations.append(["Complete all mandatory verification steps"])
+                continue
+            row_flags = [f for name in COMPONENTS for f in component_flags[name][i]]
+            flags.append(list(dict.fromkeys(row_flags)))  # Dedupe
+            recommendations.append(self._calculator._generate_recommendations(row_flags, {}))
+
+        return BatchTrustScores(
+            scores=final,
+            statuses=statuses,
+            completion_rates=completion_rates,
+            complete=complete,
+            breakdown=component_scores,
+            component_flags=component_flags,
+            present=present,
+            flags=flags,
+            recommendations=recommendations,
+            calculated_at=datetime.utcnow(),
+        )
+
+    # ============ COMPONENT EVALUATORS ============
+
+    def _aadhaar(self, rows: Sequence[Dict]) -> Tuple[np.ndarray, FlagLists]:
+        """Aadhaar component (TrustScoreCalculator._evaluate_aadhaar)."""
+        n = len(rows)
+        given, failed, match, name_mm, dob_mm, gender_mm = [], [], [], [], [], []
+        for row in rows:
+            data = row.get("aadhaar")
+            ok = bool(data) and data.get("status", "").upper() != "FAILED"
+            given.append(bool(data))
+            failed.append(bool(data) and not ok)
+            comparisons = data.get("comparisons", {}) if ok else {}
+            match.append(data.get("match_score", 100) if ok else 100)
+            name_mm.append(not comparisons.get("name", {}).get("match", True))
+            dob_mm.append(not comparisons.get("dob", {}).get("match", True))
+            gender_mm.append(not comparisons.get("gender", {}).get("match", True))
+
+        given, failed = _bools(given, n), _bools(failed, n)
+        ok = given & ~failed
+        low_match = ok & (_floats(match, n) < AADHAAR_LOW_MATCH_SCORE)
+        name_mm, dob_mm, gender_mm = ok & _bools(name_mm, n), ok & _bools(dob_mm, n), ok & _bools(gender_mm, n)
+
+        score = np.full(n, 100.0)
+        score = _deduct(score, low_match, AADHAAR_DEDUCTIONS["low_match"])
+        score = _deduct(score, name_mm, AADHAAR_DEDUCTIONS["name_mismatch"])
+        score = _deduct(score, dob_mm, AADHAAR_DEDUCTIONS["dob_mismatch"])
+        score = _deduct(score, gender_mm, AADHAAR_DEDUCTIONS["gender_mismatch"])
+        score = np.where(ok, np.maximum(score, 0.0), 0.0)
+
+        flags = _flag_lists(n)
+        _flag(flags, ~given, "AADHAAR_NOT_VERIFIED")
+        _flag(flags, failed, "AADHAAR_VERIFICATION_FAILED")
+        _flag(flags, low_match, lambda i: f"AADHAAR_LOW_MATCH_{match[i]}%")
+        _flag(flags, name_mm, "AADHAAR_NAME_MISMATCH")
+        _flag(flags, dob_mm, "AADHAAR_DOB_MISMATCH")
+        _flag(flags, gender_mm, "AADHAAR_GENDER_MISMATCH")
+        return score, flags
+
+    def _pan(self, rows: Sequence[Dict]) -> Tuple[np.ndarray, FlagLists]:
+        """PAN component (TrustScoreCalculator._evaluate_pan)."""
+        n = len(rows)
+        given, valid, name_mm, dob_mm, not_linked = [], [], [], [], []
+        for row in rows:
+            data = row.get("pan") or {}
+            given.append(bool(data))
+            valid.append(bool(data.get("valid", True)))
+            name_mm.append(data.get("name_match") == False)
+            dob_mm.append(data.get("dob_match") == False)
+            not_linked.append(data.get("aadhaar_linked") == False)
+
+        given = _bools(given, n)
+        invalid = given & ~_bools(valid, n)
+        ok = given & ~invalid
+        name_mm, dob_mm, not_linked = ok & _bools(name_mm, n), ok & _bools(dob_mm, n), ok & _bools(not_linked, n)
+
+        score = np.full(n, 100.0)
+        score = _deduct(score, name_mm, PAN_DEDUCTIONS["name_mismatch"])
+        score = _deduct(score, dob_mm, PAN_DEDUCTIONS["dob_mismatch"])
+        score = _deduct(score, not_linked, PAN_DEDUCTIONS["aadhaar_not_linked"])
+        score = np.where(ok, np.maximum(score, 0.0), 0.0)
+
+        flags = _flag_lists(n)
+        _flag(flags, ~given, "PAN_NOT_VERIFIED")
+        _flag(flags, invalid, "PAN_INVALID")
+        _flag(flags, name_mm, "PAN_NAME_MISMATCH")
+        _flag(flags, dob_mm, "PAN_DOB_MISMATCH")
+        _flag(flags, not_linked, "PAN_AADHAAR_NOT_LINKED")
+        return score, flags
+
+    def _uan(self, rows: Sequence[Dict], experience: List[Any]) -> Tuple[np.ndarray, FlagLists]:
+        """UAN component (TrustScoreCalculator._evaluate_uan)."""
+        n = len(rows)
+        given, valid, verified, gaps = [], [], [], []
+        for row, years in zip(rows, experience):
+            data = row.get("uan") or {}
+            given.append(bool(data))
+            valid.append(bool(data.get("valid", True)))
+            verified.append(data.get("total_experience_months", years * 12))
+            gaps.append(data.get("employment_gaps", 0))
+
+        years = _floats(experience, n)
+        fresher = years < UAN_EXPERIENCE_THRESHOLDS["junior"]
+        given = _bools(given, n)
+        missing_junior = ~fresher & ~given & (years < UAN_EXPERIENCE_THRESHOLDS["senior"])
+        missing_senior = ~fresher & ~given & ~missing_junior
+        invalid = ~fresher & given & ~_bools(valid, n)
+        ok = ~fresher & given & ~invalid
+
+        claimed = years * 12
+        mismatch = ok & (_floats(verified, n) < claimed * 0.8)  # 20% tolerance
+        gaps_arr = _floats(gaps, n)
+        has_gaps = ok & (gaps_arr > 0)
+
+        score = np.full(n, 100.0)
+        score = _deduct(score, missing_junior, UAN_DEDUCTIONS["not_provided_junior"])
+        score = _deduct(score, mismatch, UAN_DEDUCTIONS["experience_mismatch"])
+        score = _deduct(score, has_gaps, np.minimum(gaps_arr * UAN_DEDUCTIONS["employment_gap"], UAN_MAX_GAP_DEDUCTION))
+        score = np.maximum(score, 0.0)
+        score = np.where(missing_senior | invalid, 0.0, score)
+        score = np.where(fresher, 100.0, score)
+
+        flags = _flag_lists(n)
+        _flag(flags, missing_junior, "UAN_NOT_PROVIDED_JUNIOR")
+        _flag(flags, missing_senior, "UAN_NOT_PROVIDED_SENIOR")
+        _flag(flags, invalid, "UAN_INVALID")
+        _flag(flags, mismatch, lambda i: (
+            f"UAN_EXPERIENCE_MISMATCH_{verified[i]}mo_vs_{experience[i] * 12}mo"
+        ))
+        _flag(flags, has_gaps, lambda i: f"UAN_EMPLOYMENT_GAPS_{gaps[i]}")
+        return score, flags
+
+    def _face(self, rows: Sequence[Dict]) -> Tuple[np.ndarray, FlagLists]:
+        """Face component (TrustScoreCalculator._evaluate_face)."""
+        n = len(rows)
+        given, mismatch, low, confidence, liveness_failed = [], [], [], [], []
+        for row in rows:
+            data = row.get("face")
+            decision = data.get("decision", "").upper() if data else ""
+            given.append(bool(data))
+            mismatch.append(decision == "MISMATCH")
+            low.append(decision == "LOW_CONFIDENCE")
+            confidence.append(data.get("confidence", 100) if data else 100)
+            liveness_failed.append(bool(data) and data.get("liveness_passed") == False)
+
+        given = _bools(given, n)
+        mismatch = given & _bools(mismatch, n)
+        ok = given & ~mismatch
+        low = ok & _bools(low, n)
+        moderate = ok & ~low & (_floats(confidence, n) < FACE_MODERATE_CONFIDENCE)
+        liveness_failed = ok & _bools(liveness_failed, n)
+
+        score = np.full(n, 100.0)
+        score = _deduct(score, low, FACE_DEDUCTIONS["low_confidence"])
+        score = _deduct(score, moderate, FACE_DEDUCTIONS["moderate_confidence"])
+        score = _deduct(score, liveness_failed, FACE_DEDUCTIONS["liveness_failed"])
+        score = np.where(ok, np.maximum(score, 0.0), 0.0)
+
+        flags = _flag_lists(n)
+        _flag(flags, ~given, "FACE_NOT_VERIFIED")
+        _flag(flags, mismatch, "FACE_MISMATCH")
+        _flag(flags, low, lambda i: f"FACE_LOW_CONFIDENCE_{confidence[i]}%")
+        _flag(flags, moderate, lambda i: f"FACE_MODERATE_CONFIDENCE_{confidence[i]}%")
+        _flag(flags, liveness_failed, "LIVENESS_FAILED")
+        return score, flags
+
+    def _documents(self, rows: Sequence[Dict], experience: List[Any]) -> Tuple[np.ndarray, FlagLists]:
+        """Documents component (TrustScoreCalculator._evaluate_documents)."""
+        n = len(rows)
+
+        # Flatten to one entry per document: row index, position within the row
+        doc_row, doc_pos, doc_score, doc_status, doc_type = [], [], [], [], []
+        has_edu, has_exp = [], []
+        for i, row in enumerate(rows):
+            documents = row.get("documents", [])
+            has_edu.append(any(d.get("document_type") == "education" for d in documents))
+            has_exp.append(any(d.get("document_type") in ["experience", "payslip"] for d in documents))
+            for pos, doc in enumerate(documents):
+                doc_row.append(i)
+                doc_pos.append(pos)
+                doc_score.append(doc.get("legitimacy_score", 100))
+                doc_status.append(doc.get("status", "").upper())
+                doc_type.append(doc.get("document_type", "unknown"))
+
+        doc_row = np.array(doc_row, dtype=np.int64)
+        doc_pos = np.array(doc_pos, dtype=np.int64)
+        doc_score = np.array(doc_score, dtype=float).reshape(len(doc_row))
+        counts = np.bincount(doc_row, minlength=n)
+        given = counts > 0
+
+        # Average legitimacy, summed in document order like sum()
+        by_pos = np.argsort(doc_pos, kind="stable")
+        bounds = np.searchsorted(doc_pos[by_pos], np.arange(counts.max(initial=0) + 1))
+        columns = [by_pos[bounds[j]:bounds[j + 1]] for j in range(len(bounds) - 1)]
+        total = np.zeros(n)
+        for column in columns:
+            total[doc_row[column]] += doc_score[column]
+        avg = np.divide(total, counts, out=np.zeros(n), where=given)
+
+        missing_edu = given & ~_bools(has_edu, n)
+        missing_exp = given & (_floats(experience, n) > 0) & ~_bools(has_exp, n)
+        low = given & (avg < DOCUMENT_LEGITIMACY_THRESHOLDS["moderate"])
+        moderate = given & ~low & (avg < DOCUMENT_LEGITIMACY_THRESHOLDS["acceptable"])
+        acceptable = given & ~low & ~moderate & (avg < DOCUMENT_LEGITIMACY_THRESHOLDS["excellent"])
+
+        score = np.full(n, 100.0)
+        score = _deduct(score, missing_edu, DOCUMENT_DEDUCTIONS["missing_education"])
+        score = _deduct(score, missing_exp, DOCUMENT_DEDUCTIONS["missing_experience"])
+        score = _deduct(score, low, DOCUMENT_DEDUCTIONS["low_legitimacy"])
+        score = _deduct(score, moderate, DOCUMENT_DEDUCTIONS["moderate_legitimacy"])
+        score = _deduct(score, acceptable, DOCUMENT_DEDUCTIONS["acceptable_legitimacy"])
+
+        flags = _flag_lists(n)
+        _flag(flags, ~given, "NO_DOCUMENTS_UPLOADED")
+        _flag(flags, missing_edu, "MISSING_EDUCATION_DOCUMENTS")
+        _flag(flags, missing_exp, "MISSING_EXPERIENCE_DOCUMENTS")
+        _flag(flags, low, lambda i: f"DOCUMENTS_LOW_LEGITIMACY_{float(avg[i]):.0f}%")
+        _flag(flags, moderate, lambda i: f"DOCUMENTS_MODERATE_LEGITIMACY_{float(avg[i]):.0f}%")
+        _flag(flags, acceptable, lambda i: f"DOCUMENTS_ACCEPTABLE_LEGITIMACY_{float(avg[i]):.0f}%")
+
+        # Per-document deductions, in document order
+        suspicious = np.array([s == "SUSPICIOUS" for s in doc_status], dtype=bool).reshape(len(doc_row))
+        review = np.array([s == "REVIEW_REQUIRED" for s in doc_status], dtype=bool).reshape(len(doc_row))
+        for column in columns:
+            rows_j = doc_row[column]
+            for mask, deduction, prefix in (
+                (suspicious[column], DOCUMENT_DEDUCTIONS["suspicious_document"], "SUSPICIOUS_DOC"),
+                (review[column], DOCUMENT_DEDUCTIONS["review_required_document"], "REVIEW_DOC"),
+            ):
+                if not mask.any():
+                    continue
+                score[rows_j[mask]] -= deduction
+                for doc in column[mask]:
+                    flags[doc_row[doc]].append(f"{prefix}_{doc_type[doc]}")
+
+        score = np.where(given, np.maximum(score, 0.0), 0.0)
+        return score, flags
+
+    def _cross_match(self, rows: Sequence[Dict]) -> Tuple[np.ndarray, FlagLists]:
+        """Cross-match component (TrustScoreCalculator._evaluate_cross_match)."""
+        n = len(rows)
+        similarity: Dict[Tuple[str, str], float] = {}
+
+        def fuzzy(a: str, b: str) -> float:
+            if (a, b) not in similarity:
+                similarity[(a, b)] = self._calculator._fuzzy_match(a, b)
+            return similarity[(a, b)]
+
+        pan_sim, uan_sim, dob_mm = [], [], []
+        for row in rows:
+            aadhaar = row.get("aadhaar", {})
+            pan = row.get("pan", {})
+            uan = row.get("uan", {})
+            ap, au, dob = np.nan, np.nan, False
+            if aadhaar and pan:
+                aadhaar_data, pan_data = aadhaar.get("data", {}), pan.get("data", {})
+                aadhaar_name, pan_name = aadhaar_data.get("full_name", ""), pan_data.get("full_name", "")
+                if aadhaar_name and pan_name:
+                    ap = fuzzy(aadhaar_name, pan_name)
+                aadhaar_dob, pan_dob = aadhaar_data.get("dob"), pan_data.get("dob")
+                dob = bool(aadhaar_dob and pan_dob and aadhaar_dob != pan_dob)
+            if aadhaar and uan:
+                aadhaar_name = aadhaar.get("data", {}).get("full_name", "")
+                uan_name = uan.get("data", {}).get("name", "")
+                if aadhaar_name and uan_name:
+                    au = fuzzy(aadhaar_name, uan_name)
+            pan_sim.append(ap)
+            uan_sim.append(au)
+            dob_mm.append(dob)
+
+        pan_sim, uan_sim = _floats(pan_sim, n), _floats(uan_sim, n)
+        pan_name = pan_sim < FUZZY_MATCH_THRESHOLDS["aadhaar_pan"]  # NaN compares False
+        dob_mm = _bools(dob_mm, n)
+        uan_name = uan_sim < FUZZY_MATCH_THRESHOLDS["aadhaar_uan"]
+
+        score = np.full(n, 100.0)
+        score = _deduct(score, pan_name, CROSS_MATCH_DEDUCTIONS["aadhaar_pan_name"])
+        score = _deduct(score, dob_mm, CROSS_MATCH_DEDUCTIONS["aadhaar_pan_dob"])
+        score = _deduct(score, uan_name, CROSS_MATCH_DEDUCTIONS["aadhaar_uan_name"])
+        score = np.maximum(score, 0.0)
+
+        flags = _flag_lists(n)
+        _flag(flags, pan_name, lambda i: f"AADHAAR_PAN_NAME_DIFF_{float(pan_sim[i]):.0f}%")
+        _flag(flags, dob_mm, "AADHAAR_PAN_DOB_MISMATCH")
+        _flag(flags, uan_name, lambda i: f"AADHAAR_UAN_NAME_DIFF_{float(uan_sim[i]):.0f}%")
+        return score, flags
+
+    # ============ HELPERS ============
+
+    def _statuses(self, scores: np.ndarray, complete: np.ndarray) -> List[TrustScoreStatus]:
+        """TrustScoreCalculator._determine_status over all rows."""
+        order = [
+            TrustScoreStatus.VERIFIED,
+            TrustScoreStatus.REVIEW_REQUIRED,
+            TrustScoreStatus.HIGH_RISK,
+            TrustScoreStatus.FLAGGED,
+            TrustScoreStatus.INCOMPLETE,
+        ]
+        codes = np.select(
+            [
+                ~complete,
+                scores >= THRESHOLDS["verified"],
+                scores >= THRESHOLDS["review_required"],
+                scores >= THRESHOLDS["high_risk"],
+            ],
+            [4, 0, 1, 2],
+            default=3,
+        )
+        return [order[code] for code in codes.tolist()]
+
+
+def _bools(values: List[Any], n: int) -> np.ndarray:
+    return np.array(values, dtype=bool).reshape(n)
+
+
+def _floats(values: List[Any], n: int) -> np.ndarray:
+    return np.array(values, dtype=float).reshape(n)
+
+
+def _deduct(score: np.ndarray, mask: np.ndarray, amount) -> np.ndarray:
+    """score - amount where mask (x - 0.0 == x, so other rows are unchanged)."""
+    return score - np.where(mask, amount, 0.0)
+
+
+def _flag_lists(n: int) -> FlagLists:
+    return [[] for _ in range(n)]
+
+
+def _flag(flags: FlagLists, mask: np.ndarray, flag: Flag) -> None:
+    for i in np.flatnonzero(mask).tolist():
+        flags[i].append(flag(i) if callable(flag) else flag)
+
+
+# Singleton instance
+_batch_scorer_instance: Optional[BatchTrustScorer] = None
+
+
+def get_batch_scorer() -> BatchTrustScorer:
+    """Get or create singleton BatchTrustScorer."""
+    global _batch_scorer_instance
+    if _batch_scorer_instance is None:
+        _batch_scorer_instance = BatchTrustScorer()
+    return _batch_scorer_instance
@@ -4,8 +4,10 @@ Trust Score Calculator.
 Calculates explainable trust score with deductions.
 """
 
+import json
+import hashlib
 import logging
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterable, List, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 from difflib import SequenceMatcher
@@ -14,12 +16,17 @@ from .rules import (
     TrustScoreStatus,
     WEIGHTS,
     THRESHOLDS,
+    COMPONENTS,
+    REQUIRED_COMPONENTS,
     MIN_COMPLETION_RATE,
     AADHAAR_DEDUCTIONS,
+    AADHAAR_LOW_MATCH_SCORE,
     PAN_DEDUCTIONS,
     UAN_DEDUCTIONS,
     UAN_EXPERIENCE_THRESHOLDS,
+    UAN_MAX_GAP_DEDUCTION,
     FACE_DEDUCTIONS,
+    FACE_MODERATE_CONFIDENCE,
     DOCUMENT_DEDUCTIONS,
     DOCUMENT_LEGITIMACY_THRESHOLDS,
     CROSS_MATCH_DEDUCTIONS,
@@ -28,6 +35,42 @@ from .rules import (
 
 logger = logging.getLogger(__name__)
 
+# Fingerprint of the rules component results depend on; results cached
+# under other rules are recalculated
+RULES_FINGERPRINT = hashlib.sha1(json.dumps([
+    AADHAAR_DEDUCTIONS,
+    AADHAAR_LOW_MATCH_SCORE,
+    PAN_DEDUCTIONS,
+    UAN_DEDUCTIONS,
+    UAN_EXPERIENCE_THRESHOLDS,
+    UAN_MAX_GAP_DEDUCTION,
+    FACE_DEDUCTIONS,
+    FACE_MODERATE_CONFIDENCE,
+    DOCUMENT_DEDUCTIONS,
+    DOCUMENT_LEGITIMACY_THRESHOLDS,
+    CROSS_MATCH_DEDUCTIONS,
+    FUZZY_MATCH_THRESHOLDS,
+], sort_keys=True).encode()).hexdigest()[:12]
+
+
+@dataclass
+class ComponentResult:
+    """One component evaluator's result, cached between recalculations."""
+    score: float
+    flags: List[str] = field(default_factory=list)
+    present: bool = True  # Input supplied (counts toward completion)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"score": self.score, "flags": self.flags, "present": self.present}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ComponentResult":
+        return cls(
+            score=data["score"],
+            flags=list(data.get("flags") or []),
+            present=bool(data.get("present", True)),
+        )
+
 
 @dataclass
 class TrustScoreResult:
@@ -79,85 +122,106 @@ class TrustScoreCalculator:
         
         Args:
             verification_data: Dict with aadhaar, pan, uan, face, documents, candidate
-            
+        
         Returns:
             TrustScoreResult with score, status, flags, breakdown
         """
-        score = 100.0
-        flags = []
-        breakdown = {}
-        recommendations = []
+        # Check completion first
+        completion_rate = self._check_completion(verification_data)
+        if completion_rate < MIN_COMPLETION_RATE:
+            return self._incomplete_result(completion_rate)
+        
+        components = self.evaluate_components(verification_data)
+        return self.combine(components, completion_rate)
+    
+    def calculate_incremental(
+        self,
+        verification_data: Dict[str, Any],
+        cached: Dict[str, ComponentResult],
+        stale: Iterable[str],
+    ) -> Tuple[TrustScoreResult, Dict[str, ComponentResult]]:
+        """
+        Recalculate reusing cached component results.
         
+        Only stale components (and any missing from cached) are evaluated,
+        so verification_data needs just their inputs plus the candidate.
+        Gives the same result as calculate() on the full data.
+        
+        Returns:
+            (TrustScoreResult, component results to cache)
+        """
+        stale = set(stale)
+        components = {
+            name: result for name, result in cached.items()
+            if name in COMPONENTS and name not in stale
+        }
+        components.update(self.evaluate_components(
+            verification_data,
+            [name for name in COMPONENTS if name not in components],
+        ))
+        
+        required_steps = {"personal_data": verification_data.get("candidate") is not None}
+        required_steps.update({name: components[name].present for name in REQUIRED_COMPONENTS})
+        completion_rate = sum(required_steps.values()) / len(required_steps)
+        
+        if completion_rate < MIN_COMPLETION_RATE:
+            return self._incomplete_result(completion_rate), components
+        return self.combine(components, completion_rate), components
+    
+    def evaluate_components(
+        self,
+        verification_data: Dict[str, Any],
+        names: Iterable[str] = COMPONENTS,
+    ) -> Dict[str, ComponentResult]:
+        """Run the evaluators for the named components."""
         # Get candidate info
         candidate = verification_data.get("candidate", {})
         experience_years = candidate.get("experience_years", 0)
         
-        # Check completion first
-        completion_rate = self._check_completion(verification_data)
-        if completion_rate < MIN_COMPLETION_RATE:
-            return TrustScoreResult(
-                score=0,
-                status=TrustScoreStatus.INCOMPLETE,
-                flags=["INCOMPLETE_VERIFICATION"],
-                breakdown={},
-                completion_rate=completion_rate,
-                recommendations=["Complete all mandatory verification steps"],
-                calculated_at=datetime.utcnow(),
+        evaluators = {
+            # 1. Aadhaar Verification (20%)
+            "aadhaar": lambda: self._evaluate_aadhaar(verification_data.get("aadhaar")),
+            # 2. PAN Verification (10%)
+            "pan": lambda: self._evaluate_pan(verification_data.get("pan")),
+            # 3. UAN Verification (10% - conditional)
+            "uan": lambda: self._evaluate_uan(verification_data.get("uan"), experience_years),
+            # 4. Face Verification (25%)
+            "face": lambda: self._evaluate_face(verification_data.get("face")),
+            # 5. Document Legitimacy (25%)
+            "documents": lambda: self._evaluate_documents(
+                verification_data.get("documents", []), experience_years
+            ),
+            # 6. Cross-Match Consistency (10%)
+            "cross_match": lambda: self._evaluate_cross_match(verification_data),
+        }
+        
+        components = {}
+        for name in names:
+            score, flags = evaluators[name]()
+            components[name] = ComponentResult(
+                score=score,
+                flags=flags,
+                present=self._input_present(name, verification_data),
             )
+        return components
+    
+    def combine(
+        self,
+        components: Dict[str, ComponentResult],
+        completion_rate: float,
+    ) -> TrustScoreResult:
+        """Apply weighted deductions from every component's result."""
+        score = 100.0
+        flags = []
+        breakdown = {}
         
-        # 1. Aadhaar Verification (20%)
-        aadhaar_score, aadhaar_flags = self._evaluate_aadhaar(
-            verification_data.get("aadhaar")
-        )
-        component_deduction = (100 - aadhaar_score) * (WEIGHTS["aadhaar"] / 100)
-        score -= component_deduction
-        flags.extend(aadhaar_flags)
-        breakdown["aadhaar"] = aadhaar_score
-        
-        # 2. PAN Verification (10%)
-        pan_score, pan_flags = self._evaluate_pan(
-            verification_data.get("pan")
-        )
-        component_deduction = (100 - pan_score) * (WEIGHTS["pan"] / 100)
-        score -= component_deduction
-        flags.extend(pan_flags)
-        breakdown["pan"] = pan_score
-        
-        # 3. UAN Verification (10% - conditional)
-        uan_score, uan_flags = self._evaluate_uan(
-            verification_data.get("uan"),
-            experience_years
-        )
-        component_deduction = (100 - uan_score) * (WEIGHTS["uan"] / 100)
-        score -= component_deduction
-        flags.extend(uan_flags)
-        breakdown["uan"] = uan_score
-        
-        # 4. Face Verification (25%)
-        face_score, face_flags = self._evaluate_face(
-            verification_data.get("face")
-        )
-        component_deduction = (100 - face_score) * (WEIGHTS["face"] / 100)
-        score -= component_deduction
-        flags.extend(face_flags)
-        breakdown["face"] = face_score
-        
-        # 5. Document Legitimacy (25%)
-        doc_score, doc_flags = self._evaluate_documents(
-            verification_data.get("documents", []),
-            experience_years
-        )
-        component_deduction = (100 - doc_score) * (WEIGHTS["documents"] / 100)
-        score -= component_deduction
-        flags.extend(doc_flags)
-        breakdown["documents"] = doc_score
-        
-        # 6. Cross-Match Consistency (10%)
-        cross_score, cross_flags = self._evaluate_cross_match(verification_data)
-        component_deduction = (100 - cross_score) * (WEIGHTS["cross_match"] / 100)
-        score -= component_deduction
-        flags.extend(cross_flags)
-        breakdown["cross_match"] = cross_score
+        # Deduct in WEIGHTS order
+        for name in COMPONENTS:
+            component = components[name]
+            component_deduction = (100 - component.score) * (WEIGHTS[name] / 100)
+            score -= component_deduction
+            flags.extend(component.flags)
+            breakdown[name] = component.score
         
         # Ensure score doesn't go below 0
         final_score = max(0, round(score, 2))
@@ -195,7 +259,7 @@ class TrustScoreCalculator:
         
         # Check match quality
         match_score = aadhaar_data.get("match_score", 100)
-        if match_score < 80:
+        if match_score < AADHAAR_LOW_MATCH_SCORE:
             score -= AADHAAR_DEDUCTIONS["low_match"]
             flags.append(f"AADHAAR_LOW_MATCH_{match_score}%")
         
@@ -277,7 +341,7 @@ class TrustScoreCalculator:
         # Check employment gaps
         gaps = uan_data.get("employment_gaps", 0)
         if gaps > 0:
-            deduction = min(gaps * UAN_DEDUCTIONS["employment_gap"], 20)
+            deduction = min(gaps * UAN_DEDUCTIONS["employment_gap"], UAN_MAX_GAP_DEDUCTION)
             score -= deduction
             flags.append(f"UAN_EMPLOYMENT_GAPS_{gaps}")
         
@@ -300,7 +364,7 @@ class TrustScoreCalculator:
         if decision == "LOW_CONFIDENCE":
             score -= FACE_DEDUCTIONS["low_confidence"]
             flags.append(f"FACE_LOW_CONFIDENCE_{confidence}%")
-        elif confidence < 85:
+        elif confidence < FACE_MODERATE_CONFIDENCE:
             score -= FACE_DEDUCTIONS["moderate_confidence"]
             flags.append(f"FACE_MODERATE_CONFIDENCE_{confidence}%")
         
@@ -409,19 +473,37 @@ class TrustScoreCalculator:
     
     def _check_completion(self, verification_data: Dict) -> float:
         """Check verification completion rate."""
-        required_steps = {
-            "personal_data": verification_data.get("candidate") is not None,
-            "aadhaar": verification_data.get("aadhaar") is not None,
-            "pan": verification_data.get("pan") is not None,
-            "face": verification_data.get("face") is not None,
-            "documents": len(verification_data.get("documents", [])) > 0,
-        }
+        required_steps = {"personal_data": verification_data.get("candidate") is not None}
+        required_steps.update({
+            name: self._input_present(name, verification_data)
+            for name in REQUIRED_COMPONENTS
+        })
         
         completed = sum(required_steps.values())
         total = len(required_steps)
         
         return completed / total if total > 0 else 0
     
+    def _input_present(self, component: str, verification_data: Dict) -> bool:
+        """Whether a component's input was supplied (see REQUIRED_COMPONENTS)."""
+        if component == "documents":
+            return len(verification_data.get("documents", [])) > 0
+        if component in REQUIRED_COMPONENTS:
+            return verification_data.get(component) is not None
+        return True
+    
+    def _incomplete_result(self, completion_rate: float) -> TrustScoreResult:
+        """Result for a verification below MIN_COMPLETION_RATE."""
+        return TrustScoreResult(
+            score=0,
+            status=TrustScoreStatus.INCOMPLETE,
+            flags=["INCOMPLETE_VERIFICATION"],
+            breakdown={},
+            completion_rate=completion_rate,
+            recommendations=["Complete all mandatory verification steps"],
+            calculated_at=datetime.utcnow(),
+        )
+    
     def _determine_status(self, score: float) -> TrustScoreStatus:
         """Determine status based on score thresholds."""
         if score >= THRESHOLDS["verified"]:
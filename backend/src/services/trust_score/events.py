@@ -0,0 +1,148 @@
+"""
+Trust score change tracking.
+
+Session listeners that queue a trust_score job whenever a row feeding the
+score changes, so TrustScore and Verification.trust_score stay current
+without anyone calling POST /trust-score/calculate.
+
+- after_flush notes which components each changed row feeds
+- before_commit queues one job per affected verification, naming just
+  those components, in the same transaction as the change (a rolled-back
+  change queues nothing)
+
+Rows and the components they feed:
+    VerificationStep        by step type (see STEP_COMPONENTS; none yet)
+    FaceComparison          face (every verification of the candidate)
+    DocumentVerification    documents (every verification of the candidate)
+
+HR-uploaded documents (HRDocument) are not a score input: HR reviews them
+alongside the score, so they queue nothing.
+
+Usage:
+    install_trust_score_events()  # once per process, before sessions are used
+"""
+
+import logging
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ...models import Verification, VerificationStep
+from ...models.face_comparison import FaceComparison
+from ...models.document_verification import DocumentVerification
+
+logger = logging.getLogger(__name__)
+
+# session.info key for changes noted since the last commit
+PENDING_KEY = "trust_score_pending"
+
+# Components fed by each verification step type. Empty for now: the
+# aadhaar/pan/uan inputs are not read from steps yet (store._get_step_data
+# is a stub), and face/documents come from FaceComparison and
+# DocumentVerification, so no step change can move the score. Add a step
+# type (e.g. StepType.PAN.value: ("pan", "cross_match")) once its data is read.
+STEP_COMPONENTS: Dict[str, Tuple[str, ...]] = {}
+
+# Columns whose change can move the score; updates to anything else
+# (audit trails, HR notes, timings) are ignored
+WATCHED_COLUMNS = {
+    VerificationStep: ("step_type", "status", "input_data", "raw_response", "flags"),
+    FaceComparison: ("decision", "confidence_score", "candidate_id"),
+    DocumentVerification: ("document_type", "legitimacy_score", "status", "candidate_id"),
+}
+
+# ("verification" | "candidate", id) -> components
+Pending = Dict[Tuple[str, int], Set[str]]
+
+
+def install_trust_score_events() -> None:
+    """Register the session listeners (idempotent)."""
+    for name, listener in (
+        ("after_flush", _note_changes),
+        ("before_commit", _queue_recalculations),
+        ("after_rollback", _discard_changes),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+
+# ============ LISTENERS ============
+
+def _note_changes(session: Session, flush_context) -> None:
+    """Record which components the rows in this flush feed."""
+    for obj in _changed_rows(session):
+        target = _affected(obj)
+        if target is None:
+            continue
+        key, components = target
+        pending: Pending = session.info.setdefault(PENDING_KEY, {})
+        pending.setdefault(key, set()).update(components)
+
+
+def _queue_recalculations(session: Session) -> None:
+    """Queue a trust_score job per affected verification."""
+    if session.new or session.dirty or session.deleted:
+        session.flush()  # Note changes made since the last flush
+    pending: Optional[Pending] = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+
+    # Imported here: the jobs package imports the trust score store
+    from ..jobs import queue_trust_score
+
+    by_verification: Dict[int, Set[str]] = {}
+    for (kind, ident), components in pending.items():
+        if kind == "verification":
+            verification_ids = [ident]
+        else:
+            verification_ids = [
+                row.id for row in session.query(Verification.id).filter(
+                    Verification.candidate_id == ident
+                )
+            ]
+        for verification_id in verification_ids:
+            by_verification.setdefault(verification_id, set()).update(components)
+
+    for verification_id, components in by_verification.items():
+        queue_trust_score(session, verification_id, components)
+    logger.debug(f"[TrustScoreEvents] queued recalculation for {sorted(by_verification)}")
+
+
+def _discard_changes(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
+
+
+# ============ HELPERS ============
+
+def _changed_rows(session: Session) -> Iterator[object]:
+    """Watched rows inserted, deleted, or updated in a watched column."""
+    for obj in session.new:
+        if type(obj) in WATCHED_COLUMNS:
+            yield obj
+    for obj in session.deleted:
+        if type(obj) in WATCHED_COLUMNS:
+            yield obj
+    for obj in session.dirty:
+        columns = WATCHED_COLUMNS.get(type(obj))
+        if columns is None:
+            continue
+        attrs = inspect(obj).attrs
+        if any(attrs[column].history.has_changes() for column in columns):
+            yield obj
+
+
+def _affected(obj) -> Optional[Tuple[Tuple[str, int], Tuple[str, ...]]]:
+    """(key, components) for a changed row, or None if it feeds no component."""
+    if isinstance(obj, VerificationStep):
+        step_type = getattr(obj.step_type, "value", obj.step_type)
+        components = STEP_COMPONENTS.get(step_type)
+        if not components or obj.verification_id is None:
+            return None
+        return ("verification", obj.verification_id), components
+
+    # Face and document inputs are read per candidate (see store.gather_verification_data)
+    component = "face" if isinstance(obj, FaceComparison) else "documents"
+    if obj.candidate_id is None:
+        return None
+    return ("candidate", obj.candidate_id), (component,)
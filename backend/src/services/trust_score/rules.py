@@ -28,6 +28,9 @@ WEIGHTS = {
     "cross_match": 10,   # Consistency checks
 }
 
+# Component evaluators, in the order their deductions are applied
+COMPONENTS = tuple(WEIGHTS)
+
 # ============ STATUS THRESHOLDS ============
 
 THRESHOLDS = {
@@ -41,6 +44,9 @@ THRESHOLDS = {
 
 MIN_COMPLETION_RATE = 0.70  # 70% minimum
 
+# Components whose input counts toward completion (with personal data)
+REQUIRED_COMPONENTS = ("aadhaar", "pan", "face", "documents")
+
 # ============ AADHAAR DEDUCTIONS ============
 
 AADHAAR_DEDUCTIONS = {
@@ -49,9 +55,11 @@ AADHAAR_DEDUCTIONS = {
     "name_mismatch": 30,
     "dob_mismatch": 40,
     "gender_mismatch": 10,
-    "low_match": 20,           # Match < 80%
+    "low_match": 20,           # Match < AADHAAR_LOW_MATCH_SCORE
 }
 
+AADHAAR_LOW_MATCH_SCORE = 80
+
 # ============ PAN DEDUCTIONS ============
 
 PAN_DEDUCTIONS = {
@@ -70,9 +78,11 @@ UAN_DEDUCTIONS = {
     "not_provided_senior": 100,       # 3+ years experience
     "invalid": 100,
     "experience_mismatch": 30,        # Claimed vs verified
-    "employment_gap": 5,              # Per gap (max 20)
+    "employment_gap": 5,              # Per gap (max UAN_MAX_GAP_DEDUCTION)
 }
 
+UAN_MAX_GAP_DEDUCTION = 20
+
 # Experience thresholds for UAN
 UAN_EXPERIENCE_THRESHOLDS = {
     "fresher": 0,      # No UAN expected
@@ -86,10 +96,12 @@ FACE_DEDUCTIONS = {
     "not_verified": 100,
     "mismatch": 100,
     "low_confidence": 40,        # Decision = LOW_CONFIDENCE
-    "moderate_confidence": 15,   # Confidence 70-85%
+    "moderate_confidence": 15,   # Confidence below FACE_MODERATE_CONFIDENCE
     "liveness_failed": 30,
 }
 
+FACE_MODERATE_CONFIDENCE = 85
+
 # ============ DOCUMENT DEDUCTIONS ============
 
 DOCUMENT_DEDUCTIONS = {
@@ -17,6 +17,7 @@ import os
 import base64
 import logging
 import hashlib
+import shutil
 from datetime import datetime
 from typing import Optional, Tuple
 from pathlib import Path
@@ -164,6 +165,26 @@ class FaceStorage:
         logger.info(f"Saved audit for verification {verification_id}: {key}")
         return key
     
+    def save_document(self, key: str, path: str) -> str:
+        """
+        Save a document file under an existing key.
+        
+        Args:
+            key: Storage key (e.g. documents/{candidate_id}/...)
+            path: Local file to store (a spooled upload)
+            
+        Returns: Storage key
+        """
+        if self._storage_type == self.STORAGE_S3:
+            self.s3_client.upload_file(path, self._bucket, key)
+        else:
+            dest = self._local_path / key
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, dest)
+        
+        logger.info(f"Saved document: {key}")
+        return key
+    
     def get_image(self, key: str) -> Optional[bytes]:
         """
         Retrieve image bytes by key.
@@ -0,0 +1,207 @@
+"""
+Streaming upload spooling.
+
+Document uploads are copied to a temp file in fixed-size chunks instead of
+being read into memory. The size limit is enforced while reading, and the
+SHA-256 is computed on the way through (it keys the analysis result cache).
+
+The spool is a named file on disk because analysis runs in worker processes,
+which open it by path. Zip uploads (batch analysis) are unpacked member by
+member into spool files of their own, under the same per-file limit.
+
+Environment:
+    DOCUMENT_UPLOAD_MAX_BYTES   Largest accepted upload (default: 10MB)
+    DOCUMENT_UPLOAD_SPOOL_DIR   Directory for spooled uploads (default: system temp)
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import zipfile
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOAD_BYTES = int(os.getenv("DOCUMENT_UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+MIN_UPLOAD_BYTES = 100
+CHUNK_SIZE = 256 * 1024
+
+# Zip member holding the batch manifest
+ZIP_MANIFEST_NAME = "manifest.json"
+
+
+class UploadSizeError(Exception):
+    """Upload is smaller or larger than allowed (message is client-safe)."""
+    pass
+
+
+class SpooledUpload:
+    """
+    An upload spooled to disk.
+
+    Usage:
+        upload = await spool_upload(file)
+        try:
+            result = await executor.analyze(upload.path, doc_type, content_hash=upload.sha256)
+        finally:
+            upload.cleanup()
+    """
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def save_to(self, dest: Path) -> None:
+        """Copy the spooled file to permanent storage."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.path, dest)
+
+    def cleanup(self) -> None:
+        """Delete the spool file. Safe to call more than once."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove spooled upload {self.path}: {e}")
+
+
+def _too_large_message(max_bytes: int) -> str:
+    return f"File too large (max {max_bytes / (1024 * 1024):g}MB)"
+
+
+def _new_spool() -> Tuple[BinaryIO, SpooledUpload]:
+    spool_dir = os.getenv("DOCUMENT_UPLOAD_SPOOL_DIR") or None
+    handle = tempfile.NamedTemporaryFile(
+        prefix="upload_", suffix=".bin", dir=spool_dir, delete=False
+    )
+    return handle, SpooledUpload(handle.name, 0, "")
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: Optional[int] = None,
+    min_bytes: int = MIN_UPLOAD_BYTES,
+) -> SpooledUpload:
+    """
+    Stream an UploadFile to a temp file, enforcing size limits as it reads.
+
+    Raises:
+        UploadSizeError: Upload is too small, or passed max_bytes (reading
+            stops at that point and the partial file is removed)
+    """
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+
+    # Reject on the declared size before copying anything
+    if file.size is not None and file.size > max_bytes:
+        raise UploadSizeError(_too_large_message(max_bytes))
+
+    handle, upload = _new_spool()
+    digest = hashlib.sha256()
+
+    try:
+        with handle:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                upload.size += len(chunk)
+                if upload.size > max_bytes:
+                    raise UploadSizeError(_too_large_message(max_bytes))
+                digest.update(chunk)
+                handle.write(chunk)
+    except BaseException:
+        upload.cleanup()
+        raise
+
+    if upload.size < min_bytes:
+        upload.cleanup()
+        raise UploadSizeError("File too small")
+
+    upload.sha256 = digest.hexdigest()
+    return upload
+
+
+def spool_fileobj(
+    fileobj: BinaryIO,
+    max_bytes: Optional[int] = None,
+    min_bytes: int = MIN_UPLOAD_BYTES,
+) -> SpooledUpload:
+    """Synchronous spool_upload for file objects (e.g. zip members)."""
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+    handle, upload = _new_spool()
+    digest = hashlib.sha256()
+
+    try:
+        with handle:
+            for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+                upload.size += len(chunk)
+                if upload.size > max_bytes:
+                    raise UploadSizeError(_too_large_message(max_bytes))
+                digest.update(chunk)
+                handle.write(chunk)
+    except BaseException:
+        upload.cleanup()
+        raise
+
+    if upload.size < min_bytes:
+        upload.cleanup()
+        raise UploadSizeError("File too small")
+
+    upload.sha256 = digest.hexdigest()
+    return upload
+
+
+def unpack_zip(
+    archive: SpooledUpload,
+    max_files: int,
+    max_bytes: Optional[int] = None,
+) -> Tuple[List[Tuple[str, SpooledUpload]], Optional[str], List[Tuple[str, str]]]:
+    """
+    Spool every file in a zip upload.
+
+    Directories and hidden/__MACOSX entries are skipped. Members are read
+    as streams, so the declared sizes in the zip are never trusted. A
+    member out of limits is rejected on its own, like a loose file.
+
+    Returns:
+        ([(member name, SpooledUpload)], manifest.json text or None,
+         [(member name, error)])
+
+    Raises:
+        UploadSizeError: Not a zip, or too many files
+    """
+    members: List[Tuple[str, SpooledUpload]] = []
+    rejected: List[Tuple[str, str]] = []
+    manifest = None
+    try:
+        with zipfile.ZipFile(archive.path) as zf:
+            for info in zf.infolist():
+                name = info.filename
+                base = os.path.basename(name)
+                if info.is_dir() or not base or base.startswith(".") or name.startswith("__MACOSX/"):
+                    continue
+                if base == ZIP_MANIFEST_NAME:
+                    with zf.open(info) as f:
+                        manifest = f.read(1024 * 1024).decode("utf-8")
+                    continue
+                if len(members) >= max_files:
+                    raise UploadSizeError(f"Too many files in archive (max {max_files})")
+                with zf.open(info) as f:
+                    try:
+                        members.append((name, spool_fileobj(f, max_bytes)))
+                    except UploadSizeError as e:
+                        rejected.append((name, str(e)))
+    except zipfile.BadZipFile:
+        raise UploadSizeError("Archive is not a valid zip file")
+    except BaseException:
+        for _, upload in members:
+            upload.cleanup()
+        raise
+    return members, manifest, rejected
@@ -0,0 +1,184 @@
+"""
+Background job worker.
+
+Runs the jobs queued by the API (services/jobs): face comparison,
+document analysis and trust-score recompute. Any number of workers can
+run against the same database; each claims due jobs with
+SELECT ... FOR UPDATE SKIP LOCKED and runs them one at a time.
+
+Usage:
+    python -m src.worker                             # run until SIGTERM/SIGINT
+    python -m src.worker --types face_compare,trust_score
+    python -m src.worker --once                      # drain due jobs, then exit
+    python -m src.worker --requeue-dead [--types document_analysis]
+    python -m src.worker --stats
+
+On SIGTERM the job in hand is finished before the worker exits; a worker
+that is killed outright leaves its job to be retried once its lease
+expires (JOB_LOCK_TIMEOUT).
+
+Environment:
+    JOB_POLL_INTERVAL  Seconds between polls when no job is due (default: 1.0)
+    JOB_BATCH_SIZE     Jobs claimed per poll (default: 1)
+    JOB_TYPES          Comma-separated job types this worker runs (default: all)
+"""
+
+import os
+import sys
+import json
+import socket
+import signal
+import asyncio
+import logging
+import argparse
+from typing import List, Optional
+
+from .database import SessionLocal
+from .models.job import Job, JobStatus
+from .services.jobs import HANDLERS, PermanentJobError, get_job_queue
+from .services.document.executor import get_document_executor
+from .services.trust_score import install_trust_score_events
+
+logger = logging.getLogger(__name__)
+
+
+def worker_id() -> str:
+    """host:pid, recorded as the lease holder."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def run_job(db, job: Job, holder: str) -> Optional[JobStatus]:
+    """Run one claimed job and settle it. Returns its new status."""
+    queue = get_job_queue()
+    job_id, job_type, payload = job.id, job.job_type, dict(job.payload or {})
+    handler = HANDLERS.get(job_type)
+
+    error, permanent = None, False
+    if handler is None:
+        error, permanent = f"No handler for job type '{job_type}'", True
+    else:
+        try:
+            await handler.run(db, payload)
+        except PermanentJobError as e:
+            error, permanent = str(e), True
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+    if error is None:
+        queue.complete(db, job, holder)
+        logger.info(f"[worker] job {job_id} ({job_type}) done")
+        return JobStatus.DONE
+
+    db.rollback()
+    status = queue.fail(db, job, holder, error, permanent=permanent)
+    if status == JobStatus.DEAD:
+        settle_dead(db, job_type, payload, error)
+    return status
+
+
+def settle_dead(db, job_type: str, payload: dict, error: str) -> None:
+    """Let the handler settle the rows a dead-lettered job owns."""
+    handler = HANDLERS.get(job_type)
+    if handler is None or handler.on_dead is None:
+        return
+    try:
+        handler.on_dead(db, payload, error)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[worker] dead-letter handler for {job_type} failed: {e}")
+
+
+async def run_worker(job_types: Optional[List[str]], once: bool = False) -> int:
+    """Claim and run jobs until stopped (or, with once, until none are due)."""
+    queue = get_job_queue()
+    poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    batch_size = int(os.getenv("JOB_BATCH_SIZE", "1"))
+    holder = worker_id()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):  # Windows, or not the main thread
+            pass
+
+    logger.info(f"[worker] {holder} started: types={job_types or 'all'}")
+    processed = 0
+    last_reclaim = 0.0
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            # Jobs of workers that died mid-run
+            if loop.time() - last_reclaim >= queue.lock_timeout / 4:
+                for job in queue.reclaim_stale(db):
+                    settle_dead(db, job.job_type, dict(job.payload or {}), job.last_error or "")
+                last_reclaim = loop.time()
+
+            jobs = queue.claim(db, holder, job_types, limit=batch_size)
+            for job in jobs:
+                await run_job(db, job, holder)
+                processed += 1
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[worker] poll failed: {e}")
+            jobs = []
+        finally:
+            db.close()
+
+        if not jobs:
+            if once:
+                break
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    get_document_executor().shutdown()
+    logger.info(f"[worker] {holder} stopped after {processed} job(s)")
+    return processed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument(
+        "--types",
+        default=os.getenv("JOB_TYPES", ""),
+        help="Comma-separated job types (default: all)",
+    )
+    parser.add_argument("--once", action="store_true", help="Exit when no job is due")
+    parser.add_argument("--requeue-dead", action="store_true", help="Retry dead-lettered jobs, then exit")
+    parser.add_argument("--stats", action="store_true", help="Print queue counts, then exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    job_types = [t.strip() for t in args.types.split(",") if t.strip()] or None
+    unknown = set(job_types or []) - set(HANDLERS)
+    if unknown:
+        parser.error(f"unknown job types: {sorted(unknown)} (known: {sorted(HANDLERS)})")
+
+    if args.requeue_dead or args.stats:
+        db = SessionLocal()
+        try:
+            if args.requeue_dead:
+                for job_type in job_types or [None]:
+                    count = get_job_queue().requeue_dead(db, job_type)
+                    print(f"Requeued {count} dead job(s){f' ({job_type})' if job_type else ''}")
+            if args.stats:
+                print(json.dumps(get_job_queue().stats(db), indent=2))
+        finally:
+            db.close()
+        return 0
+
+    # Handlers write score inputs too
+    install_trust_score_events()
+    asyncio.run(run_worker(job_types, once=args.once))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Batch trust score tests - BatchTrustScorer must match calculate() row for row.
+
+Runs the scalar calculator and the batch scorer over the same random
+verifications, with the shipped rules and with the rule tables tweaked,
+so a rule changed in one place and not the other fails here.
+
+Needs no server or database; runs offline.
+
+Run with: python test_batch_trust_score.py
+"""
+
+import sys
+import random
+
+from src.services.trust_score import rules
+from src.services.trust_score.calculator import TrustScoreCalculator
+from src.services.trust_score.batch import BatchTrustScorer
+
+ROWS = 2000
+NAMES = ["RAVI KUMAR", "Ravi Kumaar", "SITA DEVI", "R KUMAR", "ravi  kumar", ""]
+
+# In-place edits to the shared rule tables; both scorers must follow them
+TWEAKS = [
+    (rules.AADHAAR_DEDUCTIONS, "low_match", 35),
+    (rules.UAN_DEDUCTIONS, "employment_gap", 7),
+    (rules.FACE_DEDUCTIONS, "moderate_confidence", 25),
+    (rules.DOCUMENT_LEGITIMACY_THRESHOLDS, "acceptable", 80),
+    (rules.THRESHOLDS, "review_required", 65),
+]
+
+
+def verification_data(rng: random.Random) -> dict:
+    """Random calculator input, including missing and malformed components."""
+    def maybe(value, p=0.85):
+        return value if rng.random() < p else rng.choice([None, {}])
+
+    data = {"candidate": {"id": 1, "experience_years": rng.choice([0, 1, 2, 3, 5, 10, 2.5])}}
+    data["aadhaar"] = maybe({
+        "status": rng.choice(["OK", "FAILED", "verified"]),
+        "match_score": rng.choice([rng.randint(50, 100), rng.uniform(50, 100)]),
+        "comparisons": {
+            "name": {"match": rng.random() < 0.8},
+            "dob": {"match": rng.random() < 0.8},
+        },
+        "data": {"full_name": rng.choice(NAMES), "dob": rng.choice(["1990", "1991", None])},
+    })
+    data["pan"] = maybe({
+        "valid": rng.random() < 0.9,
+        "name_match": rng.choice([True, False, None]),
+        "aadhaar_linked": rng.choice([True, False]),
+        "data": {"full_name": rng.choice(NAMES), "dob": rng.choice(["1990", "1991"])},
+    })
+    uan = {"valid": rng.random() < 0.9, "employment_gaps": rng.randint(0, 6), "data": {"name": rng.choice(NAMES)}}
+    if rng.random() < 0.7:
+        uan["total_experience_months"] = rng.randint(0, 150)
+    data["uan"] = maybe(uan, 0.6)
+    data["face"] = maybe({
+        "decision": rng.choice(["MATCH", "MISMATCH", "LOW_CONFIDENCE"]),
+        "confidence": rng.uniform(50, 100),
+        "liveness_passed": rng.choice([True, False, None]),
+    })
+    data["documents"] = [
+        {
+            "document_type": rng.choice(["education", "experience", "payslip", "id_card"]),
+            "legitimacy_score": rng.choice([rng.uniform(20, 100), 74.5, 84.99999]),
+            "status": rng.choice(["LEGITIMATE", "SUSPICIOUS", "REVIEW_REQUIRED"]),
+        }
+        for _ in range(rng.choice([0, 1, 2, 3, 8]))
+    ]
+    return data
+
+
+def comparable(result) -> dict:
+    """A TrustScoreResult without its timestamp, flags in a fixed order."""
+    audit = result.to_audit()
+    audit.pop("calculated_at", None)
+    audit["flags"] = sorted(audit["flags"])
+    return audit
+
+
+def mismatches(rows) -> list:
+    """Indexes of rows where the batch result differs from calculate()."""
+    calculator = TrustScoreCalculator()
+    batch = BatchTrustScorer().score(rows)
+    assert len(batch) == len(rows)
+    return [
+        i for i, row in enumerate(rows)
+        if comparable(batch.result(i)) != comparable(calculator.calculate(row))
+    ]
+
+
+def test_batch_trust_score():
+    print("=" * 60)
+    print("CHECK-360 Batch Trust Score Tests")
+    print("=" * 60)
+
+    errors = []
+    rows = [verification_data(random.Random(25 + i)) for i in range(ROWS)]
+
+    # ============ Test 1: Shipped Rules ============
+    print(f"\n[1/3] Testing batch scores against calculate() ({ROWS} rows)...")
+    try:
+        bad = mismatches(rows)
+        assert not bad, f"{len(bad)} rows differ, first {bad[0]}"
+        print("      ✅ Batch and scalar scores match")
+    except Exception as e:
+        errors.append(f"Shipped rules failed: {e}")
+        print(f"      ❌ Shipped rules failed: {e}")
+
+    # ============ Test 2: Cached Components ============
+    print("\n[2/3] Testing batch components against calculate_incremental()...")
+    try:
+        calculator = TrustScoreCalculator()
+        batch = BatchTrustScorer().score(rows[:500])
+        for i, row in enumerate(rows[:500]):
+            _, expected = calculator.calculate_incremental(row, {}, rules.COMPONENTS)
+            got = batch.components(i)
+            for name, component in expected.items():
+                assert got[name].to_dict() == component.to_dict(), f"row {i} {name}: {got[name]} != {component}"
+        print("      ✅ Components match")
+    except Exception as e:
+        errors.append(f"Components failed: {e}")
+        print(f"      ❌ Components failed: {e}")
+
+    # ============ Test 3: Tweaked Rules ============
+    print("\n[3/3] Testing batch scores with the rule tables changed...")
+    try:
+        for table, key, value in TWEAKS:
+            original = table[key]
+            table[key] = value
+            try:
+                bad = mismatches(rows[:500])
+            finally:
+                table[key] = original
+            assert not bad, f"{key}={value}: {len(bad)} rows differ, first {bad[0]}"
+        print(f"      ✅ Both scorers follow {len(TWEAKS)} rule changes")
+    except Exception as e:
+        errors.append(f"Tweaked rules failed: {e}")
+        print(f"      ❌ Tweaked rules failed: {e}")
+
+    # ============ Summary ============
+    print("\n" + "=" * 60)
+    if errors:
+        print(f"BATCH RESULT: ❌ {len(errors)} ERROR(S)")
+        for e in errors:
+            print(f"  - {e}")
+    else:
+        print("BATCH RESULT: ✅ ALL TESTS PASSED")
+    print("=" * 60)
+
+    return errors
+
+if __name__ == "__main__":
+    errors = test_batch_trust_score()
+    sys.exit(1 if errors else 0)
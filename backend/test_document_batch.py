@@ -0,0 +1,240 @@
+"""
+Batch document endpoint tests - POST /documents/analyze/batch end to end.
+
+Streams a zip (with manifest.json) through the route on a throwaway SQLite
+database: checks the result, error and summary NDJSON lines, per-member
+size limits, and that a client disconnecting mid-stream still gets the
+documents analyzed so far saved.
+
+Needs no server or Postgres; runs offline.
+
+Run with: python test_document_batch.py
+"""
+
+import io
+import os
+import sys
+import gc
+import json
+import asyncio
+import zipfile
+import tempfile
+
+WORK_DIR = tempfile.mkdtemp(prefix="check360_batch_")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORK_DIR}/batch.db"
+os.environ["FACE_STORAGE"] = "local"
+os.environ["FACE_LOCAL_PATH"] = os.path.join(WORK_DIR, "storage")
+os.environ["DOCUMENT_ANALYSIS_WORKERS"] = "0"
+os.environ["DOCUMENT_BATCH_CONCURRENCY"] = "1"
+os.environ["DOCUMENT_UPLOAD_MAX_BYTES"] = str(1024 * 1024)
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+from src.database import Base, engine, SessionLocal
+from src import models  # noqa: F401 - registers every table
+from src.models import DocumentVerification
+from src.api.routes import documents
+from src.services.document.executor import get_document_executor
+from scripts.document_corpus import generate_corpus
+
+PDFS = ["digital_1p.pdf", "digital_3p.pdf", "digital_3fonts.pdf",
+        "tampered_editor.pdf", "tampered_dates.pdf", "tampered_fonts.pdf"]
+
+
+def batch_zip(corpus_dir: str, names, candidate_id: int, extra=None, manifest_extra=None) -> bytes:
+    """A zip of corpus files under docs/, with manifest.json entries for each."""
+    manifest = [
+        {"file": f"docs/{name}", "candidate_id": candidate_id, "document_type": "education"}
+        for name in names
+    ] + (manifest_extra or [])
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zf:
+        zf.writestr("manifest.json", json.dumps(manifest))
+        for name in names:
+            zf.write(os.path.join(corpus_dir, name), f"docs/{name}")
+        for name, data in (extra or {}).items():
+            zf.writestr(name, data)
+    return out.getvalue()
+
+
+async def post_batch(app, archive: bytes, disconnect_after=None):
+    """
+    POST a zip to the batch endpoint over ASGI.
+
+    disconnect_after: NDJSON lines to read before the client goes away.
+    Returns (status code, [parsed lines]).
+    """
+    request = httpx.Request(
+        "POST", "http://test/documents/analyze/batch",
+        files={"files": ("batch.zip", archive, "application/zip")},
+    )
+    body = request.read()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/documents/analyze/batch",
+        "raw_path": b"/documents/analyze/batch", "query_string": b"", "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in request.headers.items()],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    response = {"status": None, "body": b""}
+    gone = asyncio.Event()
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+            if disconnect_after is not None and response["body"].count(b"\n") >= disconnect_after:
+                gone.set()
+
+    await app(scope, receive, send)
+    lines = [json.loads(line) for line in response["body"].decode().splitlines() if line]
+    return response["status"], lines
+
+
+def saved_rows(candidate_id: int) -> list:
+    db = SessionLocal()
+    try:
+        return db.query(DocumentVerification).filter(DocumentVerification.candidate_id == candidate_id).all()
+    finally:
+        db.close()
+
+
+def test_document_batch():
+    print("=" * 60)
+    print("CHECK-360 Batch Document Endpoint Tests")
+    print("=" * 60)
+
+    errors = []
+    Base.metadata.create_all(engine)
+    app = FastAPI()
+    app.include_router(documents.router)
+    corpus_dir = os.path.join(WORK_DIR, "corpus")
+    generate_corpus(corpus_dir, "small")
+
+    # ============ Test 1: Streamed Results and Summary ============
+    print("\n[1/3] Testing a zip batch streams results and a summary...")
+    try:
+        archive = batch_zip(corpus_dir, PDFS, candidate_id=1)
+        status, lines = asyncio.run(post_batch(app, archive))
+        assert status == 200, f"status {status}"
+        results = [line for line in lines if line["type"] == "result"]
+        assert len(results) == len(PDFS), f"{len(results)} results for {len(PDFS)} files"
+        assert {r["file"] for r in results} == {f"docs/{name}" for name in PDFS}
+        for r in results:
+            assert r["candidate_id"] == 1 and 0 <= r["legitimacy_score"] <= 100, r
+        summary = lines[-1]
+        assert summary["type"] == "summary", f"last line {summary}"
+        assert summary["analyzed"] == len(PDFS) and summary["failed"] == 0 and summary["saved"], summary
+        rows = {row.id: row for row in saved_rows(1)}
+        assert sorted(rows) == sorted(entry["id"] for entry in summary["ids"]), "summary ids not saved"
+        for entry in summary["ids"]:
+            assert rows[entry["id"]].original_filename == os.path.basename(entry["file"])
+        print(f"      ✅ {len(results)} results, summary ids match {len(rows)} saved rows")
+    except Exception as e:
+        errors.append(f"Batch results failed: {e}")
+        print(f"      ❌ Batch results failed: {e}")
+
+    # ============ Test 2: Error Lines ============
+    print("\n[2/3] Testing per-file errors and member size limits...")
+    try:
+        archive = batch_zip(
+            corpus_dir, PDFS[:1], candidate_id=2,
+            extra={
+                "docs/huge.pdf": b"%PDF-1.4\n" + os.urandom(1024 * 1024),
+                "docs/tiny.pdf": b"%PDF-1.4\n",
+                "docs/notes.txt": b"not a document " * 20,
+                "docs/stray.pdf": open(os.path.join(corpus_dir, PDFS[1]), "rb").read(),
+            },
+            manifest_extra=[
+                {"file": "docs/huge.pdf", "candidate_id": 2, "document_type": "education"},
+                {"file": "docs/tiny.pdf", "candidate_id": 2, "document_type": "education"},
+                {"file": "docs/notes.txt", "candidate_id": 2, "document_type": "other"},
+                {"file": "docs/missing.pdf", "candidate_id": 2, "document_type": "other"},
+            ],
+        )
+        status, lines = asyncio.run(post_batch(app, archive))
+        assert status == 200, f"status {status}"
+        got = {line["file"]: line["error"] for line in lines if line["type"] == "error"}
+        expected = {
+            "docs/huge.pdf": "File too large (max 1MB)",
+            "docs/tiny.pdf": "File too small",
+            "docs/notes.txt": "unsupported_type",
+            "docs/stray.pdf": "not_in_manifest",
+            "docs/missing.pdf": "file_missing",
+        }
+        assert got == expected, f"errors {got}"
+        assert [line["file"] for line in lines if line["type"] == "result"] == [f"docs/{PDFS[0]}"]
+        summary = lines[-1]
+        assert summary["type"] == "summary", f"last line {summary}"
+        assert (summary["total"], summary["analyzed"], summary["failed"]) == (6, 1, 5), summary
+        assert len(saved_rows(2)) == 1
+        print(f"      ✅ {len(expected)} error lines; the valid file is still saved")
+    except Exception as e:
+        errors.append(f"Batch errors failed: {e}")
+        print(f"      ❌ Batch errors failed: {e}")
+
+    # ============ Test 3: Client Disconnect ============
+    print("\n[3/3] Testing a disconnect mid-stream keeps analyzed rows...")
+    try:
+        archive = batch_zip(corpus_dir, PDFS, candidate_id=3)
+
+        async def disconnect():
+            status, lines = await post_batch(app, archive, disconnect_after=2)
+            # The stream's cleanup runs once the abandoned generator is closed
+            gc.collect()
+            for _ in range(100):
+                if saved_rows(3):
+                    break
+                await asyncio.sleep(0.05)
+            return status, lines
+
+        status, lines = asyncio.run(disconnect())
+        assert status == 200, f"status {status}"
+        results = [line for line in lines if line["type"] == "result"]
+        assert results and len(results) < len(PDFS), f"{len(results)} results before disconnect"
+        assert not any(line["type"] == "summary" for line in lines), "summary sent after disconnect"
+        rows = saved_rows(3)
+        assert {row.original_filename for row in rows} == {os.path.basename(r["file"]) for r in results}, (
+            f"saved {[row.original_filename for row in rows]}, streamed {[r['file'] for r in results]}"
+        )
+        print(f"      ✅ {len(rows)} of {len(PDFS)} rows saved after the disconnect")
+    except Exception as e:
+        errors.append(f"Disconnect failed: {e}")
+        print(f"      ❌ Disconnect failed: {e}")
+
+    get_document_executor().shutdown()
+
+    # ============ Summary ============
+    print("\n" + "=" * 60)
+    if errors:
+        print(f"BATCH ENDPOINT RESULT: ❌ {len(errors)} ERROR(S)")
+        for e in errors:
+            print(f"  - {e}")
+    else:
+        print("BATCH ENDPOINT RESULT: ✅ ALL TESTS PASSED")
+    print("=" * 60)
+
+    return errors
+
+if __name__ == "__main__":
+    errors = test_document_batch()
+    sys.exit(1 if errors else 0)
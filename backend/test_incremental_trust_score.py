@@ -0,0 +1,109 @@
+"""
+Incremental trust score tests - calculate_incremental must match calculate().
+
+Caches every component for one verification (round-tripped through JSON,
+as stored on the row), changes some inputs, recalculates only the stale
+components from just their inputs, and compares with a full calculation.
+
+Needs no server or database; runs offline.
+
+Run with: python test_incremental_trust_score.py
+"""
+
+import sys
+import json
+import random
+
+from src.services.trust_score.calculator import TrustScoreCalculator, ComponentResult
+from src.services.trust_score.rules import COMPONENTS
+from src.services.trust_score.store import COMPONENT_INPUTS
+from test_batch_trust_score import verification_data, comparable
+
+ROWS = 2000
+INPUTS = ("aadhaar", "pan", "uan", "face", "documents")
+
+
+def test_incremental_trust_score():
+    print("=" * 60)
+    print("CHECK-360 Incremental Trust Score Tests")
+    print("=" * 60)
+
+    errors = []
+    calculator = TrustScoreCalculator()
+
+    # ============ Test 1: Stale Components Only ============
+    print(f"\n[1/2] Testing calculate_incremental() against calculate() ({ROWS} rows)...")
+    try:
+        rng = random.Random(24)
+        for i in range(ROWS):
+            before = verification_data(rng)
+            after = verification_data(rng)
+            after["candidate"] = before["candidate"]
+
+            # Cache as stored on the verification row (JSON round trip)
+            _, cache = calculator.calculate_incremental(before, {}, COMPONENTS)
+            cache = {
+                name: ComponentResult.from_dict(json.loads(json.dumps(result.to_dict())))
+                for name, result in cache.items()
+            }
+
+            changed = [c for c in INPUTS if rng.random() < 0.5]
+            current = dict(before)
+            for component in changed:
+                current[component] = after[component]
+            stale = set(changed)
+            if stale & {"aadhaar", "pan", "uan"}:
+                stale.add("cross_match")
+
+            # Only the stale components' inputs are loaded
+            partial = {"candidate": current["candidate"]}
+            for component in stale:
+                for key in COMPONENT_INPUTS[component]:
+                    partial[key] = current[key]
+
+            result, _ = calculator.calculate_incremental(partial, cache, stale)
+            expected = calculator.calculate(current)
+            assert comparable(result) == comparable(expected), f"row {i}, stale {sorted(stale)}"
+        print("      ✅ Incremental and full scores match")
+    except Exception as e:
+        errors.append(f"Stale components failed: {e}")
+        print(f"      ❌ Stale components failed: {e}")
+
+    # ============ Test 2: Partial Cache ============
+    print("\n[2/2] Testing components missing from the cache...")
+    try:
+        rng = random.Random(240)
+        for i in range(500):
+            data = verification_data(rng)
+            _, cache = calculator.calculate_incremental(data, {}, COMPONENTS)
+            kept = {name: result for name, result in cache.items() if rng.random() < 0.5}
+            missing = set(COMPONENTS) - set(kept)
+
+            # Nothing marked stale: the missing components are recalculated anyway
+            partial = {"candidate": data["candidate"]}
+            for component in missing:
+                for key in COMPONENT_INPUTS[component]:
+                    partial[key] = data[key]
+
+            result, _ = calculator.calculate_incremental(partial, kept, [])
+            assert comparable(result) == comparable(calculator.calculate(data)), f"row {i}, missing {sorted(missing)}"
+        print("      ✅ Missing components are recalculated")
+    except Exception as e:
+        errors.append(f"Partial cache failed: {e}")
+        print(f"      ❌ Partial cache failed: {e}")
+
+    # ============ Summary ============
+    print("\n" + "=" * 60)
+    if errors:
+        print(f"INCREMENTAL RESULT: ❌ {len(errors)} ERROR(S)")
+        for e in errors:
+            print(f"  - {e}")
+    else:
+        print("INCREMENTAL RESULT: ✅ ALL TESTS PASSED")
+    print("=" * 60)
+
+    return errors
+
+if __name__ == "__main__":
+    errors = test_incremental_trust_score()
+    sys.exit(1 if errors else 0)
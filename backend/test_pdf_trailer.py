@@ -0,0 +1,151 @@
+"""
+PDF trailer reader tests - the metadata fast path must agree with pikepdf.
+
+Reads Info and XMP from the generated corpus and from pikepdf rewrites
+(xref tables, object streams, non-ASCII Info, inline-namespace XMP) with
+both readers, checks that encrypted files fall back to pikepdf, and that
+damaged files make the trailer reader give up cleanly.
+
+Needs no server or database; runs offline.
+
+Run with: python test_pdf_trailer.py
+"""
+
+import io
+import os
+import sys
+import random
+import tempfile
+
+import pikepdf
+
+from src.services.document.context import ParsedDocument
+from src.services.document.analyzers.metadata import MetadataAnalyzer
+from src.services.document.pdf_trailer import PdfStructureError, TrailerReader, scan_revisions
+from scripts.document_corpus import generate_corpus
+
+
+def pdf_variants(corpus_dir: str) -> dict:
+    """Corpus PDFs plus rewrites with xref/object streams and non-ASCII Info strings."""
+    variants = {}
+    for name in sorted(os.listdir(corpus_dir)):
+        if not name.endswith(".pdf"):
+            continue
+        with open(os.path.join(corpus_dir, name), "rb") as f:
+            variants[name] = f.read()
+
+    base = variants[next(iter(variants))]
+    with pikepdf.open(io.BytesIO(base)) as pdf:
+        with pdf.open_metadata(set_pikepdf_as_editor=False, update_docinfo=False) as meta:
+            meta["xmp:CreatorTool"] = "Adobe Photoshop"
+            meta["xmp:ModifyDate"] = "2023-01-05T10:00:00"
+        pdf.docinfo["/Producer"] = "Überprüft (Scan) \\ 2021"
+        pdf.docinfo["/Creator"] = "Adobe Acrobat"
+        pdf.docinfo["/ModDate"] = "D:20230105100000+05'30'"
+        out = io.BytesIO()
+        pdf.save(out, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        variants["object_streams.pdf"] = out.getvalue()
+        out = io.BytesIO()
+        pdf.save(out, object_stream_mode=pikepdf.ObjectStreamMode.disable)
+        variants["xref_table.pdf"] = out.getvalue()
+        out = io.BytesIO()
+        pdf.save(out, encryption=pikepdf.Encryption(owner="owner", user=""))
+        variants["encrypted.pdf"] = out.getvalue()
+    return variants
+
+
+def read_metadata(analyzer: MetadataAnalyzer, data: bytes):
+    parsed = ParsedDocument(data)
+    try:
+        return analyzer._read_metadata(parsed)
+    finally:
+        parsed.close()
+
+
+def test_pdf_trailer():
+    print("=" * 60)
+    print("CHECK-360 PDF Trailer Reader Tests")
+    print("=" * 60)
+
+    errors = []
+    fast = MetadataAnalyzer(fast_path=True)
+    slow = MetadataAnalyzer(fast_path=False)
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        generate_corpus(corpus_dir, "small")
+        variants = pdf_variants(corpus_dir)
+    encrypted = variants.pop("encrypted.pdf")
+
+    # ============ Test 1: Trailer vs pikepdf ============
+    print(f"\n[1/3] Testing trailer metadata against pikepdf ({len(variants)} PDFs)...")
+    try:
+        for name, data in variants.items():
+            info, xmp, reader = read_metadata(fast, data)
+            expected_info, expected_xmp, _ = read_metadata(slow, data)
+            assert reader == "trailer", f"{name}: fast path fell back to {reader}"
+            assert info == expected_info, f"{name}: Info {info} != {expected_info}"
+            assert xmp == expected_xmp, f"{name}: XMP {xmp} != {expected_xmp}"
+
+            results = [analyzer.analyze(data) for analyzer in (fast, slow)]
+            assert results[0].score == results[1].score, f"{name}: score differs"
+            assert sorted(results[0].flags) == sorted(results[1].flags), f"{name}: flags differ"
+
+        info, xmp, _ = read_metadata(fast, variants["object_streams.pdf"])
+        assert info["Producer"] == "Überprüft (Scan) \\ 2021", f"Info not decoded: {info}"
+        assert xmp["creator_tool"] == "Adobe Photoshop", f"XMP not read: {xmp}"
+        print("      ✅ Both readers agree")
+    except Exception as e:
+        errors.append(f"Trailer vs pikepdf failed: {e}")
+        print(f"      ❌ Trailer vs pikepdf failed: {e}")
+
+    # ============ Test 2: Encrypted Fallback ============
+    print("\n[2/3] Testing the pikepdf fallback for encrypted files...")
+    try:
+        info, xmp, reader = read_metadata(fast, encrypted)
+        assert reader == "pikepdf", f"encrypted file read by {reader}"
+        assert (info, xmp) == read_metadata(slow, encrypted)[:2]
+        print("      ✅ Encrypted file falls back to pikepdf")
+    except Exception as e:
+        errors.append(f"Encrypted fallback failed: {e}")
+        print(f"      ❌ Encrypted fallback failed: {e}")
+
+    # ============ Test 3: Damaged Files ============
+    print("\n[3/3] Testing damaged files...")
+    try:
+        rng = random.Random(21)
+        sources = list(variants.values())
+        for i in range(300):
+            data = bytearray(rng.choice(sources))
+            if rng.random() < 0.3:
+                data = data[:rng.randint(0, len(data))]
+            else:
+                tail = max(0, len(data) - 400)
+                for _ in range(rng.randint(1, 10)):
+                    data[rng.randrange(tail, len(data))] = rng.choice(b"0123456789 <>/()[]R\n")
+            data = bytes(data)
+            try:
+                scan_revisions(data)
+                reader = TrailerReader(data)
+                reader.info()
+                reader.xmp()
+            except PdfStructureError:
+                pass  # Gave up cleanly; the analyzer opens pikepdf instead
+        print("      ✅ Damaged files raise only PdfStructureError")
+    except Exception as e:
+        errors.append(f"Damaged files failed (case {i}): {e!r}")
+        print(f"      ❌ Damaged files failed (case {i}): {e!r}")
+
+    # ============ Summary ============
+    print("\n" + "=" * 60)
+    if errors:
+        print(f"TRAILER RESULT: ❌ {len(errors)} ERROR(S)")
+        for e in errors:
+            print(f"  - {e}")
+    else:
+        print("TRAILER RESULT: ✅ ALL TESTS PASSED")
+    print("=" * 60)
+
+    return errors
+
+if __name__ == "__main__":
+    errors = test_pdf_trailer()
+    sys.exit(1 if errors else 0)
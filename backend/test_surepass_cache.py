@@ -0,0 +1,116 @@
+"""
+Surepass response cache tests - async access and negative answers.
+
+Uses a throwaway SQLite shared tier (no network): aget/aset must reach the
+shared tier off the event loop, and a "not found / invalid" answer must
+expire after SUREPASS_CACHE_NEGATIVE_TTL instead of the endpoint TTL.
+
+Run with: python test_surepass_cache.py
+"""
+
+import os
+import sys
+import time
+import base64
+import asyncio
+import tempfile
+import threading
+
+os.environ["DATA_ENCRYPTION_KEY"] = base64.b64encode(os.urandom(32)).decode()
+os.environ["SUREPASS_CACHE_ENABLED"] = "true"
+
+from src.services.surepass import cache as cache_module
+from src.services.surepass.cache import SurepassResponseCache, SQLiteCacheTier
+
+PAN = ("ABCDE1234F", "RAVI KUMAR", "1990-05-15")
+
+
+class ThreadRecordingTier(SQLiteCacheTier):
+    """SQLite tier that notes which threads touched it."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value, expires_at):
+        self.threads.add(threading.get_ident())
+        super().set(key, value, expires_at)
+
+
+def test_surepass_cache():
+    print("=" * 60)
+    print("CHECK-360 Surepass Response Cache Tests")
+    print("=" * 60)
+
+    errors = []
+    work_dir = tempfile.mkdtemp(prefix="check360_cache_")
+
+    # ============ Test 1: Async Shared Tier ============
+    print("\n[1/2] Testing aget/aset use the shared tier off the event loop...")
+    try:
+        tier = ThreadRecordingTier(os.path.join(work_dir, "shared.sqlite3"))
+        writer = SurepassResponseCache(shared=tier)
+        reader = SurepassResponseCache(shared=tier)
+        response = {"valid": True, "name_match": True}
+
+        async def round_trip():
+            loop_thread = threading.get_ident()
+            await writer.aset("pan-verification", response, *PAN)
+            # A fresh process-local tier: only the shared tier can answer
+            cached = await reader.aget("pan-verification", *PAN)
+            return loop_thread, cached
+
+        loop_thread, cached = asyncio.run(round_trip())
+        assert cached == response, f"shared tier returned {cached}"
+        assert reader.snapshot()["endpoints"]["pan-verification"]["hits_shared"] == 1
+        assert tier.threads and loop_thread not in tier.threads, "SQLite called on the event loop"
+        print("      ✅ Shared tier read and written in worker threads")
+    except Exception as e:
+        errors.append(f"Async shared tier failed: {e}")
+        print(f"      ❌ Async shared tier failed: {e}")
+
+    # ============ Test 2: Negative Answers ============
+    print("\n[2/2] Testing not-found answers get the short TTL...")
+    original = cache_module.NEGATIVE_CACHE_TTL
+    cache_module.NEGATIVE_CACHE_TTL = 1
+    try:
+        cache = SurepassResponseCache(shared=SQLiteCacheTier(os.path.join(work_dir, "negative.sqlite3")))
+        assert cache.ttl_for("pan-verification", {"valid": True}) == cache.ttls["pan-verification"]
+        assert cache.ttl_for("uan-verification", {"member_name": "RAVI"}) == cache.ttls["uan-verification"]
+
+        cache.set("pan-verification", {"valid": False}, *PAN)
+        cache.set("uan-verification", {"member_name": "", "establishments": []}, "100123456789")
+        assert cache.get("pan-verification", *PAN) == {"valid": False}, "negative answer not cached at all"
+        time.sleep(1.2)
+        assert cache.get("pan-verification", *PAN) is None, "invalid PAN still cached"
+        assert cache.get("uan-verification", "100123456789") is None, "unknown UAN still cached"
+
+        cache_module.NEGATIVE_CACHE_TTL = 0
+        cache.set("pan-verification", {"valid": False}, "ZZZZZ9999Z", "", "")
+        assert cache.get("pan-verification", "ZZZZZ9999Z", "", "") is None, "cached with negative TTL 0"
+        print("      ✅ Negative answers expire early (or are skipped at TTL 0)")
+    except Exception as e:
+        errors.append(f"Negative answers failed: {e}")
+        print(f"      ❌ Negative answers failed: {e}")
+    finally:
+        cache_module.NEGATIVE_CACHE_TTL = original
+
+    # ============ Summary ============
+    print("\n" + "=" * 60)
+    if errors:
+        print(f"CACHE RESULT: ❌ {len(errors)} ERROR(S)")
+        for e in errors:
+            print(f"  - {e}")
+    else:
+        print("CACHE RESULT: ✅ ALL TESTS PASSED")
+    print("=" * 60)
+
+    return errors
+
+if __name__ == "__main__":
+    errors = test_surepass_cache()
+    sys.exit(1 if errors else 0)
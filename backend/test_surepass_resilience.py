@@ -0,0 +1,144 @@
+"""
+Surepass circuit breaker tests - a half-open trial must always report back.
+
+Drives the sync and async clients against a fake transport (no network):
+a trial that is cancelled or dies with a non-httpx error must leave the
+breaker able to admit the next call.
+
+Run with: python test_surepass_resilience.py
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+os.environ["SUREPASS_ENABLED"] = "true"
+os.environ["SUREPASS_API_KEY"] = "test"
+
+from src.services.surepass.client import SurepassClient, AsyncSurepassClient
+from src.services.surepass.resilience import CircuitBreakerRegistry, CircuitState
+from src.services.surepass.ratelimit import SurepassRateLimiter
+
+ENDPOINT = "pan-verification"
+RECOVERY = 0.05
+
+
+class HangingTransport:
+    """Async transport whose request never returns (until cancelled)."""
+
+    async def request(self, method, url, endpoint, **kwargs):
+        await asyncio.Event().wait()
+
+
+class BrokenTransport:
+    """Transport that fails with something other than an httpx error."""
+
+    def __init__(self, is_async: bool):
+        self.is_async = is_async
+
+    def request(self, method, url, endpoint, **kwargs):
+        if self.is_async:
+            return self._fail()
+        raise RuntimeError("h2 protocol error")
+
+    async def _fail(self):
+        raise RuntimeError("h2 protocol error")
+
+
+def half_open_client(client):
+    """Fresh breakers and no rate limits; the endpoint's breaker tripped and recovered."""
+    client.breakers = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=RECOVERY)
+    client.rate_limiter = SurepassRateLimiter(limits={})
+    breaker = client.breakers.get(ENDPOINT)
+    breaker.record_failure()
+    time.sleep(RECOVERY * 2)
+    assert breaker.state == CircuitState.HALF_OPEN
+    return breaker
+
+
+def test_surepass_resilience():
+    print("=" * 60)
+    print("CHECK-360 Surepass Circuit Breaker Tests")
+    print("=" * 60)
+
+    errors = []
+
+    # ============ Test 1: Cancelled Half-Open Trial ============
+    print("\n[1/3] Testing a cancelled half-open trial...")
+    try:
+        client = AsyncSurepassClient()
+        client.transport = HangingTransport()
+        breaker = half_open_client(client)
+
+        async def cancel_trial():
+            trial = asyncio.create_task(client._make_request("POST", ENDPOINT, {"id_number": "x"}))
+            await asyncio.sleep(0.01)
+            assert not breaker.allow_request(), "second call admitted during the trial"
+            trial.cancel()
+            try:
+                await trial
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(cancel_trial())
+        assert breaker.state == CircuitState.HALF_OPEN, f"state {breaker.state}"
+        assert breaker.allow_request(), "next call rejected after the trial was cancelled"
+        print("      ✅ Next call allowed after the cancelled trial")
+    except Exception as e:
+        errors.append(f"Cancelled trial failed: {e}")
+        print(f"      ❌ Cancelled trial failed: {e}")
+
+    # ============ Test 2: Async Trial With a Non-httpx Error ============
+    print("\n[2/3] Testing an async trial that raises a non-httpx error...")
+    try:
+        client = AsyncSurepassClient()
+        client.transport = BrokenTransport(is_async=True)
+        breaker = half_open_client(client)
+        try:
+            asyncio.run(client._make_request("POST", ENDPOINT, {"id_number": "x"}))
+            raise AssertionError("error was swallowed")
+        except RuntimeError:
+            pass
+        assert breaker.state == CircuitState.OPEN, f"state {breaker.state}"
+        time.sleep(RECOVERY * 2)
+        assert breaker.allow_request(), "breaker stuck after the failed trial"
+        print("      ✅ Trial counted as a failure; breaker recovers")
+    except Exception as e:
+        errors.append(f"Async failed trial failed: {e}")
+        print(f"      ❌ Async failed trial failed: {e}")
+
+    # ============ Test 3: Sync Trial With a Non-httpx Error ============
+    print("\n[3/3] Testing a sync trial that raises a non-httpx error...")
+    try:
+        client = SurepassClient()
+        client.transport = BrokenTransport(is_async=False)
+        breaker = half_open_client(client)
+        try:
+            client._make_request("POST", ENDPOINT, {"id_number": "x"})
+            raise AssertionError("error was swallowed")
+        except RuntimeError:
+            pass
+        assert breaker.state == CircuitState.OPEN, f"state {breaker.state}"
+        time.sleep(RECOVERY * 2)
+        assert breaker.allow_request(), "breaker stuck after the failed trial"
+        print("      ✅ Trial counted as a failure; breaker recovers")
+    except Exception as e:
+        errors.append(f"Sync failed trial failed: {e}")
+        print(f"      ❌ Sync failed trial failed: {e}")
+
+    # ============ Summary ============
+    print("\n" + "=" * 60)
+    if errors:
+        print(f"BREAKER RESULT: ❌ {len(errors)} ERROR(S)")
+        for e in errors:
+            print(f"  - {e}")
+    else:
+        print("BREAKER RESULT: ✅ ALL TESTS PASSED")
+    print("=" * 60)
+
+    return errors
+
+if __name__ == "__main__":
+    errors = test_surepass_resilience()
+    sys.exit(1 if errors else 0)
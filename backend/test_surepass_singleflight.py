@@ -0,0 +1,96 @@
+"""
+Surepass single-flight tests - a cancelled leader must not cancel its followers.
+
+Runs offline against AsyncSingleFlight directly.
+
+Run with: python test_surepass_singleflight.py
+"""
+
+import sys
+import asyncio
+
+from src.services.surepass.singleflight import AsyncSingleFlight, flight_key
+
+KEY = flight_key("POST", "pan-verification", {"id_number": "ABCDE1234F"})
+
+
+def test_surepass_singleflight():
+    print("=" * 60)
+    print("CHECK-360 Surepass Single-Flight Tests")
+    print("=" * 60)
+
+    errors = []
+
+    # ============ Test 1: Cancelled Leader ============
+    print("\n[1/2] Testing followers of a cancelled leader...")
+    try:
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def send():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await asyncio.Event().wait()  # The leader's call hangs until cancelled
+            await asyncio.sleep(0.01)  # The retry is in flight while the others join it
+            return {"valid": True, "call": len(calls)}
+
+        async def scenario():
+            leader = asyncio.create_task(group.do(KEY, send))
+            await asyncio.sleep(0.01)
+            followers = [asyncio.create_task(group.do(KEY, send)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*followers, return_exceptions=True)
+            try:
+                await leader
+                leader_cancelled = False
+            except asyncio.CancelledError:
+                leader_cancelled = True
+            return leader_cancelled, results
+
+        leader_cancelled, results = asyncio.run(scenario())
+        assert leader_cancelled, "leader was not cancelled"
+        failed = [r for r in results if isinstance(r, BaseException)]
+        assert not failed, f"followers failed: {failed!r}"
+        assert all(r == {"valid": True, "call": 2} for r in results), f"results {results}"
+        assert len(calls) == 2, f"{len(calls)} upstream calls, expected the original and one retry"
+        print("      ✅ Followers got the retried result; one extra upstream call")
+    except Exception as e:
+        errors.append(f"Cancelled leader failed: {e}")
+        print(f"      ❌ Cancelled leader failed: {e}")
+
+    # ============ Test 2: Leader Errors Are Shared ============
+    print("\n[2/2] Testing a leader error reaching its followers...")
+    try:
+        group = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("vendor said no")
+
+        async def scenario():
+            tasks = [asyncio.create_task(group.do(KEY, fail)) for _ in range(3)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        assert all(isinstance(r, ValueError) for r in results), f"results {results!r}"
+        print("      ✅ Every caller saw the leader's error")
+    except Exception as e:
+        errors.append(f"Shared error failed: {e}")
+        print(f"      ❌ Shared error failed: {e}")
+
+    # ============ Summary ============
+    print("\n" + "=" * 60)
+    if errors:
+        print(f"SINGLE-FLIGHT RESULT: ❌ {len(errors)} ERROR(S)")
+        for e in errors:
+            print(f"  - {e}")
+    else:
+        print("SINGLE-FLIGHT RESULT: ✅ ALL TESTS PASSED")
+    print("=" * 60)
+
+    return errors
+
+if __name__ == "__main__":
+    errors = test_surepass_singleflight()
+    sys.exit(1 if errors else 0)